@@ -20,8 +20,67 @@ class Config(BaseSettings):
         OPENWEBUI_TIMEOUT: HTTP request timeout in seconds
         OPENWEBUI_MAX_RETRIES: Maximum retry attempts
         OPENWEBUI_RATE_LIMIT: Client-side rate limit (requests/second)
+        EMBEDDING_BATCH_WINDOW_MS: Time to collect single-text embedding
+            requests into one upstream batch while an earlier batch for the
+            same model is in flight
+        EMBEDDING_BATCH_MAX_SIZE: Maximum texts per batched embedding request
+        EMBEDDING_CACHE_DIR: Directory for the persistent embedding cache
+            (disabled when unset)
+        EMBEDDING_CACHE_MAX_MB: Maximum size of cached vector data in MB
+        QUERY_CACHE_TTL_SECONDS: Lifetime of cached retrieval query results
+            (0 disables the cache)
+        QUERY_CACHE_MAX_ENTRIES: Maximum cached retrieval query results
+        FOLDER_TREE_CACHE_TTL_SECONDS: Lifetime of cached folder and chat
+            lists used by folder_tree (0 disables the cache)
+        MIRROR_DB_PATH: SQLite file for the local entity mirror (disabled
+            when unset)
+        MIRROR_KINDS: Comma-separated entity kinds to mirror
+        MIRROR_REFRESH_SECONDS: Background mirror refresh interval
+            (0 disables refreshing)
+        MIRROR_MAX_STALENESS_SECONDS: Default age limit for mirrored reads
+        MIRROR_TOOL_STALENESS: Per-tool age limits as tool=seconds pairs
+            (0 always reads upstream)
+        CHAT_INDEX_PATH: SQLite file for the offline chat search index
+            (disabled when unset)
+        CHAT_INDEX_REFRESH_SECONDS: Background chat index sync interval
+            (0 disables syncing)
+        METRICS_ENABLED: Serve Prometheus metrics at /metrics
+        WARMUP_CONNECTIONS: Upstream connections opened at startup, before
+            /ready reports ready (0 disables connection pre-warming)
+        WARMUP_TOOLS: Import and create every tool at startup
+        SHUTDOWN_DRAIN_SECONDS: Time in-flight tool calls get to finish on
+            shutdown before SSE sessions are closed
+        LOOP_MONITOR_INTERVAL_MS: Event loop lag measurement interval
+            (0 disables the monitor)
+        LOOP_BLOCK_THRESHOLD_MS: Event loop lag logged with the blocking
+            stack (0 disables blocking detection)
+        SLOW_CALL_THRESHOLD_MS: Default duration above which tool calls are
+            recorded in the slow-call log (0 disables the default)
+        SLOW_CALL_THRESHOLDS: Per-tool thresholds as tool=milliseconds
+            pairs; tool may be a glob pattern such as chat_*
+        SLOW_CALL_BUFFER_SIZE: Slow calls kept in memory for admin_slow_calls
+        SLOW_CALL_LOG_PATH: JSON lines file receiving slow-call records
+            (unset logs them only)
+        PROFILING_ENABLED: Enable the admin_cpu_profile and
+            admin_memory_profile tools
+        PROFILE_DIR: Directory receiving collapsed-stack profiles
+            (defaults to a directory under the system temp dir)
+        CASSETTE_MODE: Record upstream exchanges to CASSETTE_PATH, replay
+            them from it without network access, or off
+        CASSETTE_PATH: Cassette file (JSON lines, gzip-compressed when it
+            ends in .gz)
+        CASSETTE_TIMING_SCALE: Replay timing multiplier (1 keeps the
+            recorded timing, 0 replays instantly)
+        TRACING_EXPORT_PATH: File receiving request traces as OTLP/JSON
+            lines (unset disables file export)
+        TRACING_OTLP_ENDPOINT: OTLP/HTTP collector base URL receiving
+            request traces (unset disables collector export)
         LOG_LEVEL: Logging level
         LOG_FORMAT: Log format (json or text)
+        LOG_QUEUE_SIZE: Log records and file appends buffered for the
+            background writer thread (0 writes synchronously)
+        LOG_SAMPLING: Fraction of records below WARNING to keep per logger
+            as logger=rate pairs ("*" sets the default)
     """
 
     model_config = SettingsConfigDict(
@@ -39,13 +98,70 @@ class Config(BaseSettings):
     OPENWEBUI_MAX_RETRIES: int = 3
     OPENWEBUI_RATE_LIMIT: int = 10
 
+    # Embedding micro-batching
+    EMBEDDING_BATCH_WINDOW_MS: int = 5
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+
+    # Persistent embedding cache
+    EMBEDDING_CACHE_DIR: str | None = None
+    EMBEDDING_CACHE_MAX_MB: int = 512
+
+    # Retrieval query result cache
+    QUERY_CACHE_TTL_SECONDS: int = 60
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+
+    # Folder tree cache
+    FOLDER_TREE_CACHE_TTL_SECONDS: int = 60
+
+    # Local entity mirror
+    MIRROR_DB_PATH: str | None = None
+    MIRROR_KINDS: str = "chats,models,users,knowledge,prompts,folders"
+    MIRROR_REFRESH_SECONDS: int = 60
+    MIRROR_MAX_STALENESS_SECONDS: int = 120
+    MIRROR_TOOL_STALENESS: str = ""
+
+    # Offline chat search index
+    CHAT_INDEX_PATH: str | None = None
+    CHAT_INDEX_REFRESH_SECONDS: int = 300
+
     # HTTP Server
     PORT: int = 8000
     HOST: str = "127.0.0.1"
+    METRICS_ENABLED: bool = True
+
+    # Startup warm-up and shutdown draining
+    WARMUP_CONNECTIONS: int = 4
+    WARMUP_TOOLS: bool = True
+    SHUTDOWN_DRAIN_SECONDS: int = 30
+
+    # Event loop monitor
+    LOOP_MONITOR_INTERVAL_MS: int = 250
+    LOOP_BLOCK_THRESHOLD_MS: int = 200
+
+    # Slow-call log
+    SLOW_CALL_THRESHOLD_MS: int = 2000
+    SLOW_CALL_THRESHOLDS: str = ""
+    SLOW_CALL_BUFFER_SIZE: int = 200
+    SLOW_CALL_LOG_PATH: str | None = None
+
+    # On-demand profiling
+    PROFILING_ENABLED: bool = False
+    PROFILE_DIR: str | None = None
+
+    # Upstream record and replay
+    CASSETTE_MODE: Literal["off", "record", "replay"] = "off"
+    CASSETTE_PATH: str | None = None
+    CASSETTE_TIMING_SCALE: float = 1.0
+
+    # Request tracing
+    TRACING_EXPORT_PATH: str | None = None
+    TRACING_OTLP_ENDPOINT: str | None = None
 
     # Logging
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
     LOG_FORMAT: Literal["json", "text"] = "json"
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLING: str = ""
 
     def model_post_init(self, __context: object) -> None:
         """Validate configuration after initialization.
@@ -90,6 +206,105 @@ class Config(BaseSettings):
                 "OPENWEBUI_RATE_LIMIT must be >= 1"
             )
 
+        if self.EMBEDDING_BATCH_WINDOW_MS < 0:
+            raise CustomValidationError(
+                "EMBEDDING_BATCH_WINDOW_MS must be >= 0"
+            )
+
+        if self.EMBEDDING_BATCH_MAX_SIZE < 1:
+            raise CustomValidationError(
+                "EMBEDDING_BATCH_MAX_SIZE must be >= 1"
+            )
+
+        if self.EMBEDDING_CACHE_MAX_MB < 1:
+            raise CustomValidationError(
+                "EMBEDDING_CACHE_MAX_MB must be >= 1"
+            )
+
+        if self.QUERY_CACHE_TTL_SECONDS < 0:
+            raise CustomValidationError(
+                "QUERY_CACHE_TTL_SECONDS must be >= 0"
+            )
+
+        if self.QUERY_CACHE_MAX_ENTRIES < 1:
+            raise CustomValidationError(
+                "QUERY_CACHE_MAX_ENTRIES must be >= 1"
+            )
+
+        if self.FOLDER_TREE_CACHE_TTL_SECONDS < 0:
+            raise CustomValidationError(
+                "FOLDER_TREE_CACHE_TTL_SECONDS must be >= 0"
+            )
+
+        if self.MIRROR_REFRESH_SECONDS < 0:
+            raise CustomValidationError(
+                "MIRROR_REFRESH_SECONDS must be >= 0"
+            )
+
+        if self.MIRROR_MAX_STALENESS_SECONDS < 0:
+            raise CustomValidationError(
+                "MIRROR_MAX_STALENESS_SECONDS must be >= 0"
+            )
+
+        # Parse eagerly so malformed entries fail at startup
+        self.mirror_tool_staleness
+
+        if self.CHAT_INDEX_REFRESH_SECONDS < 0:
+            raise CustomValidationError(
+                "CHAT_INDEX_REFRESH_SECONDS must be >= 0"
+            )
+
+        if self.WARMUP_CONNECTIONS < 0:
+            raise CustomValidationError(
+                "WARMUP_CONNECTIONS must be >= 0"
+            )
+
+        if self.SHUTDOWN_DRAIN_SECONDS < 0:
+            raise CustomValidationError(
+                "SHUTDOWN_DRAIN_SECONDS must be >= 0"
+            )
+
+        if self.LOOP_MONITOR_INTERVAL_MS < 0:
+            raise CustomValidationError(
+                "LOOP_MONITOR_INTERVAL_MS must be >= 0"
+            )
+
+        if self.LOOP_BLOCK_THRESHOLD_MS < 0:
+            raise CustomValidationError(
+                "LOOP_BLOCK_THRESHOLD_MS must be >= 0"
+            )
+
+        if self.SLOW_CALL_THRESHOLD_MS < 0:
+            raise CustomValidationError(
+                "SLOW_CALL_THRESHOLD_MS must be >= 0"
+            )
+
+        if self.SLOW_CALL_BUFFER_SIZE < 1:
+            raise CustomValidationError(
+                "SLOW_CALL_BUFFER_SIZE must be >= 1"
+            )
+
+        # Parse eagerly so malformed entries fail at startup
+        self.slow_call_thresholds
+
+        if self.CASSETTE_MODE != "off" and not self.CASSETTE_PATH:
+            raise CustomValidationError(
+                "CASSETTE_PATH is required when CASSETTE_MODE is record or replay"
+            )
+
+        if self.CASSETTE_TIMING_SCALE < 0:
+            raise CustomValidationError(
+                "CASSETTE_TIMING_SCALE must be >= 0"
+            )
+
+        if self.LOG_QUEUE_SIZE < 0:
+            raise CustomValidationError(
+                "LOG_QUEUE_SIZE must be >= 0"
+            )
+
+        # Parse eagerly so malformed entries fail at startup
+        self.log_sample_rates
+
         # Validate HTTP server settings
         if self.PORT < 1 or self.PORT > 65535:
             raise CustomValidationError(
@@ -105,6 +320,85 @@ class Config(BaseSettings):
         """
         return self.OPENWEBUI_BASE_URL.rstrip("/")
 
+    @property
+    def mirror_kinds(self) -> list[str]:
+        """Get the entity kinds to mirror.
+
+        Returns:
+            Kind names
+        """
+        return [kind.strip() for kind in self.MIRROR_KINDS.split(",") if kind.strip()]
+
+    @property
+    def mirror_tool_staleness(self) -> dict[str, int]:
+        """Get per-tool mirror staleness bounds.
+
+        Returns:
+            Seconds by tool name
+
+        Raises:
+            CustomValidationError: If an entry is not tool=seconds
+        """
+        bounds: dict[str, int] = {}
+        for entry in self.MIRROR_TOOL_STALENESS.split(","):
+            if not entry.strip():
+                continue
+            tool, _, seconds = entry.partition("=")
+            if not tool.strip() or not seconds.strip().isdigit():
+                raise CustomValidationError(
+                    f"MIRROR_TOOL_STALENESS entries must be tool=seconds, got: {entry.strip()}"
+                )
+            bounds[tool.strip()] = int(seconds)
+        return bounds
+
+    @property
+    def slow_call_thresholds(self) -> dict[str, int]:
+        """Get per-tool slow-call thresholds.
+
+        Returns:
+            Milliseconds by tool name or glob pattern
+
+        Raises:
+            CustomValidationError: If an entry is not tool=milliseconds
+        """
+        thresholds: dict[str, int] = {}
+        for entry in self.SLOW_CALL_THRESHOLDS.split(","):
+            if not entry.strip():
+                continue
+            tool, _, ms = entry.partition("=")
+            if not tool.strip() or not ms.strip().isdigit():
+                raise CustomValidationError(
+                    f"SLOW_CALL_THRESHOLDS entries must be tool=milliseconds, got: {entry.strip()}"
+                )
+            thresholds[tool.strip()] = int(ms)
+        return thresholds
+
+    @property
+    def log_sample_rates(self) -> dict[str, float]:
+        """Get per-logger sampling rates.
+
+        Returns:
+            Fraction of records to keep by logger name
+
+        Raises:
+            CustomValidationError: If an entry is not logger=rate with rate 0-1
+        """
+        rates: dict[str, float] = {}
+        for entry in self.LOG_SAMPLING.split(","):
+            if not entry.strip():
+                continue
+            name, _, rate = entry.partition("=")
+            try:
+                parsed = float(rate)
+            except ValueError:
+                parsed = -1.0
+            if not name.strip() or not 0 <= parsed <= 1:
+                raise CustomValidationError(
+                    f"LOG_SAMPLING entries must be logger=rate with rate 0-1, got: {entry.strip()}"
+                )
+            rates[name.strip()] = parsed
+        return rates
+
     @property
     def api_key(self) -> str:
         """Get API key for authentication.
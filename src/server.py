@@ -4,34 +4,98 @@ Main entry point for the MCP server providing tools for Open WebUI API.
 Runs as HTTP server using Starlette and Uvicorn for production deployment.
 """
 
+import asyncio
 import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 import uvicorn
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
 from mcp.types import Tool
+from sse_starlette.sse import AppStatus
 from starlette.applications import Starlette
 from starlette.routing import Route, Mount
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.responses import JSONResponse, Response
 from src.tools.factory import ToolFactory
 from src.config import Config
-from src.utils.logging_utils import setup_logging, get_logger
+from src.utils.logging_utils import get_logger, sanitize_for_logging, setup_logging
 from src.utils.error_handler import sanitize_error
+from src.utils.lifecycle import Lifecycle
+from src.utils.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    REGISTRY,
+    SSE_SESSIONS,
+    TOOL_CALLS,
+    TOOL_DURATION,
+    TOOL_ERRORS,
+)
+from src.utils.tracing import OTLPFileExporter, OTLPHTTPExporter, configure, mark_error, span, start_trace
 
 # Initialize configuration
 config = Config()
 
 # Setup logging
-setup_logging(config.LOG_LEVEL, config.LOG_FORMAT)
+setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_QUEUE_SIZE, config.log_sample_rates)
 logger = get_logger(__name__)
 
 # Initialize tool factory
 factory = ToolFactory(config)
 
+# Export request traces when a destination is configured
+trace_exporters = []
+if config.TRACING_EXPORT_PATH:
+    trace_exporters.append(OTLPFileExporter(config.TRACING_EXPORT_PATH))
+if config.TRACING_OTLP_ENDPOINT:
+    trace_exporters.append(OTLPHTTPExporter(config.TRACING_OTLP_ENDPOINT))
+configure(trace_exporters)
+
+# Readiness, in-flight tool calls and draining
+lifecycle = Lifecycle()
+
+# sse-starlette ends every SSE stream as soon as uvicorn receives a
+# shutdown signal, cutting off in-flight tool calls; draining ends the
+# sessions itself once those calls finish
+AppStatus.disable_automatic_graceful_drain()
+
 # Create MCP server
 mcp_server = Server("open-webui-mcp")
 
+# Results estimated below this many encoded characters are serialized on
+# the event loop; a thread hop costs more than encoding them
+INLINE_ENCODE_MAX_CHARS = 16 * 1024
+
+
+def _fits_inline(value: Any, budget: int = INLINE_ENCODE_MAX_CHARS) -> bool:
+    """Estimate whether a result encodes to at most budget characters.
+
+    Walks the value until the estimate exceeds the budget, so large results
+    are rejected after visiting only a prefix of them.
+
+    Args:
+        value: Tool result
+        budget: Character budget
+
+    Returns:
+        True if the result is small enough to encode inline
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            budget -= len(item) + 8
+        elif isinstance(item, (dict, list, tuple)):
+            budget -= 8 * len(item)
+            if budget >= 0:
+                stack.extend(item.items() if isinstance(item, dict) else item)
+        else:
+            budget -= 24
+        if budget < 0:
+            return False
+    return True
+
 
 @mcp_server.list_tools()
 async def list_tools() -> list[Tool]:
@@ -66,8 +130,77 @@ async def list_tools() -> list[Tool]:
         return []
 
 
+def _session_id() -> str | None:
+    """Get the MCP session id of the request being handled.
+
+    Returns:
+        SSE session id, or None if unavailable
+    """
+    try:
+        request = mcp_server.request_context.request
+    except LookupError:
+        return None
+    query_params = getattr(request, "query_params", None)
+    return query_params.get("session_id") if query_params is not None else None
+
+
 @mcp_server.call_tool()
 async def call_tool(name: str, arguments: dict) -> dict:
+    """Execute an MCP tool within a request trace.
+
+    The trace id is the request id forwarded upstream as X-Request-ID.
+    When tracing is enabled, the per-stage latency breakdown is logged.
+    Calls over their slow-call threshold are recorded in the slow log.
+    While the server drains, new calls are refused.
+
+    Args:
+        name: Tool name
+        arguments: Tool arguments
+
+    Returns:
+        Tool execution result or error
+    """
+    if not lifecycle.accepting:
+        return {
+            "isError": True,
+            "content": [
+                {
+                    "type": "text",
+                    "text": "Server is shutting down"
+                }
+            ]
+        }
+
+    _ensure_loop_monitor()
+    with lifecycle.call(), start_trace(
+        f"tools/call {name}", session_id=_session_id(), **{"mcp.tool.name": name}
+    ) as trace:
+        response = await _run_tool(name, arguments)
+
+    slow_log = factory.get_service("slow_log")
+    if slow_log is not None:
+        slow_log.observe(
+            name,
+            arguments,
+            trace.root.duration_ms,
+            stats=trace.stats,
+            request_id=trace.request_id,
+            error=bool(response.get("isError"))
+        )
+
+    if trace.record:
+        logger.info(
+            f"Tool {name} finished in {trace.root.duration_ms:.0f}ms",
+            extra={
+                "request_id": trace.request_id,
+                "duration_ms": round(trace.root.duration_ms, 3),
+                "stages_ms": trace.stage_totals(),
+            }
+        )
+    return response
+
+
+async def _run_tool(name: str, arguments: dict) -> dict:
     """Execute an MCP tool.
 
     Args:
@@ -77,26 +210,42 @@ async def call_tool(name: str, arguments: dict) -> dict:
     Returns:
         Tool execution result or error
     """
-    logger.info(f"Calling tool: {name}", extra={"arguments": arguments})
+    logger.info(f"Calling tool: {name}", extra={"arguments": sanitize_for_logging(arguments)})
 
+    # Unknown names share one label so they cannot grow the series count
+    tool_label = "unknown"
+    start = time.monotonic()
     try:
         # Create or retrieve tool
         tool = factory.create_tool(name)
+        tool_label = name
 
         # Execute tool
-        result = await tool.execute(arguments)
-
-        # Return MCP response
+        with span("execute"):
+            result = await tool.execute(arguments)
+        TOOL_CALLS.inc(tool=tool_label, outcome="success")
+
+        # Return MCP response; indented encoding runs the pure-Python
+        # encoder, so large results would otherwise stall the event loop
+        with span("encode"):
+            if _fits_inline(result):
+                text = json.dumps(result, indent=2)
+            else:
+                text = await asyncio.to_thread(json.dumps, result, indent=2)
         return {
             "content": [
                 {
                     "type": "text",
-                    "text": json.dumps(result, indent=2)
+                    "text": text
                 }
             ]
         }
 
     except Exception as e:
+        TOOL_CALLS.inc(tool=tool_label, outcome="error")
+        TOOL_ERRORS.inc(tool=tool_label, error_type=type(e).__name__)
+        mark_error(type(e).__name__)
+
         # Sanitize error for client
         error_data = sanitize_error(e, f"Tool execution failed: {name}")
 
@@ -116,6 +265,9 @@ async def call_tool(name: str, arguments: dict) -> dict:
             ]
         }
 
+    finally:
+        TOOL_DURATION.observe(time.monotonic() - start, tool=tool_label)
+
 
 # Create SSE transport (trailing slash required per MCP SDK convention)
 sse = SseServerTransport("/messages/")
@@ -128,30 +280,298 @@ async def handle_sse(request: Request) -> Response:
         request: Starlette request object
 
     Returns:
-        SSE response stream
-    """
-    async with sse.connect_sse(
-        request.scope,
-        request.receive,
-        request._send,
-    ) as (read_stream, write_stream):
-        await mcp_server.run(
-            read_stream,
-            write_stream,
-            mcp_server.create_initialization_options(),
-        )
+        SSE response stream, or 503 while the server drains
+    """
+    if not lifecycle.accepting:
+        return Response("Server is shutting down", status_code=503)
+
+    _ensure_loop_monitor()
+    # Whether the transport started and finished the response, so only
+    # what is missing is sent once the session ends
+    sent: set[str] = set()
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.start" or not message.get("more_body", False):
+            sent.add(message["type"])
+        await request._send(message)
+
+    SSE_SESSIONS.inc()
+    try:
+        with lifecycle.session():
+            async with sse.connect_sse(
+                request.scope,
+                request.receive,
+                send,
+            ) as (read_stream, write_stream):
+                await mcp_server.run(
+                    read_stream,
+                    write_stream,
+                    mcp_server.create_initialization_options(),
+                )
+    finally:
+        SSE_SESSIONS.dec()
+    if "http.response.start" in sent:
+        return _StreamEnd(complete="http.response.body" in sent)
     return Response()
 
 
+class _StreamEnd(Response):
+    """Completes an SSE response once its session has ended.
+
+    The transport already sent the headers, so at most a final empty body
+    is left to send: when draining cancelled the session mid-stream.
+
+    Args:
+        complete: Whether the stream already sent its final body
+    """
+
+    def __init__(self, complete: bool) -> None:
+        """Initialize response.
+
+        Args:
+            complete: Whether the final body was sent
+        """
+        super().__init__()
+        self.complete = complete
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        """Send the final body if the stream did not.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive callable
+            send: ASGI send callable
+        """
+        if not self.complete:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def handle_ready(request: Request) -> Response:
+    """Report readiness for load balancers and orchestrators.
+
+    Args:
+        request: Starlette request object
+
+    Returns:
+        200 once warm-up finished, 503 while starting or draining
+    """
+    return JSONResponse(
+        {"status": lifecycle.state, "in_flight": lifecycle.in_flight, "sessions": lifecycle.sessions},
+        status_code=200 if lifecycle.state == "ready" else 503,
+    )
+
+
+def _ensure_loop_monitor() -> None:
+    """Start the event loop monitor once the server loop is running."""
+    monitor = factory.get_service("loop_monitor")
+    if monitor is not None:
+        monitor.ensure_started()
+
+
+def _loop_lag_quantiles() -> dict[str, float] | None:
+    """Read recent event loop lag percentiles.
+
+    Returns:
+        Lag in seconds by quantile, or None while the monitor is disabled
+    """
+    monitor = factory.active_services().get("loop_monitor")
+    if monitor is None:
+        return None
+    return {f"{q:g}": lag for q, lag in monitor.percentiles().items()}
+
+
+def _rate_limiter_metric(read: str) -> Any:
+    """Read a rate limiter metric without creating the limiter.
+
+    Args:
+        read: Attribute to read ("waiting" or "wait_seconds")
+
+    Returns:
+        Attribute value, or None before the limiter exists
+    """
+    limiter = factory.active_services().get("rate_limiter")
+    return getattr(limiter, read) if limiter is not None else None
+
+
+def _pool_metric(key: str) -> int | None:
+    """Read one connection pool stat.
+
+    Args:
+        key: Stat name from OpenWebUIClient.get_pool_stats
+
+    Returns:
+        Stat value, or None before the client exists
+    """
+    stats = factory.get_pool_stats()
+    return stats[key] if stats is not None else None
+
+
+def _pool_connections() -> dict[str, int] | None:
+    """Read open connection counts by state.
+
+    Returns:
+        Active and idle connection counts, or None before the client exists
+    """
+    stats = factory.get_pool_stats()
+    return {state: stats[state] for state in ("active", "idle")} if stats is not None else None
+
+
+def _cache_metric(read: str) -> dict[str, float]:
+    """Read hit/miss counters of every enabled cache service.
+
+    Args:
+        read: "hits", "misses" or "ratio"
+
+    Returns:
+        Values by service name
+    """
+    values = {}
+    for name, service in factory.active_services().items():
+        if not hasattr(service, "hits") or not hasattr(service, "misses"):
+            continue
+        if read == "ratio":
+            lookups = service.hits + service.misses
+            values[name] = service.hits / lookups if lookups else 0.0
+        else:
+            values[name] = getattr(service, read)
+    return values
+
+
+REGISTRY.callback(
+    "openwebui_mcp_rate_limiter_waiting", "Requests waiting for a rate limiter token", "gauge",
+    lambda: _rate_limiter_metric("waiting"),
+)
+REGISTRY.callback(
+    "openwebui_mcp_rate_limiter_wait_seconds", "Time spent waiting for a rate limiter token", "histogram",
+    lambda: _rate_limiter_metric("wait_seconds"),
+)
+REGISTRY.callback(
+    "openwebui_mcp_http_pool_connections", "Open connections to Open WebUI by state", "gauge",
+    _pool_connections, ("state",),
+)
+REGISTRY.callback(
+    "openwebui_mcp_http_pool_max_connections", "Connection pool size", "gauge",
+    lambda: _pool_metric("max_connections"),
+)
+REGISTRY.callback(
+    "openwebui_mcp_http_pool_queued_requests", "Requests waiting for a pooled connection", "gauge",
+    lambda: _pool_metric("queued"),
+)
+REGISTRY.callback(
+    "openwebui_mcp_event_loop_lag_quantile_seconds", "Recent event loop lag percentiles", "gauge",
+    _loop_lag_quantiles, ("quantile",),
+)
+REGISTRY.callback(
+    "openwebui_mcp_tool_calls_in_flight", "Tool calls currently running", "gauge",
+    lambda: lifecycle.in_flight,
+)
+REGISTRY.callback(
+    "openwebui_mcp_cache_hits_total", "Cache hits by cache", "counter",
+    lambda: _cache_metric("hits"), ("cache",),
+)
+REGISTRY.callback(
+    "openwebui_mcp_cache_misses_total", "Cache misses by cache", "counter",
+    lambda: _cache_metric("misses"), ("cache",),
+)
+REGISTRY.callback(
+    "openwebui_mcp_cache_hit_ratio", "Cache hit ratio since start by cache", "gauge",
+    lambda: _cache_metric("ratio"), ("cache",),
+)
+
+
+async def handle_metrics(request: Request) -> Response:
+    """Serve metrics in the Prometheus text format.
+
+    Args:
+        request: Starlette request object
+
+    Returns:
+        Metrics exposition
+    """
+    _ensure_loop_monitor()
+    return Response(REGISTRY.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+async def warm_up() -> None:
+    """Prepare for the first tool calls, then report ready.
+
+    Imports and creates every tool, starts the mirror and chat index
+    background refreshes and opens pooled upstream connections. Failures
+    are logged and the server reports ready regardless; upstream health is
+    what the healthcheck tools are for.
+    """
+    start = time.monotonic()
+    tools = connections = 0
+    _ensure_loop_monitor()
+    try:
+        if config.WARMUP_TOOLS:
+            # Importing every tool module takes long enough to stall the loop
+            tools = len(await asyncio.to_thread(factory.get_all_tools))
+        for name in ("mirror", "chat_index"):
+            service = factory.get_service(name)
+            if service is not None:
+                service.ensure_started()
+        connections = await factory.client.warm_up(config.WARMUP_CONNECTIONS)
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {e}", exc_info=True)
+    lifecycle.mark_ready()
+    logger.info(
+        f"Ready after {(time.monotonic() - start) * 1000:.0f}ms warm-up",
+        extra={"tools": tools, "connections": connections}
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator[None]:
+    """Warm up in the background on startup; drain and release resources on shutdown.
+
+    Args:
+        app: Starlette application
+    """
+    warm = asyncio.create_task(warm_up())
+    try:
+        yield
+    finally:
+        warm.cancel()
+        await asyncio.gather(warm, return_exceptions=True)
+        await lifecycle.drain(config.SHUTDOWN_DRAIN_SECONDS)
+        await factory.cleanup()
+        for exporter in trace_exporters:
+            await exporter.close()
+        logger.info("Released upstream connections and background services")
+
+
 # Create Starlette app with MCP routes
 # Note: handle_post_message is an ASGI app, so we use Mount instead of Route
 # This avoids the double-response error that occurs when wrapping it in a Route handler
-app = Starlette(
-    routes=[
-        Route("/sse", endpoint=handle_sse),
-        Mount("/messages", app=sse.handle_post_message),
-    ],
-)
+routes = [
+    Route("/sse", endpoint=handle_sse),
+    Mount("/messages", app=sse.handle_post_message),
+    Route("/ready", endpoint=handle_ready),
+]
+if config.METRICS_ENABLED:
+    routes.append(Route("/metrics", endpoint=handle_metrics))
+
+app = Starlette(routes=routes, lifespan=lifespan)
+
+
+class DrainingServer(uvicorn.Server):
+    """Uvicorn server that drains tool calls before closing connections.
+
+    Uvicorn waits for open connections before the lifespan shutdown runs,
+    and SSE connections stay open until their client leaves, so draining
+    starts here instead. The listening socket stays open meanwhile, so
+    new SSE sessions get a 503 rather than a refused connection.
+    """
+
+    async def shutdown(self, sockets: list[Any] | None = None) -> None:
+        """Drain, then shut down as usual.
+
+        Args:
+            sockets: Listening sockets
+        """
+        await lifecycle.drain(config.SHUTDOWN_DRAIN_SECONDS)
+        await super().shutdown(sockets)
 
 
 def main() -> None:
@@ -162,12 +582,14 @@ def main() -> None:
     logger.info(f"Listening on http://{config.HOST}:{config.PORT}")
 
     try:
-        uvicorn.run(
+        server = DrainingServer(uvicorn.Config(
             app,
             host=config.HOST,
             port=config.PORT,
             log_level=config.LOG_LEVEL.lower(),
-        )
+            timeout_graceful_shutdown=config.SHUTDOWN_DRAIN_SECONDS,
+        ))
+        server.run()
     except KeyboardInterrupt:
         logger.info("Server interrupted by user")
     except Exception as e:
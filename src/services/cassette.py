@@ -0,0 +1,391 @@
+"""Record and replay upstream HTTP exchanges.
+
+A cassette is a JSON lines file (gzip-compressed when the path ends in
+.gz) with one upstream exchange per line: method, path with query, a hash
+of the request body, response status, a few response headers, the body
+as received and its timing (time to headers, and chunk arrival for
+bodies that arrived in several chunks). Request headers are never
+stored, so API keys stay out of cassettes.
+
+RecordingTransport wraps the real transport and appends exchanges as
+their bodies finish. ReplayTransport serves them without network access,
+sleeping for the recorded timing multiplied by a scale factor (1 keeps
+the original timing, 0 replays instantly).
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, TextIO
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+# Response headers kept in cassettes; content-encoding stays because the
+# body is stored as received, before the client decompresses it
+RECORDED_HEADERS = (
+    "content-type", "content-encoding", "content-disposition", "retry-after", "etag", "location"
+)
+
+
+def _body_hash(content: bytes) -> str | None:
+    """Hash a request body for matching.
+
+    Args:
+        content: Request body
+
+    Returns:
+        Short hex digest, or None for an empty body
+    """
+    return hashlib.sha256(content).hexdigest()[:16] if content else None
+
+
+def _target(request: httpx.Request) -> str:
+    """Get the path and query of a request.
+
+    Args:
+        request: Request
+
+    Returns:
+        Path with query string
+    """
+    return request.url.raw_path.decode("ascii", "replace")
+
+
+def _open_cassette(path: Path, mode: str) -> TextIO:
+    """Open a cassette file, gzip-compressed when it ends in .gz.
+
+    Args:
+        path: Cassette path
+        mode: Text mode ("r" or "a")
+
+    Returns:
+        Text file object
+    """
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """Response body stream that records the body and chunk timing.
+
+    Args:
+        stream: Wrapped body stream
+        entry: Exchange being recorded (completed on close)
+        start: time.monotonic() when the request was sent
+        recorder: Transport writing the completed exchange
+    """
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        entry: dict[str, Any],
+        start: float,
+        recorder: "RecordingTransport"
+    ) -> None:
+        """Initialize stream.
+
+        Args:
+            stream: Wrapped body stream
+            entry: Exchange being recorded
+            start: Request send time
+            recorder: Writing transport
+        """
+        self.stream = stream
+        self.entry = entry
+        self.start = start
+        self.recorder = recorder
+        self.body = bytearray()
+        self.chunks: list[list[float | int]] = []
+        self.complete = False
+        self.written = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield body chunks, keeping a copy.
+
+        Yields:
+            Body chunks
+        """
+        async for chunk in self.stream:
+            self.body.extend(chunk)
+            self.chunks.append([round((time.monotonic() - self.start) * 1000, 1), len(chunk)])
+            yield chunk
+        self.complete = True
+
+    async def aclose(self) -> None:
+        """Close the wrapped stream and write the exchange once."""
+        await self.stream.aclose()
+        if self.written:
+            return
+        self.written = True
+        entry = self.entry
+        entry["duration_ms"] = round((time.monotonic() - self.start) * 1000, 1)
+        body = bytes(self.body)
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        if len(self.chunks) > 1:
+            entry["chunks"] = self.chunks
+        if not self.complete:
+            entry["truncated"] = True
+        await self.recorder.write(entry)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport that appends every exchange to a cassette.
+
+    Args:
+        transport: Wrapped transport
+        path: Cassette file (appended to)
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, path: str | Path) -> None:
+        """Initialize transport.
+
+        Args:
+            transport: Wrapped transport
+            path: Cassette file
+        """
+        self.transport = transport
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.recorded = 0
+        self._origin = time.monotonic()
+        self._file: TextIO | None = None
+        self._lock = threading.Lock()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request and record its response.
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            Response whose body is recorded as it is read
+        """
+        content = await request.aread()
+        start = time.monotonic()
+        response = await self.transport.handle_async_request(request)
+        entry = {
+            "t": round((start - self._origin) * 1000, 1),
+            "method": request.method,
+            "path": _target(request),
+            "body_hash": _body_hash(content),
+            "status": response.status_code,
+            "headers": {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            "ttfb_ms": round((time.monotonic() - start) * 1000, 1),
+        }
+        # A fresh response, so the body is read through the recording
+        # stream even when the wrapped transport preloaded it
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, entry, start, self),
+            extensions=response.extensions,
+        )
+
+    async def write(self, entry: dict[str, Any]) -> None:
+        """Append an exchange to the cassette.
+
+        Args:
+            entry: Completed exchange
+        """
+        line = json.dumps(entry, separators=(",", ":"))
+        await asyncio.to_thread(self._append, line)
+        self.recorded += 1
+
+    def _append(self, line: str) -> None:
+        """Write one line, opening the file and its header on first use.
+
+        Args:
+            line: Encoded exchange
+        """
+        with self._lock:
+            if self._file is None:
+                new = not self.path.exists() or self.path.stat().st_size == 0
+                self._file = _open_cassette(self.path, "a")
+                if new:
+                    self._file.write(json.dumps({"cassette": CASSETTE_VERSION}) + "\n")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export recording counters.
+
+        Returns:
+            Dict with mode, path and exchanges recorded
+        """
+        return {"mode": "record", "path": str(self.path), "recorded": self.recorded}
+
+    async def aclose(self) -> None:
+        """Close the cassette file and the wrapped transport."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        logger.info(f"Recorded {self.recorded} upstream exchanges to {self.path}")
+        await self.transport.aclose()
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    """Response body stream replaying recorded chunk timing.
+
+    Args:
+        body: Recorded body
+        chunks: Recorded [ms since request, size] pairs
+        ttfb_ms: Recorded time to headers (already waited for)
+        scale: Timing scale factor
+    """
+
+    def __init__(self, body: bytes, chunks: list[list[float]], ttfb_ms: float, scale: float) -> None:
+        """Initialize stream.
+
+        Args:
+            body: Recorded body
+            chunks: Chunk timing
+            ttfb_ms: Time to headers
+            scale: Timing scale
+        """
+        self.body = body
+        self.chunks = chunks or [[ttfb_ms, len(body)]]
+        self.ttfb_ms = ttfb_ms
+        self.scale = scale
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the body in its recorded chunks and timing.
+
+        Yields:
+            Body chunks
+        """
+        offset = 0
+        elapsed_ms = self.ttfb_ms
+        for at_ms, size in self.chunks:
+            if self.scale > 0 and at_ms > elapsed_ms:
+                await asyncio.sleep((at_ms - elapsed_ms) * self.scale / 1000)
+                elapsed_ms = at_ms
+            yield self.body[offset:offset + int(size)]
+            offset += int(size)
+        if offset < len(self.body):
+            yield self.body[offset:]
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Transport that serves recorded exchanges without network access.
+
+    Requests match recorded exchanges by method, path with query and body
+    hash, falling back to method and path (bodies such as multipart
+    uploads differ on every send). Repeated requests take the recorded
+    exchanges in order and start over when they run out.
+
+    Args:
+        path: Cassette file
+        scale: Timing scale (1 original, 0 instant)
+
+    Raises:
+        ValueError: If the cassette is missing or unreadable
+    """
+
+    def __init__(self, path: str | Path, scale: float = 1.0) -> None:
+        """Load a cassette.
+
+        Args:
+            path: Cassette file
+            scale: Timing scale
+
+        Raises:
+            ValueError: If the cassette is missing or unreadable
+        """
+        self.path = Path(path)
+        self.scale = scale
+        self.replayed = 0
+        self.misses = 0
+        self._exact: dict[tuple[str, str, str | None], deque[dict[str, Any]]] = {}
+        self._loose: dict[tuple[str, str], deque[dict[str, Any]]] = {}
+        try:
+            with _open_cassette(self.path, "r") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read cassette {self.path}: {e}")
+        for entry in entries:
+            if "method" not in entry:
+                continue
+            self._exact.setdefault((entry["method"], entry["path"], entry.get("body_hash")), deque()).append(entry)
+            self._loose.setdefault((entry["method"], entry["path"]), deque()).append(entry)
+        self.size = sum(len(queue) for queue in self._exact.values())
+        logger.info(f"Loaded {self.size} upstream exchanges from {self.path}")
+
+    def _next(self, queue: deque[dict[str, Any]]) -> dict[str, Any]:
+        """Take the next exchange of a queue, cycling through it.
+
+        Args:
+            queue: Matching exchanges
+
+        Returns:
+            Exchange
+        """
+        entry = queue.popleft()
+        queue.append(entry)
+        return entry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Serve a recorded response.
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            Recorded response
+
+        Raises:
+            httpx.ConnectError: If no exchange was recorded for the request
+        """
+        content = await request.aread()
+        target = _target(request)
+        queue = self._exact.get((request.method, target, _body_hash(content)))
+        if queue is None:
+            queue = self._loose.get((request.method, target))
+        if queue is None:
+            self.misses += 1
+            logger.warning(f"Cassette has no response for {request.method} {target}")
+            raise httpx.ConnectError(f"No recorded response for {request.method} {target}", request=request)
+
+        entry = self._next(queue)
+        self.replayed += 1
+        ttfb_ms = entry.get("ttfb_ms", 0.0)
+        if self.scale > 0 and ttfb_ms > 0:
+            await asyncio.sleep(ttfb_ms * self.scale / 1000)
+        if "body_b64" in entry:
+            body = base64.b64decode(entry["body_b64"])
+        else:
+            body = entry.get("body", "").encode("utf-8")
+        return httpx.Response(
+            entry["status"],
+            headers=entry.get("headers", {}),
+            stream=_ReplayStream(body, entry.get("chunks", []), ttfb_ms, self.scale),
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export replay counters.
+
+        Returns:
+            Dict with mode, path, cassette size, replayed and missed requests
+        """
+        return {
+            "mode": "replay",
+            "path": str(self.path),
+            "size": self.size,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
@@ -0,0 +1,732 @@
+"""Offline full-text index over chat history.
+
+Chat messages are stored in SQLite with an FTS5 index and ranked with
+BM25, so searches never reach Open WebUI. The index is built from a chat
+export archive or from the chat list, then kept current incrementally:
+each sync lists chats newest-first down to the ``updated_at`` watermark and
+re-fetches only chats that changed, while writes through the client mark
+the chats they touch for the next sync.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from src.exceptions import NotFoundError
+from src.utils.jsonl_archive import aiter_jsonl
+from src.utils.pagination import CHAT_LIST_ALL_PARAMS, PAGINATED_TOOLS, paginate
+
+logger = logging.getLogger(__name__)
+
+CHAT_LIST_SPEC = PAGINATED_TOOLS["get_session_user_chat_list_chats_list"]
+
+# Incremental syncs also walk the full list every Nth sync to drop deleted chats
+FULL_SYNC_EVERY = 10
+
+# Chats fetched and written per sync transaction
+SYNC_BATCH_SIZE = 50
+
+# Records written per transaction when ingesting an archive
+INGEST_BATCH_SIZE = 500
+
+# Tokens of context around each match in snippets
+SNIPPET_TOKENS = 16
+
+_CHAT_WRITE = re.compile(r"^/api/v1/(chats|folders)(?:/([^/]+))?(?:/([^/]+))?")
+
+# First chat path segments that are not chat ids
+_NON_CHAT_SEGMENTS = {"new", "import", "archive", "all", "tags", "pinned", "folder", "share", "search", "list"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    chat_id TEXT PRIMARY KEY,
+    title TEXT,
+    updated_at INTEGER,
+    tags TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chat_tags (
+    tag TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    PRIMARY KEY (tag, chat_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS chat_tags_chat ON chat_tags (chat_id);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    chat_id TEXT NOT NULL,
+    message_id TEXT,
+    role TEXT,
+    ts INTEGER,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_chat ON messages (chat_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize a tag the way Open WebUI derives tag ids.
+
+    Args:
+        tag: Tag name or id
+
+    Returns:
+        Tag id
+    """
+    return tag.strip().replace(" ", "_").lower()
+
+
+def build_match(query: str, match_all: bool = True) -> str:
+    """Build an FTS5 match expression from a search query.
+
+    Double-quoted parts are matched as phrases and a trailing ``*`` makes
+    a prefix match; everything else is a plain term. Terms are quoted so
+    FTS5 operators in user input are matched literally.
+
+    Args:
+        query: Search query
+        match_all: Require every term (otherwise any term matches)
+
+    Returns:
+        FTS5 match expression
+
+    Raises:
+        ValueError: If the query has no searchable terms
+    """
+    parts: list[str] = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', query):
+        text = phrase or word
+        prefix = not phrase and text.endswith("*")
+        text = text.rstrip("*") if prefix else text
+        if not any(ch.isalnum() for ch in text):
+            continue
+        parts.append('"' + text.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not parts:
+        raise ValueError("query must contain at least one word")
+    return (" AND " if match_all else " OR ").join(parts)
+
+
+def _message_text(content: Any) -> str:
+    """Get the text of a message's content.
+
+    Args:
+        content: String content or a list of content parts
+
+    Returns:
+        Message text
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+            if isinstance(part, (dict, str))
+        )
+    return ""
+
+
+def extract_messages(record: dict[str, Any]) -> list[dict[str, Any]]:
+    """Extract indexable messages from a chat.
+
+    Reads every branch of the message history when present, and indexes
+    the title as a message with role "title".
+
+    Args:
+        record: Chat as returned by the chat detail endpoint or an export
+
+    Returns:
+        Messages as {message_id, role, ts, content}
+    """
+    chat = record.get("chat") if isinstance(record.get("chat"), dict) else {}
+    fallback_ts = record.get("updated_at") or record.get("created_at")
+    messages: list[dict[str, Any]] = []
+
+    title = record.get("title") or chat.get("title")
+    if isinstance(title, str) and title.strip():
+        messages.append({"message_id": None, "role": "title", "ts": fallback_ts, "content": title})
+
+    history = chat.get("history") if isinstance(chat.get("history"), dict) else {}
+    source = history.get("messages")
+    items = source.values() if isinstance(source, dict) else chat.get("messages") or []
+    for message in items:
+        if not isinstance(message, dict):
+            continue
+        text = _message_text(message.get("content"))
+        if not text.strip():
+            continue
+        ts = message.get("timestamp")
+        messages.append({
+            "message_id": message.get("id"),
+            "role": message.get("role"),
+            "ts": int(ts) if isinstance(ts, (int, float)) else fallback_ts,
+            "content": text,
+        })
+    return messages
+
+
+def _tags_of(record: dict[str, Any]) -> list[str]:
+    """Get a chat's normalized tags.
+
+    Args:
+        record: Chat record
+
+    Returns:
+        Tag ids
+    """
+    meta = record.get("meta") if isinstance(record.get("meta"), dict) else {}
+    chat = record.get("chat") if isinstance(record.get("chat"), dict) else {}
+    tags = meta.get("tags") or chat.get("tags") or []
+    return sorted({normalize_tag(tag) for tag in tags if isinstance(tag, str) and tag.strip()})
+
+
+def _version_of(record: Any) -> int | None:
+    """Get a chat's updated_at.
+
+    Args:
+        record: Chat or chat list entry
+
+    Returns:
+        updated_at, or None
+    """
+    value = record.get("updated_at") if isinstance(record, dict) else None
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+class ChatIndex:
+    """BM25 full-text index of chat messages in SQLite.
+
+    Args:
+        client: OpenWebUIClient used for syncing
+        path: SQLite database file
+        refresh_seconds: Background sync interval (0 disables syncing)
+    """
+
+    def __init__(self, client: Any, path: Path, refresh_seconds: float = 300) -> None:
+        """Initialize chat index.
+
+        Args:
+            client: OpenWebUIClient
+            path: SQLite database file
+            refresh_seconds: Background sync interval
+
+        Raises:
+            ValueError: If SQLite was built without FTS5
+        """
+        self.client = client
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = sqlite3.connect(str(path), check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        try:
+            self._writer.executescript(_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._writer.close()
+            raise ValueError(f"Chat index requires SQLite with FTS5: {e}") from e
+        self._writer.commit()
+        self._reader = sqlite3.connect(str(path), check_same_thread=False)
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+
+        # Chats written or deleted through the client since they were indexed
+        self._dirty: dict[str, float] = {}
+        self._deleted: dict[str, float] = {}
+        self._needs_full: float = 0.0
+
+        self._sync_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self.searches = 0
+        self.syncs = 0
+        self.sync_errors = 0
+        self.last_sync: dict[str, Any] | None = None
+
+    def on_mutation(self, method: str, endpoint: str, json_data: Any, response: Any) -> None:
+        """Mark chats touched by a successful write for the next sync.
+
+        Registered as an OpenWebUIClient mutation listener.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path
+            json_data: Request body
+            response: Parsed response
+        """
+        match = _CHAT_WRITE.match(endpoint.split("?")[0].rstrip("/"))
+        if not match:
+            return
+        kind, first, second = match.groups()
+        now = time.time()
+        if kind == "folders":
+            if method == "DELETE":
+                # Deleting a folder deletes the chats in it
+                self._needs_full = now
+            return
+
+        if first and first not in _NON_CHAT_SEGMENTS:
+            if method == "DELETE" and second is None:
+                self._deleted[first] = now
+            else:
+                self._dirty[first] = now
+        elif method == "DELETE" or first in ("archive", "all"):
+            self._needs_full = now
+        # Created chats (new, import, clone) come back in the response
+        created = response if isinstance(response, list) else [response]
+        for chat in created:
+            if isinstance(chat, dict) and isinstance(chat.get("id"), str) and "chat" in chat:
+                self._dirty[chat["id"]] = now
+
+    def _state(self) -> tuple[dict[str, int | None], int | None, int]:
+        """Read indexed chat versions and the sync watermark.
+
+        Returns:
+            Tuple of (versions by chat id, watermark, completed syncs)
+        """
+        with self._write_lock:
+            versions = dict(self._writer.execute("SELECT chat_id, updated_at FROM chats").fetchall())
+            meta = dict(self._writer.execute("SELECT key, value FROM meta").fetchall())
+        watermark = meta.get("watermark")
+        return versions, (int(watermark) if watermark is not None else None), int(meta.get("syncs", 0))
+
+    def _delete_chats(self, chat_ids: list[str]) -> None:
+        """Delete chats inside the current write transaction.
+
+        Args:
+            chat_ids: Chats to delete
+        """
+        rows = [(chat_id,) for chat_id in chat_ids]
+        self._writer.executemany("DELETE FROM messages WHERE chat_id = ?", rows)
+        self._writer.executemany("DELETE FROM chat_tags WHERE chat_id = ?", rows)
+        self._writer.executemany("DELETE FROM chats WHERE chat_id = ?", rows)
+
+    def upsert(self, chats: list[dict[str, Any]]) -> int:
+        """Index chats, replacing any earlier version, in one transaction.
+
+        Args:
+            chats: Full chats
+
+        Returns:
+            Messages indexed
+        """
+        now = time.time()
+        indexed = 0
+        with self._write_lock, self._writer:
+            chats = [c for c in chats if isinstance(c, dict) and isinstance(c.get("id"), str)]
+            self._delete_chats([chat["id"] for chat in chats])
+            for chat in chats:
+                chat_id = chat["id"]
+                tags = _tags_of(chat)
+                messages = extract_messages(chat)
+                title = chat.get("title") or (chat.get("chat") or {}).get("title")
+                self._writer.execute(
+                    "INSERT INTO chats (chat_id, title, updated_at, tags, indexed_at) VALUES (?, ?, ?, ?, ?)",
+                    (chat_id, title, _version_of(chat), json.dumps(tags), now),
+                )
+                self._writer.executemany(
+                    "INSERT INTO chat_tags (tag, chat_id) VALUES (?, ?)", [(tag, chat_id) for tag in tags]
+                )
+                self._writer.executemany(
+                    "INSERT INTO messages (chat_id, message_id, role, ts, content) VALUES (?, ?, ?, ?, ?)",
+                    [(chat_id, m["message_id"], m["role"], m["ts"], m["content"]) for m in messages],
+                )
+                indexed += len(messages)
+        return indexed
+
+    def remove(self, chat_ids: list[str]) -> None:
+        """Remove chats from the index.
+
+        Args:
+            chat_ids: Chats to remove
+        """
+        with self._write_lock, self._writer:
+            self._delete_chats(chat_ids)
+
+    def _finish_sync(self, watermark: int | None, started: float) -> None:
+        """Record a completed sync.
+
+        Args:
+            watermark: New watermark
+            started: Sync start time
+        """
+        with self._write_lock, self._writer:
+            syncs = self._writer.execute("SELECT value FROM meta WHERE key = 'syncs'").fetchone()
+            entries = {"syncs": str(int(syncs[0]) + 1 if syncs else 1), "synced_at": str(started)}
+            if watermark is not None:
+                entries["watermark"] = str(watermark)
+            self._writer.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(entries.items())
+            )
+
+    async def ingest_archive(
+        self,
+        path: Path,
+        compression: str,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None
+    ) -> dict[str, Any]:
+        """Build or extend the index from a chat export archive.
+
+        Chats already indexed at the same or a newer version are skipped.
+
+        Args:
+            path: Archive path (as written by chat_export)
+            compression: Archive compression
+            on_progress: Async callback with (read, indexed) counts
+
+        Returns:
+            Ingest summary
+
+        Raises:
+            ValueError: If the archive is unreadable
+        """
+        async with self._sync_lock:
+            started = time.time()
+            versions, watermark, _ = await asyncio.to_thread(self._state)
+            read = indexed = skipped = messages = 0
+            newest = watermark
+            batch: list[dict[str, Any]] = []
+
+            async def flush() -> None:
+                nonlocal indexed, messages
+                messages += await asyncio.to_thread(self.upsert, batch)
+                indexed += len(batch)
+                if on_progress is not None:
+                    await on_progress(read, indexed)
+
+            async for record in aiter_jsonl(path, compression):
+                if not isinstance(record, dict) or not isinstance(record.get("id"), str):
+                    continue
+                read += 1
+                version = _version_of(record)
+                if version is not None:
+                    newest = max(version, newest or 0)
+                stored = versions.get(record["id"])
+                if stored is not None and version is not None and stored >= version:
+                    skipped += 1
+                    continue
+                batch.append(record)
+                if len(batch) >= INGEST_BATCH_SIZE:
+                    await flush()
+                    batch = []
+            if batch:
+                await flush()
+            await asyncio.to_thread(self._finish_sync, newest, started)
+
+        return {
+            "source": str(path),
+            "read": read,
+            "indexed": indexed,
+            "skipped": skipped,
+            "messages": messages,
+            "duration_ms": round((time.time() - started) * 1000, 1),
+        }
+
+    async def sync(
+        self,
+        full: bool = False,
+        concurrency: int = 8,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None
+    ) -> dict[str, Any]:
+        """Bring the index up to date with Open WebUI.
+
+        Lists chats newest-first, stopping at the watermark unless the sync
+        is full, and re-fetches chats that are new, changed or were written
+        through the client. Full syncs also drop chats no longer listed.
+
+        Args:
+            full: Walk the whole chat list
+            concurrency: Concurrent chat fetches
+            on_progress: Async callback with (done, total) chat counts
+
+        Returns:
+            Sync summary
+        """
+        async with self._sync_lock:
+            started = time.time()
+            versions, watermark, syncs = await asyncio.to_thread(self._state)
+            full = (
+                full or watermark is None or self._needs_full > 0
+                or (syncs + 1) % FULL_SYNC_EVERY == 0
+            )
+
+            def below_watermark(item: Any) -> bool:
+                version = _version_of(item)
+                return not full and version is not None and version < watermark
+
+            listed: dict[str, int | None] = {}
+            async for item in paginate(
+                self.client, CHAT_LIST_SPEC, params=CHAT_LIST_ALL_PARAMS, lookahead=2,
+                stop_when=below_watermark
+            ):
+                if isinstance(item, dict) and isinstance(item.get("id"), str):
+                    listed[item["id"]] = _version_of(item)
+
+            deleted = {chat_id for chat_id, t in self._deleted.items() if t <= started}
+            changed = {
+                chat_id for chat_id, version in listed.items()
+                if chat_id not in versions or versions[chat_id] != version
+            }
+            changed |= {chat_id for chat_id, t in self._dirty.items() if t <= started}
+            changed -= deleted
+            removed = set(deleted)
+            if full:
+                removed |= set(versions) - set(listed)
+                changed -= removed
+
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def fetch(chat_id: str) -> dict[str, Any] | None:
+                async with semaphore:
+                    try:
+                        chat = await self.client.get(f"/api/v1/chats/{chat_id}")
+                    except NotFoundError:
+                        removed.add(chat_id)
+                        return None
+                if not isinstance(chat, dict) or chat.get("archived"):
+                    removed.add(chat_id)
+                    return None
+                return chat
+
+            pending = sorted(changed)
+            updated = messages = 0
+            for start in range(0, len(pending), SYNC_BATCH_SIZE):
+                chats = await asyncio.gather(*(fetch(c) for c in pending[start:start + SYNC_BATCH_SIZE]))
+                chats = [chat for chat in chats if chat]
+                messages += await asyncio.to_thread(self.upsert, chats)
+                updated += len(chats)
+                if on_progress is not None:
+                    await on_progress(min(start + SYNC_BATCH_SIZE, len(pending)), len(pending))
+
+            if removed:
+                await asyncio.to_thread(self.remove, sorted(removed))
+            known = [v for v in listed.values() if v is not None]
+            new_watermark = max([*known, watermark or 0]) if known else watermark
+            await asyncio.to_thread(self._finish_sync, new_watermark, started)
+
+            self._dirty = {k: t for k, t in self._dirty.items() if t > started}
+            self._deleted = {k: t for k, t in self._deleted.items() if t > started}
+            if full and self._needs_full <= started:
+                self._needs_full = 0.0
+
+        self.syncs += 1
+        self.last_sync = {
+            "full": full,
+            "listed": len(listed),
+            "updated": updated,
+            "removed": len(removed),
+            "messages": messages,
+            "at": started,
+            "duration_ms": round((time.time() - started) * 1000, 1),
+        }
+        return dict(self.last_sync)
+
+    def ensure_started(self) -> None:
+        """Start the background sync task if it is not running."""
+        if self._task is not None or self.refresh_seconds <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Sync forever once the index has been built."""
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            _, watermark, _ = await asyncio.to_thread(self._state)
+            if watermark is None:
+                # Not built yet; an initial build is an explicit, potentially long job
+                continue
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.sync_errors += 1
+                logger.warning(f"Chat index sync failed: {e}")
+
+    def _search(
+        self,
+        match: str,
+        tags: list[str],
+        after: int | None,
+        before: int | None,
+        limit: int,
+        snippets_per_chat: int,
+        excluded: set[str]
+    ) -> list[dict[str, Any]]:
+        """Run a search against the index.
+
+        Args:
+            match: FTS5 match expression
+            tags: Tags every chat must have
+            after: Only messages at or after this time
+            before: Only messages before this time
+            limit: Maximum chats
+            snippets_per_chat: Maximum snippets per chat
+            excluded: Chats deleted upstream but not yet removed
+
+        Returns:
+            Ranked chats with snippets
+        """
+        filters = ""
+        params: list[Any] = []
+        if after is not None:
+            filters += " AND m.ts >= ?"
+            params.append(after)
+        if before is not None:
+            filters += " AND m.ts < ?"
+            params.append(before)
+        if tags:
+            filters += (
+                " AND m.chat_id IN (SELECT chat_id FROM chat_tags WHERE tag IN ("
+                + ", ".join("?" * len(tags)) + ") GROUP BY chat_id HAVING COUNT(*) = ?)"
+            )
+            params += [*tags, len(tags)]
+
+        with self._read_lock:
+            ranked = self._reader.execute(
+                "WITH hits AS MATERIALIZED ("
+                "SELECT rowid, bm25(messages_fts) AS score FROM messages_fts WHERE messages_fts MATCH ?) "
+                "SELECT m.chat_id, MIN(h.score), COUNT(*) FROM hits h JOIN messages m ON m.id = h.rowid "
+                f"WHERE 1 = 1{filters} GROUP BY m.chat_id ORDER BY MIN(h.score), m.chat_id LIMIT ?",
+                [match, *params, limit + len(excluded)],
+            ).fetchall()
+            ranked = [row for row in ranked if row[0] not in excluded][:limit]
+            if not ranked:
+                return []
+            chat_ids = [row[0] for row in ranked]
+            marks = ", ".join("?" * len(chat_ids))
+            chats = {
+                row[0]: row for row in self._reader.execute(
+                    f"SELECT chat_id, title, updated_at, tags FROM chats WHERE chat_id IN ({marks})", chat_ids
+                )
+            }
+            snippets: dict[str, list[dict[str, Any]]] = {chat_id: [] for chat_id in chat_ids}
+            for chat_id, message_id, role, ts, snippet in self._reader.execute(
+                "SELECT m.chat_id, m.message_id, m.role, m.ts, "
+                f"snippet(messages_fts, 0, '[', ']', '…', {SNIPPET_TOKENS}) "
+                "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                f"WHERE messages_fts MATCH ?{filters} AND m.chat_id IN ({marks}) "
+                "ORDER BY bm25(messages_fts)",
+                [match, *params, *chat_ids],
+            ):
+                if len(snippets[chat_id]) < snippets_per_chat:
+                    snippets[chat_id].append(
+                        {"message_id": message_id, "role": role, "timestamp": ts, "snippet": snippet}
+                    )
+
+        results = []
+        for chat_id, score, hits in ranked:
+            _, title, updated_at, tag_json = chats.get(chat_id, (chat_id, None, None, "[]"))
+            results.append({
+                "chat_id": chat_id,
+                "title": title,
+                "updated_at": updated_at,
+                "tags": json.loads(tag_json),
+                # FTS5 reports BM25 negated so that lower sorts first
+                "score": round(-score, 4),
+                "hits": hits,
+                "snippets": snippets[chat_id],
+            })
+        return results
+
+    async def search(
+        self,
+        query: str,
+        tags: list[str] | None = None,
+        after: int | None = None,
+        before: int | None = None,
+        match_all: bool = True,
+        limit: int = 20,
+        snippets_per_chat: int = 3
+    ) -> dict[str, Any]:
+        """Search indexed chats.
+
+        Args:
+            query: Search query (quoted phrases, trailing * for prefixes)
+            tags: Tags every chat must have
+            after: Only messages at or after this Unix time
+            before: Only messages before this Unix time
+            match_all: Require every term (otherwise any term matches)
+            limit: Maximum chats
+            snippets_per_chat: Maximum snippets per chat
+
+        Returns:
+            Dict with ranked chats and timing
+
+        Raises:
+            ValueError: If the query has no searchable terms
+        """
+        self.ensure_started()
+        match = build_match(query, match_all)
+        start = time.monotonic()
+        results = await asyncio.to_thread(
+            self._search, match, [normalize_tag(t) for t in tags or []], after, before,
+            limit, snippets_per_chat, set(self._deleted)
+        )
+        self.searches += 1
+        return {
+            "query": query,
+            "match": match,
+            "results": results,
+            "took_ms": round((time.monotonic() - start) * 1000, 2),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export index stats.
+
+        Returns:
+            Dict with chat and message counts, watermark and sync state
+        """
+        with self._read_lock:
+            chats = self._reader.execute("SELECT COUNT(*) FROM chats").fetchone()[0]
+            messages = self._reader.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+            meta = dict(self._reader.execute("SELECT key, value FROM meta").fetchall())
+        return {
+            "path": str(self.path),
+            "chats": chats,
+            "messages": messages,
+            "watermark": int(meta["watermark"]) if "watermark" in meta else None,
+            "synced_at": float(meta["synced_at"]) if "synced_at" in meta else None,
+            "pending_updates": len(self._dirty),
+            "pending_deletes": len(self._deleted),
+            "refresh_seconds": self.refresh_seconds,
+            "searches": self.searches,
+            "syncs": self.syncs,
+            "sync_errors": self.sync_errors,
+            "last_sync": self.last_sync,
+        }
+
+    async def close(self) -> None:
+        """Stop background syncing and close the database."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        with self._write_lock:
+            self._writer.close()
+        with self._read_lock:
+            self._reader.close()
@@ -4,10 +4,15 @@ Provides unified interface for all API operations with retry, rate limiting,
 and error handling.
 """
 
+import asyncio
+import gzip
 import httpx
+import json
 import logging
+import mimetypes
 import time
-from typing import Any, AsyncIterator
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
 from src.config import Config
 from src.exceptions import (
     HTTPError,
@@ -17,11 +22,120 @@ from src.exceptions import (
     ValidationError,
     ServerError
 )
+from src.services.cassette import RecordingTransport, ReplayTransport
+from src.utils.metrics import UPSTREAM_DURATION, UPSTREAM_REQUESTS, route_template
 from src.utils.rate_limiter import RateLimiter
+from src.utils.tracing import SPAN_KIND_CLIENT, CallStats, current_trace, http_stage_recorder, span
 from src.utils.url_builder import build_url
 
 logger = logging.getLogger(__name__)
 
+# Called after a successful mutating request with (method, endpoint, json_data, response)
+MutationListener = Callable[[str, str, Any, Any], None]
+
+# Bodies smaller than this are sent uncompressed even when compression is requested
+GZIP_MIN_BYTES = 64 * 1024
+
+# Connection pool size shared by all requests
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    """Response body stream that adds received bytes to call stats.
+
+    Args:
+        stream: Wrapped body stream
+        stats: Stats of the call that sent the request
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, stats: CallStats) -> None:
+        """Initialize stream.
+
+        Args:
+            stream: Wrapped body stream
+            stats: Call stats to update
+        """
+        self.stream = stream
+        self.stats = stats
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield body chunks, counting their size.
+
+        Yields:
+            Body chunks
+        """
+        async for chunk in self.stream:
+            self.stats.bytes_in += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        """Close the wrapped stream."""
+        await self.stream.aclose()
+
+
+class _InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport that records upstream request counts, latency and traces.
+
+    Latency is measured until response headers arrive, so streamed bodies
+    do not skew it. Routes are reduced to templates to bound cardinality.
+    Within a tool call, the request id is sent as X-Request-ID, the call's
+    upstream time, pool wait and bytes are counted and, when tracing,
+    connection stages are recorded as spans.
+
+    Args:
+        transport: Wrapped transport
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        """Initialize transport.
+
+        Args:
+            transport: Wrapped transport
+        """
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request and record its outcome.
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            Response from the wrapped transport
+        """
+        start = time.monotonic()
+        status = "error"
+        route = route_template(request.url.path)
+        trace = current_trace()
+        if trace is not None:
+            request.headers["X-Request-ID"] = trace.request_id
+            trace.stats.add_request(int(request.headers.get("Content-Length", 0)))
+        with span("http", SPAN_KIND_CLIENT, **{"http.request.method": request.method, "url.path": route}) as http:
+            if trace is not None:
+                request.extensions["trace"] = http_stage_recorder(trace, time.time_ns())
+            try:
+                response = await self.transport.handle_async_request(request)
+                status = str(response.status_code)
+                if http is not None:
+                    http.attributes["http.response.status_code"] = response.status_code
+                if trace is not None:
+                    response.stream = _CountingStream(response.stream, trace.stats)
+                return response
+            except httpx.TimeoutException:
+                status = "timeout"
+                raise
+            finally:
+                elapsed = time.monotonic() - start
+                labels = {"method": request.method, "route": route, "status": status}
+                UPSTREAM_REQUESTS.inc(**labels)
+                UPSTREAM_DURATION.observe(elapsed, **labels)
+                if trace is not None:
+                    trace.stats.add_upstream_time(route, elapsed * 1000)
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self.transport.aclose()
+
 
 class OpenWebUIClient:
     """HTTP client for Open WebUI API.
@@ -57,6 +171,13 @@ class OpenWebUIClient:
         self.rate_limiter = rate_limiter
 
         self._client: httpx.AsyncClient | None = None
+        self._mutation_listeners: list[MutationListener] = []
+
+        # Loaded up front so a bad cassette fails at startup, not per call
+        self._replay = (
+            ReplayTransport(config.CASSETTE_PATH, config.CASSETTE_TIMING_SCALE)
+            if config.CASSETTE_MODE == "replay" else None
+        )
 
         logger.info(
             f"OpenWebUIClient initialized for {self.base_url} "
@@ -71,15 +192,72 @@ class OpenWebUIClient:
             Configured httpx client
         """
         if self._client is None:
+            transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(limits=POOL_LIMITS)
+            if self._replay is not None:
+                transport = self._replay
+            elif self.config.CASSETTE_MODE == "record":
+                transport = RecordingTransport(transport, self.config.CASSETTE_PATH)
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
                 headers=self._build_headers(),
                 timeout=self.timeout,
-                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+                transport=_InstrumentedTransport(transport)
             )
 
         return self._client
 
+    def get_pool_stats(self) -> dict[str, int] | None:
+        """Export connection pool usage.
+
+        Returns:
+            Dict with pool size, open/active/idle connections and queued
+            requests, or None before the first request
+        """
+        if self._client is None:
+            return None
+        transport = self._client._transport
+        # Unwrap instrumentation and cassette recording down to the pool
+        while not hasattr(transport, "_pool") and hasattr(transport, "transport"):
+            transport = transport.transport
+        pool = getattr(transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "max_connections": POOL_LIMITS.max_connections,
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "queued": sum(1 for request in getattr(pool, "_requests", []) if request.is_queued()),
+        }
+
+    async def warm_up(self, connections: int) -> int:
+        """Open pooled connections before the first tool call.
+
+        Sends concurrent requests to /health, bypassing the rate limiter,
+        so their connections stay in the pool for later calls. Failures
+        are logged rather than raised; nothing is sent when replaying a
+        cassette.
+
+        Args:
+            connections: Connections to open (capped at the keep-alive limit)
+
+        Returns:
+            Connections that got a response
+        """
+        if self._replay is not None or connections <= 0:
+            return 0
+
+        async def probe() -> bool:
+            try:
+                await self.client.get("/health")
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"Connection warm-up to {self.base_url} failed: {e}")
+                return False
+
+        count = min(connections, POOL_LIMITS.max_keepalive_connections)
+        return sum(await asyncio.gather(*(probe() for _ in range(count))))
+
     def _build_headers(self) -> dict[str, str]:
         """Build request headers with Bearer token authentication.
 
@@ -96,6 +274,47 @@ class OpenWebUIClient:
 
         return headers
 
+    def add_mutation_listener(self, listener: MutationListener) -> None:
+        """Register a callback for successful mutating requests.
+
+        Used by local caches to invalidate entries when data changes upstream.
+
+        Args:
+            listener: Callable receiving (method, endpoint, json_data, response)
+        """
+        self._mutation_listeners.append(listener)
+
+    def _notify_mutation(
+        self,
+        method: str,
+        endpoint: str,
+        json_data: Any,
+        response: Any
+    ) -> None:
+        """Notify mutation listeners, logging (not raising) listener errors.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path as passed by the caller
+            json_data: Request body
+            response: Parsed response data
+        """
+        for listener in self._mutation_listeners:
+            try:
+                listener(method, endpoint, json_data, response)
+            except Exception as e:
+                logger.warning(f"Mutation listener failed for {method} {endpoint}: {e}")
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Take a rate limiter token, traced as the rate_limit stage."""
+        if self.rate_limiter:
+            start = time.monotonic()
+            with span("rate_limit"):
+                await self.rate_limiter.acquire()
+            trace = current_trace()
+            if trace is not None:
+                trace.stats.queue_ms += (time.monotonic() - start) * 1000
+
     async def get(
         self,
         endpoint: str,
@@ -116,8 +335,7 @@ class OpenWebUIClient:
             HTTPError: On HTTP errors
         """
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build URL
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -173,8 +391,7 @@ class OpenWebUIClient:
             HTTPError: On HTTP errors
         """
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build URL
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -227,7 +444,8 @@ class OpenWebUIClient:
 
         if response.status_code >= 200 and response.status_code < 300:
             try:
-                data = response.json()
+                with span("decode"):
+                    data = response.json()
                 # Wrap primitive types (bool, int, float, str, None) in a dict
                 # to ensure consistent response format for MCP framework
                 # Fixes: "object of type 'bool' has no len()" error
@@ -305,7 +523,8 @@ class OpenWebUIClient:
         endpoint: str,
         json_data: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
-        headers: dict[str, str] | None = None
+        headers: dict[str, str] | None = None,
+        compress: bool = False
     ) -> dict[str, Any]:
         """Perform POST request with JSON body.
 
@@ -314,6 +533,9 @@ class OpenWebUIClient:
             json_data: JSON request body
             params: Query parameters
             headers: Additional headers
+            compress: Gzip bodies of at least GZIP_MIN_BYTES
+                (Content-Encoding: gzip); the server or a proxy in front of it
+                must decode compressed request bodies
 
         Returns:
             Response data as dict
@@ -322,8 +544,7 @@ class OpenWebUIClient:
             HTTPError: On HTTP errors
         """
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build URL
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -339,10 +560,22 @@ class OpenWebUIClient:
         start_time = time.time()
 
         try:
-            response = await self.client.post(url, json=json_data, headers=request_headers)
+            body = json.dumps(json_data).encode("utf-8") if compress and json_data is not None else None
+            if body is not None and len(body) >= GZIP_MIN_BYTES:
+                response = await self.client.post(
+                    url,
+                    content=gzip.compress(body, compresslevel=5),
+                    headers={**request_headers, "Content-Encoding": "gzip"}
+                )
+            elif body is not None:
+                response = await self.client.post(url, content=body, headers=request_headers)
+            else:
+                response = await self.client.post(url, json=json_data, headers=request_headers)
             duration_ms = (time.time() - start_time) * 1000
             logger.debug(f"POST {url} completed in {duration_ms:.0f}ms (status: {response.status_code})")
-            return self._handle_response(response)
+            result = self._handle_response(response)
+            self._notify_mutation("POST", endpoint, json_data, result)
+            return result
 
         except httpx.HTTPStatusError as e:
             duration_ms = (time.time() - start_time) * 1000
@@ -379,8 +612,7 @@ class OpenWebUIClient:
             HTTPError: On HTTP errors
         """
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build URL
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -396,7 +628,9 @@ class OpenWebUIClient:
 
         try:
             response = await self.client.put(url, json=json_data, headers=request_headers)
-            return self._handle_response(response)
+            result = self._handle_response(response)
+            self._notify_mutation("PUT", endpoint, json_data, result)
+            return result
 
         except httpx.HTTPStatusError as e:
             raise self._transform_http_error(e)
@@ -429,8 +663,7 @@ class OpenWebUIClient:
             HTTPError: On HTTP errors
         """
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build URL
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -446,7 +679,9 @@ class OpenWebUIClient:
 
         try:
             response = await self.client.patch(url, json=json_data, headers=request_headers)
-            return self._handle_response(response)
+            result = self._handle_response(response)
+            self._notify_mutation("PATCH", endpoint, json_data, result)
+            return result
 
         except httpx.HTTPStatusError as e:
             raise self._transform_http_error(e)
@@ -480,8 +715,7 @@ class OpenWebUIClient:
             DELETE requests do not include request body per HTTP spec (RFC 7231).
         """
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build URL
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -497,7 +731,9 @@ class OpenWebUIClient:
 
         try:
             response = await self.client.delete(url, headers=request_headers)
-            return self._handle_response(response)
+            result = self._handle_response(response)
+            self._notify_mutation("DELETE", endpoint, None, result)
+            return result
 
         except httpx.HTTPStatusError as e:
             raise self._transform_http_error(e)
@@ -533,8 +769,7 @@ class OpenWebUIClient:
             HTTPError: On HTTP errors
         """
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build URL
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -550,7 +785,9 @@ class OpenWebUIClient:
 
         try:
             response = await self.client.request("DELETE", url, json=json_data, headers=request_headers)
-            return self._handle_response(response)
+            result = self._handle_response(response)
+            self._notify_mutation("DELETE", endpoint, json_data, result)
+            return result
 
         except httpx.HTTPStatusError as e:
             raise self._transform_http_error(e)
@@ -561,37 +798,21 @@ class OpenWebUIClient:
             logger.error(f"Request error: {e}")
             raise HTTPError(f"Request failed: {str(e)}", status_code=0)
 
-    async def post_with_file(
-        self,
-        endpoint: str,
-        file_path: str,
-        field_name: str = 'file',
-        additional_data: dict[str, Any] | None = None,
-        params: dict[str, Any] | None = None,
-        headers: dict[str, str] | None = None
-    ) -> dict[str, Any]:
-        """POST with file upload (multipart/form-data).
+    def _inspect_upload(self, file_path: str) -> tuple[Path, str]:
+        """Validate an upload path and detect its MIME type.
 
         Security: Path traversal prevention, symlink blocking, size limits.
+        Runs in a worker thread since every check hits the filesystem.
 
         Args:
-            endpoint: API endpoint path
             file_path: Path to file to upload
-            field_name: Form field name for file (default: 'file')
-            additional_data: Additional form fields
-            params: Query parameters
-            headers: Additional headers
 
         Returns:
-            API response data
+            Tuple of (canonical path, detected MIME type)
 
         Raises:
-            ValidationError: If file invalid, outside allowed directories, or exceeds size
-            HTTPError: If upload fails
+            ValidationError: If file invalid or exceeds size
         """
-        from pathlib import Path
-        import mimetypes
-
         # SECURITY FIX AV-001: Canonicalize path to absolute form
         try:
             path = Path(file_path).resolve(strict=True)
@@ -622,10 +843,43 @@ class OpenWebUIClient:
             logger.warning("python-magic not available, using mimetypes.guess_type()")
             detected_mime, _ = mimetypes.guess_type(str(path))
             detected_mime = detected_mime or 'application/octet-stream'
+        return path, detected_mime
+
+    async def post_with_file(
+        self,
+        endpoint: str,
+        file_path: str,
+        field_name: str = 'file',
+        additional_data: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        """POST with file upload (multipart/form-data).
+
+        Security: Path traversal prevention, symlink blocking, size limits.
+
+        Args:
+            endpoint: API endpoint path
+            file_path: Path to file to upload
+            field_name: Form field name for file (default: 'file')
+            additional_data: Additional form fields
+            params: Query parameters
+            headers: Additional headers
+
+        Returns:
+            API response data
+
+        Raises:
+            ValidationError: If file invalid, outside allowed directories, or exceeds size
+            HTTPError: If upload fails
+        """
+        # Path checks, MIME sniffing and the read touch the disk; keep them
+        # off the event loop
+        path, detected_mime = await asyncio.to_thread(self._inspect_upload, file_path)
+        content = await asyncio.to_thread(path.read_bytes)
 
         # Apply rate limiting
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         # Build request
         url = endpoint if endpoint.startswith("http") else build_url(
@@ -638,15 +892,16 @@ class OpenWebUIClient:
         logger.info(f"POST (file upload) {url}")
 
         try:
-            with open(path, 'rb') as f:
-                files = {field_name: (path.name, f, detected_mime)}
-                response = await self.client.post(
-                    url,
-                    files=files,
-                    data=additional_data,
-                    headers=request_headers
-                )
-                return self._handle_response(response)
+            files = {field_name: (path.name, content, detected_mime)}
+            response = await self.client.post(
+                url,
+                files=files,
+                data=additional_data,
+                headers=request_headers
+            )
+            result = self._handle_response(response)
+            self._notify_mutation("POST", endpoint, additional_data, result)
+            return result
         except httpx.HTTPStatusError as e:
             raise self._transform_http_error(e)
         except httpx.TimeoutException as e:
@@ -686,8 +941,7 @@ class OpenWebUIClient:
             self.config, 'OPENWEBUI_MAX_STREAM_SIZE', 10 * 1024 * 1024  # 10MB fallback
         )
 
-        if self.rate_limiter:
-            await self.rate_limiter.acquire()
+        await self._wait_for_rate_limit()
 
         url = endpoint if endpoint.startswith("http") else build_url(
             self.base_url, endpoint, params
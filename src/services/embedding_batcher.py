@@ -0,0 +1,268 @@
+"""Micro-batching coalescer for single-text embedding requests.
+
+Concurrent single-text requests for the same endpoint and model are collected
+and sent upstream as one batched request. The returned vectors are split back
+out to each caller. While nothing for the same endpoint and model is in
+flight, a batch is sent as soon as the callers already running have joined
+it; otherwise it collects texts for a short window (or until it is full).
+
+When a batched request fails because of its inputs (one text over the
+model's context length, say), the batch is split in halves and retried, so
+only the callers whose text fails get the error.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any
+from src.exceptions import HTTPError
+from src.utils.metrics import Histogram, SIZE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+# Upstream request/response styles that accept a list of inputs
+STYLE_OLLAMA = "ollama"  # POST /ollama/api/embed -> {"embeddings": [[...], ...]}
+STYLE_OPENAI = "openai"  # POST /api/embeddings -> {"data": [{"index", "embedding"}, ...]}
+
+# Statuses that fail a request whatever its inputs (connection error,
+# auth, unknown endpoint or model, timeout, rate limit, unavailable);
+# splitting the batch would only repeat them
+BATCH_WIDE_STATUSES = frozenset({0, 401, 403, 404, 408, 429, 503, 504})
+
+
+class _PendingBatch:
+    """Texts and futures waiting to be sent as one request."""
+
+    def __init__(self) -> None:
+        """Initialize empty batch."""
+        self.texts: list[str] = []
+        self.futures: list[asyncio.Future[list[float]]] = []
+        self.enqueued_at: list[float] = []
+        self.timer: asyncio.Handle | None = None
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent single-text embedding requests.
+
+    Args:
+        client: OpenWebUI HTTP client
+        window_ms: Time to wait for more texts before sending a batch
+        max_batch_size: Maximum texts per upstream request
+    """
+
+    def __init__(self, client: Any, window_ms: float = 5, max_batch_size: int = 64) -> None:
+        """Initialize batcher.
+
+        Args:
+            client: OpenWebUI HTTP client
+            window_ms: Collection window in milliseconds
+            max_batch_size: Maximum texts per upstream request
+        """
+        self.client = client
+        self.window = max(0.0, window_ms) / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: dict[tuple[Any, ...], _PendingBatch] = {}
+        self._sending: set[asyncio.Task[None]] = set()
+        self._in_flight: dict[tuple[Any, ...], int] = {}
+        self.batch_sizes = Histogram(SIZE_BUCKETS)
+        self.upstream_latency_ms = Histogram()
+        self.caller_latency_ms = Histogram()
+        self.requests = 0
+        self.upstream_requests = 0
+        self.immediate_flushes = 0
+        self.splits = 0
+
+    async def embed(
+        self,
+        endpoint: str,
+        model: str,
+        text: str,
+        style: str = STYLE_OLLAMA,
+        extra: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None
+    ) -> list[float]:
+        """Embed one text, sharing the upstream request with concurrent callers.
+
+        Args:
+            endpoint: Batched embedding endpoint path
+            model: Embedding model name
+            text: Text to embed
+            style: Request/response style (ollama or openai)
+            extra: Additional body fields; only requests with equal fields share a batch
+            params: Query parameters; only requests with equal params share a batch
+
+        Returns:
+            Embedding vector for the text
+
+        Raises:
+            HTTPError: If the upstream request fails
+        """
+        self.requests += 1
+        key = (
+            endpoint,
+            model,
+            style,
+            json.dumps(extra or {}, sort_keys=True),
+            json.dumps(params or {}, sort_keys=True),
+        )
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[float]] = loop.create_future()
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch()
+            self._pending[key] = batch
+            if self._in_flight.get(key):
+                batch.timer = loop.call_later(self.window, self._flush, key)
+            else:
+                # Nothing in flight to wait behind: send once the callers
+                # already scheduled on this loop iteration have joined
+                self.immediate_flushes += 1
+                batch.timer = loop.call_soon(self._flush, key)
+
+        batch.texts.append(text)
+        batch.futures.append(future)
+        batch.enqueued_at.append(time.monotonic())
+
+        if len(batch.texts) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: tuple[Any, ...]) -> None:
+        """Detach the pending batch for key and send it.
+
+        Args:
+            key: Batch key
+        """
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        task = asyncio.ensure_future(self._send(key, batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, key: tuple[Any, ...], batch: _PendingBatch) -> None:
+        """Send one batch and resolve the callers' futures.
+
+        Args:
+            key: Batch key (endpoint, model, style, extra, params)
+            batch: Batch to send
+        """
+        try:
+            await self._resolve(key, batch.texts, batch.futures, batch.enqueued_at)
+        finally:
+            self._in_flight[key] -= 1
+            if not self._in_flight[key]:
+                del self._in_flight[key]
+
+    async def _resolve(
+        self,
+        key: tuple[Any, ...],
+        texts: list[str],
+        futures: list[asyncio.Future[list[float]]],
+        enqueued_at: list[float]
+    ) -> None:
+        """Embed texts in one request, splitting the batch if an input fails.
+
+        Args:
+            key: Batch key
+            texts: Texts to embed
+            futures: Caller futures, in text order
+            enqueued_at: Enqueue times, in text order
+        """
+        try:
+            vectors = await self._request(key, texts)
+        except Exception as e:
+            if len(texts) > 1 and getattr(e, "status_code", None) not in BATCH_WIDE_STATUSES:
+                logger.info(f"Embedding batch of {len(texts)} failed ({e}); retrying it in halves")
+                self.splits += 1
+                middle = len(texts) // 2
+                await asyncio.gather(
+                    self._resolve(key, texts[:middle], futures[:middle], enqueued_at[:middle]),
+                    self._resolve(key, texts[middle:], futures[middle:], enqueued_at[middle:]),
+                )
+                return
+            logger.warning(f"Embedding batch of {len(texts)} for {key[1]} failed: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        now = time.monotonic()
+        for future, vector, queued in zip(futures, vectors, enqueued_at):
+            self.caller_latency_ms.observe((now - queued) * 1000)
+            if not future.done():
+                future.set_result(vector)
+
+    async def _request(self, key: tuple[Any, ...], texts: list[str]) -> list[list[float]]:
+        """Send one batched embedding request.
+
+        Args:
+            key: Batch key (endpoint, model, style, extra, params)
+            texts: Texts to embed
+
+        Returns:
+            Vectors in input order
+
+        Raises:
+            HTTPError: If the request fails or returns the wrong vector count
+        """
+        endpoint, model, style, extra_json, params_json = key
+        body = {"model": model, "input": texts, **json.loads(extra_json)}
+        params = json.loads(params_json) or None
+
+        self.upstream_requests += 1
+        self.batch_sizes.observe(len(texts))
+        start = time.monotonic()
+        try:
+            response = await self.client.post(endpoint, json_data=body, params=params)
+        finally:
+            self.upstream_latency_ms.observe((time.monotonic() - start) * 1000)
+        vectors = self._extract_vectors(response, style)
+        if len(vectors) != len(texts):
+            raise HTTPError(
+                f"Embedding batch returned {len(vectors)} vectors for {len(texts)} inputs",
+                status_code=502
+            )
+        return vectors
+
+    @staticmethod
+    def _extract_vectors(response: dict[str, Any], style: str) -> list[list[float]]:
+        """Pull the ordered vectors out of a batched response.
+
+        Args:
+            response: Upstream response
+            style: Response style
+
+        Returns:
+            Vectors in input order
+        """
+        if style == STYLE_OPENAI:
+            data = sorted(response.get("data") or [], key=lambda item: item.get("index", 0))
+            return [item["embedding"] for item in data]
+        return list(response.get("embeddings") or [])
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export batching stats.
+
+        Returns:
+            Dict with request, immediate flush and split counts and
+            batch-size/latency histograms
+        """
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "requests": self.requests,
+            "upstream_requests": self.upstream_requests,
+            "immediate_flushes": self.immediate_flushes,
+            "splits": self.splits,
+            "pending_batches": len(self._pending),
+            "batch_size": self.batch_sizes.to_dict(),
+            "upstream_latency_ms": self.upstream_latency_ms.to_dict(),
+            "caller_latency_ms": self.caller_latency_ms.to_dict(),
+        }
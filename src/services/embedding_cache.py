@@ -0,0 +1,336 @@
+"""Persistent content-addressed embedding cache.
+
+Vectors are stored as packed float32 values in an append-only data file that
+is read through mmap; an append-only index log maps each key to its offset
+and dimension. Keys hash (endpoint, model, request options, normalized text),
+so identical chunks are embedded once across sessions and restarts. New
+vectors are appended on the background log writer thread and served from
+memory until their write lands.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import re
+import threading
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from src.exceptions import HTTPError
+from src.utils.deferred_write import defer_write
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+EMBEDDING_CONFIG_ENDPOINT = "/api/v1/retrieval/embedding/update"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (NFC, collapsed whitespace, stripped).
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Normalized text
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def make_key(endpoint: str, model: str, text: str, options: dict[str, Any] | None = None) -> str:
+    """Build the content-addressed cache key.
+
+    Args:
+        endpoint: Embedding endpoint path
+        model: Embedding model name (empty when implied by server config)
+        text: Text to embed
+        options: Request fields that change the vector (e.g. truncate,
+            dimensions, url_idx); None values are ignored
+
+    Returns:
+        Hex SHA-256 key
+    """
+    material = f"{endpoint}\0{model}\0{normalize_text(text)}"
+    options = {k: v for k, v in (options or {}).items() if v is not None}
+    if options:
+        material += "\0" + json.dumps(options, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Disk-backed embedding cache with mmap reads.
+
+    Args:
+        directory: Cache directory (created if missing)
+        max_bytes: Maximum size of the vector data file; inserts stop when full
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 512 * 1024 * 1024) -> None:
+        """Initialize cache and load the index.
+
+        Args:
+            directory: Cache directory
+            max_bytes: Maximum vector data size in bytes
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.vectors_path = directory / "vectors.f32"
+        self.index_path = directory / "index.log"
+        self.meta_path = directory / "meta.json"
+
+        self.embedding_model: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._index: dict[str, tuple[int, int]] = {}
+        # Vectors queued for the writer thread, by key
+        self._pending: dict[str, list[float]] = {}
+        # Bytes reserved in the data file, including pending writes
+        self._size = 0
+        self._mmap: mmap.mmap | None = None
+        # Serializes file writes with resets; a reset bumps the generation
+        # so writes queued before it are discarded
+        self._write_lock = threading.Lock()
+        self._generation = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """Load metadata and index, dropping entries past the end of the data file."""
+        if self.meta_path.exists():
+            try:
+                meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                meta = {}
+            if meta.get("version") != CACHE_VERSION:
+                self._reset_files()
+                return
+            self.embedding_model = meta.get("embedding_model")
+
+        self._size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        if not self.index_path.exists():
+            return
+
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 3:
+                    continue
+                key, offset, dim = parts[0], int(parts[1]), int(parts[2])
+                # Skip entries torn by a crash between data and index writes
+                if offset + dim * 4 <= self._size:
+                    self._index[key] = (offset, dim)
+
+    def _save_meta(self) -> None:
+        """Persist cache metadata."""
+        self.meta_path.write_text(
+            json.dumps({"version": CACHE_VERSION, "embedding_model": self.embedding_model}),
+            encoding="utf-8"
+        )
+
+    def _reset_files(self) -> None:
+        """Truncate data and index files and clear in-memory state."""
+        with self._write_lock:
+            self._generation += 1
+            self._close_map()
+            for path in (self.vectors_path, self.index_path):
+                path.write_bytes(b"")
+            self._index.clear()
+            self._pending.clear()
+            self._size = 0
+            self._save_meta()
+
+    def _close_map(self) -> None:
+        """Close the read mapping, if any."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _mapped(self, required: int) -> mmap.mmap:
+        """Return a read mapping covering at least required bytes.
+
+        Args:
+            required: Minimum mapped size
+
+        Returns:
+            Read-only mmap of the vector data file
+        """
+        if self._mmap is None or len(self._mmap) < required:
+            self._close_map()
+            with open(self.vectors_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def get(self, key: str) -> list[float] | None:
+        """Look up a vector.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Vector, or None on miss
+        """
+        # Pending before index: a write indexes its key before unqueuing it
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            return list(pending)
+        entry = self._index.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        offset, dim = entry
+        vector = array("f")
+        vector.frombytes(self._mapped(offset + dim * 4)[offset:offset + dim * 4])
+        self.hits += 1
+        return vector.tolist()
+
+    def put(self, key: str, vector: list[float]) -> bool:
+        """Store a vector.
+
+        Args:
+            key: Cache key from make_key()
+            vector: Embedding vector
+
+        Returns:
+            True if stored, False if already present or the cache is full
+        """
+        if key in self._index or key in self._pending:
+            return False
+        data = array("f", vector).tobytes()
+        if self._size + len(data) > self.max_bytes:
+            return False
+
+        offset = self._size
+        self._size += len(data)
+        self._pending[key] = list(vector)
+        defer_write(self._write, self._generation, key, offset, data, len(vector))
+        return True
+
+    def _write(self, generation: int, key: str, offset: int, data: bytes, dim: int) -> None:
+        """Write a vector at its reserved offset and index it.
+
+        Runs on the background log writer thread.
+
+        Args:
+            generation: Cache generation the vector was stored in
+            key: Cache key
+            offset: Reserved offset in the data file
+            data: Packed float32 vector
+            dim: Vector dimension
+        """
+        with self._write_lock:
+            if generation != self._generation:
+                return
+            try:
+                with open(self.vectors_path, "r+b" if self.vectors_path.exists() else "wb") as f:
+                    f.seek(offset)
+                    f.write(data)
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.write(f"{key} {offset} {dim}\n")
+            except OSError as e:
+                logger.warning(f"Failed to write embedding cache entry: {e}")
+                self._pending.pop(key, None)
+                return
+            self._index[key] = (offset, dim)
+            self._pending.pop(key, None)
+
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        model: str,
+        texts: list[str],
+        compute: Callable[[list[str]], Awaitable[list[list[float]]]],
+        options: dict[str, Any] | None = None
+    ) -> list[list[float]]:
+        """Return vectors for texts, computing only the cache misses.
+
+        Args:
+            endpoint: Embedding endpoint path
+            model: Embedding model name
+            texts: Texts to embed
+            compute: Async callable embedding a list of texts in order
+            options: Request fields that change the vector, see make_key()
+
+        Returns:
+            Vectors in the order of texts
+
+        Raises:
+            HTTPError: If compute returns the wrong number of vectors
+        """
+        keys = [make_key(endpoint, model, text, options) for text in texts]
+        vectors: list[list[float] | None] = [self.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            computed = await compute([texts[i] for i in missing])
+            if len(computed) != len(missing):
+                raise HTTPError(
+                    f"Embedding request returned {len(computed)} vectors for {len(missing)} inputs",
+                    status_code=502
+                )
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+                self.put(keys[i], vector)
+
+        return [vector for vector in vectors if vector is not None]
+
+    def invalidate(self) -> None:
+        """Drop all cached vectors."""
+        self.invalidations += 1
+        self._reset_files()
+        logger.info("Embedding cache invalidated")
+
+    def on_mutation(self, method: str, endpoint: str, json_data: Any, response: Any) -> None:
+        """Invalidate the cache when the embedding model changes.
+
+        Registered as an OpenWebUIClient mutation listener.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path
+            json_data: Request body
+            response: Parsed response
+        """
+        if endpoint.split("?")[0].rstrip("/") != EMBEDDING_CONFIG_ENDPOINT:
+            return
+
+        model = None
+        if isinstance(response, dict):
+            model = response.get("embedding_model") or response.get("RAG_EMBEDDING_MODEL")
+        if model is None and isinstance(json_data, dict):
+            model = json_data.get("RAG_EMBEDDING_MODEL") or json_data.get("embedding_model")
+
+        if model is None or model != self.embedding_model:
+            self.invalidate()
+            self.embedding_model = model
+            self._save_meta()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export cache stats.
+
+        Returns:
+            Dict with hit rate, entry count and size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.directory),
+            "entries": len(self._index) + len(self._pending),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+            "embedding_model": self.embedding_model,
+        }
+
+    def close(self) -> None:
+        """Release the read mapping."""
+        self._close_map()
@@ -0,0 +1,188 @@
+"""Cache of the folder list and per-folder chat lists behind folder_tree.
+
+Rendering the folder tree needs one request per folder, so the pieces are
+cached for a TTL. The cache listens to client mutations: any folder write
+drops everything, while a chat write drops only the chat lists of the
+folders the chat was in or moved to.
+"""
+
+import re
+import time
+from typing import Any
+
+_CHAT_WRITE = re.compile(r"^/api/v1/chats(?:/([^/]+))?(?:/([^/]+))?")
+
+# First chat path segments that are not chat ids
+_NON_CHAT_SEGMENTS = {"new", "import", "archive", "all", "tags", "pinned", "folder", "share", "search", "list"}
+
+
+def _folder_ids_in(body: dict[str, Any]) -> set[str]:
+    """Collect the folder ids a chat write body places chats in.
+
+    Args:
+        body: Request body
+
+    Returns:
+        Folder ids
+    """
+    forms = body.get("chats") if isinstance(body.get("chats"), list) else [body]
+    folder_ids: set[str] = set()
+    for form in forms:
+        if not isinstance(form, dict):
+            continue
+        chat = form.get("chat") if isinstance(form.get("chat"), dict) else {}
+        folder_id = form.get("folder_id") or chat.get("folder_id")
+        if isinstance(folder_id, str):
+            folder_ids.add(folder_id)
+    return folder_ids
+
+
+class FolderTreeCache:
+    """TTL cache of folders and their chats with write-path invalidation.
+
+    Args:
+        ttl_seconds: Entry lifetime
+    """
+
+    def __init__(self, ttl_seconds: float = 60) -> None:
+        """Initialize cache.
+
+        Args:
+            ttl_seconds: Entry lifetime in seconds
+        """
+        self.ttl = ttl_seconds
+        self._folders: tuple[float, list[dict[str, Any]]] | None = None
+        self._chats: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._chat_folder: dict[str, str] = {}
+        # Bumped on every invalidation so in-flight fetches are not cached
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_folders(self) -> list[dict[str, Any]] | None:
+        """Return the cached folder list if fresh.
+
+        Returns:
+            Folders, or None
+        """
+        if self._folders is None or self._folders[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._folders[1]
+
+    def put_folders(self, folders: list[dict[str, Any]], generation: int) -> None:
+        """Cache the folder list unless it was invalidated while fetching.
+
+        Args:
+            folders: Folders
+            generation: Generation observed before the fetch
+        """
+        if generation == self.generation:
+            self._folders = (time.monotonic() + self.ttl, folders)
+
+    def get_chats(self, folder_id: str) -> list[dict[str, Any]] | None:
+        """Return a folder's cached chat list if fresh.
+
+        Args:
+            folder_id: Folder id
+
+        Returns:
+            Chats, or None
+        """
+        entry = self._chats.get(folder_id)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put_chats(self, folder_id: str, chats: list[dict[str, Any]], generation: int) -> None:
+        """Cache a folder's chat list unless it was invalidated while fetching.
+
+        Args:
+            folder_id: Folder id
+            chats: Chats in the folder
+            generation: Generation observed before the fetch
+        """
+        if generation != self.generation:
+            return
+        self._chats[folder_id] = (time.monotonic() + self.ttl, chats)
+        for chat in chats:
+            self._chat_folder[chat["id"]] = folder_id
+
+    def _drop_chats(self, folder_ids: set[str] | None) -> None:
+        """Drop chat lists.
+
+        Args:
+            folder_ids: Folders to drop, or None for all
+        """
+        if folder_ids is None:
+            self._chats.clear()
+            self._chat_folder.clear()
+        else:
+            for folder_id in folder_ids:
+                entry = self._chats.pop(folder_id, None)
+                for chat in entry[1] if entry else []:
+                    if self._chat_folder.get(chat["id"]) == folder_id:
+                        del self._chat_folder[chat["id"]]
+        self.generation += 1
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._folders = None
+        self._drop_chats(None)
+
+    def on_mutation(self, method: str, endpoint: str, json_data: Any, response: Any) -> None:
+        """Invalidate folders touched by a successful write.
+
+        Registered as an OpenWebUIClient mutation listener.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path
+            json_data: Request body
+            response: Parsed response
+        """
+        path = endpoint.split("?")[0].rstrip("/")
+        if path.startswith("/api/v1/folders"):
+            self.clear()
+            return
+        match = _CHAT_WRITE.match(path)
+        if not match:
+            return
+
+        chat_id = match.group(1)
+        body = json_data if isinstance(json_data, dict) else {}
+        if chat_id in ("new", "import"):
+            folder_ids = _folder_ids_in(body)
+            if folder_ids:
+                self._drop_chats(folder_ids)
+        elif chat_id is None or chat_id in _NON_CHAT_SEGMENTS:
+            # Bulk write (delete all, archive all, ...): folder membership unknown
+            self._drop_chats(None)
+        else:
+            folder_ids = _folder_ids_in(body)
+            if chat_id in self._chat_folder:
+                folder_ids.add(self._chat_folder[chat_id])
+            if folder_ids:
+                self._drop_chats(folder_ids)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export cache stats.
+
+        Returns:
+            Dict with cached folder counts and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl,
+            "folders_cached": self._folders is not None,
+            "chat_lists": len(self._chats),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,171 @@
+"""Event loop lag monitor with blocking-call detection.
+
+A ticker task sleeps for a fixed interval and measures how late it wakes
+up: the lag is the time other callbacks held the loop. A watchdog thread
+notices when the ticker is overdue by more than the blocking threshold
+and captures the event loop thread's stack while it is still blocked, so
+the warning logged once the loop recovers names the offending code.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any
+from src.utils.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+# Stack frames kept per blocking event
+MAX_STACK_FRAMES = 30
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class LoopMonitor:
+    """Continuous event loop lag measurement.
+
+    Args:
+        interval: Seconds between lag measurements
+        threshold: Lag in seconds reported as a blocking call (0 disables)
+        window: Recent measurements kept for percentiles
+        capacity: Blocking events kept in memory
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.25,
+        threshold: float = 0.2,
+        window: int = 1200,
+        capacity: int = 50
+    ) -> None:
+        """Initialize monitor.
+
+        Args:
+            interval: Seconds between lag measurements
+            threshold: Blocking threshold in seconds
+            window: Measurements kept for percentiles
+            capacity: Blocking events kept
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: deque[float] = deque(maxlen=window)
+        self.blocked: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self.blocked_total = 0
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread: int | None = None
+        self._beat = 0.0
+        self._stall_beat = 0.0
+        self._stall_stack: str | None = None
+
+    def ensure_started(self) -> None:
+        """Start the ticker (and watchdog) on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        if self.threshold > 0 and (self._watchdog is None or not self._watchdog.is_alive()):
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the ticker and watchdog."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        """Measure lag until cancelled."""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._beat = time.monotonic()
+            self.observe(self._beat - start - self.interval)
+
+    def _watch(self) -> None:
+        """Capture the event loop stack while the ticker is overdue."""
+        frames = sys._current_frames
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._beat
+            overdue = time.monotonic() - beat - self.interval
+            if overdue < self.threshold or beat == self._stall_beat:
+                continue
+            self._stall_beat = beat
+            frame = frames().get(self._loop_thread)
+            if frame is not None:
+                self._stall_stack = "".join(traceback.format_stack(frame, limit=MAX_STACK_FRAMES))
+
+    def observe(self, lag: float) -> dict[str, Any] | None:
+        """Record one lag measurement.
+
+        Args:
+            lag: Seconds the ticker woke up late
+
+        Returns:
+            The blocking event if the lag reached the threshold, else None
+        """
+        lag = max(0.0, lag)
+        self.lags.append(lag)
+        EVENT_LOOP_LAG.observe(lag)
+        stack, self._stall_stack = self._stall_stack, None
+        if self.threshold <= 0 or lag < self.threshold:
+            return None
+
+        event = {
+            "time": round(time.time(), 3),
+            "blocked_ms": round(lag * 1000, 1),
+            "stack": stack,
+        }
+        self.blocked.append(event)
+        self.blocked_total += 1
+        EVENT_LOOP_BLOCKED.inc()
+        logger.warning(
+            f"Event loop blocked for {event['blocked_ms']:.0f}ms"
+            + (f"; stack while blocked:\n{stack}" if stack else ""),
+            extra={"blocked_ms": event["blocked_ms"]}
+        )
+        return event
+
+    def percentiles(self) -> dict[float, float]:
+        """Compute lag percentiles over the recent window.
+
+        Returns:
+            Lag in seconds by quantile (empty before the first measurement)
+        """
+        if not self.lags:
+            return {}
+        ordered = sorted(self.lags)
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES}
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export lag percentiles and recent blocking events.
+
+        Returns:
+            Dict with settings, lag percentiles in ms and blocking events
+        """
+        return {
+            "interval_ms": round(self.interval * 1000),
+            "threshold_ms": round(self.threshold * 1000),
+            "samples": len(self.lags),
+            "lag_ms": {
+                f"p{round(q * 100)}": round(lag * 1000, 2) for q, lag in self.percentiles().items()
+            },
+            "max_lag_ms": round(max(self.lags) * 1000, 2) if self.lags else None,
+            "blocked_total": self.blocked_total,
+            "blocked": list(self.blocked),
+        }
@@ -0,0 +1,654 @@
+"""Local SQLite read-through mirror of Open WebUI entities.
+
+Read tools consult the mirror before going upstream. Rows carry the time
+they were last verified against Open WebUI; a read is served locally only
+while that is within the tool's staleness bound. A background task
+re-verifies mirrored rows from the list endpoints, using ``updated_at``
+watermarks to re-fetch only entities that changed, and successful writes
+through the client invalidate affected rows immediately.
+
+Reads run on the event loop against a WAL-mode reader connection (primary
+key lookups); all writes go through a separate connection in a worker
+thread.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from src.exceptions import NotFoundError
+from src.utils.pagination import CHAT_LIST_ALL_PARAMS, PAGINATED_TOOLS, PagingSpec, paginate
+
+logger = logging.getLogger(__name__)
+
+
+class MirrorKind:
+    """How an entity kind is listed and fetched.
+
+    Args:
+        detail_endpoint: Detail endpoint template with a {key} placeholder,
+            or a plain endpoint when detail_param carries the key
+        list_endpoint: Unpaged list endpoint returning every entity
+        paging: Paging spec when the list endpoint is paged
+        list_params: Extra list query parameters
+        key_field: Entity field holding the key
+        detail_param: Query parameter carrying the key for detail reads
+        incremental: List is ordered by updated_at (newest first), so a
+            refresh can stop at the watermark
+    """
+
+    def __init__(
+        self,
+        detail_endpoint: str,
+        list_endpoint: str | None = None,
+        paging: PagingSpec | None = None,
+        list_params: dict[str, Any] | None = None,
+        key_field: str = "id",
+        detail_param: str | None = None,
+        incremental: bool = False
+    ) -> None:
+        """Initialize entity kind.
+
+        Args:
+            detail_endpoint: Detail endpoint template
+            list_endpoint: Unpaged list endpoint
+            paging: Paging spec for paged lists
+            list_params: Extra list query parameters
+            key_field: Entity key field
+            detail_param: Query parameter carrying the key
+            incremental: List is newest-first by updated_at
+        """
+        self.detail_endpoint = detail_endpoint
+        self.list_endpoint = list_endpoint
+        self.paging = paging
+        self.list_params = list_params
+        self.key_field = key_field
+        self.detail_param = detail_param
+        self.incremental = incremental
+
+    def key_of(self, entity: Any) -> str | None:
+        """Extract an entity's key.
+
+        Args:
+            entity: Entity dict
+
+        Returns:
+            Key, or None if absent
+        """
+        if not isinstance(entity, dict) or not entity.get(self.key_field):
+            return None
+        return normalize_key(str(entity[self.key_field]))
+
+
+KINDS: dict[str, MirrorKind] = {
+    "chats": MirrorKind(
+        "/api/v1/chats/{key}",
+        paging=PAGINATED_TOOLS["get_session_user_chat_list_chats_list"],
+        list_params=CHAT_LIST_ALL_PARAMS,
+        incremental=True,
+    ),
+    "users": MirrorKind("/api/v1/users/{key}", paging=PAGINATED_TOOLS["get_users_users"]),
+    "models": MirrorKind("/api/v1/models/model", list_endpoint="/api/v1/models/", detail_param="id"),
+    "knowledge": MirrorKind("/api/v1/knowledge/{key}", list_endpoint="/api/v1/knowledge/"),
+    "prompts": MirrorKind(
+        "/api/v1/prompts/command/{key}", list_endpoint="/api/v1/prompts/", key_field="command"
+    ),
+    "folders": MirrorKind("/api/v1/folders/{key}", list_endpoint="/api/v1/folders/"),
+}
+
+# Paged incremental kinds also walk the full list every Nth refresh to drop deleted entities
+FULL_SWEEP_EVERY = 10
+
+# Concurrent detail fetches per refresh
+REFRESH_CONCURRENCY = 4
+
+_WRITE = re.compile(r"^/api/v1/(chats|models|users|knowledge|prompts|folders)(?:/([^/]+))?(?:/([^/]+))?")
+
+# First path segments that are not entity keys
+_NON_KEY_SEGMENTS = {
+    "chats": {"new", "import", "archive", "all", "tags", "pinned", "folder", "share", "search", "list"},
+    "users": {"user", "default", "active", "groups", "permissions", "all"},
+    "knowledge": {"create", "reindex", "list"},
+    "prompts": {"create", "list"},
+    "folders": set(),
+    "models": {"create", "model"},
+}
+_CREATE_SEGMENTS = {"new", "import", "create"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version INTEGER,
+    verified_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS lists (
+    kind TEXT PRIMARY KEY,
+    verified_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS watermarks (
+    kind TEXT PRIMARY KEY,
+    watermark INTEGER,
+    refreshed_at REAL NOT NULL,
+    refreshes INTEGER NOT NULL
+);
+"""
+
+
+def normalize_key(key: str) -> str:
+    """Normalize an entity key (prompt commands are stored with a leading slash).
+
+    Args:
+        key: Raw key
+
+    Returns:
+        Normalized key
+    """
+    return key.lstrip("/")
+
+
+def version_of(entity: Any) -> int | None:
+    """Get an entity's change version.
+
+    Args:
+        entity: Entity dict
+
+    Returns:
+        updated_at (or timestamp for prompts), or None
+    """
+    if not isinstance(entity, dict):
+        return None
+    value = entity.get("updated_at", entity.get("timestamp"))
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def _list_items(response: Any) -> list[Any]:
+    """Get the entities of an unpaged list response.
+
+    Args:
+        response: List response
+
+    Returns:
+        Entities
+    """
+    if isinstance(response, dict):
+        response = response.get("data") or response.get("items") or []
+    return response if isinstance(response, list) else []
+
+
+class EntityMirror:
+    """SQLite mirror of chats, models, users, knowledge, prompts and folders.
+
+    Args:
+        client: OpenWebUIClient used for refreshes
+        path: SQLite database file
+        kinds: Entity kinds to mirror
+        refresh_seconds: Background refresh interval (0 disables refreshing)
+        max_staleness: Default staleness bound in seconds
+        tool_staleness: Per-tool staleness bounds (0 always reads upstream)
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        path: Path,
+        kinds: list[str],
+        refresh_seconds: float = 60,
+        max_staleness: float = 120,
+        tool_staleness: dict[str, float] | None = None
+    ) -> None:
+        """Initialize mirror.
+
+        Args:
+            client: OpenWebUIClient
+            path: SQLite database file
+            kinds: Entity kinds to mirror
+            refresh_seconds: Background refresh interval
+            max_staleness: Default staleness bound in seconds
+            tool_staleness: Per-tool staleness bounds
+
+        Raises:
+            ValueError: If a kind is unknown
+        """
+        unknown = [kind for kind in kinds if kind not in KINDS]
+        if unknown:
+            raise ValueError(f"Unknown mirror kinds: {', '.join(unknown)}")
+        self.client = client
+        self.path = path
+        self.kinds = list(kinds)
+        self.refresh_seconds = refresh_seconds
+        self.max_staleness = max_staleness
+        self.tool_staleness = dict(tool_staleness or {})
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = sqlite3.connect(str(path), check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.execute("PRAGMA synchronous=NORMAL")
+        self._writer.executescript(_SCHEMA)
+        self._writer.commit()
+        self._reader = sqlite3.connect(str(path), check_same_thread=False)
+        self._write_lock = threading.Lock()
+
+        # Invalidation times: whole kinds, single entities and list snapshots
+        self._kind_invalidated: dict[str, float] = {}
+        self._key_invalidated: dict[tuple[str, str], float] = {}
+        self._list_invalidated: dict[str, float] = {}
+
+        self._refresh_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.last_refresh: dict[str, dict[str, Any]] = {}
+
+    def staleness_for(self, tool_name: str) -> float:
+        """Staleness bound for a tool.
+
+        Args:
+            tool_name: Tool name
+
+        Returns:
+            Bound in seconds (0 means always read upstream)
+        """
+        return self.tool_staleness.get(tool_name, self.max_staleness)
+
+    def lookup(self, kind: str, key: str | None, max_staleness: float) -> Any | None:
+        """Read a mirrored entity or list snapshot if fresh enough.
+
+        Args:
+            kind: Entity kind
+            key: Entity key, or None for the kind's list snapshot
+            max_staleness: Staleness bound in seconds
+
+        Returns:
+            Mirrored data, or None if missing, stale or invalidated
+        """
+        if key is None:
+            row = self._reader.execute(
+                "SELECT verified_at, data FROM lists WHERE kind = ?", (kind,)
+            ).fetchone()
+            invalidated = max(
+                self._kind_invalidated.get(kind, 0.0), self._list_invalidated.get(kind, 0.0)
+            )
+        else:
+            key = normalize_key(key)
+            row = self._reader.execute(
+                "SELECT verified_at, data FROM entities WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            invalidated = max(
+                self._kind_invalidated.get(kind, 0.0), self._key_invalidated.get((kind, key), 0.0)
+            )
+        if row is None:
+            return None
+        verified_at, data = row
+        if verified_at <= invalidated or time.time() - verified_at > max_staleness:
+            return None
+        return json.loads(data)
+
+    def store(self, kind: str, key: str | None, data: Any, verified_at: float) -> None:
+        """Write an entity or list snapshot read from upstream.
+
+        Args:
+            kind: Entity kind
+            key: Entity key, or None for the kind's list snapshot
+            data: Upstream response
+            verified_at: Time the upstream read started
+        """
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        with self._write_lock, self._writer:
+            if key is None:
+                self._writer.execute(
+                    "INSERT OR REPLACE INTO lists (kind, verified_at, data) VALUES (?, ?, ?)",
+                    (kind, verified_at, payload),
+                )
+            else:
+                self._writer.execute(
+                    "INSERT OR REPLACE INTO entities (kind, key, version, verified_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (kind, normalize_key(key), version_of(data), verified_at, payload),
+                )
+
+    async def read_through(
+        self,
+        tool_name: str,
+        kind: str,
+        key: str | None,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Serve a read from the mirror, or fetch it upstream and mirror it.
+
+        Args:
+            tool_name: Calling tool (selects the staleness bound)
+            kind: Entity kind
+            key: Entity key, or None for the kind's list (an empty key
+                always reads upstream)
+            fetch: Upstream read
+
+        Returns:
+            Entity or list data
+        """
+        if kind not in self.kinds or key == "":
+            return await fetch()
+        self.ensure_started()
+
+        max_staleness = self.staleness_for(tool_name)
+        if max_staleness > 0:
+            data = self.lookup(kind, key, max_staleness)
+            if data is not None:
+                self.hits += 1
+                return data
+            self.misses += 1
+        else:
+            self.bypassed += 1
+
+        started = time.time()
+        data = await fetch()
+        if (isinstance(data, list) if key is None else isinstance(data, dict)):
+            await asyncio.to_thread(self.store, kind, key, data, started)
+        return data
+
+    def on_mutation(self, method: str, endpoint: str, json_data: Any, response: Any) -> None:
+        """Invalidate entities touched by a successful write.
+
+        Registered as an OpenWebUIClient mutation listener.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path
+            json_data: Request body
+            response: Parsed response
+        """
+        match = _WRITE.match(endpoint.split("?")[0].rstrip("/"))
+        if not match:
+            return
+        kind, first, second = match.groups()
+        now = time.time()
+        self._list_invalidated[kind] = now
+
+        key = None
+        if kind == "prompts":
+            key = second if first == "command" else None
+        elif kind == "models":
+            body = json_data if isinstance(json_data, dict) else {}
+            key = body.get("id") if isinstance(body.get("id"), str) else None
+        elif first and first not in _NON_KEY_SEGMENTS[kind]:
+            key = first
+
+        if key is not None:
+            self._key_invalidated[(kind, normalize_key(key))] = now
+        elif first not in _CREATE_SEGMENTS and not (method == "POST" and first is None):
+            # Bulk or unidentified write: distrust the whole kind until re-verified
+            self._kind_invalidated[kind] = now
+        if kind == "folders" and method == "DELETE":
+            # Deleting a folder deletes the chats in it
+            self._kind_invalidated["chats"] = now
+        self._prune_invalidations(now)
+
+    def _prune_invalidations(self, now: float) -> None:
+        """Drop invalidation marks older than any staleness bound.
+
+        Args:
+            now: Current time
+        """
+        if len(self._key_invalidated) < 10000:
+            return
+        horizon = now - max([self.max_staleness, *self.tool_staleness.values()])
+        self._key_invalidated = {k: t for k, t in self._key_invalidated.items() if t > horizon}
+
+    def ensure_started(self) -> None:
+        """Start the background refresh task if it is not running."""
+        if self._task is not None or self.refresh_seconds <= 0:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Refresh all kinds forever."""
+        while True:
+            await self.refresh_all()
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def refresh_all(self) -> dict[str, Any]:
+        """Refresh every mirrored kind, logging (not raising) failures.
+
+        Returns:
+            Refresh summary per kind
+        """
+        summary: dict[str, Any] = {}
+        for kind in self.kinds:
+            try:
+                summary[kind] = await self.refresh(kind)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.refresh_errors += 1
+                summary[kind] = {"error": str(e)}
+                logger.warning(f"Mirror refresh of {kind} failed: {e}")
+        return summary
+
+    async def refresh(self, kind: str) -> dict[str, Any]:
+        """Re-verify the mirrored entities of one kind.
+
+        Lists the kind, re-fetches mirrored entities whose updated_at
+        changed, drops entities that no longer exist and marks the listed
+        ones verified. Incremental kinds stop listing at the watermark
+        except on every FULL_SWEEP_EVERY-th refresh; entities below the
+        watermark are not marked verified, so they age out of lookups
+        rather than outliving a deletion until the next full sweep.
+
+        Args:
+            kind: Entity kind
+
+        Returns:
+            Refresh summary
+        """
+        spec = KINDS[kind]
+        async with self._refresh_lock:
+            started = time.time()
+            stored, watermark, refreshes = await asyncio.to_thread(self._stored_state, kind)
+            full = not spec.incremental or watermark is None or refreshes % FULL_SWEEP_EVERY == 0
+
+            seen: dict[str, int | None] = {}
+            snapshot = None
+            if spec.paging is not None:
+                def below_watermark(item: Any) -> bool:
+                    version = version_of(item)
+                    return not full and version is not None and version < watermark
+
+                async for item in paginate(
+                    self.client, spec.paging, params=spec.list_params, lookahead=2,
+                    stop_when=below_watermark
+                ):
+                    key = spec.key_of(item)
+                    if key is not None:
+                        seen[key] = version_of(item)
+            else:
+                snapshot = _list_items(await self.client.get(spec.list_endpoint))
+                for item in snapshot:
+                    key = spec.key_of(item)
+                    if key is not None:
+                        seen[key] = version_of(item)
+
+            changed = [k for k, v in stored.items() if k in seen and seen[k] != v]
+            removed = [k for k in stored if k not in seen] if full else []
+            details = await self._fetch_details(kind, changed)
+            removed += [k for k in changed if k not in details]
+            # A full listing proves every entity it did not remove still exists
+            verified = None if full else [k for k in stored if k in seen and k not in removed]
+            versions = [v for v in seen.values() if v is not None]
+            new_watermark = max([*versions, watermark or 0]) if versions else watermark
+
+            await asyncio.to_thread(
+                self._apply_refresh, kind, started, details, removed, verified, snapshot, new_watermark
+            )
+
+        self.refreshes += 1
+        result = {
+            "listed": len(seen),
+            "mirrored": len(stored) - len(removed),
+            "updated": len(details),
+            "removed": len(removed),
+            "full": full,
+            "duration_ms": round((time.time() - started) * 1000, 1),
+        }
+        self.last_refresh[kind] = {**result, "at": started}
+        return result
+
+    async def _fetch_details(self, kind: str, keys: list[str]) -> dict[str, Any]:
+        """Fetch changed entities with bounded concurrency.
+
+        Args:
+            kind: Entity kind
+            keys: Keys to fetch
+
+        Returns:
+            Entities by key; missing or failed entities are left out
+        """
+        spec = KINDS[kind]
+        semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+        details: dict[str, Any] = {}
+
+        async def fetch(key: str) -> None:
+            async with semaphore:
+                try:
+                    if spec.detail_param:
+                        data = await self.client.get(spec.detail_endpoint, params={spec.detail_param: key})
+                    else:
+                        data = await self.client.get(spec.detail_endpoint.format(key=key))
+                except NotFoundError:
+                    return
+                except Exception as e:
+                    logger.debug(f"Mirror refresh of {kind} {key} failed: {e}")
+                    return
+                if isinstance(data, dict):
+                    details[key] = data
+
+        await asyncio.gather(*(fetch(key) for key in keys))
+        return details
+
+    def _stored_state(self, kind: str) -> tuple[dict[str, int | None], int | None, int]:
+        """Read mirrored versions and the watermark of a kind.
+
+        Args:
+            kind: Entity kind
+
+        Returns:
+            Tuple of (versions by key, watermark, completed refreshes)
+        """
+        with self._write_lock:
+            stored = dict(self._writer.execute(
+                "SELECT key, version FROM entities WHERE kind = ?", (kind,)
+            ).fetchall())
+            row = self._writer.execute(
+                "SELECT watermark, refreshes FROM watermarks WHERE kind = ?", (kind,)
+            ).fetchone()
+        return stored, (row[0] if row else None), (row[1] if row else 0)
+
+    def _apply_refresh(
+        self,
+        kind: str,
+        started: float,
+        details: dict[str, Any],
+        removed: list[str],
+        verified: list[str] | None,
+        snapshot: list[Any] | None,
+        watermark: int | None
+    ) -> None:
+        """Write a refresh in one transaction.
+
+        Args:
+            kind: Entity kind
+            started: Refresh start time (becomes verified_at)
+            details: Re-fetched entities
+            removed: Keys to drop
+            verified: Keys seen by the listing, or None when every
+                remaining entity was verified (full refresh)
+            snapshot: List snapshot for unpaged kinds
+            watermark: New watermark
+        """
+        with self._write_lock, self._writer:
+            self._writer.executemany(
+                "INSERT OR REPLACE INTO entities (kind, key, version, verified_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (kind, key, version_of(data), started, json.dumps(data, separators=(",", ":"), default=str))
+                    for key, data in details.items()
+                ],
+            )
+            self._writer.executemany(
+                "DELETE FROM entities WHERE kind = ? AND key = ?", [(kind, key) for key in removed]
+            )
+            if verified is None:
+                # Everything still mirrored was either unchanged or just re-fetched
+                self._writer.execute(
+                    "UPDATE entities SET verified_at = ? WHERE kind = ? AND verified_at < ?",
+                    (started, kind, started),
+                )
+            else:
+                self._writer.executemany(
+                    "UPDATE entities SET verified_at = ? WHERE kind = ? AND key = ? AND verified_at < ?",
+                    [(started, kind, key, started) for key in verified],
+                )
+            if snapshot is not None:
+                self._writer.execute(
+                    "INSERT OR REPLACE INTO lists (kind, verified_at, data) VALUES (?, ?, ?)",
+                    (kind, started, json.dumps(snapshot, separators=(",", ":"), default=str)),
+                )
+            self._writer.execute(
+                "INSERT INTO watermarks (kind, watermark, refreshed_at, refreshes) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT(kind) DO UPDATE SET watermark = excluded.watermark, "
+                "refreshed_at = excluded.refreshed_at, refreshes = refreshes + 1",
+                (kind, watermark, started),
+            )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export mirror stats.
+
+        Returns:
+            Dict with hit rate, row counts and last refresh per kind
+        """
+        counts = dict(self._reader.execute(
+            "SELECT kind, COUNT(*) FROM entities GROUP BY kind"
+        ).fetchall())
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "kinds": self.kinds,
+            "refresh_seconds": self.refresh_seconds,
+            "max_staleness_seconds": self.max_staleness,
+            "tool_staleness": self.tool_staleness,
+            "entities": {kind: counts.get(kind, 0) for kind in self.kinds},
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "last_refresh": self.last_refresh,
+        }
+
+    async def close(self) -> None:
+        """Stop background refreshing and close the database."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        with self._write_lock:
+            self._writer.close()
+        self._reader.close()
@@ -0,0 +1,391 @@
+"""On-demand CPU and memory profiling of the running server.
+
+SamplingProfiler samples every thread's Python stack from a background
+thread for a fixed time and writes the result in collapsed-stack format
+(one "frame;frame;frame count" line per stack), which flamegraph.pl,
+speedscope and most flame graph viewers read. Event loop samples are
+attributed to the asyncio task running at that moment.
+
+MemoryTracker wraps tracemalloc: it keeps a few snapshots in memory,
+reports top allocation sites and diffs snapshots to find growth, such as
+leaks in long-lived SSE sessions.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+MODES = ("wall", "cpu")
+GROUP_BY = ("lineno", "filename", "traceback")
+
+# Snapshots kept by MemoryTracker; the oldest is dropped first
+MAX_SNAPSHOTS = 5
+
+# Deepest stack recorded per sample
+MAX_STACK_DEPTH = 128
+
+# Leaf frames of a thread blocked waiting rather than running Python code
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+}
+
+
+def _short_path(filename: str) -> str:
+    """Shorten a source path for frame labels.
+
+    Args:
+        filename: Code object filename
+
+    Returns:
+        Path relative to the working directory or site-packages
+    """
+    for root in (os.getcwd(), *sys.path):
+        if root and filename.startswith(root + os.sep):
+            return filename[len(root) + 1:]
+    return filename
+
+
+class SamplingProfiler:
+    """Time-boxed statistical profiler writing collapsed stacks.
+
+    In wall mode every sample counts; in cpu mode samples of threads idle
+    in the event loop selector, a condition wait or a queue get are
+    skipped. This approximates CPU time from Python stacks alone, since
+    native frames are not visible. The sampler needs the GIL, so a thread
+    holding it is sampled at most once per switch interval.
+
+    Args:
+        output_dir: Directory receiving profile files
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        """Initialize profiler.
+
+        Args:
+            output_dir: Directory receiving profile files
+        """
+        self.output_dir = output_dir
+        self.running = False
+        self._labels: dict[Any, str] = {}
+
+    def _label(self, code: Any) -> str:
+        """Format a frame label, cached per code object.
+
+        Args:
+            code: Code object
+
+        Returns:
+            Label such as "paginate (src/utils/pagination.py:40)"
+        """
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+    def _sample(
+        self,
+        stop: threading.Event,
+        interval: float,
+        mode: str,
+        loop: asyncio.AbstractEventLoop,
+        loop_thread: int,
+        stacks: Counter,
+        counts: Counter
+    ) -> None:
+        """Sample all threads until stopped.
+
+        Args:
+            stop: Set to end sampling
+            interval: Seconds between samples
+            mode: "wall" or "cpu"
+            loop: Event loop whose running task is attributed
+            loop_thread: Thread id running the event loop
+            stacks: Receives sample counts by collapsed stack
+            counts: Receives sample and idle counters
+        """
+        own_thread = threading.get_ident()
+        names = {}
+        while not stop.wait(interval):
+            names.update({thread.ident: thread.name for thread in threading.enumerate()})
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                code = frame.f_code
+                idle = (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+                counts["samples"] += 1
+                if idle:
+                    counts["idle"] += 1
+                    if mode == "cpu":
+                        continue
+                frames = []
+                while frame is not None and len(frames) < MAX_STACK_DEPTH:
+                    frames.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                root = f"thread:{names.get(thread_id, thread_id)}"
+                if thread_id == loop_thread and not idle:
+                    task = asyncio.tasks._current_tasks.get(loop)
+                    if task is not None:
+                        coro = task.get_coro()
+                        root += f";task:{getattr(coro, '__qualname__', task.get_name())}"
+                stacks[root + ";" + ";".join(reversed(frames))] += 1
+
+    async def profile(self, duration: float, interval_ms: float = 10, mode: str = "wall") -> dict[str, Any]:
+        """Profile the process for a fixed time.
+
+        Args:
+            duration: Seconds to sample
+            interval_ms: Milliseconds between samples
+            mode: "wall" (all samples) or "cpu" (skip idle samples)
+
+        Returns:
+            Dict with the collapsed-stack file path and top functions
+
+        Raises:
+            ValueError: If a profile is already running or mode is unknown
+        """
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+        if self.running:
+            raise ValueError("A profile is already running")
+        self.running = True
+        stacks: Counter = Counter()
+        counts: Counter = Counter()
+        stop = threading.Event()
+        try:
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(stop, interval_ms / 1000, mode, asyncio.get_running_loop(), threading.get_ident(),
+                      stacks, counts),
+                name="profiler",
+                daemon=True,
+            )
+            started = time.monotonic()
+            sampler.start()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                stop.set()
+                await asyncio.to_thread(sampler.join)
+            elapsed = time.monotonic() - started
+        finally:
+            self.running = False
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{mode}.collapsed"
+        await asyncio.to_thread(
+            path.write_text,
+            "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()),
+            "utf-8",
+        )
+        return {
+            "path": str(path),
+            "format": "collapsed",
+            "mode": mode,
+            "duration_s": round(elapsed, 3),
+            "interval_ms": interval_ms,
+            "samples": counts["samples"],
+            "idle_samples": counts["idle"],
+            "stacks": len(stacks),
+            **self.summarize(stacks),
+        }
+
+    @staticmethod
+    def summarize(stacks: Counter, top: int = 20) -> dict[str, Any]:
+        """Rank functions and asyncio tasks by samples.
+
+        Args:
+            stacks: Sample counts by collapsed stack
+            top: Entries per ranking
+
+        Returns:
+            Dict with top_functions (self and total samples) and top_tasks
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        tasks: Counter = Counter()
+        recorded = sum(stacks.values()) or 1
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for label in set(frames):
+                if label.startswith("task:"):
+                    tasks[label[5:]] += count
+                elif not label.startswith("thread:"):
+                    total[label] += count
+        return {
+            "top_functions": [
+                {
+                    "function": label,
+                    "self_samples": count,
+                    "self_pct": round(100 * count / recorded, 1),
+                    "total_samples": total[label],
+                }
+                for label, count in own.most_common(top)
+            ],
+            "top_tasks": [{"task": name, "samples": count} for name, count in tasks.most_common(top)],
+        }
+
+
+class MemoryTracker:
+    """tracemalloc snapshots with top allocation sites and diffs."""
+
+    def __init__(self) -> None:
+        """Initialize tracker without tracing."""
+        self._snapshots: dict[int, tuple[float, tracemalloc.Snapshot]] = {}
+        self._next_id = 1
+
+    def start(self, frames: int = 10) -> dict[str, Any]:
+        """Start tracing allocations.
+
+        Args:
+            frames: Stack frames stored per allocation
+
+        Returns:
+            Tracing status
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.get_stats()
+
+    def stop(self) -> dict[str, Any]:
+        """Stop tracing and drop snapshots.
+
+        Returns:
+            Tracing status
+        """
+        tracemalloc.stop()
+        self._snapshots.clear()
+        return self.get_stats()
+
+    @staticmethod
+    def _statistics(stats: list[Any], top: int) -> list[dict[str, Any]]:
+        """Format tracemalloc statistics.
+
+        Args:
+            stats: Statistic or StatisticDiff objects
+            top: Maximum entries
+
+        Returns:
+            Allocation sites with sizes in KiB
+        """
+        sites = []
+        for stat in stats[:top]:
+            site: dict[str, Any] = {
+                "site": [f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback],
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+            }
+            if hasattr(stat, "size_diff"):
+                site["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+                site["count_diff"] = stat.count_diff
+            sites.append(site)
+        return sites
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        """Take a snapshot without tracemalloc and import machinery noise.
+
+        Returns:
+            Filtered snapshot
+        """
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    async def snapshot(self, group_by: str = "lineno", top: int = 20) -> dict[str, Any]:
+        """Take and keep a snapshot, reporting top allocation sites.
+
+        Args:
+            group_by: "lineno", "filename" or "traceback"
+            top: Sites to report
+
+        Returns:
+            Dict with the snapshot id, traced memory and top sites
+
+        Raises:
+            ValueError: If tracing is off or group_by is unknown
+        """
+        if not tracemalloc.is_tracing():
+            raise ValueError("Memory tracing is not running; start it first")
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY)}")
+        snapshot = await asyncio.to_thread(self._take)
+        snapshot_id = self._next_id
+        self._next_id += 1
+        self._snapshots[snapshot_id] = (time.time(), snapshot)
+        while len(self._snapshots) > MAX_SNAPSHOTS:
+            del self._snapshots[min(self._snapshots)]
+        stats = await asyncio.to_thread(snapshot.statistics, group_by)
+        return {
+            "snapshot_id": snapshot_id,
+            **self.get_stats(),
+            "top": self._statistics(stats, top),
+        }
+
+    async def diff(
+        self,
+        base_id: int,
+        target_id: int | None = None,
+        group_by: str = "lineno",
+        top: int = 20
+    ) -> dict[str, Any]:
+        """Compare two snapshots, largest growth first.
+
+        Args:
+            base_id: Earlier snapshot
+            target_id: Later snapshot (default: a new snapshot)
+            group_by: "lineno", "filename" or "traceback"
+            top: Sites to report
+
+        Returns:
+            Dict with total growth and top changed sites
+
+        Raises:
+            ValueError: If a snapshot is unknown or group_by is unknown
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY)}")
+        if base_id not in self._snapshots:
+            raise ValueError(f"Unknown snapshot: {base_id}")
+        base_time, base = self._snapshots[base_id]
+        if target_id is None:
+            taken = await self.snapshot(group_by, top=0)
+            target_id = taken["snapshot_id"]
+        if target_id not in self._snapshots:
+            raise ValueError(f"Unknown snapshot: {target_id}")
+        target_time, target = self._snapshots[target_id]
+        stats = await asyncio.to_thread(target.compare_to, base, group_by)
+        return {
+            "base_id": base_id,
+            "target_id": target_id,
+            "interval_s": round(target_time - base_time, 1),
+            "size_diff_kb": round(sum(stat.size_diff for stat in stats) / 1024, 1),
+            "top": self._statistics(stats, top),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export tracing status.
+
+        Returns:
+            Dict with tracing state, traced memory and kept snapshots
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "traced_mb": round(current / 1024 / 1024, 2),
+            "peak_mb": round(peak / 1024 / 1024, 2),
+            "snapshots": sorted(self._snapshots),
+        }
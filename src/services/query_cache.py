@@ -0,0 +1,241 @@
+"""Retrieval query result cache with write-path invalidation.
+
+Results of collection, document and memory queries are cached for a short
+TTL. The cache listens to client mutations and drops entries for a
+collection whenever content is processed into it, removed from it or the
+vector database is reset, so repeated queries never outlive an ingestion.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+from src.services.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Pseudo collection for the per-user memory store
+MEMORY_COLLECTION = "memories"
+
+_PROCESS_PREFIX = "/api/v1/retrieval/process/"
+_KNOWLEDGE_WRITE = re.compile(
+    r"^/api/v1/knowledge/([^/]+)/(?:file/(?:add|remove|update)|files/batch/add|reset|delete)$"
+)
+_FILE_WRITE = re.compile(r"^/api/v1/files/([^/]+)(?:/data/content/update)?$")
+_MEMORY_WRITE = re.compile(r"^/api/v1/memories/(?:add|reset|delete/user|[^/]+/update|[^/]+)$")
+
+
+class QueryCache:
+    """TTL + LRU cache of retrieval query results, indexed by collection.
+
+    Args:
+        ttl_seconds: Entry lifetime
+        max_entries: Maximum cached results; least recently used are evicted
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 1024) -> None:
+        """Initialize cache.
+
+        Args:
+            ttl_seconds: Entry lifetime in seconds
+            max_entries: Maximum cached results
+        """
+        self.ttl = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[float, tuple[str, ...], Any]] = OrderedDict()
+        self._by_collection: dict[str, set[str]] = {}
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(kind: str, collections: list[str], query: str, params: dict[str, Any]) -> str:
+        """Build a cache key from the query shape.
+
+        Args:
+            kind: Query kind (collection, doc or memory)
+            collections: Collections searched
+            query: Query text (normalized for whitespace)
+            params: Remaining query parameters (k, r, hybrid settings, ...)
+
+        Returns:
+            Cache key
+        """
+        return json.dumps(
+            {
+                "kind": kind,
+                "collections": sorted(collections),
+                "query": normalize_text(query or ""),
+                "params": params,
+            },
+            sort_keys=True,
+            default=str
+        )
+
+    def get(self, key: str) -> Any | None:
+        """Return a cached result if present and fresh.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached result, or None
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: str, collections: list[str], value: Any) -> None:
+        """Cache a result.
+
+        Args:
+            key: Cache key from make_key()
+            collections: Collections the result depends on
+            value: Query result
+        """
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, tuple(collections), value)
+        for name in collections:
+            self._by_collection.setdefault(name, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def get_or_fetch(
+        self,
+        kind: str,
+        collections: list[str],
+        query: str,
+        params: dict[str, Any],
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return a cached result or fetch and cache it.
+
+        Results fetched while one of their collections was invalidated are
+        returned but not cached, so an in-flight query cannot resurrect
+        pre-ingestion results.
+
+        Args:
+            kind: Query kind
+            collections: Collections searched
+            query: Query text
+            params: Remaining query parameters
+            fetch: Async callable performing the upstream query
+
+        Returns:
+            Query result
+        """
+        key = self.make_key(kind, collections, query, params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        epoch = self._epoch
+        generations = [self._generations.get(name, 0) for name in collections]
+        result = await fetch()
+        if epoch == self._epoch and generations == [
+            self._generations.get(name, 0) for name in collections
+        ]:
+            self.put(key, collections, result)
+        return result
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and its collection index references.
+
+        Args:
+            key: Cache key
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for name in entry[1]:
+            keys = self._by_collection.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_collection[name]
+
+    def invalidate_collection(self, name: str) -> None:
+        """Drop every cached result that searched a collection.
+
+        Args:
+            name: Collection name
+        """
+        self._generations[name] = self._generations.get(name, 0) + 1
+        self.invalidations += 1
+        for key in list(self._by_collection.get(name, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._epoch += 1
+        self.invalidations += 1
+        self._entries.clear()
+        self._by_collection.clear()
+
+    def on_mutation(self, method: str, endpoint: str, json_data: Any, response: Any) -> None:
+        """Invalidate collections touched by a successful write.
+
+        Registered as an OpenWebUIClient mutation listener.
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint path
+            json_data: Request body
+            response: Parsed response
+        """
+        path = endpoint.split("?")[0].rstrip("/")
+        body = json_data if isinstance(json_data, dict) else {}
+        result = response if isinstance(response, dict) else {}
+
+        if path in ("/api/v1/retrieval/reset/db", "/api/v1/knowledge/reindex"):
+            self.clear()
+            return
+
+        names: set[str] = set()
+        if path.startswith(_PROCESS_PREFIX) or path == "/api/v1/retrieval/delete":
+            for source in (body, result):
+                if source.get("collection_name"):
+                    names.add(source["collection_name"])
+                names.update(source.get("collection_names") or [])
+            if path == f"{_PROCESS_PREFIX}file" and not body.get("collection_name") and body.get("file_id"):
+                # Open WebUI stores standalone files in a per-file collection
+                names.add(f"file-{body['file_id']}")
+        elif match := _KNOWLEDGE_WRITE.match(path):
+            names.add(match.group(1))
+        elif method in ("POST", "DELETE") and (match := _FILE_WRITE.match(path)):
+            names.add(f"file-{match.group(1)}")
+        elif path != "/api/v1/memories/query" and _MEMORY_WRITE.match(path):
+            names.add(MEMORY_COLLECTION)
+
+        for name in names:
+            self.invalidate_collection(name)
+        if names:
+            logger.debug(f"Query cache invalidated for {sorted(names)} after {method} {path}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export cache stats.
+
+        Returns:
+            Dict with hit rate, entry count and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {
+            "ttl_seconds": self.ttl,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+        }
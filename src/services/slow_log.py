@@ -0,0 +1,258 @@
+"""Slow-call log with an in-memory ring buffer of latency outliers.
+
+Tool calls slower than their threshold are recorded compactly: tool,
+route templates, argument shape (sizes, never values), queue wait,
+upstream time, bytes in/out and retries. Records go to a dedicated log
+(and optionally a JSON lines file) and the last N are kept in memory for
+the admin_slow_calls tool.
+"""
+
+import fnmatch
+import json
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+from src.utils.deferred_write import defer_write
+from src.utils.tracing import CallStats
+
+logger = logging.getLogger(__name__)
+
+# Nesting depth and keys per object described by argument_shape
+MAX_SHAPE_DEPTH = 3
+MAX_SHAPE_KEYS = 20
+
+
+def argument_shape(value: Any, depth: int = 0) -> Any:
+    """Describe a value by type and size without its content.
+
+    Args:
+        value: Tool argument value
+        depth: Current nesting depth
+
+    Returns:
+        Shape, e.g. {"query": "str(42)", "ids": "list(3)"}
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return type(value).__name__
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    if isinstance(value, (list, tuple)):
+        return f"list({len(value)})"
+    if isinstance(value, dict):
+        if depth >= MAX_SHAPE_DEPTH:
+            return f"dict({len(value)})"
+        shape = {
+            str(key): argument_shape(item, depth + 1)
+            for key, item in list(value.items())[:MAX_SHAPE_KEYS]
+        }
+        if len(value) > MAX_SHAPE_KEYS:
+            shape["..."] = f"{len(value) - MAX_SHAPE_KEYS} more"
+        return shape
+    return type(value).__name__
+
+
+class SlowCallLog:
+    """Threshold-based capture of slow tool calls.
+
+    Args:
+        threshold_ms: Default threshold (0: only tools matching thresholds)
+        thresholds: Thresholds by tool name or glob pattern (e.g. chat_*)
+        capacity: Records kept in memory
+        path: Optional JSON lines file receiving every record
+    """
+
+    def __init__(
+        self,
+        threshold_ms: int = 2000,
+        thresholds: dict[str, int] | None = None,
+        capacity: int = 200,
+        path: Path | None = None
+    ) -> None:
+        """Initialize slow-call log.
+
+        Args:
+            threshold_ms: Default threshold in milliseconds
+            thresholds: Per-tool thresholds; exact names win over patterns
+            capacity: Ring buffer size
+            path: Slow log file
+        """
+        self.threshold_ms = threshold_ms
+        self.thresholds = dict(thresholds or {})
+        self.capacity = max(1, capacity)
+        self.path = path
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._records: deque[dict[str, Any]] = deque(maxlen=self.capacity)
+        self._resolved: dict[str, int] = {}
+        self.recorded = 0
+
+    def threshold_for(self, tool: str) -> int:
+        """Resolve the threshold for a tool.
+
+        Args:
+            tool: Tool name
+
+        Returns:
+            Threshold in milliseconds (0: never slow)
+        """
+        threshold = self._resolved.get(tool)
+        if threshold is None:
+            threshold = self.thresholds.get(tool)
+            if threshold is None:
+                threshold = next(
+                    (ms for pattern, ms in self.thresholds.items() if fnmatch.fnmatchcase(tool, pattern)),
+                    self.threshold_ms,
+                )
+            self._resolved[tool] = threshold
+        return threshold
+
+    def observe(
+        self,
+        tool: str,
+        arguments: dict[str, Any],
+        duration_ms: float,
+        stats: CallStats | None = None,
+        request_id: str | None = None,
+        error: bool = False
+    ) -> dict[str, Any] | None:
+        """Record a finished call if it exceeded its threshold.
+
+        Args:
+            tool: Tool name
+            arguments: Tool arguments (only their shape is kept)
+            duration_ms: Call duration
+            stats: Upstream counters of the call
+            request_id: Request id forwarded upstream
+            error: Whether the call failed
+
+        Returns:
+            The slow-call record, or None if the call was fast enough
+        """
+        threshold = self.threshold_for(tool)
+        if threshold <= 0 or duration_ms < threshold:
+            return None
+
+        stats = stats or CallStats()
+        routes = sorted(stats.route_ms.items(), key=lambda item: -item[1])
+        record = {
+            "time": round(time.time(), 3),
+            "tool": tool,
+            "request_id": request_id,
+            "duration_ms": round(duration_ms, 1),
+            "threshold_ms": threshold,
+            "error": error,
+            "route": routes[0][0] if routes else None,
+            "routes": {route: round(ms, 1) for route, ms in routes[:5]},
+            "arguments": argument_shape(arguments),
+            "queue_ms": round(stats.queue_ms, 1),
+            "upstream_ms": round(stats.upstream_ms, 1),
+            "upstream_requests": stats.upstream_requests,
+            "bytes_out": stats.bytes_out,
+            "bytes_in": stats.bytes_in,
+            "retries": stats.retries,
+        }
+        self._records.append(record)
+        self.recorded += 1
+
+        logger.warning(
+            f"Slow call: {tool} took {record['duration_ms']:.0f}ms (threshold {threshold}ms)",
+            extra={"slow_call": record}
+        )
+        if self.path is not None:
+            defer_write(self._append, json.dumps(record, separators=(",", ":")) + "\n")
+        return record
+
+    def _append(self, line: str) -> None:
+        """Append a record to the slow log file (runs on the log writer thread).
+
+        Args:
+            line: JSON line
+        """
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            logger.warning(f"Failed to write slow log {self.path}: {e}")
+
+    def query(
+        self,
+        tool: str | None = None,
+        min_duration_ms: float = 0,
+        limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """List buffered slow calls, newest first.
+
+        Args:
+            tool: Only calls of tools matching this name or glob pattern
+            min_duration_ms: Only calls at least this slow
+            limit: Maximum records
+
+        Returns:
+            Slow-call records
+        """
+        matches = [
+            record for record in reversed(self._records)
+            if (tool is None or fnmatch.fnmatchcase(record["tool"], tool))
+            and record["duration_ms"] >= min_duration_ms
+        ]
+        return matches[:limit]
+
+    def summarize(self, records: list[dict[str, Any]]) -> dict[str, Any]:
+        """Aggregate slow calls by tool and by upstream route.
+
+        Args:
+            records: Slow-call records
+
+        Returns:
+            Dict with per-tool and per-route call counts and times, slowest first
+        """
+        by_tool: dict[str, dict[str, Any]] = {}
+        by_route: dict[str, dict[str, Any]] = {}
+        for record in records:
+            entry = by_tool.setdefault(record["tool"], {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["calls"] += 1
+            entry["total_ms"] += record["duration_ms"]
+            entry["max_ms"] = max(entry["max_ms"], record["duration_ms"])
+            for route, ms in record["routes"].items():
+                entry = by_route.setdefault(route, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+                entry["calls"] += 1
+                entry["total_ms"] += ms
+                entry["max_ms"] = max(entry["max_ms"], ms)
+
+        def ranked(groups: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+            for entry in groups.values():
+                entry["total_ms"] = round(entry["total_ms"], 1)
+            return dict(sorted(groups.items(), key=lambda item: -item[1]["total_ms"]))
+
+        return {"by_tool": ranked(by_tool), "by_route": ranked(by_route)}
+
+    def clear(self) -> int:
+        """Drop all buffered records.
+
+        Returns:
+            Number of records dropped
+        """
+        dropped = len(self._records)
+        self._records.clear()
+        return dropped
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export slow log settings and counts.
+
+        Returns:
+            Dict with thresholds and buffer usage
+        """
+        return {
+            "threshold_ms": self.threshold_ms,
+            "thresholds": self.thresholds,
+            "capacity": self.capacity,
+            "buffered": len(self._records),
+            "recorded": self.recorded,
+            "path": str(self.path) if self.path else None,
+        }
@@ -0,0 +1,91 @@
+"""Admin CPU profile tool."""
+
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.services.profiler import MODES
+from src.utils.validation import ToolInputValidator
+
+
+class AdminCpuProfileTool(BaseTool):
+    """Sample the running server's stacks for a fixed time.
+
+    Writes a collapsed-stack file for flame graph viewers and returns the
+    functions and asyncio tasks with the most samples.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "admin_cpu_profile",
+            "description": (
+                "Profile the running server for a few seconds (wall or CPU sampling with asyncio task "
+                "attribution), write a collapsed-stack flame graph file and return the top functions"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "duration_seconds": {
+                        "type": "integer",
+                        "description": "Sampling time (1-120 seconds)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 120
+                    },
+                    "interval_ms": {
+                        "type": "integer",
+                        "description": "Time between samples (1-1000 ms)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 1000
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": list(MODES),
+                        "description": "wall counts every sample; cpu skips threads idle in the event loop or waiting",
+                        "default": "wall"
+                    }
+                },
+                "required": []
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute CPU profile.
+
+        Args:
+            arguments: Tool arguments with optional duration_seconds, interval_ms and mode
+
+        Returns:
+            Dict with the profile path, sample counts and top functions and tasks
+
+        Raises:
+            ValidationError: If arguments invalid or a profile is already running
+        """
+        self._log_execution_start(arguments)
+
+        profiler = self.get_service("profiler")
+        if profiler is None:
+            result = {"enabled": False}
+            self._log_execution_end(result)
+            return result
+
+        duration = ToolInputValidator.validate_int_range(
+            arguments.get("duration_seconds", 10), "duration_seconds", 1, 120
+        )
+        interval_ms = ToolInputValidator.validate_int_range(
+            arguments.get("interval_ms", 10), "interval_ms", 1, 1000
+        )
+
+        try:
+            profile = await profiler.profile(duration, interval_ms, arguments.get("mode", "wall"))
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        result = {"enabled": True, **profile}
+        self._log_execution_end(result)
+        return result
@@ -0,0 +1,50 @@
+"""Admin embedding stats tool."""
+
+from typing import Any
+from src.tools.base import BaseTool
+
+
+class AdminEmbeddingStatsTool(BaseTool):
+    """Report embedding batching and cache statistics.
+
+    Returns batch-size and latency histograms from the embedding batcher and
+    hit rate and size of the persistent embedding cache.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "admin_embedding_stats",
+            "description": "Show embedding micro-batching statistics (batch sizes and latency histograms) and embedding cache hit rate and size",
+            "inputSchema": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute embedding stats lookup.
+
+        Args:
+            arguments: Tool arguments (none required)
+
+        Returns:
+            Embedding batcher and cache stats dict
+        """
+        self._log_execution_start(arguments)
+
+        batcher = self.get_service("embedding_batcher")
+        cache = self.get_service("embedding_cache")
+        result = {
+            "batcher": batcher.get_stats() if batcher is not None else None,
+            "cache": cache.get_stats() if cache is not None else None
+        }
+
+        self._log_execution_end(result)
+
+        return result
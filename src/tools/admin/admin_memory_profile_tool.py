@@ -0,0 +1,122 @@
+"""Admin memory profile tool."""
+
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.services.profiler import GROUP_BY
+from src.utils.validation import ToolInputValidator
+
+ACTIONS = ("status", "start", "snapshot", "diff", "stop")
+
+
+class AdminMemoryProfileTool(BaseTool):
+    """Trace allocations with tracemalloc to find memory growth.
+
+    Start tracing, take snapshots over time and diff them to see which
+    allocation sites grew, e.g. across a long-lived SSE session.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "admin_memory_profile",
+            "description": (
+                "Start or stop tracemalloc, take snapshots with top allocation sites and diff two "
+                "snapshots to find memory growth in the running server"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": list(ACTIONS),
+                        "description": "status, start tracing, take a snapshot, diff snapshots or stop tracing",
+                        "default": "status"
+                    },
+                    "frames": {
+                        "type": "integer",
+                        "description": "Stack frames stored per allocation when starting (1-50)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 50
+                    },
+                    "group_by": {
+                        "type": "string",
+                        "enum": list(GROUP_BY),
+                        "description": "Group allocation sites by line, file or full traceback",
+                        "default": "lineno"
+                    },
+                    "top": {
+                        "type": "integer",
+                        "description": "Allocation sites to return (1-100)",
+                        "default": 20,
+                        "minimum": 1,
+                        "maximum": 100
+                    },
+                    "base_id": {
+                        "type": "integer",
+                        "description": "Earlier snapshot to diff from (required for diff)"
+                    },
+                    "target_id": {
+                        "type": ["integer", "null"],
+                        "description": "Later snapshot to diff to (default: take a new snapshot)"
+                    }
+                },
+                "required": []
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute memory profile action.
+
+        Args:
+            arguments: Tool arguments with action and its options
+
+        Returns:
+            Dict with tracing status and, for snapshot and diff, top allocation sites
+
+        Raises:
+            ValidationError: If arguments invalid, tracing is off or a snapshot is unknown
+        """
+        self._log_execution_start(arguments)
+
+        tracker = self.get_service("memory_tracker")
+        if tracker is None:
+            result = {"enabled": False}
+            self._log_execution_end(result)
+            return result
+
+        action = arguments.get("action", "status")
+        if action not in ACTIONS:
+            raise ValidationError(f"action must be one of: {', '.join(ACTIONS)}")
+        group_by = arguments.get("group_by", "lineno")
+        top = ToolInputValidator.validate_int_range(arguments.get("top", 20), "top", 1, 100)
+
+        try:
+            if action == "start":
+                frames = ToolInputValidator.validate_int_range(arguments.get("frames", 10), "frames", 1, 50)
+                report = tracker.start(frames)
+            elif action == "stop":
+                report = tracker.stop()
+            elif action == "snapshot":
+                report = await tracker.snapshot(group_by, top)
+            elif action == "diff":
+                if "base_id" not in arguments:
+                    raise ValidationError("base_id is required for diff")
+                base_id = ToolInputValidator.validate_int_range(arguments["base_id"], "base_id", 1, 2**31)
+                target_id = arguments.get("target_id")
+                if target_id is not None:
+                    target_id = ToolInputValidator.validate_int_range(target_id, "target_id", 1, 2**31)
+                report = await tracker.diff(base_id, target_id, group_by, top)
+            else:
+                report = tracker.get_stats()
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        result = {"enabled": True, "action": action, **report}
+        self._log_execution_end(result)
+        return result
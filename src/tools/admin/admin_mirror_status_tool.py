@@ -0,0 +1,78 @@
+"""Admin mirror status tool."""
+
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.services.mirror import KINDS
+
+
+class AdminMirrorStatusTool(BaseTool):
+    """Report local entity mirror statistics and optionally refresh it.
+
+    Returns hit rate, mirrored entity counts and the last refresh of each
+    kind. With refresh set, re-verifies the mirror against Open WebUI first.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "admin_mirror_status",
+            "description": "Show local entity mirror statistics (hit rate, entity counts, last refresh) and optionally refresh it now",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Refresh the mirror before reporting",
+                        "default": False
+                    },
+                    "kinds": {
+                        "type": ["array", "null"],
+                        "items": {"type": "string", "enum": list(KINDS)},
+                        "description": "Kinds to refresh (default: all mirrored kinds)"
+                    }
+                },
+                "required": []
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute mirror status lookup.
+
+        Args:
+            arguments: Tool arguments with optional refresh and kinds
+
+        Returns:
+            Mirror stats dict, with refresh results if requested
+
+        Raises:
+            ValidationError: If a kind is not mirrored
+        """
+        self._log_execution_start(arguments)
+
+        mirror = self.get_service("mirror")
+        if mirror is None:
+            result = {"enabled": False}
+            self._log_execution_end(result)
+            return result
+
+        result: dict[str, Any] = {"enabled": True}
+        if arguments.get("refresh", False):
+            kinds = arguments.get("kinds") or mirror.kinds
+            unknown = [kind for kind in kinds if kind not in mirror.kinds]
+            if unknown:
+                raise ValidationError(f"Kinds not mirrored: {', '.join(map(str, unknown))}")
+            result["refreshed"] = {}
+            for kind in kinds:
+                try:
+                    result["refreshed"][kind] = await mirror.refresh(kind)
+                except Exception as e:
+                    result["refreshed"][kind] = {"error": str(e)}
+        result.update(mirror.get_stats())
+
+        self._log_execution_end(result)
+        return result
@@ -0,0 +1,98 @@
+"""Admin slow calls tool."""
+
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.utils.validation import ToolInputValidator
+
+
+class AdminSlowCallsTool(BaseTool):
+    """List recent tool calls that exceeded their slow-call threshold.
+
+    Reads the in-memory ring buffer of the slow-call log, newest first,
+    with totals per tool and per upstream route to point at hot endpoints.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "admin_slow_calls",
+            "description": (
+                "List recent slow tool calls (route, argument sizes, queue wait, upstream time, "
+                "bytes, retries) with totals per tool and per upstream route"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "tool": {
+                        "type": ["string", "null"],
+                        "description": "Only calls of this tool (glob patterns such as chat_* allowed)"
+                    },
+                    "min_duration_ms": {
+                        "type": "number",
+                        "description": "Only calls at least this slow",
+                        "default": 0,
+                        "minimum": 0
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum calls to return (1-500)",
+                        "default": 50,
+                        "minimum": 1,
+                        "maximum": 500
+                    },
+                    "clear": {
+                        "type": "boolean",
+                        "description": "Empty the buffer after reading",
+                        "default": False
+                    }
+                },
+                "required": []
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute slow call lookup.
+
+        Args:
+            arguments: Tool arguments with optional tool, min_duration_ms, limit and clear
+
+        Returns:
+            Dict with slow calls, per-tool and per-route summary and settings
+
+        Raises:
+            ValidationError: If arguments invalid
+        """
+        self._log_execution_start(arguments)
+
+        slow_log = self.get_service("slow_log")
+        if slow_log is None:
+            result = {"enabled": False}
+            self._log_execution_end(result)
+            return result
+
+        tool = arguments.get("tool")
+        if tool is not None:
+            tool = ToolInputValidator.validate_string_length(tool, "tool", 1, 200)
+        min_duration_ms = arguments.get("min_duration_ms", 0)
+        if not isinstance(min_duration_ms, (int, float)) or isinstance(min_duration_ms, bool) or min_duration_ms < 0:
+            raise ValidationError("min_duration_ms must be a non-negative number")
+        limit = ToolInputValidator.validate_int_range(arguments.get("limit", 50), "limit", 1, 500)
+
+        matches = slow_log.query(tool=tool, min_duration_ms=min_duration_ms, limit=slow_log.capacity)
+        result = {
+            "enabled": True,
+            "calls": matches[:limit],
+            "matched": len(matches),
+            "summary": slow_log.summarize(matches),
+            **slow_log.get_stats(),
+        }
+        if arguments.get("clear", False):
+            result["cleared"] = slow_log.clear()
+
+        self._log_execution_end(result)
+        return result
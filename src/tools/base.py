@@ -3,12 +3,16 @@
 Provides common functionality for tool execution and validation.
 """
 
-from typing import Any, Protocol
+from typing import Any, AsyncIterator, Awaitable, Callable, Protocol
 from abc import abstractmethod
+from contextlib import aclosing
 import logging
 import time
+from mcp.server.lowlevel.server import request_ctx
 from src.services.client import OpenWebUIClient
 from src.config import Config
+from src.utils.logging_utils import sanitize_for_logging
+from src.utils.pagination import PagingSpec, paginate
 
 logger = logging.getLogger(__name__)
 
@@ -53,19 +57,128 @@ class BaseTool:
     Args:
         client: OpenWebUI HTTP client
         config: Configuration instance
+        services: Optional service provider (the ToolFactory) for shared services
     """
 
-    def __init__(self, client: OpenWebUIClient, config: Config) -> None:
+    def __init__(
+        self,
+        client: OpenWebUIClient,
+        config: Config,
+        services: Any | None = None
+    ) -> None:
         """Initialize base tool.
 
         Args:
             client: HTTP client instance
             config: Configuration instance
+            services: Optional service provider exposing get_service(name)
         """
         self.client = client
         self.config = config
+        self.services = services
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    def get_service(self, name: str) -> Any | None:
+        """Get a shared service from the service provider.
+
+        Args:
+            name: Service name
+
+        Returns:
+            Service instance, or None when the tool runs without a provider
+        """
+        if self.services is None:
+            return None
+        return self.services.get_service(name)
+
+    async def _report_progress(
+        self,
+        progress: float,
+        total: float | None = None,
+        message: str | None = None
+    ) -> None:
+        """Send an MCP progress notification for the current tool call.
+
+        No-op when the caller did not request progress (no progress token)
+        or the tool runs outside an MCP request.
+
+        Args:
+            progress: Progress so far
+            total: Total amount of work, if known
+            message: Optional progress message
+        """
+        try:
+            ctx = request_ctx.get()
+        except LookupError:
+            return
+        token = getattr(ctx.meta, "progressToken", None) if ctx.meta is not None else None
+        if token is None:
+            return
+        try:
+            await ctx.session.send_progress_notification(
+                token, progress, total=total, message=message
+            )
+        except Exception as e:
+            self.logger.debug(f"Progress notification failed: {e}")
+
+    async def _mirror_read(
+        self,
+        kind: str,
+        key: str | None,
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Read an entity (or a kind's full list) through the local mirror.
+
+        Falls back to fetch when no mirror is configured.
+
+        Args:
+            kind: Entity kind (chats, models, users, knowledge, prompts, folders)
+            key: Entity key, or None for the kind's full list (an empty key
+                always reads upstream)
+            fetch: Upstream read
+
+        Returns:
+            Entity or list data
+        """
+        mirror = self.get_service("mirror")
+        if mirror is None:
+            return await fetch()
+        if not hasattr(self, "_tool_name"):
+            self._tool_name = self.get_definition()["name"]
+        return await mirror.read_through(self._tool_name, kind, key, fetch)
+
+    async def _paginate(
+        self,
+        spec: PagingSpec,
+        path_params: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None,
+        lookahead: int = 4,
+        max_items: int | None = None,
+        stop_when: Callable[[Any], bool] | None = None
+    ) -> AsyncIterator[Any]:
+        """Iterate every item of a paged endpoint.
+
+        Pages are fetched up to lookahead ahead of the consumer. Iteration
+        stops after max_items items or before the first item matching
+        stop_when; outstanding page requests are then cancelled.
+
+        Args:
+            spec: Paging spec of the endpoint
+            path_params: Values for the endpoint's path placeholders
+            params: Extra query parameters (GET) or body fields (POST)
+            lookahead: Maximum pages in flight
+            max_items: Stop after this many items
+            stop_when: Stop before the first item for which this returns True
+
+        Yields:
+            Items in page order
+        """
+        async with aclosing(
+            paginate(self.client, spec, path_params, params, lookahead, max_items, stop_when)
+        ) as items:
+            async for item in items:
+                yield item
+
     @abstractmethod
     def get_definition(self) -> dict[str, Any]:
         """Get MCP tool definition.
@@ -152,16 +265,7 @@ class BaseTool:
         Returns:
             Sanitized arguments safe for logging
         """
-        sensitive_keys = {'password', 'token', 'api_key', 'secret', 'auth'}
-        sanitized = {}
-        for key, value in arguments.items():
-            if any(s in key.lower() for s in sensitive_keys):
-                sanitized[key] = '***REDACTED***'
-            elif isinstance(value, str) and len(value) > 200:
-                sanitized[key] = f"{value[:200]}... (truncated)"
-            else:
-                sanitized[key] = value
-        return sanitized
+        return sanitize_for_logging(arguments)
 
     def _get_result_preview(self, result: dict[str, Any] | list) -> str:
         """Get a preview of the result for logging.
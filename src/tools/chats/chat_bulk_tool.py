@@ -0,0 +1,328 @@
+"""Chat bulk tool - Apply one action to every chat matching a filter."""
+
+import re
+import time
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.utils.pagination import CHAT_LIST_ALL_PARAMS, PAGINATED_TOOLS
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.validation import ToolInputValidator
+
+CHAT_LIST_SPEC = PAGINATED_TOOLS["get_session_user_chat_list_chats_list"]
+TAG_LIST_SPEC = PAGINATED_TOOLS["get_user_chat_list_by_tag_name_chats_tags"]
+
+ACTIONS = ("archive", "delete", "pin", "unpin", "tag", "move", "clone")
+
+# Actions safe to repeat; archive and pin toggle upstream and clone creates,
+# so a retry after an unseen success would undo or duplicate the change
+RETRYABLE_ACTIONS = ("delete", "tag", "move")
+
+# Matched chats shown in the plan preview
+PLAN_PREVIEW_SIZE = 20
+
+
+class ChatBulkTool(BaseTool):
+    """Archive, delete, pin, tag, move or clone all chats matching a filter.
+
+    Plans the affected set first (so deletions cannot shift the listing
+    being walked), then runs the action with bounded concurrency, retries
+    for the idempotent actions and progress notifications. Failed chats are returned as a retry list
+    that can be passed back as filter.chat_ids.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "chat_bulk",
+            "description": (
+                "Apply an action (archive, delete, pin, unpin, tag, move, clone) to all chats "
+                "matching a filter (age, tag, folder, title regex, ids), with dry run and retry list"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": list(ACTIONS),
+                        "description": "Action to apply to each matching chat"
+                    },
+                    "filter": {
+                        "type": "object",
+                        "description": "Conditions a chat must all match",
+                        "properties": {
+                            "older_than_days": {
+                                "type": "number",
+                                "description": "Last updated more than this many days ago"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Has this tag"
+                            },
+                            "folder_id": {
+                                "type": "string",
+                                "description": "Is in this folder"
+                            },
+                            "title_regex": {
+                                "type": "string",
+                                "description": "Title matches this regular expression (case-insensitive)"
+                            },
+                            "chat_ids": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Is one of these chats (e.g. a previous retry list)"
+                            }
+                        }
+                    },
+                    "tag_name": {
+                        "type": ["string", "null"],
+                        "description": "Tag to add (action: tag)"
+                    },
+                    "target_folder_id": {
+                        "type": ["string", "null"],
+                        "description": "Destination folder, null for none (action: move)"
+                    },
+                    "dry_run": {
+                        "type": "boolean",
+                        "description": "Only plan: return the matching chats without changing them",
+                        "default": False
+                    },
+                    "max_chats": {
+                        "type": ["integer", "null"],
+                        "description": "Refuse to run if more chats match than this",
+                        "minimum": 1
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent requests (1-32)",
+                        "default": 8,
+                        "minimum": 1,
+                        "maximum": 32
+                    },
+                    "max_retries": {
+                        "type": "integer",
+                        "description": (
+                            "Retry attempts per failed chat (0-5); only delete, tag and move are retried"
+                        ),
+                        "default": 1,
+                        "minimum": 0,
+                        "maximum": 5
+                    }
+                },
+                "required": ["action", "filter"]
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute bulk chat action.
+
+        Args:
+            arguments: Tool arguments with action, filter and limits
+
+        Returns:
+            Dict with the plan and, unless dry_run, succeeded and failed chats
+
+        Raises:
+            ValidationError: If arguments invalid or too many chats match
+            HTTPError: If listing chats fails
+        """
+        self._log_execution_start(arguments)
+
+        action = arguments.get("action")
+        if action not in ACTIONS:
+            raise ValidationError(f"action must be one of: {', '.join(ACTIONS)}")
+        conditions = arguments.get("filter")
+        if not isinstance(conditions, dict) or not conditions:
+            raise ValidationError("filter must be a non-empty object")
+        tag_name = arguments.get("tag_name")
+        if action == "tag" and (not isinstance(tag_name, str) or not tag_name.strip()):
+            raise ValidationError("tag_name is required for action 'tag'")
+        target_folder_id = arguments.get("target_folder_id")
+        if action == "move" and target_folder_id is not None:
+            target_folder_id = ToolInputValidator.validate_id(target_folder_id, "target_folder_id")
+        max_chats = arguments.get("max_chats")
+        if max_chats is not None:
+            max_chats = ToolInputValidator.validate_int_range(max_chats, "max_chats", 1, 10**9)
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 8), "concurrency", 1, 32
+        )
+        max_retries = ToolInputValidator.validate_int_range(
+            arguments.get("max_retries", 1), "max_retries", 0, 5
+        )
+
+        start = time.monotonic()
+        matched = await self._plan(action, conditions)
+        plan = {
+            "matched": len(matched),
+            "preview": matched[:PLAN_PREVIEW_SIZE],
+            "plan_ms": round((time.monotonic() - start) * 1000, 1),
+        }
+        if max_chats is not None and len(matched) > max_chats:
+            raise ValidationError(
+                f"{len(matched)} chats match the filter, more than max_chats ({max_chats})"
+            )
+
+        if arguments.get("dry_run", False):
+            result = {
+                "action": action,
+                "dry_run": True,
+                "plan": plan,
+                "chat_ids": [chat["id"] for chat in matched],
+            }
+            self._log_execution_end(result)
+            return result
+
+        async def apply(batch: list[str]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            chat_id = batch[0]
+            if action == "delete":
+                await self.client.delete(f"/api/v1/chats/{chat_id}")
+            elif action == "archive":
+                await self.client.post(f"/api/v1/chats/{chat_id}/archive", json_data={})
+            elif action in ("pin", "unpin"):
+                # The endpoint toggles; planning already excluded chats in the target state
+                await self.client.post(f"/api/v1/chats/{chat_id}/pin", json_data={})
+            elif action == "tag":
+                await self.client.post(f"/api/v1/chats/{chat_id}/tags", json_data={"name": tag_name})
+            elif action == "move":
+                await self.client.post(
+                    f"/api/v1/chats/{chat_id}/folder", json_data={"folder_id": target_folder_id}
+                )
+            elif action == "clone":
+                clone = await self.client.post(f"/api/v1/chats/{chat_id}/clone", json_data={})
+                return [{"id": chat_id, "clone_id": (clone or {}).get("id")}], []
+            return [{"id": chat_id}], []
+
+        total = len(matched)
+
+        async def on_progress(completed: int, failed: int) -> None:
+            await self._report_progress(
+                completed + failed, total, f"{completed} done, {failed} failed of {total}"
+            )
+
+        pipeline = Pipeline(
+            [PipelineStage(
+                action, apply, concurrency=concurrency,
+                max_retries=max_retries if action in RETRYABLE_ACTIONS else 0
+            )]
+        )
+        outcome = await pipeline.run([chat["id"] for chat in matched], on_progress=on_progress)
+
+        result = {
+            "action": action,
+            "dry_run": False,
+            "plan": plan,
+            "succeeded": len(outcome.outputs),
+            "failed": [{"id": f["item"], "error": f["error"]} for f in outcome.failures],
+            "retry_ids": [f["item"] for f in outcome.failures],
+            "duration_ms": round(outcome.duration_seconds * 1000, 1),
+        }
+        if action == "clone":
+            result["clones"] = outcome.outputs
+
+        self._log_execution_end(result)
+        return result
+
+    async def _plan(self, action: str, conditions: dict[str, Any]) -> list[dict[str, Any]]:
+        """List the chats matching the filter for an action.
+
+        The most selective listing is walked (tag, then folder, then all
+        chats) and the remaining conditions are applied to its entries.
+
+        Args:
+            action: Bulk action
+            conditions: Filter conditions
+
+        Returns:
+            Matching chats as {id, title, updated_at}
+
+        Raises:
+            ValidationError: If a condition is invalid
+        """
+        older_than = conditions.get("older_than_days")
+        if older_than is not None and (
+            not isinstance(older_than, (int, float)) or isinstance(older_than, bool) or older_than < 0
+        ):
+            raise ValidationError("filter.older_than_days must be a non-negative number")
+        cutoff = time.time() - older_than * 86400 if older_than is not None else None
+
+        title_regex = conditions.get("title_regex")
+        pattern = None
+        if title_regex is not None:
+            try:
+                pattern = re.compile(title_regex, re.IGNORECASE)
+            except (re.error, TypeError) as e:
+                raise ValidationError(f"filter.title_regex is invalid: {e}")
+
+        chat_ids = conditions.get("chat_ids")
+        if chat_ids is not None:
+            if not isinstance(chat_ids, list):
+                raise ValidationError("filter.chat_ids must be a list of strings")
+            chat_ids = {ToolInputValidator.validate_id(chat_id, "chat_ids") for chat_id in chat_ids}
+
+        tag = conditions.get("tag")
+        folder_id = conditions.get("folder_id")
+        if folder_id is not None:
+            folder_id = ToolInputValidator.validate_id(folder_id, "folder_id")
+
+        folder_chats: list[dict[str, Any]] | None = None
+        if folder_id is not None:
+            response = await self.client.get(f"/api/v1/chats/folder/{folder_id}")
+            folder_chats = [c for c in response or [] if isinstance(c, dict)]
+
+        if tag:
+            candidates = self._paginate(TAG_LIST_SPEC, params={"name": tag})
+        elif folder_chats is not None:
+            candidates = _aiter(folder_chats)
+        elif chat_ids is not None and cutoff is None and pattern is None:
+            candidates = _aiter([{"id": chat_id} for chat_id in sorted(chat_ids)])
+        else:
+            candidates = self._paginate(CHAT_LIST_SPEC, params=CHAT_LIST_ALL_PARAMS)
+        folder_ids = {c.get("id") for c in folder_chats} if folder_chats is not None else None
+
+        pinned_ids: set[str] | None = None
+        if action in ("pin", "unpin"):
+            pinned = await self.client.get("/api/v1/chats/pinned")
+            pinned_ids = {c.get("id") for c in pinned or [] if isinstance(c, dict)}
+
+        matched: list[dict[str, Any]] = []
+        seen: set[str] = set()
+        async for chat in candidates:
+            chat_id = chat.get("id") if isinstance(chat, dict) else None
+            if not chat_id or chat_id in seen:
+                continue
+            seen.add(chat_id)
+            if chat_ids is not None and chat_id not in chat_ids:
+                continue
+            if folder_ids is not None and chat_id not in folder_ids:
+                continue
+            if cutoff is not None and not (chat.get("updated_at") or 0) < cutoff:
+                continue
+            if pattern is not None and not pattern.search(chat.get("title") or ""):
+                continue
+            if action == "archive" and chat.get("archived"):
+                continue
+            if pinned_ids is not None and (chat_id in pinned_ids) == (action == "pin"):
+                continue
+            matched.append({
+                "id": chat_id,
+                "title": chat.get("title"),
+                "updated_at": chat.get("updated_at"),
+            })
+        return matched
+
+
+async def _aiter(items: list[Any]) -> Any:
+    """Iterate a list asynchronously.
+
+    Args:
+        items: Items
+
+    Yields:
+        Each item
+    """
+    for item in items:
+        yield item
@@ -0,0 +1,201 @@
+"""Chat export tool - Stream every chat to a JSONL archive."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import AuthError, HTTPError, ValidationError
+from src.utils.jsonl_archive import (
+    COMPRESSIONS,
+    ArchiveWriter,
+    compression_for_path,
+    encode_block,
+    iter_jsonl,
+)
+from src.utils.pagination import CHAT_LIST_ALL_PARAMS, PAGINATED_TOOLS
+from src.utils.validation import ToolInputValidator
+
+# Chat list endpoints walked by the export
+CHAT_LIST_SPEC = PAGINATED_TOOLS["get_session_user_chat_list_chats_list"]
+ARCHIVED_LIST_SPEC = PAGINATED_TOOLS["get_archived_session_user_chat_list_chats_archived"]
+
+# Failed chat ids returned in the result
+MAX_REPORTED_FAILURES = 100
+
+
+class ChatExportTool(BaseTool):
+    """Export all chats to a JSONL archive without holding them in memory.
+
+    Pages through the chat list, fetches full chats concurrently and appends
+    them to the archive in checkpointed blocks. An interrupted export resumes
+    from the last block, skipping chats already written.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "chat_export",
+            "description": (
+                "Export all chats with full message history to a JSONL file "
+                "(optionally gzip or zstd compressed), resumable after interruption"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "output_path": {
+                        "type": "string",
+                        "description": "Archive path (.jsonl, .jsonl.gz or .jsonl.zst)"
+                    },
+                    "compression": {
+                        "type": ["string", "null"],
+                        "enum": [*COMPRESSIONS, None],
+                        "description": "Compression (default: inferred from the file suffix)"
+                    },
+                    "include_archived": {
+                        "type": "boolean",
+                        "description": "Also export archived chats",
+                        "default": False
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent chat fetches (1-32)",
+                        "default": 8,
+                        "minimum": 1,
+                        "maximum": 32
+                    },
+                    "batch_size": {
+                        "type": "integer",
+                        "description": "Chats per checkpointed block (1-500)",
+                        "default": 50,
+                        "minimum": 1,
+                        "maximum": 500
+                    },
+                    "resume": {
+                        "type": "boolean",
+                        "description": "Continue an interrupted export of the same file",
+                        "default": True
+                    }
+                },
+                "required": ["output_path"]
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute chat export.
+
+        Args:
+            arguments: Tool arguments with output_path, compression and limits
+
+        Returns:
+            Dict with exported, skipped and failed counts and the archive path
+
+        Raises:
+            ValidationError: If arguments invalid or the checkpoint does not match
+        """
+        self._log_execution_start(arguments)
+
+        output_path = arguments.get("output_path")
+        if not isinstance(output_path, str) or not output_path:
+            raise ValidationError("output_path must be a non-empty string")
+        path = Path(output_path).expanduser()
+        compression = arguments.get("compression") or compression_for_path(path)
+        if compression not in COMPRESSIONS:
+            raise ValidationError(f"compression must be one of: {', '.join(COMPRESSIONS)}")
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 8), "concurrency", 1, 32
+        )
+        batch_size = ToolInputValidator.validate_int_range(
+            arguments.get("batch_size", 50), "batch_size", 1, 500
+        )
+        resume = bool(arguments.get("resume", True))
+        specs = [(CHAT_LIST_SPEC, CHAT_LIST_ALL_PARAMS)]
+        if arguments.get("include_archived", False):
+            specs.append((ARCHIVED_LIST_SPEC, None))
+
+        writer = ArchiveWriter(path, compression)
+        try:
+            # Fail before touching the archive if the codec is unavailable
+            encode_block([], compression)
+            resumed = await asyncio.to_thread(writer.open, resume)
+            exported_ids = (
+                await asyncio.to_thread(
+                    lambda: {r.get("id") for r in iter_jsonl(path, compression) if isinstance(r, dict)}
+                )
+                if resumed
+                else set()
+            )
+        except ValueError as e:
+            writer.close(complete=False)
+            raise ValidationError(str(e))
+
+        start = time.monotonic()
+        semaphore = asyncio.Semaphore(concurrency)
+        skipped = len(exported_ids)
+        failed: list[dict[str, Any]] = []
+        failed_count = 0
+        exported = 0
+
+        async def fetch_chat(chat_id: str) -> dict[str, Any] | None:
+            nonlocal failed_count
+            async with semaphore:
+                try:
+                    return await self.client.get(f"/api/v1/chats/{chat_id}")
+                except AuthError:
+                    raise
+                except HTTPError as e:
+                    failed_count += 1
+                    if len(failed) < MAX_REPORTED_FAILURES:
+                        failed.append({"id": chat_id, "error": str(e)})
+                    return None
+
+        async def flush(batch: list[str]) -> None:
+            nonlocal exported
+            chats = await asyncio.gather(*(fetch_chat(chat_id) for chat_id in batch))
+            records = [chat for chat in chats if chat]
+            await asyncio.to_thread(writer.write_block, records)
+            exported += len(records)
+            await self._report_progress(
+                exported + skipped, None, f"{exported} exported, {skipped} already in archive"
+            )
+
+        complete = False
+        try:
+            batch: list[str] = []
+            for spec, params in specs:
+                async for item in self._paginate(spec, params=params, lookahead=2):
+                    chat_id = item.get("id") if isinstance(item, dict) else None
+                    if not chat_id or chat_id in exported_ids:
+                        continue
+                    # Listing pages can shift while exporting; never write a chat twice
+                    exported_ids.add(chat_id)
+                    batch.append(chat_id)
+                    if len(batch) >= batch_size:
+                        await flush(batch)
+                        batch = []
+            await flush(batch)
+            # Keep the checkpoint so a resumed run retries the failed chats
+            complete = failed_count == 0
+        finally:
+            await asyncio.to_thread(writer.close, complete)
+
+        result = {
+            "output_path": str(path),
+            "compression": compression,
+            "resumed": resumed,
+            "complete": complete,
+            "exported": exported,
+            "skipped": skipped,
+            "failed": failed_count,
+            "failures": failed,
+            "records": writer.records,
+            "bytes": writer.offset,
+            "duration_ms": round((time.monotonic() - start) * 1000, 1),
+        }
+
+        self._log_execution_end(result)
+        return result
@@ -57,7 +57,9 @@ class ChatGetTool(BaseTool):
         chat_id = ToolInputValidator.validate_id(chat_id, "chat_id")
 
         # Call API
-        response_data = await self.client.get(f"/api/v1/chats/{chat_id}")
+        response_data = await self._mirror_read(
+            "chats", chat_id, lambda: self.client.get(f"/api/v1/chats/{chat_id}")
+        )
 
         # Return response (API response is already in correct format)
         result = response_data
@@ -0,0 +1,395 @@
+"""Chat import tool - Bulk import chats from a JSONL archive."""
+
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator
+import httpx
+from src.tools.base import BaseTool
+from src.exceptions import HTTPError, RateLimitError, ValidationError
+from src.utils.chat_import_ledger import ChatImportLedger
+from src.utils.jsonl_archive import COMPRESSIONS, aiter_jsonl, compression_for_path
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.tracing import note_retry
+from src.utils.validation import ToolInputValidator
+
+# Ledger files live in the cache directory; ledger_path may not escape it
+LEDGER_DIR = "~/.cache/openwebui-mcp"
+
+# Failures returned in the result
+MAX_REPORTED_FAILURES = 100
+
+# Base delay in seconds between import request retries (doubles each attempt)
+IMPORT_RETRY_DELAY = 0.5
+
+
+def source_id_of(record: Any) -> str:
+    """Identify a source chat record.
+
+    Uses the exported chat id and falls back to a hash of the chat content
+    for records without one.
+
+    Args:
+        record: Archive record
+
+    Returns:
+        Stable source id
+    """
+    if isinstance(record, dict) and isinstance(record.get("id"), str) and record["id"]:
+        return record["id"]
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return "sha256:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _validate_mapping(value: Any, field_name: str) -> dict[str, str | None]:
+    """Validate a source → target id mapping.
+
+    Args:
+        value: Mapping argument
+        field_name: Field name for errors
+
+    Returns:
+        Validated mapping
+
+    Raises:
+        ValidationError: If the mapping is not an object of strings
+    """
+    if value is None:
+        return {}
+    if not isinstance(value, dict) or not all(
+        isinstance(k, str) and (v is None or isinstance(v, str)) for k, v in value.items()
+    ):
+        raise ValidationError(f"{field_name} must be an object mapping strings to strings or null")
+    return value
+
+
+def _sent_before_commit(error: Exception) -> bool:
+    """Whether a failed import request certainly created no chats.
+
+    The import endpoint is not idempotent, so only errors raised before the
+    server could commit (rate limiting, failing to connect) may be retried.
+
+    Args:
+        error: Error raised by the import request
+
+    Returns:
+        True if the request can be retried safely
+    """
+    if isinstance(error, RateLimitError):
+        return True
+    return isinstance(error.__context__, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+class ChatImportTool(BaseTool):
+    """Import many chats from a JSONL archive (as written by chat_export).
+
+    Streams the archive, imports chats in batched requests with bounded
+    concurrency, then applies folder and tag mappings to each new chat.
+    A ledger of imported chats makes reruns skip work already done. Import
+    requests are only retried when they failed before reaching the server,
+    so a retry never creates a batch twice.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "chat_import",
+            "description": (
+                "Bulk import chats from a JSONL file (optionally gzip or zstd compressed) "
+                "with concurrency, folder/tag mapping and a ledger so reruns skip imported chats"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "input_path": {
+                        "type": "string",
+                        "description": "Archive path (.jsonl, .jsonl.gz or .jsonl.zst)"
+                    },
+                    "compression": {
+                        "type": ["string", "null"],
+                        "enum": [*COMPRESSIONS, None],
+                        "description": "Compression (default: inferred from the file suffix)"
+                    },
+                    "folder_map": {
+                        "type": ["object", "null"],
+                        "additionalProperties": {"type": ["string", "null"]},
+                        "description": "Source folder id → target folder id; unmapped chats get no folder"
+                    },
+                    "tag_map": {
+                        "type": ["object", "null"],
+                        "additionalProperties": {"type": ["string", "null"]},
+                        "description": "Source tag → target tag (null drops the tag); unmapped tags are kept"
+                    },
+                    "apply_tags": {
+                        "type": "boolean",
+                        "description": "Re-create the chats' tags on the target",
+                        "default": True
+                    },
+                    "chats_per_request": {
+                        "type": "integer",
+                        "description": "Chats sent per import request (1-100)",
+                        "default": 20,
+                        "minimum": 1,
+                        "maximum": 100
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent requests per stage (1-16)",
+                        "default": 4,
+                        "minimum": 1,
+                        "maximum": 16
+                    },
+                    "max_retries": {
+                        "type": "integer",
+                        "description": (
+                            "Retry attempts per failed request (0-5); import requests are only "
+                            "retried when rate limited or unable to connect"
+                        ),
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 5
+                    },
+                    "ledger_path": {
+                        "type": ["string", "null"],
+                        "description": (
+                            f"Import ledger file inside {LEDGER_DIR} "
+                            "(default: one per target instance)"
+                        )
+                    }
+                },
+                "required": ["input_path"]
+            }
+        }
+
+    def _ledger_path(self, ledger_path: Any) -> Path:
+        """Resolve the ledger file, confined to the cache directory.
+
+        Args:
+            ledger_path: Caller-supplied path, relative to the cache directory
+                or absolute; None for one ledger per target instance
+
+        Returns:
+            Resolved ledger path
+
+        Raises:
+            ValidationError: If the path is not a string or escapes the cache directory
+        """
+        if ledger_path is not None and not isinstance(ledger_path, str):
+            raise ValidationError("ledger_path must be a string")
+        base = Path(LEDGER_DIR).expanduser().resolve()
+        if not ledger_path:
+            target = str(getattr(self.config, "base_url", ""))
+            digest = hashlib.sha256(target.encode("utf-8")).hexdigest()[:12]
+            return base / f"chat-import-{digest}.jsonl"
+        path = (base / Path(ledger_path).expanduser()).resolve()
+        if path == base or not path.is_relative_to(base):
+            raise ValidationError(f"ledger_path must be a file inside {LEDGER_DIR}")
+        return path
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute bulk chat import.
+
+        Args:
+            arguments: Tool arguments with input_path, mappings and limits
+
+        Returns:
+            Dict with imported, organized, skipped and failed counts
+
+        Raises:
+            ValidationError: If arguments invalid, the archive or ledger is unreadable
+                or the ledger path is outside the cache directory
+        """
+        self._log_execution_start(arguments)
+
+        input_path = arguments.get("input_path")
+        if not isinstance(input_path, str) or not input_path:
+            raise ValidationError("input_path must be a non-empty string")
+        path = Path(input_path).expanduser()
+        if not path.is_file():
+            raise ValidationError(f"Archive not found: {input_path}")
+        compression = arguments.get("compression") or compression_for_path(path)
+        if compression not in COMPRESSIONS:
+            raise ValidationError(f"compression must be one of: {', '.join(COMPRESSIONS)}")
+        folder_map = _validate_mapping(arguments.get("folder_map"), "folder_map")
+        tag_map = _validate_mapping(arguments.get("tag_map"), "tag_map")
+        apply_tags = bool(arguments.get("apply_tags", True))
+        chats_per_request = ToolInputValidator.validate_int_range(
+            arguments.get("chats_per_request", 20), "chats_per_request", 1, 100
+        )
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 4), "concurrency", 1, 16
+        )
+        max_retries = ToolInputValidator.validate_int_range(
+            arguments.get("max_retries", 2), "max_retries", 0, 5
+        )
+
+        ledger = ChatImportLedger(self._ledger_path(arguments.get("ledger_path")))
+        try:
+            await asyncio.to_thread(ledger.load)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        ledger_lock = asyncio.Lock()
+        counts = {"read": 0, "skipped": 0, "imported": 0, "organized": 0}
+        # Chats the server returned that could not be matched to records or
+        # recorded in the ledger; a rerun imports their records again
+        unrecorded_chat_ids: list[str] = []
+
+        async def record_entries(entries: list[dict[str, Any]]) -> None:
+            async with ledger_lock:
+                await asyncio.to_thread(ledger.append, entries)
+
+        def plan(record: dict[str, Any]) -> tuple[str | None, list[str]]:
+            folder_id = folder_map.get(record.get("folder_id")) if record.get("folder_id") else None
+            tags: list[str] = []
+            if apply_tags:
+                for tag in (record.get("meta") or {}).get("tags") or []:
+                    target = tag_map.get(tag, tag)
+                    if target and target not in tags:
+                        tags.append(target)
+            return folder_id, tags
+
+        async def records() -> AsyncIterator[dict[str, Any]]:
+            async for record in aiter_jsonl(path, compression):
+                if not isinstance(record, dict):
+                    continue
+                counts["read"] += 1
+                entry = ledger.get(source_id_of(record))
+                if entry is not None and entry.get("organized"):
+                    counts["skipped"] += 1
+                    continue
+                yield record
+
+        async def import_chats(batch: list[dict[str, Any]]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            jobs: list[dict[str, Any]] = []
+            new: list[tuple[dict[str, Any], str]] = []
+            for record in batch:
+                source_id = source_id_of(record)
+                entry = ledger.get(source_id)
+                folder_id, tags = plan(record)
+                if entry is not None:
+                    # Imported by an earlier run whose folder/tag step did not finish
+                    jobs.append({"source_id": source_id, "chat_id": entry["chat_id"],
+                                 "folder_id": folder_id, "tags": tags})
+                else:
+                    new.append((record, source_id))
+
+            if new:
+                forms = []
+                for record, _ in new:
+                    chat = record.get("chat") if isinstance(record.get("chat"), dict) else record
+                    meta = {k: v for k, v in (record.get("meta") or {}).items() if k != "tags"}
+                    forms.append({
+                        "chat": chat,
+                        "meta": meta,
+                        "pinned": bool(record.get("pinned", False)),
+                        "folder_id": None,
+                        "created_at": record.get("created_at"),
+                        "updated_at": record.get("updated_at"),
+                    })
+                for attempt in range(max_retries + 1):
+                    try:
+                        response = await self.client.post("/api/v1/chats/import", json_data={"chats": forms})
+                        break
+                    except HTTPError as e:
+                        if attempt == max_retries or not _sent_before_commit(e):
+                            raise
+                        note_retry()
+                        await asyncio.sleep(IMPORT_RETRY_DELAY * (2 ** attempt))
+
+                created = [response] if isinstance(response, dict) else response
+                if not isinstance(created, list) or len(created) != len(new):
+                    chat_ids = [
+                        chat["id"] for chat in (created if isinstance(created, list) else [])
+                        if isinstance(chat, dict) and chat.get("id")
+                    ]
+                    unrecorded_chat_ids.extend(chat_ids)
+                    error = (
+                        f"Unexpected import response: {len(chat_ids)} chats for {len(new)} records "
+                        f"(created: {', '.join(chat_ids) or 'none'})"
+                    )
+                    return jobs, [(record, error) for record, _ in new]
+
+                entries = []
+                for (record, source_id), chat in zip(new, created):
+                    folder_id, tags = plan(record)
+                    entries.append({"source_id": source_id, "chat_id": chat.get("id"),
+                                    "organized": not folder_id and not tags})
+                    jobs.append({"source_id": source_id, "chat_id": chat.get("id"),
+                                 "folder_id": folder_id, "tags": tags})
+                try:
+                    await record_entries(entries)
+                except OSError as e:
+                    chat_ids = [entry["chat_id"] for entry in entries if entry["chat_id"]]
+                    unrecorded_chat_ids.extend(chat_ids)
+                    error = f"Imported as {', '.join(chat_ids)} but the ledger write failed: {e}"
+                    return jobs[:len(jobs) - len(new)], [(record, error) for record, _ in new]
+                counts["imported"] += len(new)
+            return jobs, []
+
+        async def organize(batch: list[dict[str, Any]]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            job = batch[0]
+            if not job["folder_id"] and not job["tags"]:
+                return [job["source_id"]], []
+            chat_id = job["chat_id"]
+            if job["folder_id"]:
+                await self.client.post(
+                    f"/api/v1/chats/{chat_id}/folder", json_data={"folder_id": job["folder_id"]}
+                )
+            for tag in job["tags"]:
+                await self.client.post(f"/api/v1/chats/{chat_id}/tags", json_data={"name": tag})
+            await record_entries([{"source_id": job["source_id"], "chat_id": chat_id, "organized": True}])
+            counts["organized"] += 1
+            return [job["source_id"]], []
+
+        async def on_progress(completed: int, failed: int) -> None:
+            await self._report_progress(
+                completed + failed + counts["skipped"], None,
+                f"{completed} imported, {counts['skipped']} skipped, {failed} failed"
+            )
+
+        pipeline = Pipeline(
+            [
+                # Not idempotent: import_chats retries only requests that never reached the server
+                PipelineStage("import", import_chats, batch_size=chats_per_request,
+                              concurrency=concurrency),
+                PipelineStage("organize", organize, concurrency=concurrency, max_retries=max_retries),
+            ],
+            queue_size=chats_per_request * 2,
+        )
+        try:
+            outcome = await pipeline.run(records(), on_progress=on_progress)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        duration = outcome.duration_seconds
+        failures = [
+            {
+                "source_id": f["item"]["source_id"] if f["stage"] == "organize" else source_id_of(f["item"]),
+                "stage": f["stage"],
+                "error": f["error"],
+            }
+            for f in outcome.failures[:MAX_REPORTED_FAILURES]
+        ]
+        result = {
+            "input_path": str(path),
+            "ledger_path": str(ledger.path),
+            "read": counts["read"],
+            "imported": counts["imported"],
+            "organized": counts["organized"],
+            "skipped": counts["skipped"],
+            "failed": len(outcome.failures),
+            "failures": failures,
+            "unrecorded_chat_ids": unrecorded_chat_ids,
+            "stages": [s.to_dict() for s in outcome.stats],
+            "duration_ms": round(duration * 1000, 1),
+            "chats_per_second": round(len(outcome.outputs) / duration, 2) if duration > 0 else None,
+        }
+
+        self._log_execution_end(result)
+        return result
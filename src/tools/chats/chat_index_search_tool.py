@@ -0,0 +1,152 @@
+"""Chat index search tool - Search chat history offline."""
+
+from datetime import datetime, timezone
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.utils.validation import ToolInputValidator
+
+
+def _parse_time(value: Any, field_name: str) -> int | None:
+    """Parse a date filter.
+
+    Args:
+        value: Unix time in seconds or an ISO 8601 date/time (UTC if no offset)
+        field_name: Field name for errors
+
+    Returns:
+        Unix time in seconds, or None
+
+    Raises:
+        ValidationError: If the value is not a time
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.strip())
+        except ValueError:
+            pass
+        else:
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return int(parsed.timestamp())
+    raise ValidationError(f"{field_name} must be a Unix timestamp or an ISO 8601 date")
+
+
+class ChatIndexSearchTool(BaseTool):
+    """Search chat history in the local full-text index.
+
+    Ranks chats by their best-matching message (BM25) and returns
+    message-level snippets, without calling Open WebUI. Run
+    chat_index_sync first to build the index.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "chat_index_search",
+            "description": (
+                "Search all chat messages offline in the local index (BM25 ranking) with "
+                "phrase, tag and date filters; returns chat ids with message snippets"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": 'Search terms; "quoted text" matches a phrase, term* a prefix'
+                    },
+                    "match": {
+                        "type": "string",
+                        "enum": ["all", "any"],
+                        "description": "Require all terms or any term",
+                        "default": "all"
+                    },
+                    "tags": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only chats with all of these tags"
+                    },
+                    "after": {
+                        "type": ["string", "number", "null"],
+                        "description": "Only messages at or after this time (ISO 8601 or Unix seconds)"
+                    },
+                    "before": {
+                        "type": ["string", "number", "null"],
+                        "description": "Only messages before this time (ISO 8601 or Unix seconds)"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum chats to return (1-100)",
+                        "default": 20,
+                        "minimum": 1,
+                        "maximum": 100
+                    },
+                    "snippets_per_chat": {
+                        "type": "integer",
+                        "description": "Maximum message snippets per chat (1-10)",
+                        "default": 3,
+                        "minimum": 1,
+                        "maximum": 10
+                    }
+                },
+                "required": ["query"]
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute offline chat search.
+
+        Args:
+            arguments: Tool arguments with query, filters and limits
+
+        Returns:
+            Dict with ranked chats, snippets and search time
+
+        Raises:
+            ValidationError: If the index is disabled or arguments invalid
+        """
+        self._log_execution_start(arguments)
+
+        index = self.get_service("chat_index")
+        if index is None:
+            raise ValidationError("Chat index is disabled; set CHAT_INDEX_PATH to enable it")
+
+        query = arguments.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise ValidationError("query must be a non-empty string")
+        match = arguments.get("match", "all")
+        if match not in ("all", "any"):
+            raise ValidationError("match must be 'all' or 'any'")
+        tags = arguments.get("tags") or []
+        if not isinstance(tags, list) or not all(isinstance(t, str) and t.strip() for t in tags):
+            raise ValidationError("tags must be a list of non-empty strings")
+        after = _parse_time(arguments.get("after"), "after")
+        before = _parse_time(arguments.get("before"), "before")
+        limit = ToolInputValidator.validate_int_range(arguments.get("limit", 20), "limit", 1, 100)
+        snippets_per_chat = ToolInputValidator.validate_int_range(
+            arguments.get("snippets_per_chat", 3), "snippets_per_chat", 1, 10
+        )
+
+        try:
+            result = await index.search(
+                query,
+                tags=tags,
+                after=after,
+                before=before,
+                match_all=match == "all",
+                limit=limit,
+                snippets_per_chat=snippets_per_chat,
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        self._log_execution_end(result)
+        return result
@@ -0,0 +1,109 @@
+"""Chat index sync tool - Build or update the offline chat search index."""
+
+from pathlib import Path
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.utils.jsonl_archive import COMPRESSIONS, compression_for_path
+from src.utils.validation import ToolInputValidator
+
+
+class ChatIndexSyncTool(BaseTool):
+    """Build or update the local full-text chat index.
+
+    With archive_path, indexes a chat_export archive (the fast way to build
+    the index for a large history). Otherwise syncs with Open WebUI,
+    re-fetching only chats changed since the last sync.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "chat_index_sync",
+            "description": (
+                "Build or update the offline chat search index, from a chat_export archive "
+                "or incrementally from Open WebUI"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "archive_path": {
+                        "type": ["string", "null"],
+                        "description": "Index this chat_export archive instead of syncing with Open WebUI"
+                    },
+                    "compression": {
+                        "type": ["string", "null"],
+                        "enum": [*COMPRESSIONS, None],
+                        "description": "Archive compression (default: inferred from the file suffix)"
+                    },
+                    "full": {
+                        "type": "boolean",
+                        "description": "Walk the whole chat list and drop chats deleted upstream",
+                        "default": False
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent chat fetches (1-32)",
+                        "default": 8,
+                        "minimum": 1,
+                        "maximum": 32
+                    }
+                },
+                "required": []
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute chat index sync.
+
+        Args:
+            arguments: Tool arguments with optional archive_path, full and concurrency
+
+        Returns:
+            Dict with the sync summary and index stats
+
+        Raises:
+            ValidationError: If the index is disabled or arguments invalid
+            HTTPError: If listing chats fails
+        """
+        self._log_execution_start(arguments)
+
+        index = self.get_service("chat_index")
+        if index is None:
+            raise ValidationError("Chat index is disabled; set CHAT_INDEX_PATH to enable it")
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 8), "concurrency", 1, 32
+        )
+
+        archive_path = arguments.get("archive_path")
+        if archive_path:
+            path = Path(archive_path).expanduser()
+            if not path.is_file():
+                raise ValidationError(f"Archive not found: {archive_path}")
+            compression = arguments.get("compression") or compression_for_path(path)
+            if compression not in COMPRESSIONS:
+                raise ValidationError(f"compression must be one of: {', '.join(COMPRESSIONS)}")
+
+            async def on_ingest(read: int, indexed: int) -> None:
+                await self._report_progress(read, None, f"{indexed} of {read} chats indexed")
+
+            try:
+                summary = await index.ingest_archive(path, compression, on_progress=on_ingest)
+            except ValueError as e:
+                raise ValidationError(str(e))
+        else:
+            async def on_sync(done: int, total: int) -> None:
+                await self._report_progress(done, total, f"{done} of {total} changed chats indexed")
+
+            summary = await index.sync(
+                full=bool(arguments.get("full", False)), concurrency=concurrency, on_progress=on_sync
+            )
+
+        result = {"sync": summary, "index": index.get_stats()}
+
+        self._log_execution_end(result)
+        return result
@@ -16,6 +16,25 @@ class EmbeddingsEmbeddingsTool(BaseTool):
             "inputSchema": {
                 "type": "object",
                 "properties": {
+                    "model": {
+                        "type": "string",
+                        "description": "Name of the model to use for embeddings"
+                    },
+                    "input": {
+                        "oneOf": [
+                            {"type": "array", "items": {"type": "string"}},
+                            {"type": "string"}
+                        ],
+                        "description": "Text(s) to embed - can be a string or array of strings"
+                    },
+                    "encoding_format": {
+                        "type": ["string", "null"],
+                        "description": "Vector encoding format (float or base64)"
+                    },
+                    "dimensions": {
+                        "type": ["integer", "null"],
+                        "description": "Number of output dimensions, if supported by the model"
+                    }
                 },
                 "required": []
             }
@@ -25,12 +44,86 @@ class EmbeddingsEmbeddingsTool(BaseTool):
         """Execute embeddings_embeddings operation."""
         self._log_execution_start(arguments)
 
-
-
         # Build request
         json_data = {}
+        for key in ("model", "input", "encoding_format", "dimensions"):
+            if arguments.get(key) is not None:
+                json_data[key] = arguments[key]
 
-        response = await self.client.post("/api/embeddings", json_data=json_data)
+        model = json_data.get("model")
+        cache = self.get_service("embedding_cache")
+        cacheable = (
+            cache is not None
+            and model
+            and isinstance(json_data.get("input"), (str, list))
+            and json_data.get("encoding_format", "float") == "float"
+        )
+        if cacheable:
+            # Only embed texts missing from the persistent cache; dimensions change vectors
+            texts = json_data["input"] if isinstance(json_data["input"], list) else [json_data["input"]]
+            vectors = await cache.get_or_compute(
+                "/api/embeddings",
+                model,
+                texts,
+                lambda missing: self._embed_texts(json_data, missing),
+                options={"dimensions": json_data.get("dimensions")}
+            )
+            response = self._list_response(model, vectors)
+        elif (
+            self.get_service("embedding_batcher") is not None
+            and model
+            and isinstance(json_data.get("input"), str)
+        ):
+            vectors = await self._embed_texts(json_data, [json_data["input"]])
+            response = self._list_response(model, vectors)
+        else:
+            response = await self.client.post("/api/embeddings", json_data=json_data)
 
         self._log_execution_end(response)
-        return response
\ No newline at end of file
+        return response
+
+    async def _embed_texts(self, json_data: dict[str, Any], texts: list[str]) -> list[list[float]]:
+        """Embed texts upstream, coalescing single texts through the batcher.
+
+        Args:
+            json_data: Request body (model and options)
+            texts: Texts to embed
+
+        Returns:
+            Vectors in the order of texts
+        """
+        batcher = self.get_service("embedding_batcher")
+        if batcher is not None and len(texts) == 1:
+            # Single text: share one batched upstream request with concurrent callers
+            vector = await batcher.embed(
+                "/api/embeddings",
+                json_data["model"],
+                texts[0],
+                style="openai",
+                extra={k: v for k, v in json_data.items() if k not in ("model", "input")}
+            )
+            return [vector]
+
+        response = await self.client.post("/api/embeddings", json_data={**json_data, "input": texts})
+        data = sorted(response.get("data") or [], key=lambda item: item.get("index", 0))
+        return [item["embedding"] for item in data]
+
+    @staticmethod
+    def _list_response(model: str, vectors: list[list[float]]) -> dict[str, Any]:
+        """Build an OpenAI-shaped embeddings response.
+
+        Args:
+            model: Model name
+            vectors: Vectors in input order
+
+        Returns:
+            Embeddings list response
+        """
+        return {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "embedding": vector, "index": index}
+                for index, vector in enumerate(vectors)
+            ],
+            "model": model
+        }
@@ -5,11 +5,22 @@ Manages tool instantiation, caching, and dependency injection for all MCP tools.
 
 import logging
 import importlib
+import inspect
 import pkgutil
+import tempfile
 from typing import Any
 from pathlib import Path
 from src.config import Config
+from src.services.chat_index import ChatIndex
 from src.services.client import OpenWebUIClient
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.embedding_cache import EmbeddingCache
+from src.services.folder_tree_cache import FolderTreeCache
+from src.services.loop_monitor import LoopMonitor
+from src.services.mirror import EntityMirror
+from src.services.profiler import MemoryTracker, SamplingProfiler
+from src.services.query_cache import QueryCache
+from src.services.slow_log import SlowCallLog
 from src.utils.rate_limiter import RateLimiter
 from src.tools.base import MCPTool
 
@@ -111,11 +122,120 @@ class ToolFactory:
                 self._services[name] = RateLimiter(
                     rate=self.config.OPENWEBUI_RATE_LIMIT
                 )
+            elif name == 'embedding_batcher':
+                self._services[name] = EmbeddingBatcher(
+                    client=self.client,
+                    window_ms=getattr(self.config, 'EMBEDDING_BATCH_WINDOW_MS', 5),
+                    max_batch_size=getattr(self.config, 'EMBEDDING_BATCH_MAX_SIZE', 64)
+                )
+            elif name == 'embedding_cache':
+                # Opt-in: stays None unless a cache directory is configured
+                cache_dir = getattr(self.config, 'EMBEDDING_CACHE_DIR', None)
+                cache = None
+                if isinstance(cache_dir, str) and cache_dir:
+                    cache = EmbeddingCache(
+                        directory=Path(cache_dir).expanduser(),
+                        max_bytes=getattr(self.config, 'EMBEDDING_CACHE_MAX_MB', 512) * 1024 * 1024
+                    )
+                    self.client.add_mutation_listener(cache.on_mutation)
+                self._services[name] = cache
+            elif name == 'query_cache':
+                ttl = getattr(self.config, 'QUERY_CACHE_TTL_SECONDS', 60)
+                cache = None
+                if ttl > 0:
+                    cache = QueryCache(
+                        ttl_seconds=ttl,
+                        max_entries=getattr(self.config, 'QUERY_CACHE_MAX_ENTRIES', 1024)
+                    )
+                    self.client.add_mutation_listener(cache.on_mutation)
+                self._services[name] = cache
+            elif name == 'folder_tree_cache':
+                ttl = getattr(self.config, 'FOLDER_TREE_CACHE_TTL_SECONDS', 60)
+                cache = None
+                if ttl > 0:
+                    cache = FolderTreeCache(ttl_seconds=ttl)
+                    self.client.add_mutation_listener(cache.on_mutation)
+                self._services[name] = cache
+            elif name == 'mirror':
+                # Opt-in: stays None unless a database path is configured
+                db_path = getattr(self.config, 'MIRROR_DB_PATH', None)
+                mirror = None
+                if isinstance(db_path, str) and db_path:
+                    mirror = EntityMirror(
+                        client=self.client,
+                        path=Path(db_path).expanduser(),
+                        kinds=self.config.mirror_kinds,
+                        refresh_seconds=getattr(self.config, 'MIRROR_REFRESH_SECONDS', 60),
+                        max_staleness=getattr(self.config, 'MIRROR_MAX_STALENESS_SECONDS', 120),
+                        tool_staleness=self.config.mirror_tool_staleness
+                    )
+                    self.client.add_mutation_listener(mirror.on_mutation)
+                self._services[name] = mirror
+            elif name == 'chat_index':
+                # Opt-in: stays None unless a database path is configured
+                index_path = getattr(self.config, 'CHAT_INDEX_PATH', None)
+                index = None
+                if isinstance(index_path, str) and index_path:
+                    index = ChatIndex(
+                        client=self.client,
+                        path=Path(index_path).expanduser(),
+                        refresh_seconds=getattr(self.config, 'CHAT_INDEX_REFRESH_SECONDS', 300)
+                    )
+                    self.client.add_mutation_listener(index.on_mutation)
+                self._services[name] = index
+            elif name == 'slow_log':
+                threshold = getattr(self.config, 'SLOW_CALL_THRESHOLD_MS', 2000)
+                thresholds = self.config.slow_call_thresholds
+                log_path = getattr(self.config, 'SLOW_CALL_LOG_PATH', None)
+                slow_log = None
+                if threshold > 0 or thresholds:
+                    slow_log = SlowCallLog(
+                        threshold_ms=threshold,
+                        thresholds=thresholds,
+                        capacity=getattr(self.config, 'SLOW_CALL_BUFFER_SIZE', 200),
+                        path=Path(log_path).expanduser() if isinstance(log_path, str) and log_path else None
+                    )
+                self._services[name] = slow_log
+            elif name == 'loop_monitor':
+                interval_ms = getattr(self.config, 'LOOP_MONITOR_INTERVAL_MS', 250)
+                self._services[name] = LoopMonitor(
+                    interval=interval_ms / 1000,
+                    threshold=getattr(self.config, 'LOOP_BLOCK_THRESHOLD_MS', 200) / 1000
+                ) if interval_ms > 0 else None
+            elif name in ('profiler', 'memory_tracker'):
+                # Opt-in: profiling exposes code paths and writes files
+                service = None
+                if getattr(self.config, 'PROFILING_ENABLED', False) is True:
+                    if name == 'profiler':
+                        profile_dir = getattr(self.config, 'PROFILE_DIR', None)
+                        service = SamplingProfiler(
+                            Path(profile_dir).expanduser() if isinstance(profile_dir, str) and profile_dir
+                            else Path(tempfile.gettempdir()) / 'openwebui-mcp-profiles'
+                        )
+                    else:
+                        service = MemoryTracker()
+                self._services[name] = service
             else:
                 raise ValueError(f"Unknown service: {name}")
 
         return self._services[name]
 
+    def active_services(self) -> dict[str, Any]:
+        """List services created so far, skipping disabled ones.
+
+        Returns:
+            Service instances by name
+        """
+        return {name: service for name, service in self._services.items() if service is not None}
+
+    def get_pool_stats(self) -> dict[str, int] | None:
+        """Export HTTP connection pool usage without creating the client.
+
+        Returns:
+            Pool stats, or None before the client has sent a request
+        """
+        return self._client.get_pool_stats() if self._client is not None else None
+
     def create_tool(self, name: str) -> MCPTool:
         """Create or retrieve cached tool instance.
 
@@ -148,7 +268,8 @@ class ToolFactory:
         # Instantiate with dependencies
         tool_instance = tool_class(
             client=self.client,
-            config=self.config
+            config=self.config,
+            services=self
         )
 
         # Cache instance
@@ -264,7 +385,24 @@ class ToolFactory:
         return getattr(module, class_name)
 
     async def cleanup(self) -> None:
-        """Cleanup resources."""
+        """Cleanup resources.
+
+        Stops background services before closing the client they use, so
+        no refresh starts on a closed connection pool.
+        """
+        for name, service in self.active_services().items():
+            close = getattr(service, "close", None) or (
+                service.stop if isinstance(service, LoopMonitor) else None
+            )
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Failed to close service {name}: {e}")
+
         if self._client:
             await self._client.close()
             self._client = None
@@ -0,0 +1,230 @@
+"""Folder tree tool - Materialize the folder hierarchy with chat counts."""
+
+import asyncio
+import time
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import AuthError, HTTPError, ValidationError
+from src.utils.validation import ToolInputValidator
+
+CHAT_MODES = ("none", "count", "list")
+
+
+def link_folders(folders: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Build the folder hierarchy from parent_id links in a single pass.
+
+    Folders whose parent is missing become roots, as do folders caught in
+    a parent_id cycle.
+
+    Args:
+        folders: Folders as returned by the folder list endpoint
+
+    Returns:
+        Tuple of (root nodes, nodes by folder id)
+    """
+    nodes: dict[str, dict[str, Any]] = {}
+    for folder in folders:
+        if isinstance(folder, dict) and isinstance(folder.get("id"), str):
+            nodes[folder["id"]] = {
+                "id": folder["id"],
+                "name": folder.get("name"),
+                "parent_id": folder.get("parent_id"),
+                "is_expanded": folder.get("is_expanded", False),
+                "children": [],
+            }
+
+    roots: list[dict[str, Any]] = []
+    for node in nodes.values():
+        parent = nodes.get(node["parent_id"]) if node["parent_id"] else None
+        if parent is None or parent is node:
+            roots.append(node)
+        else:
+            parent["children"].append(node)
+
+    # Folders in a parent_id cycle are unreachable from any root
+    reached = {node["id"] for node in walk(roots)}
+    for node in nodes.values():
+        if node["id"] not in reached:
+            nodes[node["parent_id"]]["children"].remove(node)
+            roots.append(node)
+            reached.update(n["id"] for n in walk([node]))
+    return roots, nodes
+
+
+def walk(roots: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """List nodes depth-first, parents before children.
+
+    Args:
+        roots: Subtree roots
+
+    Returns:
+        Nodes in pre-order
+    """
+    order: list[dict[str, Any]] = []
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(reversed(node["children"]))
+    return order
+
+
+def count_subtrees(roots: list[dict[str, Any]], with_chats: bool) -> None:
+    """Add folder (and chat) counts per subtree to each node.
+
+    Args:
+        roots: Subtree roots
+        with_chats: Nodes carry chat_count
+    """
+    for node in reversed(walk(roots)):
+        node["subtree_folder_count"] = sum(1 + child["subtree_folder_count"] for child in node["children"])
+        if with_chats:
+            node["subtree_chat_count"] = node["chat_count"] + sum(
+                child["subtree_chat_count"] for child in node["children"]
+            )
+
+
+class FolderTreeTool(BaseTool):
+    """Return the folder hierarchy with per-folder and per-subtree chat counts.
+
+    Fetches the folder list and each folder's chats concurrently, links
+    folders by parent_id and counts chats per subtree. Fetched pieces are
+    cached and invalidated by folder and chat writes.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "folder_tree",
+            "description": (
+                "Get the folder hierarchy (optionally one subtree) with chat counts per folder "
+                "and per subtree, fetching folder contents concurrently"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "root_id": {
+                        "type": ["string", "null"],
+                        "description": "Only return the subtree under this folder"
+                    },
+                    "chats": {
+                        "type": "string",
+                        "enum": list(CHAT_MODES),
+                        "description": "Skip chats, count them, or also list them per folder",
+                        "default": "count"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Ignore cached folders and chat lists",
+                        "default": False
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent folder fetches (1-32)",
+                        "default": 8,
+                        "minimum": 1,
+                        "maximum": 32
+                    }
+                },
+                "required": []
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute folder tree materialization.
+
+        Args:
+            arguments: Tool arguments with optional root_id, chats, refresh and concurrency
+
+        Returns:
+            Dict with the tree, totals and cache usage
+
+        Raises:
+            ValidationError: If arguments invalid or root_id is not a folder
+            HTTPError: If listing folders fails
+        """
+        self._log_execution_start(arguments)
+
+        root_id = arguments.get("root_id")
+        if root_id is not None:
+            root_id = ToolInputValidator.validate_id(root_id, "root_id")
+        mode = arguments.get("chats", "count")
+        if mode not in CHAT_MODES:
+            raise ValidationError(f"chats must be one of: {', '.join(CHAT_MODES)}")
+        refresh = bool(arguments.get("refresh", False))
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 8), "concurrency", 1, 32
+        )
+
+        start = time.monotonic()
+        cache = self.get_service("folder_tree_cache")
+        generation = cache.generation if cache is not None else 0
+        cached_lists = 0
+
+        folders = cache.get_folders() if cache is not None and not refresh else None
+        folders_cached = folders is not None
+        if folders is None:
+            response = await self.client.get("/api/v1/folders/")
+            folders = [f for f in response or [] if isinstance(f, dict)]
+            if cache is not None:
+                cache.put_folders(folders, generation)
+
+        roots, nodes = link_folders(folders)
+        if root_id is not None:
+            if root_id not in nodes:
+                raise ValidationError(f"Folder not found: {root_id}")
+            roots = [nodes[root_id]]
+        selected = walk(roots)
+
+        errors = 0
+        if mode != "none":
+            semaphore = asyncio.Semaphore(concurrency)
+            done = 0
+
+            async def load_chats(node: dict[str, Any]) -> None:
+                nonlocal cached_lists, done, errors
+                chats = cache.get_chats(node["id"]) if cache is not None and not refresh else None
+                if chats is not None:
+                    cached_lists += 1
+                else:
+                    async with semaphore:
+                        try:
+                            response = await self.client.get(f"/api/v1/chats/folder/{node['id']}")
+                        except AuthError:
+                            raise
+                        except HTTPError as e:
+                            errors += 1
+                            node["chats_error"] = str(e)
+                            response = []
+                    chats = [
+                        {"id": c["id"], "title": c.get("title"), "updated_at": c.get("updated_at")}
+                        for c in response or []
+                        if isinstance(c, dict) and isinstance(c.get("id"), str)
+                    ]
+                    if cache is not None and "chats_error" not in node:
+                        cache.put_chats(node["id"], chats, generation)
+                node["chat_count"] = len(chats)
+                if mode == "list":
+                    node["chats"] = chats
+                done += 1
+                await self._report_progress(done, len(selected), f"{done} of {len(selected)} folders loaded")
+
+            await asyncio.gather(*(load_chats(node) for node in selected))
+
+        count_subtrees(roots, mode != "none")
+
+        result = {
+            "tree": roots,
+            "folders": len(selected),
+            "chats": sum(node["chat_count"] for node in selected) if mode != "none" else None,
+            "errors": errors,
+            "cached": {"folders": folders_cached, "chat_lists": cached_lists},
+            "duration_ms": round((time.monotonic() - start) * 1000, 1),
+        }
+
+        self._log_execution_end(result)
+        return result
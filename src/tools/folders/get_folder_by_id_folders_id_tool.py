@@ -38,7 +38,9 @@ class GetFolderByIdFoldersIdTool(BaseTool):
         # Build request
         params = {}
 
-        response = await self.client.get(f"/api/v1/folders/{id}", params=params)
+        response = await self._mirror_read(
+            "folders", id or "", lambda: self.client.get(f"/api/v1/folders/{id}", params=params)
+        )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
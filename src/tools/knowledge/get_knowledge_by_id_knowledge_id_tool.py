@@ -38,7 +38,9 @@ class GetKnowledgeByIdKnowledgeIdTool(BaseTool):
         # Build request
         params = {}
 
-        response = await self.client.get(f"/api/v1/knowledge/{id}", params=params)
+        response = await self._mirror_read(
+            "knowledge", id or "", lambda: self.client.get(f"/api/v1/knowledge/{id}", params=params)
+        )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
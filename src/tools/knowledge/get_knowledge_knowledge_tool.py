@@ -30,7 +30,9 @@ class GetKnowledgeKnowledgeTool(BaseTool):
         # Build request
         params = {}
 
-        response = await self.client.get("/api/v1/knowledge/", params=params)
+        response = await self._mirror_read(
+            "knowledge", None, lambda: self.client.get("/api/v1/knowledge/", params=params)
+        )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
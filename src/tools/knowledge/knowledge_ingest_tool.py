@@ -0,0 +1,185 @@
+"""Knowledge ingest tool - Pipelined upload, processing and attachment of files."""
+
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.validation import ToolInputValidator
+
+
+class KnowledgeIngestTool(BaseTool):
+    """Ingest local files into a knowledge base in one call.
+
+    Uploads files and attaches them as overlapping stages connected by
+    bounded queues. Uploads skip processing: the batched attach request
+    processes the files into the knowledge base, so each file is embedded
+    once. Only failed items are retried.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "knowledge_ingest",
+            "description": (
+                "Upload local files, process them for retrieval and attach them to a "
+                "knowledge base as a pipelined batch operation with per-stage throughput"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "id": {
+                        "type": "string",
+                        "description": "The knowledge base ID"
+                    },
+                    "file_paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Paths of local files to ingest"
+                    },
+                    "batch_size": {
+                        "type": "integer",
+                        "description": "Files per attach request, which also processes them (1-100)",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 100
+                    },
+                    "upload_concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent uploads (1-16)",
+                        "default": 4,
+                        "minimum": 1,
+                        "maximum": 16
+                    },
+                    "queue_size": {
+                        "type": "integer",
+                        "description": "Capacity of the queues between stages (1-1000)",
+                        "default": 32,
+                        "minimum": 1,
+                        "maximum": 1000
+                    },
+                    "max_retries": {
+                        "type": "integer",
+                        "description": "Retry attempts for failed items per stage (0-5)",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 5
+                    }
+                },
+                "required": ["id", "file_paths"]
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute pipelined knowledge ingestion.
+
+        Args:
+            arguments: Tool arguments with id, file_paths and tuning options
+
+        Returns:
+            Dict with attached file IDs, failures and per-stage stats
+
+        Raises:
+            ValidationError: If arguments invalid
+        """
+        self._log_execution_start(arguments)
+
+        knowledge_id = ToolInputValidator.validate_id(arguments.get("id"), "id")
+        file_paths = arguments.get("file_paths")
+        if not isinstance(file_paths, list) or not file_paths:
+            raise ValidationError("file_paths must be a non-empty array")
+
+        batch_size = ToolInputValidator.validate_int_range(
+            arguments.get("batch_size", 10), "batch_size", 1, 100
+        )
+        upload_concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("upload_concurrency", 4), "upload_concurrency", 1, 16
+        )
+        queue_size = ToolInputValidator.validate_int_range(
+            arguments.get("queue_size", 32), "queue_size", 1, 1000
+        )
+        max_retries = ToolInputValidator.validate_int_range(
+            arguments.get("max_retries", 2), "max_retries", 0, 5
+        )
+
+        async def upload(batch: list[str]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            response = await self.client.post_with_file(
+                "/api/v1/files/",
+                file_path=batch[0],
+                params={"process": False}
+            )
+            return [{"path": batch[0], "file": response}], []
+
+        async def attach(batch: list[dict[str, Any]]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            # Processes the files into the knowledge collection; files that
+            # failed to process are listed in the response warnings
+            response = await self.client.post(
+                f"/api/v1/knowledge/{knowledge_id}/files/batch/add",
+                json_data=[{"file_id": entry["file"].get("id")} for entry in batch]
+            )
+            errors = _attach_errors(response)
+            succeeded = [entry for entry in batch if entry["file"].get("id") not in errors]
+            failed = [
+                (entry, errors[entry["file"].get("id")])
+                for entry in batch if entry["file"].get("id") in errors
+            ]
+            return succeeded, failed
+
+        pipeline = Pipeline(
+            [
+                PipelineStage("upload", upload, concurrency=upload_concurrency,
+                              max_retries=max_retries),
+                PipelineStage("attach", attach, batch_size=batch_size,
+                              max_retries=max_retries),
+            ],
+            queue_size=queue_size
+        )
+        outcome = await pipeline.run(file_paths)
+
+        result = {
+            "knowledge_id": knowledge_id,
+            "attached": [
+                {"path": entry["path"], "file_id": entry["file"].get("id")}
+                for entry in outcome.outputs
+            ],
+            "failed": [
+                {
+                    "stage": failure["stage"],
+                    "path": failure["item"] if isinstance(failure["item"], str)
+                    else failure["item"]["path"],
+                    "error": failure["error"]
+                }
+                for failure in outcome.failures
+            ],
+            "stages": [stats.to_dict() for stats in outcome.stats],
+            "duration_ms": round(outcome.duration_seconds * 1000, 1)
+        }
+
+        self._log_execution_end(result)
+        return result
+
+
+def _attach_errors(response: Any) -> dict[str, str]:
+    """Read per-file processing errors from a batch attach response.
+
+    Open WebUI lists them under warnings.errors, as "file_id: error"
+    strings or as objects with file_id and error.
+
+    Args:
+        response: Batch attach response
+
+    Returns:
+        Error message by file ID
+    """
+    warnings = response.get("warnings") if isinstance(response, dict) else None
+    errors: dict[str, str] = {}
+    for error in (warnings or {}).get("errors") or []:
+        if isinstance(error, dict):
+            errors[str(error.get("file_id"))] = str(error.get("error") or error.get("status") or "failed")
+        else:
+            file_id, _, message = str(error).partition(": ")
+            errors[file_id] = message or "failed"
+    return errors
@@ -0,0 +1,272 @@
+"""Knowledge sync tool - Incremental directory-to-knowledge synchronization."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+from src.tools.base import BaseTool
+from src.exceptions import NotFoundError, ValidationError
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.sync_manifest import SyncManifest
+from src.utils.validation import ToolInputValidator
+
+DEFAULT_MANIFEST_NAME = ".openwebui-sync.json"
+
+
+class KnowledgeSyncTool(BaseTool):
+    """Sync a local directory into a knowledge base incrementally.
+
+    Diffs the directory against a local manifest and only uploads new or
+    modified files, replacing the old versions, and removes deleted ones.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "knowledge_sync",
+            "description": (
+                "Incrementally sync a local directory into a knowledge base using a local "
+                "manifest; only new, modified and deleted files are sent upstream"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "id": {
+                        "type": "string",
+                        "description": "The knowledge base ID"
+                    },
+                    "directory": {
+                        "type": "string",
+                        "description": "Local directory to sync"
+                    },
+                    "manifest_path": {
+                        "type": ["string", "null"],
+                        "description": f"Manifest file (default: <directory>/{DEFAULT_MANIFEST_NAME})"
+                    },
+                    "pattern": {
+                        "type": "string",
+                        "description": "Glob pattern of files to sync, relative to directory",
+                        "default": "**/*"
+                    },
+                    "delete_missing": {
+                        "type": "boolean",
+                        "description": "Remove files deleted locally from the knowledge base",
+                        "default": True
+                    },
+                    "dry_run": {
+                        "type": "boolean",
+                        "description": "Only report the change set without syncing",
+                        "default": False
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent file operations (1-16)",
+                        "default": 4,
+                        "minimum": 1,
+                        "maximum": 16
+                    },
+                    "max_retries": {
+                        "type": "integer",
+                        "description": "Retry attempts per failed file (0-5)",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 5
+                    }
+                },
+                "required": ["id", "directory"]
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute incremental knowledge sync.
+
+        Args:
+            arguments: Tool arguments with id, directory and sync options
+
+        Returns:
+            Dict with the change set, applied changes and failures
+
+        Raises:
+            ValidationError: If arguments invalid or manifest belongs to another knowledge base
+        """
+        self._log_execution_start(arguments)
+
+        knowledge_id = ToolInputValidator.validate_id(arguments.get("id"), "id")
+        directory = arguments.get("directory")
+        if not isinstance(directory, str) or not directory:
+            raise ValidationError("directory must be a non-empty string")
+        root = Path(directory).expanduser()
+        if not root.is_dir():
+            raise ValidationError(f"Directory not found: {directory}")
+
+        manifest_path = arguments.get("manifest_path")
+        manifest = SyncManifest(
+            Path(manifest_path).expanduser() if manifest_path else root / DEFAULT_MANIFEST_NAME
+        )
+        pattern = arguments.get("pattern") or "**/*"
+        delete_missing = arguments.get("delete_missing", True)
+        dry_run = arguments.get("dry_run", False)
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 4), "concurrency", 1, 16
+        )
+        max_retries = ToolInputValidator.validate_int_range(
+            arguments.get("max_retries", 2), "max_retries", 0, 5
+        )
+
+        try:
+            await asyncio.to_thread(manifest.load)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        if manifest.knowledge_id not in (None, knowledge_id):
+            raise ValidationError(
+                f"Manifest {manifest.path} belongs to knowledge base {manifest.knowledge_id}"
+            )
+        manifest.knowledge_id = knowledge_id
+
+        diff = await asyncio.to_thread(manifest.diff, root, pattern)
+        if not delete_missing:
+            diff.deleted = []
+
+        # Content identical, only mtime changed: refresh the manifest entry
+        for key in diff.touched:
+            manifest.files[key].update(diff.stats[key])
+
+        changes = (
+            [("added", key) for key in diff.added]
+            + [("modified", key) for key in diff.modified]
+            + [("deleted", key) for key in diff.deleted]
+        )
+
+        if dry_run or not changes:
+            if not dry_run and diff.touched:
+                await asyncio.to_thread(manifest.save)
+            result = {
+                "knowledge_id": knowledge_id,
+                "dry_run": dry_run,
+                "changes": diff.to_dict(),
+                "applied": {"added": 0, "modified": 0, "deleted": 0},
+                "failed": [],
+            }
+            self._log_execution_end(result)
+            return result
+
+        async def apply(batch: list[tuple[str, str]]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            action, key = batch[0]
+            if action == "added":
+                await self._add_file(knowledge_id, root / key, key, manifest, diff.stats[key])
+            elif action == "modified":
+                await self._update_file(knowledge_id, root / key, key, manifest, diff.stats[key])
+            else:
+                await self._remove_file(knowledge_id, key, manifest)
+            return [batch[0]], []
+
+        pipeline = Pipeline(
+            [PipelineStage("sync", apply, concurrency=concurrency, max_retries=max_retries)]
+        )
+        try:
+            outcome = await pipeline.run(changes)
+        finally:
+            await asyncio.to_thread(manifest.save)
+
+        applied = {"added": 0, "modified": 0, "deleted": 0}
+        for action, _ in outcome.outputs:
+            applied[action] += 1
+
+        result = {
+            "knowledge_id": knowledge_id,
+            "dry_run": False,
+            "changes": diff.to_dict(),
+            "applied": applied,
+            "failed": [
+                {"action": f["item"][0], "path": f["item"][1], "error": f["error"]}
+                for f in outcome.failures
+            ],
+            "stages": [stats.to_dict() for stats in outcome.stats],
+            "duration_ms": round(outcome.duration_seconds * 1000, 1),
+        }
+
+        self._log_execution_end(result)
+        return result
+
+    async def _add_file(
+        self,
+        knowledge_id: str,
+        path: Path,
+        key: str,
+        manifest: SyncManifest,
+        stat: dict[str, Any]
+    ) -> None:
+        """Upload a new file and attach it to the knowledge base.
+
+        The upload skips processing; attaching processes the file into the
+        knowledge base, so it is embedded once.
+
+        Args:
+            knowledge_id: Knowledge base ID
+            path: Local file path
+            key: Manifest key
+            manifest: Manifest to update
+            stat: Current size, mtime and hash
+        """
+        entry = manifest.files.get(key) or {}
+        if entry.get("file_id") and entry.get("sha256") == stat["sha256"]:
+            # Uploaded by an earlier attempt whose attach step failed
+            file_id = entry["file_id"]
+        else:
+            uploaded = await self.client.post_with_file(
+                "/api/v1/files/", file_path=str(path), params={"process": False}
+            )
+            file_id = uploaded.get("id")
+            # Record the upload before attaching so a failed attach does not re-upload
+            manifest.files[key] = {**stat, "file_id": file_id, "attached": False}
+        await self.client.post(
+            f"/api/v1/knowledge/{knowledge_id}/file/add", json_data={"file_id": file_id}
+        )
+        manifest.files[key]["attached"] = True
+
+    async def _update_file(
+        self,
+        knowledge_id: str,
+        path: Path,
+        key: str,
+        manifest: SyncManifest,
+        stat: dict[str, Any]
+    ) -> None:
+        """Replace a modified file in the knowledge base.
+
+        Open WebUI re-embeds a file on a content update and again on the
+        knowledge file update, so the old version is removed instead and
+        the new one added, which processes it once. A retry skips the
+        removal once the manifest no longer holds the old version.
+
+        Args:
+            knowledge_id: Knowledge base ID
+            path: Local file path
+            key: Manifest key
+            manifest: Manifest to update
+            stat: Current size, mtime and hash
+        """
+        entry = manifest.files.get(key)
+        if entry is not None and entry.get("sha256") != stat["sha256"]:
+            await self._remove_file(knowledge_id, key, manifest)
+        await self._add_file(knowledge_id, path, key, manifest, stat)
+
+    async def _remove_file(self, knowledge_id: str, key: str, manifest: SyncManifest) -> None:
+        """Remove a deleted file from the knowledge base.
+
+        Args:
+            knowledge_id: Knowledge base ID
+            key: Manifest key
+            manifest: Manifest to update
+        """
+        file_id = manifest.files[key].get("file_id")
+        try:
+            await self.client.post(
+                f"/api/v1/knowledge/{knowledge_id}/file/remove", json_data={"file_id": file_id}
+            )
+        except NotFoundError:
+            self.logger.info(f"File {file_id} already removed from knowledge {knowledge_id}")
+        manifest.files.pop(key, None)
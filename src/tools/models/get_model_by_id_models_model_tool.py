@@ -38,7 +38,9 @@ class GetModelByIdModelsModelTool(BaseTool):
         if id is not None:
             params["id"] = id
 
-        response = await self.client.get("/api/v1/models/model", params=params)
+        response = await self._mirror_read(
+            "models", id or "", lambda: self.client.get("/api/v1/models/model", params=params)
+        )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
@@ -74,7 +74,63 @@ class EmbedOllamaEmbedUrlIdxTool(BaseTool):
         if arguments.get("keep_alive") is not None:
             json_data["keep_alive"] = arguments["keep_alive"]
 
-        response = await self.client.post(f"/ollama/api/embed/{url_idx}", json_data=json_data)
+        endpoint = f"/ollama/api/embed/{url_idx}"
+        cache = self.get_service("embedding_cache")
+        if cache is not None:
+            # Only embed texts missing from the persistent cache; fields that change vectors are keyed
+            texts = json_data["input"] if isinstance(json_data["input"], list) else [json_data["input"]]
+            vectors = await cache.get_or_compute(
+                "/ollama/api/embed",
+                json_data["model"],
+                texts,
+                lambda missing: self._embed_texts(endpoint, json_data, missing, {}),
+                options={
+                    "truncate": json_data.get("truncate"),
+                    "options": json_data.get("options"),
+                    "url_idx": url_idx
+                }
+            )
+            response = {"model": json_data["model"], "embeddings": vectors}
+        elif self.get_service("embedding_batcher") is not None and isinstance(json_data["input"], str):
+            vectors = await self._embed_texts(endpoint, json_data, [json_data["input"]], {})
+            response = {"model": json_data["model"], "embeddings": vectors}
+        else:
+            response = await self.client.post(endpoint, json_data=json_data)
 
         self._log_execution_end(response)
-        return response
\ No newline at end of file
+        return response
+
+    async def _embed_texts(
+        self,
+        endpoint: str,
+        json_data: dict[str, Any],
+        texts: list[str],
+        params: dict[str, Any]
+    ) -> list[list[float]]:
+        """Embed texts upstream, coalescing single texts through the batcher.
+
+        Args:
+            endpoint: Embed endpoint path
+            json_data: Request body (model and options)
+            texts: Texts to embed
+            params: Query parameters
+
+        Returns:
+            Vectors in the order of texts
+        """
+        batcher = self.get_service("embedding_batcher")
+        if batcher is not None and len(texts) == 1:
+            # Single text: share one batched upstream request with concurrent callers
+            vector = await batcher.embed(
+                endpoint,
+                json_data["model"],
+                texts[0],
+                extra={k: v for k, v in json_data.items() if k not in ("model", "input")},
+                params=params
+            )
+            return [vector]
+
+        response = await self.client.post(
+            endpoint, json_data={**json_data, "input": texts}, params=params or None
+        )
+        return list(response.get("embeddings") or [])
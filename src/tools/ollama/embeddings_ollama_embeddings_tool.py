@@ -66,7 +66,21 @@ class EmbeddingsOllamaEmbeddingsTool(BaseTool):
         if arguments.get("keep_alive") is not None:
             json_data["keep_alive"] = arguments["keep_alive"]
 
-        response = await self.client.post("/ollama/api/embeddings", json_data=json_data, params=params)
+        cache = self.get_service("embedding_cache")
+        if cache is not None and "options" not in json_data:
+            # Model options may change vectors, so only plain requests are cached
+            async def compute(missing: list[str]) -> list[list[float]]:
+                result = await self.client.post(
+                    "/ollama/api/embeddings", json_data={**json_data, "prompt": missing[0]}, params=params
+                )
+                return [result["embedding"]]
+
+            vectors = await cache.get_or_compute(
+                "/ollama/api/embeddings", json_data["model"], [json_data["prompt"]], compute
+            )
+            response = {"embedding": vectors[0]}
+        else:
+            response = await self.client.post("/ollama/api/embeddings", json_data=json_data, params=params)
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
@@ -38,7 +38,9 @@ class GetPromptByCommandPromptsCommandCommandTool(BaseTool):
         # Build request
         params = {}
 
-        response = await self.client.get(f"/api/v1/prompts/command/{command}", params=params)
+        response = await self._mirror_read(
+            "prompts", command or "", lambda: self.client.get(f"/api/v1/prompts/command/{command}", params=params)
+        )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
@@ -30,7 +30,9 @@ class GetPromptsPromptsTool(BaseTool):
         # Build request
         params = {}
 
-        response = await self.client.get("/api/v1/prompts/", params=params)
+        response = await self._mirror_read(
+            "prompts", None, lambda: self.client.get("/api/v1/prompts/", params=params)
+        )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 from typing import Any
 from src.tools.base import BaseTool
+from src.services.query_cache import MEMORY_COLLECTION
 from src.utils.validation import ToolInputValidator
 
 
@@ -41,7 +42,17 @@ class QueryMemoryMemoriesQueryTool(BaseTool):
         if arguments.get("k") is not None:
             json_data["k"] = arguments.get("k")
 
-        response = await self.client.post("/api/v1/memories/query", json_data=json_data)
+        cache = self.get_service("query_cache")
+        if cache is None:
+            response = await self.client.post("/api/v1/memories/query", json_data=json_data)
+        else:
+            response = await cache.get_or_fetch(
+                "memory",
+                [MEMORY_COLLECTION],
+                json_data["content"],
+                {"k": json_data.get("k")},
+                lambda: self.client.post("/api/v1/memories/query", json_data=json_data)
+            )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
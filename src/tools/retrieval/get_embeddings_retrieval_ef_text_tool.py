@@ -3,6 +3,7 @@
 from typing import Any
 from urllib.parse import quote
 from src.tools.base import BaseTool
+from src.services.embedding_cache import make_key
 
 
 class GetEmbeddingsRetrievalEfTextTool(BaseTool):
@@ -36,7 +37,20 @@ class GetEmbeddingsRetrievalEfTextTool(BaseTool):
         # Build request
         params = {}
 
-        response = await self.client.get(f"/api/v1/retrieval/ef/{encoded_text}", params=params)
+        cache = self.get_service("embedding_cache")
+        if cache is None:
+            response = await self.client.get(f"/api/v1/retrieval/ef/{encoded_text}", params=params)
+        else:
+            # The server's configured model embeds this text; the cache is
+            # invalidated whenever that model changes
+            key = make_key("/api/v1/retrieval/ef", cache.embedding_model or "", text)
+            vector = cache.get(key)
+            if vector is not None:
+                response = {"result": vector}
+            else:
+                response = await self.client.get(f"/api/v1/retrieval/ef/{encoded_text}", params=params)
+                if isinstance(response.get("result"), list):
+                    cache.put(key, response["result"])
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
@@ -1,9 +1,17 @@
 """Process Text"""
 
+import hashlib
+import time
 from typing import Any
 from src.tools.base import BaseTool
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.text_splitter import TextSegment, split_text
 from src.utils.validation import ToolInputValidator
 
+# Default collection names keep to this length so segment suffixes stay
+# within vector store limits (63 characters)
+DEFAULT_COLLECTION_CHARS = 48
+
 
 class ProcessTextRetrievalProcessTextTool(BaseTool):
     """Process Text"""
@@ -18,7 +26,45 @@ class ProcessTextRetrievalProcessTextTool(BaseTool):
                 "properties": {
                     "name": {"type": "string", "description": "Name for the text document"},
                     "content": {"type": "string", "description": "Text content to process"},
-                    "collection_name": {"type": ["string", "null"], "description": "Collection name to store in"}
+                    "collection_name": {"type": ["string", "null"], "description": "Collection name to store in"},
+                    "chunked": {
+                        "type": "boolean",
+                        "description": (
+                            "Split the text on paragraph/sentence boundaries and submit the "
+                            "segments in parallel, each into its own collection named "
+                            "<collection_name>-part-<n>; query them together via collection_names"
+                        ),
+                        "default": False
+                    },
+                    "segment_size": {
+                        "type": "integer",
+                        "description": "Maximum characters per segment in chunked mode (1000-5000000)",
+                        "default": 200000,
+                        "minimum": 1000,
+                        "maximum": 5000000
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent segment submissions in chunked mode (1-16)",
+                        "default": 4,
+                        "minimum": 1,
+                        "maximum": 16
+                    },
+                    "max_retries": {
+                        "type": "integer",
+                        "description": "Retry attempts per failed segment (0-5)",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 5
+                    },
+                    "compress": {
+                        "type": "boolean",
+                        "description": (
+                            "Gzip large request bodies; requires Open WebUI or a proxy in front "
+                            "of it to accept Content-Encoding: gzip"
+                        ),
+                        "default": False
+                    }
                 },
                 "required": ["name", "content"]
             }
@@ -35,8 +81,114 @@ class ProcessTextRetrievalProcessTextTool(BaseTool):
         }
         if arguments.get("collection_name") is not None:
             json_data["collection_name"] = arguments["collection_name"]
+        compress = bool(arguments.get("compress", False))
 
-        response = await self.client.post("/api/v1/retrieval/process/text", json_data=json_data)
+        if arguments.get("chunked"):
+            response = await self._process_chunked(json_data, arguments, compress)
+        else:
+            response = await self.client.post(
+                "/api/v1/retrieval/process/text", json_data=json_data, compress=compress
+            )
 
         self._log_execution_end(response)
-        return response
\ No newline at end of file
+        return response
+
+    async def _process_chunked(
+        self,
+        json_data: dict[str, Any],
+        arguments: dict[str, Any],
+        compress: bool
+    ) -> dict[str, Any]:
+        """Split the text and submit segments in parallel.
+
+        process/text never adds to an existing collection (Open WebUI skips
+        saving when the collection exists), so each segment gets its own
+        collection, derived from the requested one.
+
+        Args:
+            json_data: Single-request body (name, content, collection_name)
+            arguments: Tool arguments with chunking options
+            compress: Whether to gzip large segment bodies
+
+        Returns:
+            Dict with the base and per-segment collection names, per-segment
+            results and a summary
+        """
+        segment_size = ToolInputValidator.validate_int_range(
+            arguments.get("segment_size", 200000), "segment_size", 1000, 5000000
+        )
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 4), "concurrency", 1, 16
+        )
+        max_retries = ToolInputValidator.validate_int_range(
+            arguments.get("max_retries", 2), "max_retries", 0, 5
+        )
+
+        content = json_data["content"]
+        collection_name = json_data.get("collection_name") or hashlib.sha256(
+            content.encode("utf-8")
+        ).hexdigest()[:DEFAULT_COLLECTION_CHARS]
+        segments = split_text(content, segment_size)
+        total = len(segments)
+        records: dict[int, dict[str, Any]] = {
+            segment.index: {
+                "index": segment.index,
+                "name": f"{json_data['name']} (part {segment.index + 1}/{total})",
+                "collection_name": (
+                    collection_name if total == 1 else f"{collection_name}-part-{segment.index + 1}"
+                ),
+                "offset": segment.offset,
+                "chars": len(segment.text),
+                "sha256": hashlib.sha256(segment.text.encode("utf-8")).hexdigest(),
+                "attempts": 0,
+            }
+            for segment in segments
+        }
+
+        async def submit(batch: list[TextSegment]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            segment = batch[0]
+            record = records[segment.index]
+            record["attempts"] += 1
+            start = time.monotonic()
+            try:
+                await self.client.post(
+                    "/api/v1/retrieval/process/text",
+                    json_data={
+                        "name": record["name"],
+                        "content": segment.text,
+                        "collection_name": record["collection_name"],
+                    },
+                    compress=compress
+                )
+            finally:
+                record["duration_ms"] = round((time.monotonic() - start) * 1000, 1)
+            return [segment.index], []
+
+        async def on_progress(completed: int, failed: int) -> None:
+            await self._report_progress(completed + failed, total, f"{completed}/{total} segments")
+
+        outcome = await Pipeline(
+            [PipelineStage("segment", submit, concurrency=concurrency, max_retries=max_retries)]
+        ).run(segments, on_progress=on_progress)
+
+        for index in outcome.outputs:
+            records[index]["status"] = "ok"
+        for failure in outcome.failures:
+            records[failure["item"].index].update(status="failed", error=failure["error"])
+
+        duration = outcome.duration_seconds
+        return {
+            "collection_name": collection_name,
+            "collection_names": [records[index]["collection_name"] for index in sorted(records)],
+            "name": json_data["name"],
+            "segments": [records[index] for index in sorted(records)],
+            "summary": {
+                "segments": total,
+                "succeeded": len(outcome.outputs),
+                "failed": len(outcome.failures),
+                "retried": outcome.stats[0].retried,
+                "chars": len(content),
+                "duration_ms": round(duration * 1000, 1),
+                "chars_per_second": round(len(content) / duration) if duration > 0 else None,
+            },
+        }
\ No newline at end of file
@@ -1,7 +1,10 @@
 """Query Collection Handler"""
 
+import asyncio
+import time
 from typing import Any
 from src.tools.base import BaseTool
+from src.utils.retrieval_merge import merge_query_results
 from src.utils.validation import ToolInputValidator
 
 
@@ -26,7 +29,22 @@ class QueryCollectionHandlerRetrievalQueryCollectionTool(BaseTool):
                     "k_reranker": {"type": ["integer", "null"], "description": "Number of results for reranker"},
                     "r": {"type": ["number", "null"], "description": "Relevance threshold"},
                     "hybrid": {"type": ["boolean", "null"], "description": "Enable hybrid search"},
-                    "hybrid_bm25_weight": {"type": ["number", "null"], "description": "BM25 weight for hybrid search"}
+                    "hybrid_bm25_weight": {"type": ["number", "null"], "description": "BM25 weight for hybrid search"},
+                    "fan_out": {
+                        "type": "boolean",
+                        "description": (
+                            "Query each collection concurrently and merge the top-k locally, "
+                            "de-duplicating identical chunks and reporting per-collection latency"
+                        ),
+                        "default": False
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent collection queries in fan-out mode (1-16)",
+                        "default": 8,
+                        "minimum": 1,
+                        "maximum": 16
+                    }
                 },
                 "required": ["collection_names", "query"]
             }
@@ -52,7 +70,87 @@ class QueryCollectionHandlerRetrievalQueryCollectionTool(BaseTool):
         if arguments.get("hybrid_bm25_weight") is not None:
             json_data["hybrid_bm25_weight"] = arguments["hybrid_bm25_weight"]
 
-        response = await self.client.post("/api/v1/retrieval/query/collection", json_data=json_data)
+        fan_out = bool(arguments.get("fan_out"))
+        if fan_out:
+            concurrency = ToolInputValidator.validate_int_range(
+                arguments.get("concurrency", 8), "concurrency", 1, 16
+            )
+
+            async def fetch() -> dict[str, Any]:
+                return await self._fan_out(json_data, concurrency)
+        else:
+            async def fetch() -> dict[str, Any]:
+                return await self.client.post("/api/v1/retrieval/query/collection", json_data=json_data)
+
+        cache = self.get_service("query_cache")
+        if cache is None:
+            response = await fetch()
+        else:
+            params = {k: v for k, v in json_data.items() if k not in ("collection_names", "query")}
+            response = await cache.get_or_fetch(
+                "collection",
+                list(json_data["collection_names"]),
+                json_data["query"],
+                {**params, "fan_out": fan_out},
+                fetch
+            )
 
         self._log_execution_end(response)
-        return response
\ No newline at end of file
+        return response
+
+    async def _fan_out(self, json_data: dict[str, Any], concurrency: int) -> dict[str, Any]:
+        """Query each collection through query/doc concurrently and merge locally.
+
+        Args:
+            json_data: Collection query body
+            concurrency: Maximum concurrent collection queries
+
+        Returns:
+            Merged result with per-collection latency and errors
+
+        Raises:
+            Exception: The first upstream error if every collection failed
+        """
+        names = list(dict.fromkeys(json_data["collection_names"]))
+        doc_query = {
+            key: value for key, value in json_data.items()
+            if key not in ("collection_names", "hybrid_bm25_weight")
+        }
+        semaphore = asyncio.Semaphore(concurrency)
+        start = time.monotonic()
+
+        async def query(name: str) -> tuple[dict[str, Any], float]:
+            async with semaphore:
+                query_start = time.monotonic()
+                result = await self.client.post(
+                    "/api/v1/retrieval/query/doc", json_data={**doc_query, "collection_name": name}
+                )
+                return result, (time.monotonic() - query_start) * 1000
+
+        outcomes = await asyncio.gather(*(query(name) for name in names), return_exceptions=True)
+
+        results: dict[str, dict[str, Any]] = {}
+        collections: dict[str, dict[str, Any]] = {}
+        errors: list[BaseException] = []
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                errors.append(outcome)
+                collections[name] = {"error": str(outcome)}
+                continue
+            result, latency_ms = outcome
+            results[name] = result or {}
+            collections[name] = {"latency_ms": round(latency_ms, 1)}
+
+        if errors and not results:
+            raise errors[0]
+
+        merged, duplicates = merge_query_results(results, k=json_data.get("k"))
+        for source in merged["collection_names"][0]:
+            collections[source]["selected"] = collections[source].get("selected", 0) + 1
+
+        return {
+            **merged,
+            "collections": collections,
+            "duplicates_removed": duplicates,
+            "duration_ms": round((time.monotonic() - start) * 1000, 1),
+        }
\ No newline at end of file
@@ -45,7 +45,17 @@ class QueryDocHandlerRetrievalQueryDocTool(BaseTool):
         if arguments.get("hybrid") is not None:
             json_data["hybrid"] = arguments["hybrid"]
 
-        response = await self.client.post("/api/v1/retrieval/query/doc", json_data=json_data)
+        cache = self.get_service("query_cache")
+        if cache is None:
+            response = await self.client.post("/api/v1/retrieval/query/doc", json_data=json_data)
+        else:
+            response = await cache.get_or_fetch(
+                "doc",
+                [json_data["collection_name"]],
+                json_data["query"],
+                {k: v for k, v in json_data.items() if k not in ("collection_name", "query")},
+                lambda: self.client.post("/api/v1/retrieval/query/doc", json_data=json_data)
+            )
 
         self._log_execution_end(response)
         return response
\ No newline at end of file
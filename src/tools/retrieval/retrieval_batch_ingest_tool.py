@@ -0,0 +1,304 @@
+"""Retrieval batch ingest tool - Concurrent web, YouTube and web search ingestion."""
+
+import asyncio
+import hashlib
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.utils.ingest_ledger import IngestLedger, content_hash
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.validation import ToolInputValidator
+
+# Ledger files live in the cache directory; ledger_path may not escape it
+LEDGER_DIR = "~/.cache/openwebui-mcp"
+DEFAULT_LEDGER_NAME = "ingest-ledger.json"
+
+# Source kind → process endpoint and request field
+KIND_ENDPOINTS = {
+    "web": ("/api/v1/retrieval/process/web", "url"),
+    "youtube": ("/api/v1/retrieval/process/youtube", "url"),
+    "web_search": ("/api/v1/retrieval/process/web/search", "queries"),
+}
+
+# Save the ledger after this many newly ingested sources
+LEDGER_FLUSH_EVERY = 25
+
+# Per-source collections are <collection_name>-<hash>, kept within vector
+# store limits (63 characters)
+MAX_COLLECTION_CHARS = 63
+SOURCE_HASH_CHARS = 12
+
+
+class RetrievalBatchIngestTool(BaseTool):
+    """Ingest many URLs or search queries into a collection.
+
+    Runs process/web, process/youtube or process/web/search for each source
+    with bounded total and per-host concurrency, skipping sources already
+    recorded in a local ledger. Open WebUI overwrites the collection on each
+    of these calls, so every source goes into its own collection derived
+    from the requested one. Sources are fed
+    round-robin across hosts and only while their host has a free slot, so
+    workers never sit idle behind one busy host.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "retrieval_batch_ingest",
+            "description": (
+                "Ingest a list of web URLs, YouTube URLs or web search queries concurrently, "
+                "each into its own collection named <collection_name>-<hash>, with a per-host "
+                "limit, skipping sources already ingested; query them together via collection_names"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "URLs (web, youtube) or search queries (web_search)"
+                    },
+                    "kind": {
+                        "type": "string",
+                        "enum": list(KIND_ENDPOINTS),
+                        "description": "Source kind",
+                        "default": "web"
+                    },
+                    "collection_name": {
+                        "type": "string",
+                        "description": "Base name for the per-source collections"
+                    },
+                    "concurrency": {
+                        "type": "integer",
+                        "description": "Concurrent ingest requests (1-32)",
+                        "default": 8,
+                        "minimum": 1,
+                        "maximum": 32
+                    },
+                    "per_host_limit": {
+                        "type": "integer",
+                        "description": "Concurrent requests per host; search queries count as one host (1-16)",
+                        "default": 2,
+                        "minimum": 1,
+                        "maximum": 16
+                    },
+                    "max_retries": {
+                        "type": "integer",
+                        "description": "Retry attempts per failed source (0-5)",
+                        "default": 2,
+                        "minimum": 0,
+                        "maximum": 5
+                    },
+                    "ledger_path": {
+                        "type": ["string", "null"],
+                        "description": (
+                            f"Ingest ledger file inside {LEDGER_DIR} (default: {DEFAULT_LEDGER_NAME})"
+                        )
+                    },
+                    "force": {
+                        "type": "boolean",
+                        "description": "Re-ingest sources already in the ledger",
+                        "default": False
+                    }
+                },
+                "required": ["items", "collection_name"]
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute batch ingestion.
+
+        Args:
+            arguments: Tool arguments with items, kind, collection_name and limits
+
+        Returns:
+            Dict with ingested, skipped and failed sources, the per-source
+            collection names and a throughput summary
+
+        Raises:
+            ValidationError: If arguments invalid, the ledger path is outside
+                the cache directory or the ledger is unreadable
+        """
+        self._log_execution_start(arguments)
+
+        items = arguments.get("items")
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            raise ValidationError("items must be a list of strings")
+        kind = arguments.get("kind") or "web"
+        if kind not in KIND_ENDPOINTS:
+            raise ValidationError(f"kind must be one of: {', '.join(KIND_ENDPOINTS)}")
+        collection_name = arguments.get("collection_name")
+        if not isinstance(collection_name, str) or not collection_name:
+            raise ValidationError("collection_name must be a non-empty string")
+        concurrency = ToolInputValidator.validate_int_range(
+            arguments.get("concurrency", 8), "concurrency", 1, 32
+        )
+        per_host_limit = ToolInputValidator.validate_int_range(
+            arguments.get("per_host_limit", 2), "per_host_limit", 1, 16
+        )
+        max_retries = ToolInputValidator.validate_int_range(
+            arguments.get("max_retries", 2), "max_retries", 0, 5
+        )
+        force = bool(arguments.get("force", False))
+
+        ledger = IngestLedger(self._ledger_path(arguments.get("ledger_path")))
+        try:
+            await asyncio.to_thread(ledger.load)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        sources = list(dict.fromkeys(item.strip() for item in items if item.strip()))
+        collections = {source: self._source_collection(collection_name, source) for source in sources}
+        skipped = [] if force else [s for s in sources if ledger.contains(collections[s], s)]
+        invalid = []
+        pending = []
+        skipped_set = set(skipped)
+        for source in sources:
+            if source in skipped_set:
+                continue
+            if kind != "web_search" and urlparse(source).scheme not in ("http", "https"):
+                invalid.append({"source": source, "error": "Not an http(s) URL"})
+            else:
+                pending.append(source)
+
+        endpoint, field = KIND_ENDPOINTS[kind]
+        unsaved = [0]
+        save_lock = asyncio.Lock()
+
+        def host_of(source: str) -> str:
+            return "" if kind == "web_search" else urlparse(source).netloc.lower()
+
+        by_host: dict[str, deque[str]] = {}
+        for source in pending:
+            by_host.setdefault(host_of(source), deque()).append(source)
+        hosts = len(by_host)
+        active: Counter[str] = Counter()
+        attempts: Counter[str] = Counter()
+        slot_freed = asyncio.Event()
+
+        def release(source: str) -> None:
+            active[host_of(source)] -= 1
+            slot_freed.set()
+
+        async def schedule() -> AsyncIterator[str]:
+            # Hand out sources round-robin across hosts with a free slot; a
+            # slot stays taken until the source succeeds or runs out of retries
+            while by_host:
+                ready = [host for host in by_host if active[host] < per_host_limit]
+                if not ready:
+                    slot_freed.clear()
+                    await slot_freed.wait()
+                    continue
+                for host in ready:
+                    active[host] += 1
+                    yield by_host[host].popleft()
+                    if not by_host[host]:
+                        del by_host[host]
+
+        async def ingest(batch: list[str]) -> tuple[list[Any], list[tuple[Any, str]]]:
+            source = batch[0]
+            attempts[source] += 1
+            body = {
+                field: [source] if field == "queries" else source,
+                "collection_name": collections[source],
+            }
+            finished = True
+            try:
+                response = await self.client.post(endpoint, json_data=body)
+                ledger.record(collections[source], source, content_hash(response))
+                unsaved[0] += 1
+                if unsaved[0] >= LEDGER_FLUSH_EVERY:
+                    unsaved[0] = 0
+                    # Snapshot on the loop; other workers keep recording while the file is written
+                    payload = ledger.dumps()
+                    async with save_lock:
+                        await asyncio.to_thread(ledger.write, payload)
+                return [source], []
+            except Exception:
+                # The pipeline retries this source; keep its host slot until the last attempt
+                finished = attempts[source] > max_retries
+                raise
+            finally:
+                if finished:
+                    release(source)
+
+        total = len(pending)
+
+        async def on_progress(completed: int, failed: int) -> None:
+            await self._report_progress(
+                completed + failed, total, f"{completed} ingested, {failed} failed of {total}"
+            )
+
+        pipeline = Pipeline(
+            [PipelineStage("ingest", ingest, concurrency=concurrency, max_retries=max_retries)]
+        )
+        try:
+            outcome = await pipeline.run(schedule(), on_progress=on_progress)
+        finally:
+            await asyncio.to_thread(ledger.save)
+
+        duration = outcome.duration_seconds
+        stored = set(outcome.outputs).union(skipped)
+        result = {
+            "collection_name": collection_name,
+            "collection_names": [collections[source] for source in sources if source in stored],
+            "kind": kind,
+            "total": len(sources),
+            "ingested": outcome.outputs,
+            "skipped": skipped,
+            "failed": invalid + [{"source": f["item"], "error": f["error"]} for f in outcome.failures],
+            "summary": {
+                "ingested": len(outcome.outputs),
+                "skipped": len(skipped),
+                "failed": len(invalid) + len(outcome.failures),
+                "retried": outcome.stats[0].retried,
+                "hosts": hosts,
+                "duration_ms": round(duration * 1000, 1),
+                "items_per_second": round(len(outcome.outputs) / duration, 2) if duration > 0 else None,
+            },
+        }
+
+        self._log_execution_end(result)
+        return result
+
+    @staticmethod
+    def _source_collection(collection_name: str, source: str) -> str:
+        """Derive the collection holding one source.
+
+        Args:
+            collection_name: Requested base collection name
+            source: URL or search query
+
+        Returns:
+            <collection_name>-<hash of source>, within the collection name limit
+        """
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:SOURCE_HASH_CHARS]
+        return f"{collection_name[:MAX_COLLECTION_CHARS - SOURCE_HASH_CHARS - 1]}-{digest}"
+
+    @staticmethod
+    def _ledger_path(ledger_path: Any) -> Path:
+        """Resolve the ledger file, confined to the cache directory.
+
+        Args:
+            ledger_path: Caller-supplied path, relative to the cache directory or absolute
+
+        Returns:
+            Resolved ledger path
+
+        Raises:
+            ValidationError: If the path is not a string or escapes the cache directory
+        """
+        if ledger_path is not None and not isinstance(ledger_path, str):
+            raise ValidationError("ledger_path must be a string")
+        base = Path(LEDGER_DIR).expanduser().resolve()
+        path = (base / Path(ledger_path or DEFAULT_LEDGER_NAME).expanduser()).resolve()
+        if path == base or not path.is_relative_to(base):
+            raise ValidationError(f"ledger_path must be a file inside {LEDGER_DIR}")
+        return path
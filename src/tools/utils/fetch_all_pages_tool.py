@@ -0,0 +1,241 @@
+"""Fetch all pages tool - Walk every page of a paged list endpoint in one call."""
+
+import asyncio
+import json
+import operator
+import time
+from pathlib import Path
+from typing import Any, Callable
+from src.tools.base import BaseTool
+from src.exceptions import ValidationError
+from src.utils.pagination import PAGINATED_TOOLS
+from src.utils.validation import ToolInputValidator
+
+# Comparison operators accepted in stop_when
+STOP_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+}
+
+# Items returned inline when no spool file is given
+INLINE_MAX_ITEMS = 5000
+
+# Spool files live in the cache directory; spool_path may not escape it
+SPOOL_DIR = "~/.cache/openwebui-mcp"
+
+
+def build_stop_condition(condition: Any) -> Callable[[Any], bool] | None:
+    """Build a stop predicate from a {field, op, value} condition.
+
+    Args:
+        condition: Condition dict, or None
+
+    Returns:
+        Predicate over items, or None
+
+    Raises:
+        ValidationError: If the condition is malformed
+    """
+    if condition is None:
+        return None
+    if not isinstance(condition, dict) or not isinstance(condition.get("field"), str):
+        raise ValidationError("stop_when must be an object with field, op and value")
+    op = STOP_OPERATORS.get(condition.get("op", "eq"))
+    if op is None:
+        raise ValidationError(f"stop_when.op must be one of: {', '.join(STOP_OPERATORS)}")
+    field = condition["field"]
+    value = condition.get("value")
+
+    def predicate(item: Any) -> bool:
+        if not isinstance(item, dict) or item.get(field) is None:
+            return False
+        try:
+            return op(item[field], value)
+        except TypeError:
+            return False
+
+    return predicate
+
+
+class FetchAllPagesTool(BaseTool):
+    """Fetch every item of a paged list tool in one call.
+
+    Pages are fetched concurrently with a look-ahead window. Items are
+    streamed to a JSONL spool file (bounded memory) or returned inline, and
+    MCP progress notifications report the running item count.
+    """
+
+    def get_definition(self) -> dict[str, Any]:
+        """Get MCP tool definition.
+
+        Returns:
+            Tool definition with schema
+        """
+        return {
+            "name": "fetch_all_pages",
+            "description": (
+                "Fetch all pages of a paged list tool (chats, users, channel messages, ...) "
+                "with concurrent look-ahead, optionally streaming items to a JSONL file"
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "tool": {
+                        "type": "string",
+                        "enum": sorted(PAGINATED_TOOLS),
+                        "description": "Paged list tool to walk"
+                    },
+                    "arguments": {
+                        "type": "object",
+                        "description": (
+                            "Arguments of the paged tool other than paging "
+                            "(path parameters such as id, filters such as query)"
+                        )
+                    },
+                    "max_items": {
+                        "type": ["integer", "null"],
+                        "description": f"Stop after this many items (inline default: {INLINE_MAX_ITEMS})",
+                        "minimum": 1
+                    },
+                    "stop_when": {
+                        "type": ["object", "null"],
+                        "description": (
+                            "Stop before the first item matching {field, op, value}; "
+                            f"op is one of {', '.join(STOP_OPERATORS)}"
+                        )
+                    },
+                    "lookahead": {
+                        "type": "integer",
+                        "description": "Pages fetched ahead concurrently (1-16)",
+                        "default": 4,
+                        "minimum": 1,
+                        "maximum": 16
+                    },
+                    "spool_path": {
+                        "type": ["string", "null"],
+                        "description": (
+                            f"Write items to this JSONL file inside {SPOOL_DIR} instead of returning them"
+                        )
+                    }
+                },
+                "required": ["tool"]
+            }
+        }
+
+    async def execute(self, arguments: dict[str, Any]) -> dict[str, Any]:
+        """Execute paged fetch.
+
+        Args:
+            arguments: Tool arguments with tool name, paging limits and output
+
+        Returns:
+            Dict with item count and either the items or the spool path
+
+        Raises:
+            ValidationError: If arguments invalid or the spool path is outside
+                the cache directory
+        """
+        self._log_execution_start(arguments)
+
+        spec = PAGINATED_TOOLS.get(arguments.get("tool"))
+        if spec is None:
+            raise ValidationError(f"tool must be one of: {', '.join(sorted(PAGINATED_TOOLS))}")
+        tool_args = dict(arguments.get("arguments") or {})
+        path_params = {
+            name: ToolInputValidator.validate_id(tool_args.pop(name, None), name)
+            for name in spec.path_params
+        }
+        # Paging is driven by the iterator
+        for key in ("page", "skip", "limit"):
+            tool_args.pop(key, None)
+        params = {k: v for k, v in tool_args.items() if v is not None}
+
+        spool_path = arguments.get("spool_path")
+        spool_file = self._spool_path(spool_path) if spool_path else None
+        max_items = arguments.get("max_items")
+        if max_items is not None:
+            max_items = ToolInputValidator.validate_int_range(max_items, "max_items", 1, 10**9)
+        elif spool_file is None:
+            max_items = INLINE_MAX_ITEMS
+        lookahead = ToolInputValidator.validate_int_range(
+            arguments.get("lookahead", 4), "lookahead", 1, 16
+        )
+        stop_when = build_stop_condition(arguments.get("stop_when"))
+
+        start = time.monotonic()
+        items: list[Any] = []
+        count = 0
+        stopped_early = False
+        spool = None
+        if spool_file is not None:
+            await asyncio.to_thread(spool_file.parent.mkdir, parents=True, exist_ok=True)
+            spool = await asyncio.to_thread(open, spool_file, "w", encoding="utf-8")
+
+        def stop(item: Any) -> bool:
+            nonlocal stopped_early
+            if stop_when is not None and stop_when(item):
+                stopped_early = True
+                return True
+            return False
+
+        try:
+            buffer: list[str] = []
+            async for item in self._paginate(
+                spec, path_params, params, lookahead=lookahead, max_items=max_items, stop_when=stop
+            ):
+                count += 1
+                if spool is None:
+                    items.append(item)
+                else:
+                    buffer.append(json.dumps(item, default=str) + "\n")
+                    if len(buffer) >= 500:
+                        await asyncio.to_thread(spool.write, "".join(buffer))
+                        buffer.clear()
+                if count % 500 == 0:
+                    await self._report_progress(count, max_items, f"{count} items")
+            if spool is not None and buffer:
+                await asyncio.to_thread(spool.write, "".join(buffer))
+        finally:
+            if spool is not None:
+                await asyncio.to_thread(spool.close)
+
+        await self._report_progress(count, count, f"{count} items")
+        result: dict[str, Any] = {
+            "tool": arguments["tool"],
+            "count": count,
+            "truncated": max_items is not None and count >= max_items,
+            "stopped_early": stopped_early,
+            "duration_ms": round((time.monotonic() - start) * 1000, 1),
+        }
+        if spool is None:
+            result["items"] = items
+        else:
+            result["spool_path"] = str(spool_file)
+
+        self._log_execution_end(result)
+        return result
+
+    @staticmethod
+    def _spool_path(spool_path: Any) -> Path:
+        """Resolve the spool file, confined to the cache directory.
+
+        Args:
+            spool_path: Caller-supplied path, relative to the cache directory or absolute
+
+        Returns:
+            Resolved spool path
+
+        Raises:
+            ValidationError: If the path is not a string or escapes the cache directory
+        """
+        if not isinstance(spool_path, str):
+            raise ValidationError("spool_path must be a string")
+        base = Path(SPOOL_DIR).expanduser().resolve()
+        path = (base / Path(spool_path).expanduser()).resolve()
+        if path == base or not path.is_relative_to(base):
+            raise ValidationError(f"spool_path must be a file inside {SPOOL_DIR}")
+        return path
@@ -0,0 +1,88 @@
+"""Append-only ledger of chats imported into an Open WebUI instance.
+
+Each line maps a source chat id to the chat created for it on the target
+and whether its folder and tags were applied. Appending keeps checkpoints
+cheap however many chats a migration covers; the last line for a source
+wins when the ledger is loaded.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+class ChatImportLedger:
+    """JSONL ledger of imported chats.
+
+    Args:
+        path: Ledger file location
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize ledger.
+
+        Args:
+            path: Ledger file location
+        """
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+
+    def load(self) -> None:
+        """Load ledger from disk if it exists.
+
+        A partial last line left by an interrupted append is cut off so
+        later appends start on a clean line.
+
+        Raises:
+            ValueError: If the ledger is unreadable
+        """
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            if data and not data.endswith(b"\n"):
+                data = data[:data.rfind(b"\n") + 1]
+                with open(self.path, "r+b") as f:
+                    f.truncate(len(data))
+        except OSError as e:
+            raise ValueError(f"Unreadable chat import ledger {self.path}: {e}") from e
+
+        for line_number, line in enumerate(data.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{self.path}:{line_number}: invalid ledger entry: {e}") from e
+            self.entries[entry["source_id"]] = entry
+
+    def get(self, source_id: str) -> dict[str, Any] | None:
+        """Get the entry for a source chat.
+
+        Args:
+            source_id: Source chat id
+
+        Returns:
+            Ledger entry, or None if the chat was not imported
+        """
+        return self.entries.get(source_id)
+
+    def append(self, entries: list[dict[str, Any]]) -> None:
+        """Record entries and append them to the ledger file.
+
+        Args:
+            entries: Entries with source_id, chat_id and organized
+        """
+        if not entries:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        for entry in entries:
+            self.entries[entry["source_id"]] = entry
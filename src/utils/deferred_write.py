@@ -0,0 +1,78 @@
+"""Blocking file writes handed to the background log writer thread.
+
+Appends to local files (slow log, trace export, embedding cache) are queued
+on the bounded queue drained by the logging listener thread, so they never
+block the event loop. setup_logging() attaches that queue; without it, or
+when the queue is full, writes run immediately in the caller's thread.
+"""
+
+import logging
+import queue
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_queue: queue.Queue | None = None
+
+
+class DeferredWrite:
+    """A file write queued for the background writer thread.
+
+    Args:
+        write: Callable performing the write
+        args: Positional arguments for write
+    """
+
+    def __init__(self, write: Callable[..., None], args: tuple[Any, ...]) -> None:
+        """Initialize deferred write.
+
+        Args:
+            write: Callable performing the write
+            args: Positional arguments for write
+        """
+        self.write = write
+        self.args = args
+
+    def run(self) -> None:
+        """Perform the write, logging rather than raising failures."""
+        try:
+            self.write(*self.args)
+        except Exception as e:
+            logger.warning(f"Background write failed: {e}")
+
+
+def attach_writer_queue(writer_queue: queue.Queue) -> None:
+    """Send deferred writes to a queue drained by a background thread.
+
+    Args:
+        writer_queue: Queue whose consumer runs DeferredWrite items
+    """
+    global _queue
+    _queue = writer_queue
+
+
+def detach_writer_queue() -> None:
+    """Run deferred writes inline again."""
+    global _queue
+    _queue = None
+
+
+def defer_write(write: Callable[..., None], *args: Any) -> None:
+    """Run a blocking file write on the background writer thread.
+
+    Writes run in submission order. Without a writer queue, or when it is
+    full, the write runs immediately instead of being lost.
+
+    Args:
+        write: Callable performing the write
+        *args: Positional arguments for write
+    """
+    task = DeferredWrite(write, args)
+    writer_queue = _queue
+    if writer_queue is not None:
+        try:
+            writer_queue.put_nowait(task)
+            return
+        except queue.Full:
+            pass
+    task.run()
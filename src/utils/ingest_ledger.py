@@ -0,0 +1,124 @@
+"""Local ledger of sources already ingested into collections.
+
+Maps collection → source (URL or search query) → content hash, so batch
+ingestion can skip sources that were already processed into the target
+collection by an earlier run.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+LEDGER_VERSION = 1
+
+
+def content_hash(response: Any) -> str:
+    """Hash the ingested content of a process response.
+
+    Uses the extracted document text when the response carries it and
+    falls back to the whole response otherwise.
+
+    Args:
+        response: Upstream process response
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    content = None
+    if isinstance(response, dict):
+        content = ((response.get("file") or {}).get("data") or {}).get("content")
+    if not isinstance(content, str):
+        content = json.dumps(response, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class IngestLedger:
+    """JSON ledger of ingested sources per collection.
+
+    Args:
+        path: Ledger file location
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize ledger.
+
+        Args:
+            path: Ledger file location
+        """
+        self.path = path
+        self.collections: dict[str, dict[str, dict[str, Any]]] = {}
+
+    def load(self) -> None:
+        """Load ledger from disk if it exists.
+
+        Raises:
+            ValueError: If the ledger is unreadable or has an unknown version
+        """
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Unreadable ingest ledger {self.path}: {e}") from e
+
+        if data.get("version") != LEDGER_VERSION:
+            raise ValueError(f"Unsupported ingest ledger version: {data.get('version')}")
+
+        self.collections = data.get("collections", {})
+
+    def dumps(self) -> str:
+        """Serialize the ledger.
+
+        Returns:
+            JSON document
+        """
+        return json.dumps(
+            {"version": LEDGER_VERSION, "collections": self.collections},
+            separators=(",", ":"),
+        )
+
+    def write(self, payload: str) -> None:
+        """Write a serialized ledger atomically (temp file + rename).
+
+        Args:
+            payload: JSON document from dumps()
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    def save(self) -> None:
+        """Write ledger atomically."""
+        self.write(self.dumps())
+
+    def contains(self, collection_name: str, source: str) -> bool:
+        """Check whether a source was ingested into a collection.
+
+        Args:
+            collection_name: Target collection
+            source: URL or query
+
+        Returns:
+            True if recorded
+        """
+        return source in self.collections.get(collection_name, {})
+
+    def record(self, collection_name: str, source: str, digest: str) -> None:
+        """Record an ingested source.
+
+        Args:
+            collection_name: Target collection
+            source: URL or query
+            digest: Content hash of the ingested document
+        """
+        self.collections.setdefault(collection_name, {})[source] = {
+            "sha256": digest,
+            "ingested_at": int(time.time()),
+        }
@@ -0,0 +1,271 @@
+"""Compressed JSONL archives written in independently compressed blocks.
+
+Archives are appended one block at a time. With compression each block is
+a complete gzip member or zstd frame, so the file is valid after every
+block, can be truncated back to any block boundary and resumed, and is
+read back as one continuous stream.
+"""
+
+import asyncio
+import gzip
+import io
+import itertools
+import json
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+COMPRESSIONS = (COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD)
+
+CHECKPOINT_VERSION = 1
+
+
+def compression_for_path(path: Path) -> str:
+    """Infer compression from the file suffix.
+
+    Args:
+        path: Archive path
+
+    Returns:
+        Compression name
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        return COMPRESSION_GZIP
+    if suffix in (".zst", ".zstd"):
+        return COMPRESSION_ZSTD
+    return COMPRESSION_NONE
+
+
+def _zstandard() -> Any:
+    """Import the optional zstandard module.
+
+    Returns:
+        zstandard module
+
+    Raises:
+        ValueError: If zstandard is not installed
+    """
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ValueError(
+            "zstd compression requires the zstandard package (pip install open-webui-mcp[zstd])"
+        ) from e
+    return zstandard
+
+
+def encode_block(records: list[Any], compression: str) -> bytes:
+    """Encode records as one self-contained JSONL block.
+
+    Args:
+        records: JSON-serializable records
+        compression: Compression name
+
+    Returns:
+        Block bytes
+
+    Raises:
+        ValueError: If the compression is unknown or unavailable
+    """
+    data = b"".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        + b"\n"
+        for record in records
+    )
+    if compression == COMPRESSION_NONE:
+        return data
+    if compression == COMPRESSION_GZIP:
+        return gzip.compress(data, compresslevel=6)
+    if compression == COMPRESSION_ZSTD:
+        return _zstandard().ZstdCompressor(level=3).compress(data)
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def iter_jsonl(path: Path, compression: str | None = None) -> Iterator[Any]:
+    """Stream records from a (compressed) JSONL archive.
+
+    Args:
+        path: Archive path
+        compression: Compression name (inferred from the suffix if None)
+
+    Yields:
+        Parsed records; blank lines are skipped
+
+    Raises:
+        ValueError: If a line is not valid JSON or the compression is unavailable
+    """
+    compression = compression or compression_for_path(path)
+    with open(path, "rb") as raw:
+        if compression == COMPRESSION_GZIP:
+            reader: Any = gzip.GzipFile(fileobj=raw)
+        elif compression == COMPRESSION_ZSTD:
+            reader = io.BufferedReader(
+                _zstandard().ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+            )
+        else:
+            reader = raw
+        for line_number, line in enumerate(reader, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from e
+
+
+async def aiter_jsonl(
+    path: Path,
+    compression: str | None = None,
+    chunk_size: int = 100
+) -> AsyncIterator[Any]:
+    """Stream records from an archive, reading and decoding in a worker thread.
+
+    Args:
+        path: Archive path
+        compression: Compression name (inferred from the suffix if None)
+        chunk_size: Records read per thread hop
+
+    Yields:
+        Parsed records
+
+    Raises:
+        ValueError: If a line is not valid JSON or the compression is unavailable
+    """
+    records = iter_jsonl(path, compression)
+    try:
+        while True:
+            chunk = await asyncio.to_thread(lambda: list(itertools.islice(records, chunk_size)))
+            if not chunk:
+                return
+            for record in chunk:
+                yield record
+    finally:
+        records.close()
+
+
+class ArchiveWriter:
+    """Append-only block writer with a resumable checkpoint.
+
+    The checkpoint records the byte offset after the last durable block.
+    Reopening with resume truncates anything written after it, so a crash
+    mid-block never leaves a corrupt archive.
+
+    Args:
+        path: Archive path
+        compression: Compression name
+    """
+
+    def __init__(self, path: Path, compression: str) -> None:
+        """Initialize writer.
+
+        Args:
+            path: Archive path
+            compression: Compression name
+        """
+        self.path = path
+        self.compression = compression
+        self.checkpoint_path = path.with_name(path.name + ".checkpoint.json")
+        self.offset = 0
+        self.records = 0
+        self._file: Any = None
+
+    def open(self, resume: bool) -> bool:
+        """Open the archive, resuming from the checkpoint if asked and present.
+
+        Args:
+            resume: Continue an interrupted archive instead of starting over
+
+        Returns:
+            True if an earlier archive was resumed
+
+        Raises:
+            ValueError: If the checkpoint is unreadable or does not match
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        checkpoint = self._load_checkpoint() if resume else None
+        if checkpoint is None:
+            self._file = open(self.path, "wb")
+            self.offset = 0
+            self.records = 0
+            self._save_checkpoint()
+            return False
+
+        if checkpoint.get("compression") != self.compression:
+            raise ValueError(
+                f"Checkpoint was written with {checkpoint.get('compression')} compression, "
+                f"not {self.compression}"
+            )
+        self._file = open(self.path, "r+b" if self.path.exists() else "wb")
+        self.offset = int(checkpoint.get("offset", 0))
+        self.records = int(checkpoint.get("records", 0))
+        # Drop any partial block written after the last checkpoint
+        self._file.truncate(self.offset)
+        self._file.seek(self.offset)
+        return True
+
+    def write_block(self, records: list[Any]) -> None:
+        """Append records as one block and advance the checkpoint.
+
+        Args:
+            records: Records to append
+        """
+        if not records:
+            return
+        block = encode_block(records, self.compression)
+        self._file.write(block)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.offset += len(block)
+        self.records += len(records)
+        self._save_checkpoint()
+
+    def close(self, complete: bool) -> None:
+        """Close the archive.
+
+        Args:
+            complete: Remove the checkpoint because the archive is finished
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if complete:
+            self.checkpoint_path.unlink(missing_ok=True)
+
+    def _load_checkpoint(self) -> dict[str, Any] | None:
+        """Load the checkpoint if it exists.
+
+        Returns:
+            Checkpoint data, or None
+
+        Raises:
+            ValueError: If the checkpoint is unreadable or has an unknown version
+        """
+        if not self.checkpoint_path.exists():
+            return None
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Unreadable checkpoint {self.checkpoint_path}: {e}") from e
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {data.get('version')}")
+        return data
+
+    def _save_checkpoint(self) -> None:
+        """Write the checkpoint atomically (temp file + rename)."""
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": CHECKPOINT_VERSION,
+                    "compression": self.compression,
+                    "offset": self.offset,
+                    "records": self.records,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,101 @@
+"""Server lifecycle: readiness, in-flight tool calls and draining.
+
+The server starts in the "starting" state and turns "ready" once start-up
+warm-up finishes. On shutdown it turns "draining": new SSE sessions and
+tool calls are refused, tool calls already running get until a deadline
+to finish, then the remaining SSE sessions are cancelled so the HTTP
+server can close their connections.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Literal
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+State = Literal["starting", "ready", "draining"]
+
+# Seconds between in-flight checks while draining
+DRAIN_POLL_INTERVAL = 0.05
+
+# Seconds left for the last responses to reach their SSE streams before
+# sessions are cancelled; a finished call's response is still being sent
+SESSION_FLUSH_DELAY = 0.1
+
+
+class Lifecycle:
+    """Track server readiness, in-flight tool calls and open SSE sessions."""
+
+    def __init__(self) -> None:
+        """Initialize lifecycle in the starting state."""
+        self.state: State = "starting"
+        self.in_flight = 0
+        self._sessions: set[anyio.CancelScope] = set()
+
+    @property
+    def accepting(self) -> bool:
+        """Whether new sessions and tool calls are accepted."""
+        return self.state != "draining"
+
+    @property
+    def sessions(self) -> int:
+        """Number of open SSE sessions."""
+        return len(self._sessions)
+
+    def mark_ready(self) -> None:
+        """Report the server ready, unless it is already draining."""
+        if self.state == "starting":
+            self.state = "ready"
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """Count a tool call as in flight while the block runs."""
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        """Run an SSE session that draining can cancel.
+
+        Cancellation ends the block quietly, so the handler returns normally.
+        """
+        with anyio.CancelScope() as scope:
+            self._sessions.add(scope)
+            try:
+                yield
+            finally:
+                self._sessions.discard(scope)
+
+    async def drain(self, timeout: float) -> int:
+        """Stop accepting work and wait for in-flight tool calls.
+
+        Safe to call more than once; later calls return once the first
+        drain's calls are done or abandoned.
+
+        Args:
+            timeout: Seconds to wait for in-flight tool calls
+
+        Returns:
+            Tool calls still running at the deadline
+        """
+        if self.state != "draining":
+            self.state = "draining"
+            logger.info(f"Draining {self.in_flight} in-flight tool calls and {self.sessions} SSE sessions")
+        deadline = time.monotonic() + timeout
+        while self.in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
+        remaining = self.in_flight
+        if remaining:
+            logger.warning(f"Drain deadline of {timeout:g}s passed with {remaining} tool calls running")
+        if self._sessions:
+            await asyncio.sleep(SESSION_FLUSH_DELAY)
+        for scope in list(self._sessions):
+            scope.cancel()
+        return remaining
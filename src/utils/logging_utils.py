@@ -1,17 +1,171 @@
 """Logging configuration and utilities.
 
-Provides structured JSON logging with request tracing support.
+Provides structured JSON logging with request tracing support. Records are
+handed to a background thread through a bounded queue so that formatting
+and stdout writes never block the event loop, and high-volume loggers can
+be sampled below WARNING. The same queue and thread also carry the file
+appends queued with src.utils.deferred_write.defer_write().
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-import json
-from datetime import datetime
+import time
 from typing import Any
+from src.utils.deferred_write import DeferredWrite, attach_writer_queue, detach_writer_queue
+from src.utils.tracing import current_trace
+
+# LogRecord attributes that are not `extra` fields
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# Argument keys containing these are redacted in logs
+SENSITIVE_KEYS = ("password", "token", "api_key", "secret", "auth")
+
+# Longer string arguments are truncated in logs
+MAX_LOGGED_STRING = 200
+
+_listener: "WriterQueueListener | None" = None
+
+
+def sanitize_for_logging(arguments: dict[str, Any]) -> dict[str, Any]:
+    """Redact sensitive values and truncate long strings in tool arguments.
+
+    Args:
+        arguments: Raw arguments
+
+    Returns:
+        Sanitized arguments safe for logging
+    """
+    sanitized: dict[str, Any] = {}
+    for key, value in arguments.items():
+        if any(s in key.lower() for s in SENSITIVE_KEYS):
+            sanitized[key] = '***REDACTED***'
+        elif isinstance(value, str) and len(value) > MAX_LOGGED_STRING:
+            sanitized[key] = f"{value[:MAX_LOGGED_STRING]}... (truncated)"
+        elif isinstance(value, dict):
+            sanitized[key] = sanitize_for_logging(value)
+        else:
+            sanitized[key] = value
+    return sanitized
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request and MCP session ids to log records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Add request_id and session_id from the active trace.
+
+        Args:
+            record: Log record
+
+        Returns:
+            Always True
+        """
+        trace = current_trace()
+        if trace is not None:
+            if not hasattr(record, "request_id"):
+                record.request_id = trace.request_id
+            if trace.session_id and not hasattr(record, "session_id"):
+                record.session_id = trace.session_id
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of records below WARNING for selected loggers.
+
+    Rates apply to a logger and its children; the most specific configured
+    name wins. Every 1/rate-th record is kept, so sampling is even rather
+    than random. WARNING and above always pass.
+
+    Args:
+        rates: Fraction of records to keep by logger name ("*" for default)
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        """Initialize filter.
+
+        Args:
+            rates: Fraction of records to keep by logger name
+        """
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float] = {}
+        self._credit: dict[str, float] = {}
+        self.dropped = 0
+
+    def _rate_for(self, name: str) -> float:
+        """Resolve the rate for a logger name.
+
+        Args:
+            name: Logger name
+
+        Returns:
+            Fraction of records to keep
+        """
+        rate = self._resolved.get(name)
+        if rate is None:
+            prefix = name
+            while prefix and prefix not in self.rates:
+                prefix = prefix.rpartition(".")[0]
+            rate = self.rates.get(prefix or "*", 1.0)
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether to keep a record.
+
+        Args:
+            record: Log record
+
+        Returns:
+            True to keep the record
+        """
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate >= 1.0:
+            return True
+        credit = self._credit.get(record.name, 0.0) + rate
+        if credit >= 1.0:
+            self._credit[record.name] = credit - 1.0
+            return True
+        self._credit[record.name] = credit
+        self.dropped += 1
+        return False
 
 
 class JSONFormatter(logging.Formatter):
-    """JSON log formatter for structured logging."""
+    """JSON log formatter for structured logging.
+
+    Emits every `extra` field passed to the logger. Timestamps are built
+    from the record's creation time with a per-second cache.
+    """
+
+    def __init__(self) -> None:
+        """Initialize formatter."""
+        super().__init__()
+        self._encoder = json.JSONEncoder(default=str, ensure_ascii=False)
+        self._second = -1
+        self._second_text = ""
+
+    def _timestamp(self, created: float) -> str:
+        """Format a record time as ISO 8601 UTC with microseconds.
+
+        Args:
+            created: Record creation time (epoch seconds)
+
+        Returns:
+            Timestamp string
+        """
+        second = int(created)
+        if second != self._second:
+            self._second = second
+            self._second_text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._second_text}.{int((created - second) * 1_000_000):06d}Z"
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON.
@@ -23,34 +177,105 @@ class JSONFormatter(logging.Formatter):
             JSON-formatted log string
         """
         log_data: dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
-        # Add exception info if present
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
+        # Add exception info if present (pre-rendered when queued)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_data["exception"] = record.exc_text
 
         # Add extra fields
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
-        if hasattr(record, "tool"):
-            log_data["tool"] = record.tool
-        if hasattr(record, "duration_ms"):
-            log_data["duration_ms"] = record.duration_ms
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                log_data[key] = value
+
+        return self._encoder.encode(log_data)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the queue is full.
+
+    Records are rendered just enough to be thread-safe (message merged with
+    its args, exception text pre-formatted) while keeping extra fields for
+    the formatter in the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        """Initialize handler.
+
+        Args:
+            log_queue: Bounded queue drained by a QueueListener
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy a record for hand-off to the listener thread.
 
-        return json.dumps(log_data)
+        Args:
+            record: Log record
+
+        Returns:
+            Prepared copy
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Enqueue a record, dropping it if the queue is full.
+
+        Args:
+            record: Prepared record
+        """
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class WriterQueueListener(logging.handlers.QueueListener):
+    """Queue listener that also performs deferred file writes."""
 
+    def handle(self, record: Any) -> None:
+        """Run a deferred write or hand a log record to the handlers.
 
-def setup_logging(level: str = "INFO", format_type: str = "json") -> None:
+        Args:
+            record: Log record or DeferredWrite
+        """
+        if isinstance(record, DeferredWrite):
+            record.run()
+        else:
+            super().handle(record)
+
+
+def setup_logging(
+    level: str = "INFO",
+    format_type: str = "json",
+    queue_size: int = 10000,
+    sample_rates: dict[str, float] | None = None
+) -> None:
     """Configure logging for the application.
 
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         format_type: Format type (json or text)
+        queue_size: Records buffered for the background writer thread
+            (0 writes synchronously)
+        sample_rates: Fraction of records below WARNING to keep by logger
     """
+    global _listener
+    shutdown_logging()
+
     log_level = getattr(logging, level.upper(), logging.INFO)
 
     # Create handler
@@ -66,11 +291,36 @@ def setup_logging(level: str = "INFO", format_type: str = "json") -> None:
             )
         )
 
+    # Filters run before queueing, in the caller's context where the trace
+    # context variable is visible
+    front: logging.Handler = handler
+    if queue_size > 0:
+        front = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        _listener = WriterQueueListener(front.queue, handler)
+        _listener.start()
+        attach_writer_queue(front.queue)
+    if sample_rates:
+        front.addFilter(SamplingFilter(sample_rates))
+    front.addFilter(RequestContextFilter())
+
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     root_logger.handlers = []
-    root_logger.addHandler(handler)
+    root_logger.addHandler(front)
+
+
+def shutdown_logging() -> None:
+    """Stop the background writer thread after flushing queued records and writes."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        # Detached first, so writes deferred while draining run inline
+        detach_writer_queue()
+        listener.stop()
+
+
+atexit.register(shutdown_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
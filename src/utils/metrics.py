@@ -0,0 +1,512 @@
+"""Lightweight in-process metrics primitives.
+
+Provides fixed-bucket histograms for latency and size distributions that can
+be exported as plain dicts through admin tools, and labelled metric families
+collected in a registry that renders the Prometheus text exposition format
+for the server's /metrics route.
+"""
+
+import math
+import re
+import threading
+from typing import Any, Callable
+
+# Default latency buckets in milliseconds
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Default size buckets (items per batch)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+# Default latency buckets in seconds for exported metrics
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Event loop lag buckets in seconds
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+# Label combinations kept per metric; later ones are folded into "other"
+MAX_SERIES = 1000
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_ROUTE_SEGMENT = re.compile(r"^(?:[a-z][a-z_-]*|v\d+)$")
+
+
+class Histogram:
+    """Cumulative fixed-bucket histogram.
+
+    Args:
+        buckets: Sorted upper bounds of the buckets
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        """Initialize histogram.
+
+        Args:
+            buckets: Sorted upper bounds of the buckets
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value.
+
+        Args:
+            value: Observed value
+        """
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile from bucket counts.
+
+        Returns the upper bound of the bucket holding the quantile, which is
+        an upper estimate. Values above the last bucket report the last bound.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated quantile, or None if empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bound in enumerate(self.buckets):
+            seen += self.counts[index]
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export histogram.
+
+        Returns:
+            Dict with count, sum, mean, p50/p95/p99 and cumulative buckets
+        """
+        cumulative = 0
+        buckets: dict[str, int] = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[f"{bound:g}"] = cumulative
+        buckets["+Inf"] = self.count
+
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "mean": round(self.sum / self.count, 3) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+def route_template(path: str) -> str:
+    """Reduce a request path to a low-cardinality route template.
+
+    Segments that look like identifiers (containing digits, upper case or
+    punctuation, or unusually long) become ``{id}``, as does the segment
+    after ``command``. Version segments such as ``v1`` are kept.
+
+    Args:
+        path: Request path without query string
+
+    Returns:
+        Route template, e.g. /api/v1/chats/{id}/tags
+    """
+    segments = path.split("/")
+    for index, segment in enumerate(segments):
+        if not segment:
+            continue
+        if (
+            len(segment) > 32
+            or not _ROUTE_SEGMENT.match(segment)
+            or (index > 0 and segments[index - 1] == "command")
+        ):
+            segments[index] = "{id}"
+    return "/".join(segments)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value.
+
+    Args:
+        value: Label value
+
+    Returns:
+        Escaped value
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value.
+
+    Args:
+        value: Sample value
+
+    Returns:
+        Prometheus number
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    """Format a label set.
+
+    Args:
+        names: Label names
+        values: Label values
+        extra: Pre-formatted extra label (e.g. le="0.5")
+
+    Returns:
+        Label set including braces, or "" if empty
+    """
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricFamily:
+    """Labelled counter, gauge or histogram.
+
+    Args:
+        name: Metric name
+        documentation: Help text
+        kind: "counter", "gauge" or "histogram"
+        labelnames: Label names
+        buckets: Histogram bucket upper bounds
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = SECONDS_BUCKETS
+    ) -> None:
+        """Initialize metric family.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            kind: Metric type
+            labelnames: Label names
+            buckets: Histogram bucket upper bounds
+        """
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        """Build the series key for a label set.
+
+        Args:
+            labels: Label values by name
+
+        Returns:
+            Label values in labelnames order
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        if key not in self._series and len(self._series) >= MAX_SERIES:
+            key = tuple("other" for _ in self.labelnames)
+        return key
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Increase a counter or gauge.
+
+        Args:
+            amount: Increment
+            **labels: Label values
+        """
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        """Decrease a gauge.
+
+        Args:
+            amount: Decrement
+            **labels: Label values
+        """
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set a gauge.
+
+        Args:
+            value: New value
+            **labels: Label values
+        """
+        with self._lock:
+            self._series[self._key(labels)] = value
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record a histogram observation.
+
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        with self._lock:
+            key = self._key(labels)
+            histogram = self._series.get(key)
+            if histogram is None:
+                histogram = self._series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def get(self, **labels: Any) -> Any:
+        """Get the current value of one series.
+
+        Args:
+            **labels: Label values
+
+        Returns:
+            Number for counters and gauges, Histogram for histograms, or None
+        """
+        return self._series.get(tuple(str(labels.get(name, "")) for name in self.labelnames))
+
+    def collect(self) -> dict[tuple[str, ...], Any]:
+        """Snapshot all series.
+
+        Returns:
+            Values by label values
+        """
+        with self._lock:
+            return dict(self._series)
+
+
+class CallbackMetric:
+    """Metric whose series are read from a callback at scrape time.
+
+    Args:
+        name: Metric name
+        documentation: Help text
+        kind: "counter", "gauge" or "histogram"
+        labelnames: Label names
+        callback: Returns values (numbers or Histograms) by label values,
+            or a single value when there are no labels
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: tuple[str, ...],
+        callback: Callable[[], Any]
+    ) -> None:
+        """Initialize callback metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            kind: Metric type
+            labelnames: Label names
+            callback: Value source
+        """
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def collect(self) -> dict[tuple[str, ...], Any]:
+        """Read all series from the callback.
+
+        Returns:
+            Values by label values
+        """
+        values = self.callback()
+        if values is None:
+            return {}
+        if not isinstance(values, dict):
+            return {(): values}
+        return {key if isinstance(key, tuple) else (key,): value for key, value in values.items()}
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        """Initialize empty registry."""
+        self._metrics: dict[str, MetricFamily | CallbackMetric] = {}
+
+    def register(self, metric: Any) -> Any:
+        """Add a metric, replacing any metric with the same name.
+
+        Args:
+            metric: MetricFamily or CallbackMetric
+
+        Returns:
+            The metric
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        """Remove a metric.
+
+        Args:
+            name: Metric name
+        """
+        self._metrics.pop(name, None)
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> MetricFamily:
+        """Create and register a counter.
+
+        Args:
+            name: Metric name (ending in _total)
+            documentation: Help text
+            labelnames: Label names
+
+        Returns:
+            Counter family
+        """
+        return self.register(MetricFamily(name, documentation, "counter", labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> MetricFamily:
+        """Create and register a gauge.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+
+        Returns:
+            Gauge family
+        """
+        return self.register(MetricFamily(name, documentation, "gauge", labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = SECONDS_BUCKETS
+    ) -> MetricFamily:
+        """Create and register a histogram.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names
+            buckets: Bucket upper bounds
+
+        Returns:
+            Histogram family
+        """
+        return self.register(MetricFamily(name, documentation, "histogram", labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        callback: Callable[[], Any],
+        labelnames: tuple[str, ...] = ()
+    ) -> CallbackMetric:
+        """Create and register a callback metric.
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            kind: Metric type
+            callback: Value source
+            labelnames: Label names
+
+        Returns:
+            Callback metric
+        """
+        return self.register(CallbackMetric(name, documentation, kind, labelnames, callback))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Callback failures are skipped so one broken source cannot fail
+        the scrape.
+
+        Returns:
+            Exposition text
+        """
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            try:
+                series = metric.collect()
+            except Exception:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for values, value in sorted(series.items()):
+                if isinstance(value, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(value.buckets, value.counts):
+                        cumulative += count
+                        le = f'le="{_format_value(bound)}"'
+                        lines.append(
+                            f"{metric.name}_bucket{_format_labels(metric.labelnames, values, le)} {cumulative}"
+                        )
+                    inf = 'le="+Inf"'
+                    lines.append(
+                        f"{metric.name}_bucket{_format_labels(metric.labelnames, values, inf)} {value.count}"
+                    )
+                    labels = _format_labels(metric.labelnames, values)
+                    lines.append(f"{metric.name}_sum{labels} {_format_value(value.sum)}")
+                    lines.append(f"{metric.name}_count{labels} {value.count}")
+                elif value is not None:
+                    labels = _format_labels(metric.labelnames, values)
+                    lines.append(f"{metric.name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served by /metrics
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter(
+    "openwebui_mcp_tool_calls_total", "MCP tool calls by outcome", ("tool", "outcome")
+)
+TOOL_DURATION = REGISTRY.histogram(
+    "openwebui_mcp_tool_call_duration_seconds", "MCP tool call latency", ("tool",)
+)
+TOOL_ERRORS = REGISTRY.counter(
+    "openwebui_mcp_tool_errors_total", "Failed MCP tool calls by exception type", ("tool", "error_type")
+)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "openwebui_mcp_upstream_requests_total",
+    "Requests to Open WebUI by route template and status",
+    ("method", "route", "status"),
+)
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "openwebui_mcp_upstream_request_duration_seconds",
+    "Open WebUI request latency (until response headers) by route template and status",
+    ("method", "route", "status"),
+)
+SSE_SESSIONS = REGISTRY.gauge("openwebui_mcp_sse_sessions_active", "Open SSE sessions")
+SSE_SESSIONS.set(0)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "openwebui_mcp_event_loop_lag_seconds", "Delay of event loop callbacks past their scheduled time",
+    buckets=LAG_BUCKETS,
+)
+EVENT_LOOP_BLOCKED = REGISTRY.counter(
+    "openwebui_mcp_event_loop_blocked_total", "Event loop stalls longer than the blocking threshold"
+)
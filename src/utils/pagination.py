@@ -0,0 +1,207 @@
+"""Pagination specs and a concurrent look-ahead page iterator.
+
+Open WebUI list endpoints page in different ways: some take a 1-based
+``page`` number with a server-defined page size, others take ``skip`` and
+``limit``. PAGINATED_TOOLS records the style of each paged tool so callers
+can walk every page without knowing the details.
+"""
+
+import asyncio
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+# Paging styles
+STYLE_PAGE = "page"  # ?page=1,2,... until an empty page
+STYLE_SKIP_LIMIT = "skip_limit"  # skip/limit until a short page
+
+
+class PagingSpec:
+    """How a list endpoint pages.
+
+    Args:
+        endpoint: Endpoint path template with {path_param} placeholders
+        style: STYLE_PAGE or STYLE_SKIP_LIMIT
+        method: HTTP method (GET sends paging in the query, POST in the body)
+        page_size: Items per page for skip/limit endpoints
+        items_key: Key holding the items when the response is an object
+        path_params: Required path parameters
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        style: str,
+        method: str = "GET",
+        page_size: int = 50,
+        items_key: str | None = None,
+        path_params: tuple[str, ...] = ()
+    ) -> None:
+        """Initialize paging spec.
+
+        Args:
+            endpoint: Endpoint path template
+            style: Paging style
+            method: HTTP method
+            page_size: Items per page for skip/limit endpoints
+            items_key: Key holding the items in object responses
+            path_params: Required path parameters
+        """
+        self.endpoint = endpoint
+        self.style = style
+        self.method = method
+        self.page_size = page_size
+        self.items_key = items_key
+        self.path_params = path_params
+
+    def page_args(self, index: int) -> dict[str, Any]:
+        """Paging arguments for a zero-based page index.
+
+        Args:
+            index: Zero-based page index
+
+        Returns:
+            Query or body fields selecting the page
+        """
+        if self.style == STYLE_SKIP_LIMIT:
+            return {"skip": index * self.page_size, "limit": self.page_size}
+        return {"page": index + 1}
+
+    def extract_items(self, response: Any) -> list[Any]:
+        """Pull the list of items out of a page response.
+
+        Args:
+            response: Page response
+
+        Returns:
+            Items on the page
+        """
+        if self.items_key and isinstance(response, dict):
+            return list(response.get(self.items_key) or [])
+        if isinstance(response, list):
+            return response
+        return []
+
+
+# Query parameters that make /chats/list include every chat; newer Open WebUI
+# versions leave pinned chats and chats in folders out by default
+CHAT_LIST_ALL_PARAMS = {"include_pinned": "true", "include_folders": "true"}
+
+# Paged tools by tool name
+PAGINATED_TOOLS: dict[str, PagingSpec] = {
+    "get_session_user_chat_list_chats_list": PagingSpec("/api/v1/chats/list", STYLE_PAGE),
+    "get_session_user_chat_list_chats": PagingSpec("/api/v1/chats/", STYLE_PAGE),
+    "get_archived_session_user_chat_list_chats_archived": PagingSpec(
+        "/api/v1/chats/archived", STYLE_PAGE
+    ),
+    "get_user_chat_list_by_user_id_chats_list_user_user_id": PagingSpec(
+        "/api/v1/chats/list/user/{user_id}", STYLE_PAGE, path_params=("user_id",)
+    ),
+    "search_user_chats_chats_search": PagingSpec("/api/v1/chats/search", STYLE_PAGE),
+    "get_users_users": PagingSpec("/api/v1/users/", STYLE_PAGE, items_key="users"),
+    "get_user_chat_list_by_tag_name_chats_tags": PagingSpec(
+        "/api/v1/chats/tags", STYLE_SKIP_LIMIT, method="POST"
+    ),
+    "get_channel_messages_channels_id_messages": PagingSpec(
+        "/api/v1/channels/{id}/messages", STYLE_SKIP_LIMIT, path_params=("id",)
+    ),
+    "get_channel_thread_messages_channels_id_messages_message_id_thread": PagingSpec(
+        "/api/v1/channels/{id}/messages/{message_id}/thread",
+        STYLE_SKIP_LIMIT,
+        path_params=("id", "message_id")
+    ),
+}
+
+
+async def iterate_pages(
+    fetch_page: Callable[[int], Awaitable[list[Any]]],
+    lookahead: int = 4,
+    page_size: int | None = None
+) -> AsyncIterator[list[Any]]:
+    """Yield pages in order while fetching up to lookahead pages ahead.
+
+    Iteration ends at the first empty page, or at the first page shorter
+    than page_size when the page size is known. Pages fetched beyond the
+    end are discarded, and in-flight fetches are cancelled when the caller
+    stops early.
+
+    Args:
+        fetch_page: Async callable returning the items of a zero-based page
+        lookahead: Maximum pages in flight
+        page_size: Known page size, if any
+
+    Yields:
+        Lists of items, one per page
+    """
+    lookahead = max(1, lookahead)
+    in_flight: dict[int, asyncio.Task[list[Any]]] = {}
+    next_index = 0
+    try:
+        for index in range(lookahead):
+            in_flight[index] = asyncio.ensure_future(fetch_page(index))
+        scheduled = lookahead
+
+        while True:
+            items = await in_flight.pop(next_index)
+            if not items:
+                return
+            yield items
+            if page_size is not None and len(items) < page_size:
+                return
+            next_index += 1
+            in_flight[scheduled] = asyncio.ensure_future(fetch_page(scheduled))
+            scheduled += 1
+    finally:
+        for task in in_flight.values():
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight.values(), return_exceptions=True)
+
+
+async def paginate(
+    client: Any,
+    spec: PagingSpec,
+    path_params: dict[str, str] | None = None,
+    params: dict[str, Any] | None = None,
+    lookahead: int = 4,
+    max_items: int | None = None,
+    stop_when: Callable[[Any], bool] | None = None
+) -> AsyncIterator[Any]:
+    """Iterate every item of a paged endpoint.
+
+    Pages are fetched up to lookahead ahead of the consumer. Iteration
+    stops after max_items items or before the first item matching
+    stop_when; outstanding page requests are then cancelled.
+
+    Args:
+        client: OpenWebUIClient used for the page requests
+        spec: Paging spec of the endpoint
+        path_params: Values for the endpoint's path placeholders
+        params: Extra query parameters (GET) or body fields (POST)
+        lookahead: Maximum pages in flight
+        max_items: Stop after this many items
+        stop_when: Stop before the first item for which this returns True
+
+    Yields:
+        Items in page order
+    """
+    endpoint = spec.endpoint.format(**(path_params or {}))
+
+    async def fetch_page(index: int) -> list[Any]:
+        page_args = {**(params or {}), **spec.page_args(index)}
+        if spec.method == "POST":
+            response = await client.post(endpoint, json_data=page_args)
+        else:
+            response = await client.get(endpoint, params=page_args)
+        return spec.extract_items(response)
+
+    page_size = spec.page_size if spec.style == STYLE_SKIP_LIMIT else None
+    count = 0
+    async with aclosing(iterate_pages(fetch_page, lookahead, page_size)) as pages:
+        async for page in pages:
+            for item in page:
+                if stop_when is not None and stop_when(item):
+                    return
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
@@ -0,0 +1,321 @@
+"""Staged async pipeline with bounded queues.
+
+Runs a sequence of stages as overlapping worker pools connected by bounded
+queues, so a slow downstream stage applies backpressure instead of letting
+work pile up in memory. Stages may batch items and retry failed items.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
+from src.utils.tracing import note_retry
+
+logger = logging.getLogger(__name__)
+
+# Stage handler: receives a batch, returns (outputs, failures) where failures
+# is a list of (item, error_message) pairs. Raising fails the whole batch.
+StageHandler = Callable[[list[Any]], Awaitable[tuple[list[Any], list[tuple[Any, str]]]]]
+
+# Progress callback: receives (completed, failed) item counts of the whole run
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+_DONE = object()
+
+
+class StageStats:
+    """Throughput counters for a single pipeline stage.
+
+    Args:
+        name: Stage name
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize stage stats.
+
+        Args:
+            name: Stage name
+        """
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export stats as a dict.
+
+        Returns:
+            Dict with counts, elapsed time and items per second
+        """
+        elapsed = 0.0
+        if self.started_at is not None and self.finished_at is not None:
+            elapsed = self.finished_at - self.started_at
+        return {
+            "stage": self.name,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "items_per_second": round(self.processed / elapsed, 2) if elapsed > 0 else None,
+        }
+
+
+class PipelineStage:
+    """Definition of one pipeline stage.
+
+    Args:
+        name: Stage name used in stats and failure records
+        handler: Async callable processing a batch of items
+        batch_size: Maximum items handed to the handler at once
+        concurrency: Number of workers running the handler
+        max_retries: Retry attempts for failed items
+        retry_delay: Base delay in seconds between retries (doubles each attempt)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler,
+        batch_size: int = 1,
+        concurrency: int = 1,
+        max_retries: int = 0,
+        retry_delay: float = 0.5
+    ) -> None:
+        """Initialize pipeline stage.
+
+        Args:
+            name: Stage name
+            handler: Batch handler
+            batch_size: Maximum batch size
+            concurrency: Worker count
+            max_retries: Retry attempts for failed items
+            retry_delay: Base retry delay in seconds
+        """
+        self.name = name
+        self.handler = handler
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(0, max_retries)
+        self.retry_delay = retry_delay
+
+
+class PipelineResult:
+    """Outcome of a pipeline run.
+
+    Args:
+        outputs: Items emitted by the last stage
+        failures: Failure records ({stage, item, error})
+        stats: Per-stage stats
+        duration_seconds: Total wall-clock duration
+    """
+
+    def __init__(
+        self,
+        outputs: list[Any],
+        failures: list[dict[str, Any]],
+        stats: list[StageStats],
+        duration_seconds: float
+    ) -> None:
+        """Initialize pipeline result.
+
+        Args:
+            outputs: Items emitted by the last stage
+            failures: Failure records
+            stats: Per-stage stats
+            duration_seconds: Total duration
+        """
+        self.outputs = outputs
+        self.failures = failures
+        self.stats = stats
+        self.duration_seconds = duration_seconds
+
+
+class Pipeline:
+    """Run items through stages connected by bounded queues.
+
+    Args:
+        stages: Ordered list of stages
+        queue_size: Capacity of each inter-stage queue
+    """
+
+    def __init__(self, stages: list[PipelineStage], queue_size: int = 32) -> None:
+        """Initialize pipeline.
+
+        Args:
+            stages: Ordered list of stages
+            queue_size: Capacity of each inter-stage queue
+
+        Raises:
+            ValueError: If no stages given
+        """
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+
+    async def run(
+        self,
+        items: Iterable[Any] | AsyncIterable[Any],
+        on_progress: ProgressCallback | None = None
+    ) -> PipelineResult:
+        """Run all items through the pipeline.
+
+        Args:
+            items: Input items for the first stage; async iterables are
+                consumed lazily as the first stage drains its queue
+            on_progress: Called after items leave the pipeline, either as
+                outputs of the last stage or as failures of any stage
+
+        Returns:
+            PipelineResult with outputs, failures and per-stage stats
+        """
+        start = time.monotonic()
+        queues: list[asyncio.Queue[Any]] = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in self.stages
+        ]
+        outputs: list[Any] = []
+        failures: list[dict[str, Any]] = []
+        stats = [StageStats(stage.name) for stage in self.stages]
+        progress = {"on_progress": on_progress, "completed": 0, "failed": 0}
+
+        async def feed() -> None:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await queues[0].put(item)
+            else:
+                for item in items:
+                    await queues[0].put(item)
+            await queues[0].put(_DONE)
+
+        tasks = [asyncio.create_task(feed())]
+        for index, stage in enumerate(self.stages):
+            downstream = queues[index + 1] if index + 1 < len(queues) else None
+            remaining = [stage.concurrency]
+            for _ in range(stage.concurrency):
+                tasks.append(asyncio.create_task(self._worker(
+                    stage, stats[index], queues[index], downstream,
+                    remaining, outputs, failures, progress
+                )))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return PipelineResult(outputs, failures, stats, time.monotonic() - start)
+
+    async def _worker(
+        self,
+        stage: PipelineStage,
+        stats: StageStats,
+        inbox: "asyncio.Queue[Any]",
+        outbox: "asyncio.Queue[Any] | None",
+        remaining: list[int],
+        outputs: list[Any],
+        failures: list[dict[str, Any]],
+        progress: dict[str, Any]
+    ) -> None:
+        """Pull batches from the inbox, run the handler and forward results.
+
+        Args:
+            stage: Stage definition
+            stats: Stage stats to update
+            inbox: Input queue
+            outbox: Output queue (None for the last stage)
+            remaining: Shared count of live workers for this stage
+            outputs: Collected outputs of the last stage
+            failures: Collected failure records
+            progress: Shared completed/failed counters and progress callback
+        """
+        done = False
+        while not done:
+            first = await inbox.get()
+            if first is _DONE:
+                break
+            batch = [first]
+            while len(batch) < stage.batch_size:
+                try:
+                    item = inbox.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+
+            if stats.started_at is None:
+                stats.started_at = time.monotonic()
+            results, failed = await self._run_batch(stage, stats, batch)
+            stats.finished_at = time.monotonic()
+
+            for item, error in failed:
+                failures.append({"stage": stage.name, "item": item, "error": error})
+            for result in results:
+                if outbox is None:
+                    outputs.append(result)
+                else:
+                    await outbox.put(result)
+
+            if outbox is None:
+                progress["completed"] += len(results)
+            progress["failed"] += len(failed)
+            if progress["on_progress"] is not None and (failed or outbox is None):
+                await progress["on_progress"](progress["completed"], progress["failed"])
+
+        # Let sibling workers see the end marker, then close the next stage
+        await inbox.put(_DONE)
+        remaining[0] -= 1
+        if remaining[0] == 0 and outbox is not None:
+            await outbox.put(_DONE)
+
+    async def _run_batch(
+        self,
+        stage: PipelineStage,
+        stats: StageStats,
+        batch: list[Any]
+    ) -> tuple[list[Any], list[tuple[Any, str]]]:
+        """Run the handler on a batch, retrying only the failed items.
+
+        Args:
+            stage: Stage definition
+            stats: Stage stats to update
+            batch: Items to process
+
+        Returns:
+            Tuple of (outputs, failures after the last attempt)
+        """
+        results: list[Any] = []
+        pending = batch
+        failed: list[tuple[Any, str]] = []
+
+        for attempt in range(stage.max_retries + 1):
+            if attempt > 0:
+                stats.retried += len(pending)
+                note_retry()
+                await asyncio.sleep(stage.retry_delay * (2 ** (attempt - 1)))
+
+            stats.batches += 1
+            busy_start = time.monotonic()
+            try:
+                outputs, failed = await stage.handler(pending)
+            except Exception as e:
+                logger.warning(f"Stage {stage.name} batch of {len(pending)} failed: {e}")
+                outputs, failed = [], [(item, str(e)) for item in pending]
+            stats.busy_seconds += time.monotonic() - busy_start
+
+            results.extend(outputs)
+            stats.processed += len(outputs)
+            if not failed:
+                break
+            pending = [item for item, _ in failed]
+
+        stats.failed += len(failed)
+        return results, failed
@@ -6,6 +6,7 @@ Provides client-side rate limiting to prevent overwhelming the API.
 import asyncio
 import time
 from typing import Optional
+from src.utils.metrics import SECONDS_BUCKETS, Histogram
 
 
 class RateLimiter:
@@ -28,12 +29,25 @@ class RateLimiter:
         self.tokens = float(self.burst)
         self.last_update = time.monotonic()
         self._lock = asyncio.Lock()
+        # Callers currently inside acquire() and how long each waited
+        self.waiting = 0
+        self.wait_seconds = Histogram(SECONDS_BUCKETS)
 
     async def acquire(self) -> None:
         """Acquire a token, waiting if necessary.
 
         This method blocks until a token is available.
         """
+        self.waiting += 1
+        start = time.monotonic()
+        try:
+            await self._acquire()
+        finally:
+            self.waiting -= 1
+            self.wait_seconds.observe(time.monotonic() - start)
+
+    async def _acquire(self) -> None:
+        """Wait for and consume one token."""
         async with self._lock:
             now = time.monotonic()
             elapsed = now - self.last_update
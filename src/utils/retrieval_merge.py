@@ -0,0 +1,106 @@
+"""Merge retrieval results from several collections.
+
+Open WebUI returns query results as column lists nested one level deep
+(``{"ids": [[...]], "documents": [[...]], "metadatas": [[...]],
+"distances": [[...]]}``). These helpers flatten per-collection results,
+drop duplicate chunks by content hash and select the global top-k with a heap.
+"""
+
+import hashlib
+import heapq
+from typing import Any
+
+RESULT_FIELDS = ("ids", "documents", "metadatas", "distances")
+
+
+def _first_column(result: dict[str, Any], field: str) -> list[Any]:
+    """Return the first (only) query column of a result field.
+
+    Args:
+        result: Upstream query result
+        field: Field name
+
+    Returns:
+        Column values, or an empty list
+    """
+    value = result.get(field) or []
+    if value and isinstance(value[0], list):
+        return value[0]
+    return value
+
+
+def flatten_query_result(result: dict[str, Any], collection_name: str) -> list[dict[str, Any]]:
+    """Turn a column-oriented query result into one dict per chunk.
+
+    Args:
+        result: Upstream query result
+        collection_name: Collection the result came from
+
+    Returns:
+        Chunks with id, document, metadata, distance and collection_name
+    """
+    columns = {field: _first_column(result, field) for field in RESULT_FIELDS}
+    documents = columns["documents"]
+    chunks = []
+    for index, document in enumerate(documents):
+        chunks.append({
+            "id": columns["ids"][index] if index < len(columns["ids"]) else None,
+            "document": document,
+            "metadata": columns["metadatas"][index] if index < len(columns["metadatas"]) else None,
+            "distance": columns["distances"][index] if index < len(columns["distances"]) else None,
+            "collection_name": collection_name,
+        })
+    return chunks
+
+
+def merge_query_results(
+    results: dict[str, dict[str, Any]],
+    k: int | None = None,
+    higher_is_better: bool = True
+) -> tuple[dict[str, Any], int]:
+    """Merge per-collection results into one ranked result.
+
+    Chunks with identical content are collapsed to the best-scoring one.
+    Open WebUI reports relevance scores in ``distances`` (higher is better);
+    pass ``higher_is_better=False`` for raw vector distances.
+
+    Args:
+        results: Collection name → upstream query result
+        k: Number of chunks to keep (all when None)
+        higher_is_better: Whether larger distance values rank first
+
+    Returns:
+        Tuple of (merged column-oriented result, duplicates removed)
+    """
+    def rank(chunk: dict[str, Any]) -> float:
+        distance = chunk["distance"]
+        if distance is None:
+            return float("-inf")
+        return distance if higher_is_better else -distance
+
+    best: dict[str, dict[str, Any]] = {}
+    duplicates = 0
+    for collection_name, result in results.items():
+        for chunk in flatten_query_result(result, collection_name):
+            digest = hashlib.sha256(str(chunk["document"]).encode("utf-8")).hexdigest()
+            current = best.get(digest)
+            if current is None:
+                best[digest] = chunk
+                continue
+            duplicates += 1
+            if rank(chunk) > rank(current):
+                best[digest] = chunk
+
+    if k is None:
+        ranked = sorted(best.values(), key=rank, reverse=True)
+    else:
+        ranked = heapq.nlargest(k, best.values(), key=rank)
+
+    merged = {
+        "ids": [[chunk["id"] for chunk in ranked]],
+        "documents": [[chunk["document"] for chunk in ranked]],
+        "metadatas": [[chunk["metadata"] for chunk in ranked]],
+        "distances": [[chunk["distance"] for chunk in ranked]],
+        "collection_names": [[chunk["collection_name"] for chunk in ranked]],
+    }
+    return merged, duplicates
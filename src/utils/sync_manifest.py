@@ -0,0 +1,170 @@
+"""Local sync manifest for incremental directory uploads.
+
+Tracks path → (size, mtime, content hash, Open WebUI file ID) so a directory
+can be diffed against its last synced state. Files whose size and mtime are
+unchanged are never read, keeping a re-sync proportional to the change set.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+MANIFEST_VERSION = 1
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Hash file contents with SHA-256.
+
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DirectoryDiff:
+    """Changes between a directory and its manifest.
+
+    Args:
+        added: Relative paths not present in the manifest
+        modified: Relative paths whose content hash changed
+        deleted: Manifest paths no longer present on disk
+        touched: Relative paths with new mtime but identical content
+        unchanged: Count of files skipped on size/mtime
+        stats: Current (size, mtime, sha256) of added/modified/touched paths
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty diff."""
+        self.added: list[str] = []
+        self.modified: list[str] = []
+        self.deleted: list[str] = []
+        self.touched: list[str] = []
+        self.unchanged = 0
+        self.stats: dict[str, dict[str, Any]] = {}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export diff summary.
+
+        Returns:
+            Dict with changed paths and counts
+        """
+        return {
+            "added": self.added,
+            "modified": self.modified,
+            "deleted": self.deleted,
+            "touched": len(self.touched),
+            "unchanged": self.unchanged,
+        }
+
+
+class SyncManifest:
+    """JSON manifest of files synced to a knowledge base.
+
+    Args:
+        path: Manifest file location
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize manifest.
+
+        Args:
+            path: Manifest file location
+        """
+        self.path = path
+        self.knowledge_id: str | None = None
+        self.files: dict[str, dict[str, Any]] = {}
+
+    def load(self) -> None:
+        """Load manifest from disk if it exists.
+
+        Raises:
+            ValueError: If the manifest is unreadable or has an unknown version
+        """
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Unreadable sync manifest {self.path}: {e}") from e
+
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported sync manifest version: {data.get('version')}")
+
+        self.knowledge_id = data.get("knowledge_id")
+        self.files = data.get("files", {})
+
+    def save(self) -> None:
+        """Write manifest atomically (temp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "knowledge_id": self.knowledge_id,
+                    "files": self.files,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, self.path)
+
+    def diff(self, root: Path, pattern: str = "**/*") -> DirectoryDiff:
+        """Diff a directory against the manifest.
+
+        Hidden files and directories and the manifest itself are skipped.
+        Content is only hashed when size or mtime differ from the manifest.
+
+        Args:
+            root: Directory to scan
+            pattern: Glob pattern relative to root
+
+        Returns:
+            DirectoryDiff describing the change set
+        """
+        result = DirectoryDiff()
+        seen: set[str] = set()
+        manifest_path = self.path.resolve()
+
+        for path in root.glob(pattern):
+            relative = path.relative_to(root)
+            if any(part.startswith(".") for part in relative.parts):
+                continue
+            if path.is_symlink() or not path.is_file() or path.resolve() == manifest_path:
+                continue
+
+            key = relative.as_posix()
+            seen.add(key)
+            stat = path.stat()
+            entry = self.files.get(key)
+
+            synced = bool(entry and entry.get("file_id") and entry.get("attached", True))
+            if synced and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime_ns:
+                result.unchanged += 1
+                continue
+
+            sha256 = file_sha256(path)
+            result.stats[key] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": sha256}
+            if not synced:
+                result.added.append(key)
+            elif entry.get("sha256") == sha256:
+                result.touched.append(key)
+            else:
+                result.modified.append(key)
+
+        result.deleted = sorted(set(self.files) - seen)
+        result.added.sort()
+        result.modified.sort()
+        return result
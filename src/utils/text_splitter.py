@@ -0,0 +1,97 @@
+"""Boundary-aware text splitting for chunked submission.
+
+Splits large text into segments no longer than a size limit, preferring
+paragraph boundaries, then sentence boundaries, and only cutting inside a
+sentence when a single sentence exceeds the limit. Segment offsets refer to
+the original text so segments can be traced back to their source.
+"""
+
+import re
+from typing import NamedTuple
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+")
+
+
+class TextSegment(NamedTuple):
+    """One segment of a split text.
+
+    Attributes:
+        index: Position of the segment
+        offset: Start offset in the original text
+        text: Segment text
+    """
+
+    index: int
+    offset: int
+    text: str
+
+
+def _pieces(text: str, start: int, end: int, max_chars: int) -> list[tuple[int, int]]:
+    """Break text[start:end] into (start, end) spans of at most max_chars.
+
+    Args:
+        text: Original text
+        start: Span start
+        end: Span end
+        max_chars: Maximum span length
+
+    Returns:
+        Spans on the coarsest boundary that fits
+    """
+    if end - start <= max_chars:
+        return [(start, end)]
+
+    spans: list[tuple[int, int]] = []
+    for pattern in (_PARAGRAPH_BREAK, _SENTENCE_END):
+        cut = start
+        for match in pattern.finditer(text, start, end):
+            if start < match.end() < end:
+                spans.append((cut, match.end()))
+                cut = match.end()
+        if spans:
+            spans.append((cut, end))
+            break
+
+    if not spans:
+        # No boundary at all: cut at the limit
+        return [(i, min(i + max_chars, end)) for i in range(start, end, max_chars)]
+
+    result: list[tuple[int, int]] = []
+    for span_start, span_end in spans:
+        if span_end > span_start:
+            result.extend(_pieces(text, span_start, span_end, max_chars))
+    return result
+
+
+def split_text(text: str, max_chars: int) -> list[TextSegment]:
+    """Split text into boundary-aligned segments of at most max_chars.
+
+    Adjacent pieces are packed together while they fit, so segments are as
+    large as the limit allows.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum segment length
+
+    Returns:
+        Segments in order
+
+    Raises:
+        ValueError: If max_chars is not positive
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be >= 1")
+    if not text:
+        return []
+
+    segments: list[TextSegment] = []
+    seg_start, seg_end = 0, 0
+    for start, end in _pieces(text, 0, len(text), max_chars):
+        if end - seg_start > max_chars and seg_end > seg_start:
+            segments.append(TextSegment(len(segments), seg_start, text[seg_start:seg_end]))
+            seg_start = start
+        seg_end = end
+    if seg_end > seg_start:
+        segments.append(TextSegment(len(segments), seg_start, text[seg_start:seg_end]))
+    return segments
@@ -0,0 +1,529 @@
+"""Request-scoped tracing with per-stage latency spans.
+
+Each MCP tool call opens a trace whose id doubles as the request id sent
+upstream in X-Request-ID. The trace travels through tool execution and
+the HTTP client in a context variable, so spans for rate limiting, pool
+acquisition, connect/TLS, upstream processing, body download, JSON decode
+and result encoding need no explicit plumbing. Finished traces are
+exported as OTLP/JSON, to a file or an OTLP/HTTP collector.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+import httpx
+from src.utils.deferred_write import defer_write
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "open-webui-mcp"
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# httpcore trace events (without .started/.complete) by reported stage
+HTTP_STAGES = {
+    "connection.connect_tcp": "connect",
+    "connection.connect_unix_socket": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http11.send_request_body": "send",
+    "http11.receive_response_headers": "server",
+    "http11.receive_response_body": "download",
+    "http2.send_request_headers": "send",
+    "http2.send_request_body": "send",
+    "http2.receive_response_headers": "server",
+    "http2.receive_response_body": "download",
+}
+
+# Traces queued for a collector before the oldest are dropped
+MAX_PENDING_TRACES = 1000
+
+_trace: ContextVar["Trace | None"] = ContextVar("trace", default=None)
+_span: ContextVar["Span | None"] = ContextVar("span", default=None)
+_exporters: list[Any] = []
+
+
+class Span:
+    """Timed operation within a trace.
+
+    Args:
+        name: Span name
+        parent_id: Parent span id, or None for the root
+        kind: OTLP span kind
+        attributes: Span attributes
+    """
+
+    __slots__ = ("name", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(
+        self,
+        name: str,
+        parent_id: str | None = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: dict[str, Any] | None = None
+    ) -> None:
+        """Initialize and start span.
+
+        Args:
+            name: Span name
+            parent_id: Parent span id
+            kind: OTLP span kind
+            attributes: Span attributes
+        """
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = dict(attributes or {})
+        self.error: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        """Span duration in milliseconds (so far, if still open)."""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self, trace_id: str) -> dict[str, Any]:
+        """Encode as an OTLP/JSON span.
+
+        Args:
+            trace_id: Owning trace id
+
+        Returns:
+            OTLP span dict
+        """
+        span: dict[str, Any] = {
+            "traceId": trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            span["status"] = {"code": 2, "message": self.error}
+        return span
+
+
+class CallStats:
+    """Upstream counters of one MCP request, kept even when not recording.
+
+    Retries are reported by the code that retries, through note_retry().
+    """
+
+    __slots__ = ("upstream_requests", "upstream_ms", "queue_ms", "bytes_out", "bytes_in", "retries",
+                 "route_ms")
+
+    def __init__(self) -> None:
+        """Initialize zeroed counters."""
+        self.upstream_requests = 0
+        self.upstream_ms = 0.0
+        self.queue_ms = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.retries = 0
+        self.route_ms: dict[str, float] = {}
+
+    def add_request(self, bytes_out: int) -> None:
+        """Count an upstream request as it is sent.
+
+        Args:
+            bytes_out: Request body size
+        """
+        self.upstream_requests += 1
+        self.bytes_out += bytes_out
+
+    def add_upstream_time(self, route: str, ms: float) -> None:
+        """Add time spent waiting for an upstream response.
+
+        Args:
+            route: Route template
+            ms: Milliseconds until response headers
+        """
+        self.upstream_ms += ms
+        self.route_ms[route] = self.route_ms.get(route, 0.0) + ms
+
+
+class Trace:
+    """Spans of one MCP request.
+
+    Args:
+        name: Root span name
+        request_id: Trace id, forwarded upstream as X-Request-ID
+        session_id: MCP session id
+        record: Record spans (False keeps only the request id)
+        attributes: Root span attributes
+    """
+
+    def __init__(
+        self,
+        name: str,
+        request_id: str,
+        session_id: str | None = None,
+        record: bool = True,
+        attributes: dict[str, Any] | None = None
+    ) -> None:
+        """Initialize trace with its root span.
+
+        Args:
+            name: Root span name
+            request_id: Request id
+            session_id: MCP session id
+            record: Record spans
+            attributes: Root span attributes
+        """
+        self.request_id = request_id
+        self.session_id = session_id
+        self.record = record
+        root_attributes = dict(attributes or {})
+        if session_id:
+            root_attributes["mcp.session.id"] = session_id
+        self.root = Span(name, kind=SPAN_KIND_SERVER, attributes=root_attributes)
+        self.spans: list[Span] = [self.root]
+        self.stats = CallStats()
+
+    def stage_totals(self) -> dict[str, float]:
+        """Sum span durations by name, excluding the root.
+
+        Concurrent spans (e.g. parallel upstream requests) add up, so totals
+        can exceed the request's wall time.
+
+        Returns:
+            Milliseconds by span name
+        """
+        totals: dict[str, float] = {}
+        for span in self.spans[1:]:
+            if span.end_ns is not None:
+                totals[span.name] = round(totals.get(span.name, 0.0) + span.duration_ms, 3)
+        return totals
+
+    def to_otlp(self) -> dict[str, Any]:
+        """Encode as an OTLP/JSON ExportTraceServiceRequest.
+
+        Returns:
+            OTLP request dict
+        """
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{
+                    "scope": {"name": SERVICE_NAME},
+                    "spans": [span.to_otlp(self.request_id) for span in self.spans],
+                }],
+            }]
+        }
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    """Encode attributes as OTLP key/value pairs.
+
+    Args:
+        attributes: Attribute values
+
+    Returns:
+        OTLP attribute list
+    """
+    encoded = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        encoded.append({"key": key, "value": typed})
+    return encoded
+
+
+def configure(exporters: list[Any]) -> None:
+    """Set the exporters that receive finished traces.
+
+    Spans are only recorded while at least one exporter is configured;
+    request ids are always generated and forwarded.
+
+    Args:
+        exporters: Objects with export(trace) and async close()
+    """
+    _exporters[:] = exporters
+
+
+def current_trace() -> Trace | None:
+    """Return the trace of the running request.
+
+    Returns:
+        Trace, or None outside a request
+    """
+    return _trace.get()
+
+
+@contextmanager
+def start_trace(
+    name: str,
+    session_id: str | None = None,
+    **attributes: Any
+) -> Iterator[Trace]:
+    """Open a trace for one request and export it when it ends.
+
+    Args:
+        name: Root span name
+        session_id: MCP session id
+        **attributes: Root span attributes
+
+    Yields:
+        The active trace
+    """
+    trace = Trace(
+        name, uuid.uuid4().hex, session_id=session_id, record=bool(_exporters), attributes=attributes
+    )
+    trace_token = _trace.set(trace)
+    span_token = _span.set(trace.root)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.root.error = type(e).__name__
+        raise
+    finally:
+        trace.root.end_ns = time.time_ns()
+        _span.reset(span_token)
+        _trace.reset(trace_token)
+        if trace.record:
+            for exporter in _exporters:
+                try:
+                    exporter.export(trace)
+                except Exception as e:
+                    logger.warning(f"Trace export failed: {e}")
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes: Any) -> Iterator[Span | None]:
+    """Time a stage of the current request.
+
+    Does nothing outside a recorded trace.
+
+    Args:
+        name: Span name
+        kind: OTLP span kind
+        **attributes: Span attributes
+
+    Yields:
+        The span, or None when not recording
+    """
+    trace = _trace.get()
+    if trace is None or not trace.record:
+        yield None
+        return
+    parent = _span.get()
+    current = Span(name, parent.span_id if parent else None, kind, attributes)
+    trace.spans.append(current)
+    token = _span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _span.reset(token)
+
+
+def mark_error(message: str) -> None:
+    """Mark the current span as failed.
+
+    Args:
+        message: Error description
+    """
+    current = _span.get()
+    if current is not None and _trace.get() is not None:
+        current.error = message
+
+
+def note_retry() -> None:
+    """Count a retried attempt against the current request."""
+    trace = _trace.get()
+    if trace is not None:
+        trace.stats.retries += 1
+
+
+def http_stage_recorder(trace: Trace, start_ns: int) -> Callable[[str, dict[str, Any]], Awaitable[None]]:
+    """Build an httpx "trace" extension callback for the current span.
+
+    The time from start_ns to the first connection event is pool wait and
+    always adds to the call's queue time. When recording, it becomes a
+    pool_wait span and httpcore events become connect (DNS and TCP), tls,
+    send, server (waiting for response headers) and download spans.
+
+    Args:
+        trace: Active trace
+        start_ns: When the request entered the transport (time.time_ns)
+
+    Returns:
+        Async callback receiving (event_name, info)
+    """
+    parent = _span.get()
+    parent_id = parent.span_id if parent else None
+    started: dict[str, int] = {}
+    first_event = True
+
+    async def on_event(event_name: str, info: dict[str, Any]) -> None:
+        nonlocal first_event
+        now = time.time_ns()
+        if first_event:
+            first_event = False
+            trace.stats.queue_ms += (now - start_ns) / 1e6
+            if trace.record:
+                wait = Span("pool_wait", parent_id)
+                wait.start_ns, wait.end_ns = start_ns, now
+                trace.spans.append(wait)
+        if not trace.record:
+            return
+        prefix, _, phase = event_name.rpartition(".")
+        stage = HTTP_STAGES.get(prefix)
+        if stage is None:
+            return
+        if phase == "started":
+            started[prefix] = now
+        elif prefix in started:
+            stage_span = Span(stage, parent_id, attributes={"http.event": prefix})
+            stage_span.start_ns, stage_span.end_ns = started.pop(prefix), now
+            if phase == "failed":
+                stage_span.error = type(info.get("exception")).__name__
+            trace.spans.append(stage_span)
+
+    return on_event
+
+
+class OTLPFileExporter:
+    """Append finished traces to a file as OTLP/JSON lines.
+
+    Follows the OpenTelemetry file exporter format: one
+    ExportTraceServiceRequest per line. Lines are appended on the
+    background log writer thread.
+
+    Args:
+        path: Output file
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize exporter.
+
+        Args:
+            path: Output file (parent directories are created)
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.exported = 0
+
+    def export(self, trace: Trace) -> None:
+        """Write one trace.
+
+        Args:
+            trace: Finished trace
+        """
+        defer_write(self._append, json.dumps(trace.to_otlp(), separators=(",", ":")) + "\n")
+        self.exported += 1
+
+    def _append(self, line: str) -> None:
+        """Append one line to the export file.
+
+        Args:
+            line: OTLP/JSON line
+        """
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    async def close(self) -> None:
+        """Nothing to flush; queued lines are written when logging shuts down."""
+
+
+class OTLPHTTPExporter:
+    """Send finished traces to an OTLP/HTTP collector in the background.
+
+    Traces are queued and posted as OTLP/JSON to <endpoint>/v1/traces in
+    batches, so exporting never delays a tool call. When the collector
+    falls behind, the oldest queued traces are dropped.
+
+    Args:
+        endpoint: Collector base URL (e.g. http://localhost:4318)
+        interval: Seconds between flushes
+        batch_size: Maximum traces per request
+    """
+
+    def __init__(self, endpoint: str, interval: float = 2.0, batch_size: int = 64) -> None:
+        """Initialize exporter.
+
+        Args:
+            endpoint: Collector base URL
+            interval: Seconds between flushes
+            batch_size: Maximum traces per request
+        """
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.interval = interval
+        self.batch_size = batch_size
+        self._pending: deque[Trace] = deque(maxlen=MAX_PENDING_TRACES)
+        self._task: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def export(self, trace: Trace) -> None:
+        """Queue one trace, starting the flush loop if needed.
+
+        Args:
+            trace: Finished trace
+        """
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(trace)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        """Flush queued traces until the queue stays empty."""
+        while self._pending:
+            await self.flush()
+            await asyncio.sleep(self.interval)
+
+    async def flush(self) -> None:
+        """Post all queued traces."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10)
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            body = {"resourceSpans": [rs for trace in batch for rs in trace.to_otlp()["resourceSpans"]]}
+            try:
+                response = await self._client.post(self.url, json=body)
+                response.raise_for_status()
+                self.exported += len(batch)
+            except httpx.HTTPError as e:
+                self.failed += len(batch)
+                logger.warning(f"OTLP export to {self.url} failed: {e}")
+                return
+
+    async def close(self) -> None:
+        """Flush queued traces and close the HTTP client."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -66,6 +66,37 @@ class ToolInputValidator:
 
         return limit, offset
 
+    @staticmethod
+    def validate_int_range(
+        value: Any,
+        field_name: str,
+        minimum: int,
+        maximum: int
+    ) -> int:
+        """Validate integer is within an inclusive range.
+
+        Args:
+            value: Value to validate
+            field_name: Field name for errors
+            minimum: Minimum allowed value
+            maximum: Maximum allowed value
+
+        Returns:
+            Validated integer
+
+        Raises:
+            ValidationError: If value is not an integer or out of range
+        """
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValidationError(f"{field_name} must be an integer")
+
+        if value < minimum or value > maximum:
+            raise ValidationError(
+                f"{field_name} must be between {minimum} and {maximum}"
+            )
+
+        return value
+
     @staticmethod
     def validate_string_length(
         value: str,
@@ -0,0 +1,22 @@
+"""End-to-end throughput and latency benchmark.
+
+Drives the real server over SSE with concurrent MCP sessions against the
+mock Open WebUI server and reports calls/sec, latency percentiles per
+tool class, server-side overhead, memory per session and CPU per call.
+Run it with ``python -m tests.benchmark``.
+"""
+
+from tests.benchmark.report import compare, format_report, read_traces, summarize
+from tests.benchmark.runner import run_benchmark
+from tests.benchmark.workload import TOOL_CLASSES, Workload, parse_mix
+
+__all__ = [
+    "TOOL_CLASSES",
+    "Workload",
+    "compare",
+    "format_report",
+    "parse_mix",
+    "read_traces",
+    "run_benchmark",
+    "summarize",
+]
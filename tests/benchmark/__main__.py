@@ -0,0 +1,113 @@
+"""Run the end-to-end benchmark.
+
+Example:
+    python -m tests.benchmark --sessions 20 --duration 30 \\
+        --latency lognormal:20,0.6 --baseline benchmark-results/baseline.json
+
+Writes results.json (and the server's traces and logs) to --output, prints
+a per-class table and, with --baseline, exits 1 when a metric regressed.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from tests.benchmark.report import compare, format_report
+from tests.benchmark.runner import run_benchmark
+from tests.benchmark.workload import DEFAULT_MIX, parse_mix
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv: Arguments (default: sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmark", description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent MCP sessions")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of measured load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Tool class weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results"), help="Output directory")
+    parser.add_argument("--baseline", type=Path, help="Results file to compare against")
+    parser.add_argument("--save-baseline", type=Path, help="Also write the results to this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    parser.add_argument(
+        "--no-traces", action="store_true",
+        help="Do not record server traces (no overhead breakdown, no tracing cost)"
+    )
+    parser.add_argument(
+        "--server-env", action="append", default=[], metavar="KEY=VALUE",
+        help="Extra server environment variable (repeatable)"
+    )
+
+    upstream = parser.add_argument_group("mock upstream")
+    upstream.add_argument("--chats", type=int, default=10_000)
+    upstream.add_argument("--users", type=int, default=1_000)
+    upstream.add_argument("--knowledge", type=int, default=10)
+    upstream.add_argument("--files-per-knowledge", type=int, default=20)
+    upstream.add_argument("--latency", help="Upstream latency spec, e.g. lognormal:20,0.6")
+    upstream.add_argument("--error-rate", type=float, default=0.0)
+    upstream.add_argument("--rate-limit-rate", type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and report.
+
+    Args:
+        argv: Arguments (default: sys.argv)
+
+    Returns:
+        Exit status: 1 if a baseline metric regressed, else 0
+    """
+    args = parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    upstream_args = [f"--error-rate={args.error_rate}", f"--rate-limit-rate={args.rate_limit_rate}"]
+    if args.latency:
+        upstream_args.append(f"--latency={args.latency}")
+    results = asyncio.run(run_benchmark(
+        args.output,
+        sessions=args.sessions,
+        duration=args.duration,
+        mix=mix,
+        dataset={
+            "chats": args.chats,
+            "users": args.users,
+            "knowledge": args.knowledge,
+            "files_per_knowledge": args.files_per_knowledge,
+        },
+        upstream_args=upstream_args,
+        server_env=dict(item.split("=", 1) for item in args.server_env),
+        traces=not args.no_traces,
+        seed=args.seed,
+    ))
+
+    comparison = None
+    if args.baseline:
+        comparison = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        results["comparison"] = {"baseline": str(args.baseline), "tolerance": args.tolerance, "metrics": comparison}
+
+    text = json.dumps(results, indent=2)
+    (args.output / "results.json").write_text(text)
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(text)
+
+    print(format_report(results, comparison))
+    print(f"\nresults: {args.output / 'results.json'}")
+    return 1 if comparison and any(entry["regression"] for entry in comparison) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""Benchmark result aggregation and baseline comparison.
+
+Client-side latencies come from the harness. Server-side time comes from
+the server's OTLP/JSON trace file: the root span of each tool call is the
+server time, the HTTP stage spans under it (connect, tls, send, server,
+download) are upstream time, and the rest is overhead added by
+call_tool, ToolFactory and OpenWebUIClient.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from tests.benchmark.workload import tool_class_of
+
+RESULTS_VERSION = 1
+
+# Span names counted as time spent on the upstream request
+UPSTREAM_STAGES = frozenset({"connect", "tls", "send", "server", "download"})
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Compared metrics: (path, higher is better, absolute change ignored as noise)
+COMPARED_METRICS = (
+    ("calls_per_sec", True, 1.0),
+    ("latency_ms.p50", False, 1.0),
+    ("latency_ms.p95", False, 2.0),
+    ("latency_ms.p99", False, 5.0),
+    ("overhead_ms.p50", False, 0.5),
+    ("overhead_ms.p95", False, 1.0),
+)
+COMPARED_RESOURCES = (
+    ("memory_per_session_kb", False, 64.0),
+    ("cpu_ms_per_call", False, 0.2),
+)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile.
+
+    Args:
+        values: Samples
+        q: Quantile between 0 and 1
+
+    Returns:
+        Percentile, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(q * len(ordered) + 0.5) - 1))]
+
+
+def distribution(values: list[float]) -> dict[str, float | None]:
+    """Summarize samples as mean and percentiles.
+
+    Args:
+        values: Samples in milliseconds
+
+    Returns:
+        Dict with mean, p50, p95 and p99 (None without samples)
+    """
+    summary = {"mean": round(sum(values) / len(values), 3) if values else None}
+    for q in QUANTILES:
+        value = percentile(values, q)
+        summary[f"p{round(q * 100)}"] = round(value, 3) if value is not None else None
+    return summary
+
+
+def read_traces(path: str | Path, since_ns: int = 0) -> list[dict[str, Any]]:
+    """Extract per-call server and upstream time from a trace file.
+
+    Args:
+        path: OTLP/JSON lines file written by the server
+        since_ns: Ignore calls that started earlier (time.time_ns)
+
+    Returns:
+        Dicts with tool, server_ms, upstream_ms and overhead_ms
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+    calls = []
+    with path.open() as f:
+        for line in f:
+            try:
+                spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+            except (ValueError, KeyError, IndexError):
+                continue
+            root = next((s for s in spans if "parentSpanId" not in s), None)
+            if root is None or int(root["startTimeUnixNano"]) < since_ns:
+                continue
+            attributes = {a["key"]: a["value"] for a in root.get("attributes", [])}
+            tool = attributes.get("mcp.tool.name", {}).get("stringValue")
+            if tool is None:
+                continue
+            server_ms = _duration_ms(root)
+            upstream_ms = sum(_duration_ms(s) for s in spans if s["name"] in UPSTREAM_STAGES)
+            calls.append({
+                "tool": tool,
+                "server_ms": server_ms,
+                "upstream_ms": upstream_ms,
+                # Parallel upstream requests overlap, so upstream time can exceed the call
+                "overhead_ms": max(0.0, server_ms - upstream_ms),
+            })
+    return calls
+
+
+def _duration_ms(span: dict[str, Any]) -> float:
+    """Get the duration of an OTLP span.
+
+    Args:
+        span: OTLP span dict
+
+    Returns:
+        Milliseconds
+    """
+    return (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+
+
+def summarize(
+    calls: list[dict[str, Any]],
+    traces: list[dict[str, Any]],
+    elapsed: float,
+    resources: dict[str, Any],
+    config: dict[str, Any]
+) -> dict[str, Any]:
+    """Build the results document.
+
+    Args:
+        calls: Client-side calls with tool_class, tool, latency_ms and error
+        traces: Server-side calls from read_traces
+        elapsed: Seconds the measured phase lasted
+        resources: Server memory and CPU figures
+        config: Benchmark settings
+
+    Returns:
+        Results with totals, per-class and per-tool figures
+    """
+    def group(selected: list[dict[str, Any]], server: list[dict[str, Any]]) -> dict[str, Any]:
+        errors = sum(1 for call in selected if call["error"])
+        summary = {
+            "calls": len(selected),
+            "errors": errors,
+            "error_rate": round(errors / len(selected), 4) if selected else 0.0,
+            "calls_per_sec": round(len(selected) / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": distribution([call["latency_ms"] for call in selected]),
+        }
+        if server:
+            for key in ("server_ms", "upstream_ms", "overhead_ms"):
+                summary[key] = distribution([trace[key] for trace in server])
+        return summary
+
+    classes = sorted({call["tool_class"] for call in calls})
+    tools = sorted({call["tool"] for call in calls})
+    return {
+        "version": RESULTS_VERSION,
+        "config": config,
+        "elapsed_sec": round(elapsed, 3),
+        "totals": group(calls, traces),
+        "classes": {
+            name: group(
+                [c for c in calls if c["tool_class"] == name],
+                [t for t in traces if tool_class_of(t["tool"]) == name],
+            )
+            for name in classes
+        },
+        "tools": {
+            name: group([c for c in calls if c["tool"] == name], [t for t in traces if t["tool"] == name])
+            for name in tools
+        },
+        "resources": resources,
+    }
+
+
+def _lookup(section: dict[str, Any], path: str) -> float | None:
+    """Read a dotted path such as "latency_ms.p95".
+
+    Args:
+        section: Results section
+        path: Dotted key path
+
+    Returns:
+        Value, or None if absent
+    """
+    value: Any = section
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.15) -> list[dict[str, Any]]:
+    """Compare results with a baseline run.
+
+    A metric regresses when it is worse by more than the tolerance and by
+    more than its noise floor.
+
+    Args:
+        results: Current results
+        baseline: Baseline results
+        tolerance: Allowed relative change (0.15 = 15%)
+
+    Returns:
+        One entry per metric present in both runs, with baseline and
+        current values, relative change and a regression flag
+    """
+    sections = [("totals", results.get("totals", {}), baseline.get("totals", {}), COMPARED_METRICS)]
+    for name, current in results.get("classes", {}).items():
+        sections.append((f"classes.{name}", current, baseline.get("classes", {}).get(name, {}), COMPARED_METRICS))
+    sections.append(("resources", results.get("resources", {}), baseline.get("resources", {}), COMPARED_RESOURCES))
+
+    comparison = []
+    for prefix, current, base, metrics in sections:
+        for path, higher_is_better, floor in metrics:
+            now, before = _lookup(current, path), _lookup(base, path)
+            if now is None or before is None:
+                continue
+            change = (now - before) / before if before else 0.0
+            worse = before - now if higher_is_better else now - before
+            comparison.append({
+                "metric": f"{prefix}.{path}",
+                "baseline": before,
+                "current": now,
+                "change": round(change, 4),
+                "regression": worse > floor and worse > abs(before) * tolerance,
+            })
+    return comparison
+
+
+def format_report(results: dict[str, Any], comparison: list[dict[str, Any]] | None = None) -> str:
+    """Render results as a text table.
+
+    Args:
+        results: Results document
+        comparison: Output of compare(), if a baseline was given
+
+    Returns:
+        Report text
+    """
+    def ms(summary: dict[str, Any], key: str, q: str) -> str:
+        value = (summary.get(key) or {}).get(q)
+        return f"{value:.1f}" if value is not None else "-"
+
+    header = f"{'class':<12}{'calls':>8}{'err':>6}{'calls/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'ovh p50':>9}{'ovh p95':>9}"
+    lines = [header, "-" * len(header)]
+    rows = [*results["classes"].items(), ("total", results["totals"])]
+    for name, summary in rows:
+        lines.append(
+            f"{name:<12}{summary['calls']:>8}{summary['errors']:>6}{summary['calls_per_sec']:>10.1f}"
+            f"{ms(summary, 'latency_ms', 'p50'):>9}{ms(summary, 'latency_ms', 'p95'):>9}"
+            f"{ms(summary, 'latency_ms', 'p99'):>9}{ms(summary, 'overhead_ms', 'p50'):>9}"
+            f"{ms(summary, 'overhead_ms', 'p95'):>9}"
+        )
+    resources = results.get("resources", {})
+    lines.append("")
+    lines.append(
+        "memory/session: "
+        + (f"{resources['memory_per_session_kb']:.0f} KB" if resources.get("memory_per_session_kb") is not None else "-")
+        + "   cpu/call: "
+        + (f"{resources['cpu_ms_per_call']:.2f} ms" if resources.get("cpu_ms_per_call") is not None else "-")
+        + "   server rss: "
+        + (f"{resources['rss_loaded_mb']:.1f} MB" if resources.get("rss_loaded_mb") is not None else "-")
+    )
+    if comparison:
+        regressions = [entry for entry in comparison if entry["regression"]]
+        lines.append("")
+        lines.append(f"baseline comparison: {len(regressions)} regression(s) in {len(comparison)} metrics")
+        for entry in regressions:
+            lines.append(
+                f"  REGRESSION {entry['metric']}: {entry['baseline']} -> {entry['current']} "
+                f"({entry['change']:+.1%})"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,334 @@
+"""Benchmark runner: starts the mock upstream and the real server, then
+drives concurrent MCP sessions over SSE.
+
+Phases:
+
+1. Start ``python -m tests.mock_openwebui`` and ``python -m src.server``
+   on free ports, with tracing written to the output directory.
+2. Warm up: one session calls every tool in the mix so imports, tool
+   instances and connection pools exist before measuring.
+3. Open the sessions and record server RSS before and after, giving the
+   memory held per idle session.
+4. Run the mix on every session for the duration, reading server CPU
+   time before and after to get CPU per call.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from tests.benchmark.report import read_traces, summarize
+from tests.benchmark.workload import Workload
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+API_KEY = "benchmark-key"
+
+# Seconds to wait for a child process to accept connections
+STARTUP_TIMEOUT = 30.0
+
+
+def free_port() -> int:
+    """Reserve a free local TCP port.
+
+    Returns:
+        Port number
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_rss_kb(pid: int) -> int | None:
+    """Read the resident set size of a process.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        RSS in KB, or None where /proc is unavailable
+    """
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def process_cpu_seconds(pid: int) -> float | None:
+    """Read the user plus system CPU time of a process.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        CPU seconds, or None where /proc is unavailable
+    """
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # utime and stime are fields 14 and 15, counted from the pid
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class ChildProcess:
+    """Python module run as a child process with its output in a log file.
+
+    Args:
+        name: Label used in errors
+        args: Arguments after ``python -m``
+        env: Extra environment variables
+        log_path: File receiving stdout and stderr
+    """
+
+    def __init__(self, name: str, args: list[str], env: dict[str, str], log_path: Path) -> None:
+        """Initialize child process settings.
+
+        Args:
+            name: Label
+            args: Module and arguments
+            env: Extra environment
+            log_path: Log file
+        """
+        self.name = name
+        self.args = args
+        self.env = env
+        self.log_path = log_path
+        self.process: asyncio.subprocess.Process | None = None
+
+    @property
+    def pid(self) -> int | None:
+        """Process id while running."""
+        return self.process.pid if self.process is not None else None
+
+    async def start(self, port: int) -> None:
+        """Start the process and wait until it accepts connections.
+
+        Args:
+            port: Port the process listens on
+
+        Raises:
+            RuntimeError: If the process exits or does not listen in time
+        """
+        log = self.log_path.open("wb")
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", *self.args,
+            cwd=REPO_ROOT,
+            env={**os.environ, **self.env},
+            stdout=log,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        log.close()
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.returncode is not None:
+                break
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+            except OSError:
+                await asyncio.sleep(0.1)
+                continue
+            writer.close()
+            await writer.wait_closed()
+            return
+        tail = self.log_path.read_text(errors="replace")[-2000:]
+        raise RuntimeError(f"{self.name} did not start on port {port}:\n{tail}")
+
+    async def stop(self) -> None:
+        """Terminate the process, killing it if it does not exit."""
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), 10)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+async def _call(session: ClientSession, tool_class: str, tool: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    """Call a tool and time it.
+
+    Args:
+        session: MCP session
+        tool_class: Tool class
+        tool: Tool name
+        arguments: Tool arguments
+
+    Returns:
+        Dict with tool_class, tool, latency_ms and error
+    """
+    start = time.perf_counter()
+    try:
+        result = await session.call_tool(tool, arguments)
+        # call_tool returns its error envelope as a dict, which the SDK
+        # passes through as structured content rather than setting isError
+        structured = result.structuredContent or {}
+        error = bool(result.isError or structured.get("isError"))
+    except Exception:
+        error = True
+    return {
+        "tool_class": tool_class,
+        "tool": tool,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "error": error,
+    }
+
+
+async def _drive(session: ClientSession, workload: Workload, deadline: float, calls: list[dict[str, Any]]) -> None:
+    """Issue calls back to back on one session until the deadline.
+
+    Args:
+        session: MCP session
+        workload: Call source for this session
+        deadline: time.monotonic() at which to stop
+        calls: Receives one record per call
+    """
+    while time.monotonic() < deadline:
+        calls.append(await _call(session, *workload.next_call()))
+
+
+async def _open_session(stack: AsyncExitStack, url: str) -> ClientSession:
+    """Open and initialize an MCP session over SSE.
+
+    Args:
+        stack: Exit stack owning the session
+        url: Server SSE endpoint
+
+    Returns:
+        Initialized session
+    """
+    read, write = await stack.enter_async_context(sse_client(url, timeout=30, sse_read_timeout=300))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+async def run_benchmark(
+    output_dir: Path,
+    sessions: int = 10,
+    duration: float = 30.0,
+    mix: dict[str, float] | None = None,
+    dataset: dict[str, int] | None = None,
+    upstream_args: list[str] | None = None,
+    server_env: dict[str, str] | None = None,
+    traces: bool = True,
+    seed: int = 0
+) -> dict[str, Any]:
+    """Run one benchmark.
+
+    Args:
+        output_dir: Directory receiving logs and the trace file
+        sessions: Concurrent MCP sessions
+        duration: Seconds of measured load
+        mix: Weights by tool class
+        dataset: Mock dataset sizes (chats, users, knowledge, files_per_knowledge)
+        upstream_args: Extra mock server arguments (latency, faults)
+        server_env: Extra server environment variables
+        traces: Record server traces for the overhead breakdown
+        seed: Workload seed
+
+    Returns:
+        Results document (see report.summarize)
+    """
+    dataset = {"chats": 10_000, "users": 1_000, "knowledge": 10, "files_per_knowledge": 20, **(dataset or {})}
+    output_dir.mkdir(parents=True, exist_ok=True)
+    trace_path = output_dir / "traces.jsonl"
+    trace_path.unlink(missing_ok=True)
+
+    upstream_port, server_port = free_port(), free_port()
+    upstream = ChildProcess(
+        "mock upstream",
+        [
+            "tests.mock_openwebui", "--port", str(upstream_port), "--api-key", API_KEY,
+            *(f"--{key.replace('_', '-')}={value}" for key, value in dataset.items()),
+            *(upstream_args or []),
+        ],
+        {},
+        output_dir / "upstream.log",
+    )
+    env = {
+        "OPENWEBUI_BASE_URL": f"http://127.0.0.1:{upstream_port}",
+        "OPENWEBUI_API_KEY": API_KEY,
+        "HOST": "127.0.0.1",
+        "PORT": str(server_port),
+        # The client-side rate limiter would cap throughput at its default of 10/s
+        "OPENWEBUI_RATE_LIMIT": "1000000",
+        "LOG_LEVEL": "WARNING",
+        **({"TRACING_EXPORT_PATH": str(trace_path)} if traces else {}),
+        **(server_env or {}),
+    }
+    server = ChildProcess("server", ["src.server"], env, output_dir / "server.log")
+    url = f"http://127.0.0.1:{server_port}/sse"
+    sizes = {
+        "chats": dataset["chats"],
+        "users": dataset["users"],
+        "knowledge": dataset["knowledge"],
+        "files": dataset["knowledge"] * dataset["files_per_knowledge"],
+    }
+    mix = mix or {"list": 1.0}
+
+    try:
+        await upstream.start(upstream_port)
+        await server.start(server_port)
+
+        async with AsyncExitStack() as stack:
+            warmup = await _open_session(stack, url)
+            for call in Workload(mix, sizes, seed).every_call():
+                await _call(warmup, *call)
+
+        rss_idle = process_rss_kb(server.pid)
+        async with AsyncExitStack() as stack:
+            opened = [await _open_session(stack, url) for _ in range(sessions)]
+            rss_loaded = process_rss_kb(server.pid)
+
+            calls: list[dict[str, Any]] = []
+            cpu_start = process_cpu_seconds(server.pid)
+            since_ns = time.time_ns()
+            start = time.monotonic()
+            deadline = start + duration
+            await asyncio.gather(*(
+                _drive(session, Workload(mix, sizes, seed + n + 1), deadline, calls)
+                for n, session in enumerate(opened)
+            ))
+            elapsed = time.monotonic() - start
+            cpu_end = process_cpu_seconds(server.pid)
+    finally:
+        await server.stop()
+        await upstream.stop()
+
+    cpu_seconds = cpu_end - cpu_start if cpu_start is not None and cpu_end is not None else None
+    resources = {
+        "rss_idle_mb": round(rss_idle / 1024, 2) if rss_idle is not None else None,
+        "rss_loaded_mb": round(rss_loaded / 1024, 2) if rss_loaded is not None else None,
+        "memory_per_session_kb": (
+            round((rss_loaded - rss_idle) / sessions, 1) if rss_idle is not None and rss_loaded is not None else None
+        ),
+        "cpu_seconds": round(cpu_seconds, 3) if cpu_seconds is not None else None,
+        "cpu_ms_per_call": round(cpu_seconds * 1000 / len(calls), 3) if cpu_seconds is not None and calls else None,
+        "cpu_utilization": round(cpu_seconds / elapsed, 3) if cpu_seconds is not None and elapsed > 0 else None,
+    }
+    config = {
+        "sessions": sessions,
+        "duration_sec": duration,
+        "mix": mix,
+        "dataset": dataset,
+        "upstream_args": upstream_args or [],
+        "server_env": server_env or {},
+        "traces": traces,
+        "seed": seed,
+        "python": sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    return summarize(calls, read_traces(trace_path, since_ns) if traces else [], elapsed, resources, config)
@@ -0,0 +1,159 @@
+"""Benchmark workload: tool classes and the calls they issue.
+
+Each class groups tools with the same cost profile so regressions show
+up where they happen: small paged lists, single-entity reads, searches
+that scan the dataset, completions with streamed upstream bodies and
+binary downloads. Arguments point at entities of the mock dataset.
+"""
+
+import random
+from typing import Any, Callable
+
+from tests.mock_openwebui.dataset import WORDS, synthetic_id
+
+ArgsBuilder = Callable[[random.Random, dict[str, int]], dict[str, Any]]
+
+
+def _messages(rng: random.Random) -> list[dict[str, str]]:
+    """Build a short chat history.
+
+    Args:
+        rng: Random generator
+
+    Returns:
+        Messages
+    """
+    return [{"role": "user", "content": " ".join(rng.choice(WORDS) for _ in range(12))}]
+
+
+# Tools by class, each with a builder for its arguments
+TOOL_CLASSES: dict[str, list[tuple[str, ArgsBuilder]]] = {
+    "list": [
+        ("chat_list", lambda rng, sizes: {"limit": 50, "offset": rng.randrange(0, 500, 50)}),
+        # Generated endpoint tools take page as a string
+        ("get_session_user_chat_list_chats_list", lambda rng, sizes: {"page": str(rng.randint(1, 20))}),
+        ("get_users_users", lambda rng, sizes: {"page": str(rng.randint(1, 10))}),
+        ("get_user_pinned_chats_chats_pinned", lambda rng, sizes: {}),
+    ],
+    "get": [
+        ("chat_get", lambda rng, sizes: {"chat_id": synthetic_id("chats", rng.randrange(sizes["chats"]))}),
+        ("get_user_by_id_users_user_id", lambda rng, sizes: {
+            "user_id": synthetic_id("users", rng.randrange(sizes["users"]))
+        }),
+        ("get_knowledge_by_id_knowledge_id", lambda rng, sizes: {
+            "id": synthetic_id("knowledge", rng.randrange(max(1, sizes["knowledge"])))
+        }),
+    ],
+    "search": [
+        ("search_user_chats_chats_search", lambda rng, sizes: {"text": rng.choice(WORDS)}),
+        ("query_doc_handler_retrieval_query_doc", lambda rng, sizes: {
+            "collection_name": synthetic_id("knowledge", 0), "query": " ".join(rng.sample(WORDS, 3)), "k": 5
+        }),
+    ],
+    "completion": [
+        ("generate_chat_completion_ollama_chat", lambda rng, sizes: {
+            "model": "mock-model-0000", "messages": _messages(rng)
+        }),
+        ("generate_chat_completion_openai_chat_completions", lambda rng, sizes: {
+            "model": "mock-model-0000", "messages": _messages(rng)
+        }),
+    ],
+    "binary": [
+        ("get_file_content_by_id_files_id_content", lambda rng, sizes: {
+            "id": synthetic_id("files", rng.randrange(max(1, sizes["files"])))
+        }),
+    ],
+}
+
+DEFAULT_MIX = "list=4,get=4,search=1,completion=1,binary=1"
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    """Parse a class mix such as "list=4,get=4,search=1".
+
+    Args:
+        spec: Comma-separated class=weight pairs
+
+    Returns:
+        Weights by class
+
+    Raises:
+        ValueError: If a class is unknown or a weight is not positive
+    """
+    mix: dict[str, float] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        name, _, weight = entry.partition("=")
+        name = name.strip()
+        if name not in TOOL_CLASSES:
+            raise ValueError(f"Unknown tool class: {name} (expected one of: {', '.join(TOOL_CLASSES)})")
+        try:
+            mix[name] = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise ValueError(f"Weight must be a number: {entry.strip()}")
+        if mix[name] <= 0:
+            raise ValueError(f"Weight must be > 0: {entry.strip()}")
+    if not mix:
+        raise ValueError("Mix must name at least one tool class")
+    return mix
+
+
+class Workload:
+    """Random sequence of tool calls following a class mix.
+
+    Args:
+        mix: Weights by class
+        sizes: Dataset sizes (chats, users, knowledge, files)
+        seed: Random seed
+    """
+
+    def __init__(self, mix: dict[str, float], sizes: dict[str, int], seed: int = 0) -> None:
+        """Initialize workload.
+
+        Args:
+            mix: Weights by class
+            sizes: Dataset sizes
+            seed: Random seed
+        """
+        self.classes = list(mix)
+        self.weights = [mix[name] for name in self.classes]
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+
+    def next_call(self) -> tuple[str, str, dict[str, Any]]:
+        """Pick the next call.
+
+        Returns:
+            (tool class, tool name, arguments)
+        """
+        tool_class = self.rng.choices(self.classes, self.weights)[0]
+        name, build = self.rng.choice(TOOL_CLASSES[tool_class])
+        return tool_class, name, build(self.rng, self.sizes)
+
+    def every_call(self) -> list[tuple[str, str, dict[str, Any]]]:
+        """List one call per tool in the mix, for warm-up.
+
+        Returns:
+            (tool class, tool name, arguments) tuples
+        """
+        return [
+            (tool_class, name, build(self.rng, self.sizes))
+            for tool_class in self.classes
+            for name, build in TOOL_CLASSES[tool_class]
+        ]
+
+
+def tool_class_of(tool: str) -> str | None:
+    """Find the class of a tool.
+
+    Args:
+        tool: Tool name
+
+    Returns:
+        Class name, or None if the tool is not part of any class
+    """
+    for tool_class, tools in TOOL_CLASSES.items():
+        if any(name == tool for name, _ in tools):
+            return tool_class
+    return None
@@ -0,0 +1,22 @@
+"""Mock Open WebUI server for offline load and benchmark testing.
+
+Serves a synthetic dataset of configurable size with injectable latency,
+errors and rate limiting. Run it standalone with
+``python -m tests.mock_openwebui`` or mount ``create_app()`` in-process
+through ``httpx.ASGITransport``.
+"""
+
+from tests.mock_openwebui.app import MockSettings, create_app
+from tests.mock_openwebui.dataset import Collection, Dataset, synthetic_id
+from tests.mock_openwebui.faults import FaultInjector, Faults, Latency
+
+__all__ = [
+    "Collection",
+    "Dataset",
+    "FaultInjector",
+    "Faults",
+    "Latency",
+    "MockSettings",
+    "create_app",
+    "synthetic_id",
+]
@@ -0,0 +1,112 @@
+"""Run the mock Open WebUI server.
+
+Example:
+    python -m tests.mock_openwebui --chats 100000 --users 10000 \\
+        --latency lognormal:20,0.6 --rate-limit-rate 0.01 --port 8081
+
+Point the MCP server at it with OPENWEBUI_BASE_URL=http://127.0.0.1:8081
+and OPENWEBUI_API_KEY set to --api-key (any value when --api-key is unset).
+"""
+
+import argparse
+import json
+
+import uvicorn
+
+from tests.mock_openwebui.app import MockSettings, create_app
+from tests.mock_openwebui.dataset import Dataset
+from tests.mock_openwebui.faults import Faults
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments.
+
+    Args:
+        argv: Arguments (default: sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(prog="python -m tests.mock_openwebui", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--api-key", help="Bearer token required on requests (default: no auth)")
+
+    data = parser.add_argument_group("dataset")
+    data.add_argument("--chats", type=int, default=1000)
+    data.add_argument("--users", type=int, default=100)
+    data.add_argument("--models", type=int, default=20)
+    data.add_argument("--knowledge", type=int, default=10)
+    data.add_argument("--files-per-knowledge", type=int, default=20)
+    data.add_argument("--prompts", type=int, default=50)
+    data.add_argument("--folders", type=int, default=20)
+    data.add_argument("--messages-per-chat", type=int, default=6)
+    data.add_argument("--file-size", type=int, default=64 * 1024, help="Maximum file size in bytes")
+    data.add_argument("--seed", type=int, default=0)
+
+    faults = parser.add_argument_group("faults")
+    faults.add_argument("--latency", help="Latency spec, e.g. fixed:20, uniform:5,50, lognormal:20,0.6")
+    faults.add_argument(
+        "--route-latency", action="append", default=[], metavar="GLOB=SPEC",
+        help="Per-path latency, e.g. '/api/v1/chats/*=pareto:50,2' (repeatable)"
+    )
+    faults.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    faults.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests rejected with 429")
+    faults.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    faults.add_argument(
+        "--fault-route", action="append", default=[], metavar="GLOB",
+        help="Only inject errors on matching paths (repeatable)"
+    )
+    faults.add_argument("--stream-delay-ms", type=float, default=0.0, help="Delay between streamed chunks")
+    faults.add_argument("--fault-seed", type=int, help="Seed for latency and fault draws")
+
+    responses = parser.add_argument_group("responses")
+    responses.add_argument("--page-size", type=int, default=60)
+    responses.add_argument("--completion-tokens", type=int, default=64)
+    responses.add_argument("--embedding-dim", type=int, default=384)
+    responses.add_argument("--speech-bytes", type=int, default=64 * 1024)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Build the mock server from arguments and serve it.
+
+    Args:
+        argv: Arguments (default: sys.argv)
+    """
+    args = parse_args(argv)
+    dataset = Dataset(
+        chats=args.chats,
+        users=args.users,
+        models=args.models,
+        knowledge=args.knowledge,
+        files_per_knowledge=args.files_per_knowledge,
+        prompts=args.prompts,
+        folders=args.folders,
+        messages_per_chat=args.messages_per_chat,
+        file_size=args.file_size,
+        seed=args.seed,
+    )
+    faults = Faults(
+        latency=args.latency,
+        route_latency=dict(item.split("=", 1) for item in args.route_latency),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        fault_routes=args.fault_route,
+        stream_delay_ms=args.stream_delay_ms,
+        seed=args.fault_seed,
+    )
+    settings = MockSettings(
+        api_key=args.api_key,
+        page_size=args.page_size,
+        completion_tokens=args.completion_tokens,
+        embedding_dim=args.embedding_dim,
+        speech_bytes=args.speech_bytes,
+    )
+    print(json.dumps({"listening": f"http://{args.host}:{args.port}", "faults": faults.to_dict()}))
+    uvicorn.run(create_app(dataset, faults, settings), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,986 @@
+"""Starlette app standing in for Open WebUI.
+
+Implements the endpoints behind the chat, user, model, knowledge, prompt,
+folder and file tools, retrieval processing and queries, embeddings, chat
+completions (JSON, NDJSON and SSE streams) and speech (binary). Other paths
+answer 200 with an empty object and an X-Mock-Fallback header, so every
+tool can run against the mock; /__mock__/stats reports which paths fell
+through.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import math
+import time
+from collections import Counter
+from typing import Any, AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from tests.mock_openwebui.dataset import WORDS, Collection, Dataset, synthetic_id, synthetic_index
+from tests.mock_openwebui.faults import CONTROL_PREFIX, FaultInjector, Faults
+
+
+class MockSettings:
+    """Response shaping settings.
+
+    Args:
+        api_key: Bearer token required on every request (None: no auth)
+        page_size: Items per page of paged lists
+        completion_tokens: Tokens per generated completion
+        embedding_dim: Embedding vector length
+        speech_bytes: Size of generated speech audio
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        page_size: int = 60,
+        completion_tokens: int = 64,
+        embedding_dim: int = 384,
+        speech_bytes: int = 64 * 1024
+    ) -> None:
+        """Initialize settings.
+
+        Args:
+            api_key: Required bearer token
+            page_size: Items per page
+            completion_tokens: Tokens per completion
+            embedding_dim: Embedding length
+            speech_bytes: Speech audio size
+        """
+        self.api_key = api_key
+        self.page_size = page_size
+        self.completion_tokens = completion_tokens
+        self.embedding_dim = embedding_dim
+        self.speech_bytes = speech_bytes
+
+
+def _not_found(what: str = "Item") -> JSONResponse:
+    """Build an Open WebUI style 404.
+
+    Args:
+        what: Missing resource
+
+    Returns:
+        404 response
+    """
+    return JSONResponse({"detail": f"{what} not found"}, status_code=404)
+
+
+def _page(request: Request, default: int | None = 1) -> int | None:
+    """Read the 1-based page query parameter.
+
+    Args:
+        request: Request
+        default: Page when absent (None: unpaged)
+
+    Returns:
+        Page number, or None for the whole list
+    """
+    raw = request.query_params.get("page")
+    if raw is None:
+        return default
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 1
+
+
+async def _body(request: Request) -> dict[str, Any]:
+    """Read a JSON object body.
+
+    Args:
+        request: Request
+
+    Returns:
+        Body, or {} when empty or not an object
+    """
+    raw = await request.body()
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _tokens(seed: str, count: int) -> list[str]:
+    """Generate completion tokens deterministically from the prompt.
+
+    Args:
+        seed: Prompt text
+        count: Tokens
+
+    Returns:
+        Tokens, each with a leading space except the first
+    """
+    digest = int(hashlib.sha256(seed.encode()).hexdigest()[:8], 16)
+    return [("" if n == 0 else " ") + WORDS[(digest + n * 7) % len(WORDS)] for n in range(count)]
+
+
+def _vector(text: str, dim: int) -> list[float]:
+    """Build a unit-length embedding that depends only on the text.
+
+    Args:
+        text: Input text
+        dim: Vector length
+
+    Returns:
+        Embedding
+    """
+    seed = hashlib.sha256(text.encode()).digest()
+    raw = [seed[n % len(seed)] - 127.5 + (n % 7) for n in range(dim)]
+    norm = math.sqrt(sum(v * v for v in raw)) or 1.0
+    return [round(v / norm, 6) for v in raw]
+
+
+class MockOpenWebUI:
+    """Request handlers over a dataset.
+
+    Args:
+        dataset: Synthetic data
+        settings: Response shaping settings
+        faults: Fault settings (for the stream chunk delay)
+    """
+
+    def __init__(self, dataset: Dataset, settings: MockSettings, faults: Faults) -> None:
+        """Initialize handlers.
+
+        Args:
+            dataset: Synthetic data
+            settings: Response settings
+            faults: Fault settings
+        """
+        self.dataset = dataset
+        self.settings = settings
+        self.faults = faults
+        self.fallbacks: Counter = Counter()
+        self.routes: Counter = Counter()
+
+    # Generic collection handlers
+
+    def _list(self, collection: Collection, request: Request, default_page: int | None = None) -> list[Any]:
+        """List a collection, paged when a page is requested.
+
+        Args:
+            collection: Collection
+            request: Request
+            default_page: Page when absent (None: everything)
+
+        Returns:
+            Entities
+        """
+        page = _page(request, default_page)
+        if page is None:
+            return list(collection)
+        size = self.settings.page_size
+        return collection.page((page - 1) * size, size)
+
+    def _get(self, collection: Collection, key: str) -> Response:
+        """Get one entity.
+
+        Args:
+            collection: Collection
+            key: Entity key
+
+        Returns:
+            Entity or 404
+        """
+        entity = collection.get(key)
+        return JSONResponse(entity) if entity is not None else _not_found()
+
+    async def _update(self, collection: Collection, key: str, request: Request) -> Response:
+        """Merge the request body into an entity.
+
+        Args:
+            collection: Collection
+            key: Entity key
+            request: Request
+
+        Returns:
+            Updated entity or 404
+        """
+        entity = collection.update(key, await _body(request))
+        return JSONResponse(entity) if entity is not None else _not_found()
+
+    def _delete(self, collection: Collection, key: str) -> Response:
+        """Delete an entity.
+
+        Args:
+            collection: Collection
+            key: Entity key
+
+        Returns:
+            true or 404
+        """
+        return JSONResponse(True) if collection.delete(key) else _not_found()
+
+    # Chats
+
+    def _chat_summaries(self, indexes: range, extra: list[dict[str, Any]], request: Request) -> list[Any]:
+        """Page chat summaries over written chats and selected synthetic indexes.
+
+        Args:
+            indexes: Synthetic chat indexes, newest first
+            extra: Matching written chats, newest first
+            request: Request
+
+        Returns:
+            Chat summaries
+        """
+        chats = self.dataset.chats
+        page = _page(request, None)
+        size = self.settings.page_size
+        start, stop = ((page - 1) * size, page * size) if page is not None else (0, None)
+        summaries = [self.dataset.chat_summary(c) for c in extra[start:stop]]
+        skip = max(0, start - len(extra))
+        for index in indexes:
+            if stop is not None and len(summaries) >= size:
+                break
+            chat = chats.at(index)
+            if chat is None:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            summaries.append(self.dataset.chat_summary(chat))
+        return summaries
+
+    async def chats_list(self, request: Request) -> Response:
+        """GET /api/v1/chats/ and /api/v1/chats/list."""
+        return JSONResponse([self.dataset.chat_summary(c) for c in self._list(self.dataset.chats, request)])
+
+    async def chats_by_user(self, request: Request) -> Response:
+        """GET /api/v1/chats/list/user/{user_id}."""
+        user_id = request.path_params["user_id"]
+        index = synthetic_index("users", user_id)
+        users = self.dataset.users.count
+        indexes = range(index, self.dataset.chats.count, users) if index is not None and index < users else range(0)
+        extra = [c for c in self.dataset.chats.written() if c.get("user_id") == user_id]
+        return JSONResponse(self._chat_summaries(indexes, extra, request))
+
+    async def chats_pinned(self, request: Request) -> Response:
+        """GET /api/v1/chats/pinned."""
+        extra = [c for c in self.dataset.chats.written() if c.get("pinned")]
+        indexes = range(0, self.dataset.chats.count, 50)
+        return JSONResponse(self._chat_summaries(indexes, extra, request))
+
+    async def chats_archived(self, request: Request) -> Response:
+        """GET /api/v1/chats/archived."""
+        extra = [c for c in self.dataset.chats.written() if c.get("archived")]
+        return JSONResponse(self._chat_summaries(range(0), extra, request))
+
+    async def chats_search(self, request: Request) -> Response:
+        """GET /api/v1/chats/search?text=... (all words must appear in the title)."""
+        terms = request.query_params.get("text", "").lower().split()
+
+        def matches(title: str) -> bool:
+            title = title.lower()
+            return all(term in title for term in terms)
+
+        extra = [c for c in self.dataset.chats.written() if matches(c.get("title") or "")]
+        indexes = [i for i in range(self.dataset.chats.count) if matches(self.dataset.chat_title(i))]
+        return JSONResponse(self._chat_summaries(indexes, extra, request))
+
+    async def chats_in_folder(self, request: Request) -> Response:
+        """GET /api/v1/chats/folder/{folder_id} (full chats)."""
+        folder_id = request.path_params["folder_id"]
+        if self.dataset.folders.get(folder_id) is None:
+            return _not_found("Folder")
+        chats = self.dataset.chats
+        index = synthetic_index("folders", folder_id)
+        step = self.dataset.folders.count * 4
+        result = [c for c in chats.written() if c.get("folder_id") == folder_id]
+        if index is not None and index < self.dataset.folders.count:
+            result.extend(
+                chat for chat in (chats.at(i) for i in range(index, chats.count, step))
+                if chat is not None and chat.get("folder_id") == folder_id
+            )
+        return JSONResponse(result)
+
+    async def chats_by_tag(self, request: Request) -> Response:
+        """POST /api/v1/chats/tags ({"name", "skip", "limit"}; chat summaries)."""
+        body = await _body(request)
+        tag_id = str(body.get("name") or "").replace(" ", "_").lower()
+        skip = max(0, int(body.get("skip") or 0))
+        limit = max(0, int(body.get("limit") or 50))
+        chats = self.dataset.chats
+        first = WORDS.index(tag_id) if tag_id in WORDS else chats.count
+        matching = itertools.chain(
+            (c for c in chats.written() if tag_id in ((c.get("meta") or {}).get("tags") or [])),
+            (
+                chat for chat in (chats.at(i) for i in range(first, chats.count, len(WORDS)))
+                if chat is not None
+            ),
+        )
+        return JSONResponse(
+            [self.dataset.chat_summary(c) for c in itertools.islice(matching, skip, skip + limit)]
+        )
+
+    async def chat_new(self, request: Request) -> Response:
+        """POST /api/v1/chats/new."""
+        chat = (await _body(request)).get("chat") or {}
+        return JSONResponse(self.dataset.chats.create({
+            "user_id": synthetic_id("users", 0),
+            "title": chat.get("title", "New Chat"),
+            "chat": chat,
+            "share_id": None,
+            "archived": False,
+            "pinned": False,
+            "meta": {},
+            "folder_id": chat.get("folder_id"),
+        }))
+
+    async def chat(self, request: Request) -> Response:
+        """GET, POST (update) and DELETE /api/v1/chats/{id}."""
+        chats = self.dataset.chats
+        key = request.path_params["id"]
+        if request.method == "GET":
+            return self._get(chats, key)
+        if request.method == "DELETE":
+            return self._delete(chats, key)
+        existing = chats.get(key)
+        if existing is None:
+            return _not_found()
+        chat = {**existing.get("chat", {}), **((await _body(request)).get("chat") or {})}
+        return JSONResponse(chats.update(key, {"chat": chat, "title": chat.get("title", existing.get("title"))}))
+
+    async def chat_import(self, request: Request) -> Response:
+        """POST /api/v1/chats/import (one form, or {"chats": [forms]})."""
+        body = await _body(request)
+        forms = body.get("chats") if isinstance(body.get("chats"), list) else None
+        created = []
+        for form in forms if forms is not None else [body]:
+            chat = form.get("chat") or {}
+            created.append(self.dataset.chats.create({
+                "user_id": synthetic_id("users", 0),
+                "title": chat.get("title", "New Chat"),
+                "chat": chat,
+                "share_id": None,
+                "archived": False,
+                "pinned": bool(form.get("pinned", False)),
+                "meta": form.get("meta") or {},
+                "folder_id": form.get("folder_id"),
+            }))
+        return JSONResponse(created if forms is not None else created[0])
+
+    async def chat_action(self, request: Request) -> Response:
+        """POST /api/v1/chats/{id}/pin|archive|clone|folder|tags."""
+        chats = self.dataset.chats
+        key = request.path_params["id"]
+        action = request.path_params["action"]
+        if action not in ("pin", "archive", "clone", "folder", "tags"):
+            return JSONResponse({"detail": "Not Found"}, status_code=404)
+        chat = chats.get(key)
+        if chat is None:
+            return _not_found()
+        if action in ("pin", "archive"):
+            field = "pinned" if action == "pin" else "archived"
+            return JSONResponse(chats.update(key, {field: not chat.get(field)}))
+        if action == "folder":
+            return JSONResponse(chats.update(key, {"folder_id": (await _body(request)).get("folder_id")}))
+        if action == "tags":
+            name = str((await _body(request)).get("name") or "")
+            tag_id = name.replace(" ", "_").lower()
+            meta = dict(chat.get("meta") or {})
+            tags = list(meta.get("tags") or [])
+            if tag_id and tag_id not in tags:
+                tags.append(tag_id)
+            chats.update(key, {"meta": {**meta, "tags": tags}})
+            return JSONResponse([{"id": tag, "name": tag, "user_id": chat.get("user_id")} for tag in tags])
+        clone = {k: v for k, v in chat.items() if k not in ("id", "created_at", "updated_at")}
+        return JSONResponse(chats.create({**clone, "title": f"Clone of {chat.get('title')}"}))
+
+    # Users
+
+    async def users_list(self, request: Request) -> Response:
+        """GET /api/v1/users/ ({"users", "total"})."""
+        users = self.dataset.users
+        return JSONResponse({"users": self._list(users, request, default_page=1), "total": len(users)})
+
+    async def user(self, request: Request) -> Response:
+        """GET and DELETE /api/v1/users/{id}."""
+        key = request.path_params["id"]
+        if request.method == "DELETE":
+            return self._delete(self.dataset.users, key)
+        return self._get(self.dataset.users, key)
+
+    async def user_update(self, request: Request) -> Response:
+        """POST /api/v1/users/{id}/update."""
+        return await self._update(self.dataset.users, request.path_params["id"], request)
+
+    # Models
+
+    async def models_list(self, request: Request) -> Response:
+        """GET /api/v1/models/."""
+        return JSONResponse(list(self.dataset.models))
+
+    async def model(self, request: Request) -> Response:
+        """GET /api/v1/models/model?id=..."""
+        return self._get(self.dataset.models, request.query_params.get("id", ""))
+
+    async def model_create(self, request: Request) -> Response:
+        """POST /api/v1/models/create."""
+        return JSONResponse(self.dataset.models.create(await _body(request)))
+
+    async def model_update(self, request: Request) -> Response:
+        """POST /api/v1/models/model/update?id=..."""
+        return await self._update(self.dataset.models, request.query_params.get("id", ""), request)
+
+    async def model_delete(self, request: Request) -> Response:
+        """DELETE /api/v1/models/model/delete?id=..."""
+        return self._delete(self.dataset.models, request.query_params.get("id", ""))
+
+    # Knowledge, prompts, folders
+
+    async def knowledge_list(self, request: Request) -> Response:
+        """GET /api/v1/knowledge/."""
+        return JSONResponse(list(self.dataset.knowledge))
+
+    async def knowledge_create(self, request: Request) -> Response:
+        """POST /api/v1/knowledge/create."""
+        body = await _body(request)
+        return JSONResponse(self.dataset.knowledge.create({"data": {"file_ids": []}, "files": [], **body}))
+
+    async def knowledge(self, request: Request) -> Response:
+        """GET /api/v1/knowledge/{id}."""
+        return self._get(self.dataset.knowledge, request.path_params["id"])
+
+    async def knowledge_update(self, request: Request) -> Response:
+        """POST /api/v1/knowledge/{id}/update."""
+        return await self._update(self.dataset.knowledge, request.path_params["id"], request)
+
+    async def knowledge_delete(self, request: Request) -> Response:
+        """DELETE /api/v1/knowledge/{id}/delete."""
+        return self._delete(self.dataset.knowledge, request.path_params["id"])
+
+    async def knowledge_files_batch_add(self, request: Request) -> Response:
+        """POST /api/v1/knowledge/{id}/files/batch/add (processes, then attaches)."""
+        knowledge = self.dataset.knowledge.get(request.path_params["id"])
+        if knowledge is None:
+            return _not_found()
+        try:
+            forms = json.loads(await request.body() or b"[]")
+        except ValueError:
+            forms = None
+        if not isinstance(forms, list):
+            return JSONResponse({"detail": "Expected a list of files"}, status_code=422)
+        files = []
+        for form in forms:
+            file = self.dataset.files.get(str((form or {}).get("file_id") or ""))
+            if file is None:
+                return JSONResponse({"detail": f"File {(form or {}).get('file_id')} not found"}, status_code=400)
+            files.append(file)
+
+        _, errors = self._process_files(files, knowledge["id"])
+        failed = {error["file_id"] for error in errors}
+        attached = [f for f in knowledge.get("files", []) if f["id"] not in {file["id"] for file in files}]
+        attached += [{"id": file["id"], "meta": file["meta"]} for file in files if file["id"] not in failed]
+        updated = self.dataset.knowledge.update(knowledge["id"], {
+            "files": attached, "data": {"file_ids": [f["id"] for f in attached]},
+        })
+        if errors:
+            updated = {**updated, "warnings": {
+                "message": "Some files failed to process",
+                "errors": [f"{error['file_id']}: {error['error']}" for error in errors],
+            }}
+        return JSONResponse(updated)
+
+    async def knowledge_file(self, request: Request) -> Response:
+        """POST /api/v1/knowledge/{id}/file/add and /file/remove."""
+        knowledge = self.dataset.knowledge.get(request.path_params["id"])
+        file = self.dataset.files.get((await _body(request)).get("file_id") or "")
+        if knowledge is None or file is None:
+            return _not_found()
+        files = [f for f in knowledge.get("files", []) if f["id"] != file["id"]]
+        if request.path_params["action"] == "add":
+            files.append({"id": file["id"], "meta": file["meta"]})
+        return JSONResponse(self.dataset.knowledge.update(knowledge["id"], {
+            "files": files, "data": {"file_ids": [f["id"] for f in files]},
+        }))
+
+    async def prompts_list(self, request: Request) -> Response:
+        """GET /api/v1/prompts/."""
+        return JSONResponse(list(self.dataset.prompts))
+
+    async def prompt_create(self, request: Request) -> Response:
+        """POST /api/v1/prompts/create."""
+        body = await _body(request)
+        body["command"] = str(body.get("command", "")).lstrip("/") or None
+        if body["command"] is None:
+            del body["command"]
+        return JSONResponse(self.dataset.prompts.create(body))
+
+    async def prompt(self, request: Request) -> Response:
+        """GET /api/v1/prompts/command/{command}."""
+        return self._get(self.dataset.prompts, request.path_params["command"])
+
+    async def prompt_update(self, request: Request) -> Response:
+        """POST /api/v1/prompts/command/{command}/update."""
+        return await self._update(self.dataset.prompts, request.path_params["command"], request)
+
+    async def prompt_delete(self, request: Request) -> Response:
+        """DELETE /api/v1/prompts/command/{command}/delete."""
+        return self._delete(self.dataset.prompts, request.path_params["command"])
+
+    async def folders(self, request: Request) -> Response:
+        """GET (list) and POST (create) /api/v1/folders/."""
+        if request.method == "POST":
+            body = await _body(request)
+            return JSONResponse(self.dataset.folders.create({"parent_id": None, "is_expanded": False, **body}))
+        return JSONResponse(list(self.dataset.folders))
+
+    async def folder(self, request: Request) -> Response:
+        """GET and DELETE /api/v1/folders/{id}."""
+        key = request.path_params["id"]
+        if request.method == "DELETE":
+            return self._delete(self.dataset.folders, key)
+        return self._get(self.dataset.folders, key)
+
+    async def folder_update(self, request: Request) -> Response:
+        """POST /api/v1/folders/{id}/update[/parent|/expanded]."""
+        return await self._update(self.dataset.folders, request.path_params["id"], request)
+
+    # Files
+
+    async def files(self, request: Request) -> Response:
+        """GET (list) and POST (multipart upload) /api/v1/files/."""
+        if request.method == "GET":
+            return JSONResponse(self._list(self.dataset.files, request))
+        form = await request.form()
+        upload = next((value for value in form.values() if hasattr(value, "read")), None)
+        if upload is None:
+            return JSONResponse({"detail": "No file uploaded"}, status_code=400)
+        content = await upload.read()
+        name = upload.filename or "upload.bin"
+        file = self.dataset.files.create({
+            "user_id": synthetic_id("users", 0),
+            "filename": name,
+            "meta": {"name": name, "content_type": upload.content_type, "size": len(content)},
+        })
+        self.dataset.file_contents[file["id"]] = content
+        return JSONResponse(file)
+
+    async def file(self, request: Request) -> Response:
+        """GET and DELETE /api/v1/files/{id}."""
+        key = request.path_params["id"]
+        if request.method == "DELETE":
+            self.dataset.file_contents.pop(key, None)
+            return self._delete(self.dataset.files, key)
+        return self._get(self.dataset.files, key)
+
+    async def file_content(self, request: Request) -> Response:
+        """GET /api/v1/files/{id}/content (binary)."""
+        file = self.dataset.files.get(request.path_params["id"])
+        if file is None:
+            return _not_found("File")
+        return Response(
+            self.dataset.file_content(file),
+            media_type=file["meta"].get("content_type") or "application/octet-stream",
+        )
+
+    # Retrieval and embeddings
+
+    def _store_docs(
+        self,
+        collection_name: str,
+        docs: list[dict[str, Any]],
+        add: bool = False,
+        overwrite: bool = False
+    ) -> bool:
+        """Save documents into a collection the way Open WebUI does.
+
+        With overwrite the collection's contents are replaced; otherwise,
+        without add, an existing collection is left unchanged, like
+        save_docs_to_vector_db returning early.
+
+        Args:
+            collection_name: Target collection
+            docs: Documents with content and metadata
+            add: Append to an existing collection
+            overwrite: Replace an existing collection
+
+        Returns:
+            True if the documents were stored
+        """
+        if overwrite:
+            self.dataset.collections[collection_name] = list(docs)
+            return True
+        collection = self.dataset.collections.get(collection_name)
+        if collection is not None and not add:
+            return False
+        self.dataset.collections.setdefault(collection_name, []).extend(docs)
+        return True
+
+    def _process_files(
+        self,
+        files: list[dict[str, Any]],
+        collection_name: str
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Process files into a collection, failing files without content.
+
+        Args:
+            files: File entities
+            collection_name: Target collection
+
+        Returns:
+            Tuple of (results, errors) as in BatchProcessFilesResponse
+        """
+        results, errors = [], []
+        for file in files:
+            content = self.dataset.file_content(file).decode("utf-8", errors="replace")
+            if not content.strip():
+                errors.append({"file_id": file["id"], "status": "failed", "error": "No content extracted"})
+                continue
+            self._store_docs(collection_name, [{
+                "content": content, "metadata": {"file_id": file["id"], "name": file["meta"].get("name")},
+            }], add=True)
+            results.append({"file_id": file["id"], "status": "completed"})
+        return results, errors
+
+    async def process_text(self, request: Request) -> Response:
+        """POST /api/v1/retrieval/process/text."""
+        body = await _body(request)
+        content = str(body.get("content") or "")
+        collection_name = body.get("collection_name") or hashlib.sha256(content.encode()).hexdigest()[:63]
+        self._store_docs(collection_name, [{"content": content, "metadata": {"name": body.get("name")}}], add=False)
+        return JSONResponse({"status": True, "collection_name": collection_name, "content": content})
+
+    def _process_source(self, source: str, collection_name: str) -> dict[str, Any]:
+        """Load a web page or video transcript, replacing the collection's contents.
+
+        Args:
+            source: URL or search query
+            collection_name: Target collection
+
+        Returns:
+            Process response with the loaded content
+        """
+        content = "".join(_tokens(source, self.settings.completion_tokens))
+        self._store_docs(collection_name, [{"content": content, "metadata": {"source": source}}], overwrite=True)
+        return {
+            "status": True,
+            "collection_name": collection_name,
+            "filename": source,
+            "file": {"data": {"content": content}, "meta": {"name": source, "source": source}},
+        }
+
+    async def process_web(self, request: Request) -> Response:
+        """POST /api/v1/retrieval/process/web and /process/youtube (overwrite the collection)."""
+        body = await _body(request)
+        url = str(body.get("url") or "")
+        collection_name = body.get("collection_name") or hashlib.sha256(url.encode()).hexdigest()[:63]
+        return JSONResponse(self._process_source(url, collection_name))
+
+    async def process_web_search(self, request: Request) -> Response:
+        """POST /api/v1/retrieval/process/web/search (overwrite the collection)."""
+        body = await _body(request)
+        queries = [str(q) for q in body.get("queries") or []]
+        collection_name = body.get("collection_name") or hashlib.sha256(
+            "-".join(queries).encode()
+        ).hexdigest()[:63]
+        return JSONResponse(self._process_source(" ".join(queries), collection_name))
+
+    async def process_files_batch(self, request: Request) -> Response:
+        """POST /api/v1/retrieval/process/files/batch."""
+        body = await _body(request)
+        files = [f for f in body.get("files") or [] if isinstance(f, dict) and f.get("id")]
+        known = [self.dataset.files.get(f["id"]) for f in files]
+        results, errors = self._process_files([f for f in known if f is not None], body.get("collection_name") or "")
+        errors += [
+            {"file_id": f["id"], "status": "failed", "error": "File not found"}
+            for f, file in zip(files, known) if file is None
+        ]
+        return JSONResponse({"results": results, "errors": errors})
+
+    async def retrieval_query(self, request: Request) -> Response:
+        """POST /api/v1/retrieval/query/doc and /query/collection."""
+        body = await _body(request)
+        names = body.get("collection_names") or [body.get("collection_name") or "default"]
+        k = max(1, min(int(body.get("k") or 4), 50))
+        query = str(body.get("query", ""))
+        ids, documents, metadatas, distances = [], [], [], []
+        for n in range(k):
+            source = names[n % len(names)]
+            file_index = (int(hashlib.sha256(f"{query}:{source}".encode()).hexdigest()[:6], 16) + n) % max(
+                1, self.dataset.files.count
+            )
+            ids.append(f"{source}-{file_index}-{n}")
+            documents.append(" ".join(_tokens(f"{query}:{n}", 40)))
+            metadatas.append({"source": source, "file_id": synthetic_id("files", file_index), "chunk": n})
+            distances.append(round(0.1 + n * 0.05, 4))
+        return JSONResponse({"ids": [ids], "documents": [documents], "metadatas": [metadatas], "distances": [distances]})
+
+    async def embeddings(self, request: Request) -> Response:
+        """POST /api/embeddings (OpenAI style, batched input)."""
+        body = await _body(request)
+        inputs = body.get("input")
+        inputs = inputs if isinstance(inputs, list) else [inputs or ""]
+        dim = self.settings.embedding_dim
+        return JSONResponse({
+            "object": "list",
+            "model": body.get("model"),
+            "data": [
+                {"object": "embedding", "index": n, "embedding": _vector(str(text), dim)}
+                for n, text in enumerate(inputs)
+            ],
+        })
+
+    async def ollama_embed(self, request: Request) -> Response:
+        """POST /ollama/api/embed[/{url_idx}] (batched input)."""
+        body = await _body(request)
+        inputs = body.get("input")
+        inputs = inputs if isinstance(inputs, list) else [inputs or ""]
+        dim = self.settings.embedding_dim
+        return JSONResponse({
+            "model": body.get("model"),
+            "embeddings": [_vector(str(text), dim) for text in inputs],
+        })
+
+    async def ollama_embeddings(self, request: Request) -> Response:
+        """POST /ollama/api/embeddings (single prompt)."""
+        body = await _body(request)
+        return JSONResponse({"embedding": _vector(str(body.get("prompt", "")), self.settings.embedding_dim)})
+
+    # Completions
+
+    async def _paced(self, chunks: list[bytes]) -> AsyncIterator[bytes]:
+        """Yield chunks with the configured delay between them.
+
+        Args:
+            chunks: Encoded chunks
+
+        Yields:
+            Chunks
+        """
+        for n, chunk in enumerate(chunks):
+            if n and self.faults.stream_delay_ms > 0:
+                await asyncio.sleep(self.faults.stream_delay_ms / 1000)
+            yield chunk
+
+    async def ollama_chat(self, request: Request) -> Response:
+        """POST /ollama/api/chat and /ollama/api/generate (NDJSON unless stream is false)."""
+        body = await _body(request)
+        model = body.get("model", "mock-model-0000")
+        generate = request.url.path.startswith("/ollama/api/generate")
+        prompt = body.get("prompt") if generate else json.dumps(body.get("messages", []))
+        tokens = _tokens(str(prompt), self.settings.completion_tokens)
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+        def chunk(text: str, done: bool) -> dict[str, Any]:
+            payload = {"response": text} if generate else {"message": {"role": "assistant", "content": text}}
+            extra = {"done_reason": "stop", "eval_count": len(tokens)} if done else {}
+            return {"model": model, "created_at": created, **payload, "done": done, **extra}
+
+        if body.get("stream") is False:
+            return JSONResponse(chunk("".join(tokens), True))
+        lines = [json.dumps(chunk(token, False)).encode() + b"\n" for token in tokens]
+        lines.append(json.dumps(chunk("", True)).encode() + b"\n")
+        return StreamingResponse(self._paced(lines), media_type="application/x-ndjson")
+
+    async def openai_chat(self, request: Request) -> Response:
+        """POST /openai/chat/completions and /api/chat/completions (SSE when stream is true)."""
+        body = await _body(request)
+        model = body.get("model", "mock-model-0000")
+        tokens = _tokens(json.dumps(body.get("messages", [])), self.settings.completion_tokens)
+        completion_id = f"chatcmpl-{hashlib.sha256(str(time.time_ns()).encode()).hexdigest()[:12]}"
+        created = int(time.time())
+        if not body.get("stream"):
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+            })
+
+        def event(delta: dict[str, Any], finish: str | None = None) -> bytes:
+            data = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            return f"data: {json.dumps(data)}\n\n".encode()
+
+        events = [event({"role": "assistant", "content": token} if n == 0 else {"content": token})
+                  for n, token in enumerate(tokens)]
+        events.append(event({}, "stop"))
+        events.append(b"data: [DONE]\n\n")
+        return StreamingResponse(self._paced(events), media_type="text/event-stream")
+
+    async def speech(self, request: Request) -> Response:
+        """POST /openai/audio/speech (binary audio)."""
+        text = str((await _body(request)).get("input", ""))
+        block = hashlib.sha256(text.encode()).digest()
+        size = self.settings.speech_bytes
+        return Response((block * (size // len(block) + 1))[:size], media_type="audio/mpeg")
+
+    # Misc
+
+    async def health(self, request: Request) -> Response:
+        """GET /health."""
+        return JSONResponse({"status": True})
+
+    async def fallback(self, request: Request) -> Response:
+        """Answer unimplemented paths with an empty object."""
+        self.fallbacks[f"{request.method} {request.url.path}"] += 1
+        return JSONResponse({}, headers={"X-Mock-Fallback": "1"})
+
+
+class RequireAPIKey:
+    """ASGI middleware rejecting requests without the expected bearer token.
+
+    Args:
+        app: Wrapped application
+        api_key: Expected token
+    """
+
+    def __init__(self, app: Any, api_key: str) -> None:
+        """Initialize middleware.
+
+        Args:
+            app: Wrapped application
+            api_key: Expected token
+        """
+        self.app = app
+        self.expected = f"Bearer {api_key}".encode()
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        """Check the Authorization header of HTTP requests.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive callable
+            send: ASGI send callable
+        """
+        if scope["type"] == "http" and not scope.get("path", "").startswith(CONTROL_PREFIX):
+            if dict(scope.get("headers") or []).get(b"authorization") != self.expected:
+                response = JSONResponse({"detail": "Not authenticated"}, status_code=401)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def create_app(
+    dataset: Dataset | None = None,
+    faults: Faults | None = None,
+    settings: MockSettings | None = None
+) -> FaultInjector:
+    """Build the mock server.
+
+    Args:
+        dataset: Synthetic data (default: Dataset())
+        faults: Latency and fault injection (default: none)
+        settings: Response shaping (default: MockSettings())
+
+    Returns:
+        ASGI app; its .app attribute is the Starlette app and
+        .app.state.mock the handlers with their dataset
+    """
+    dataset = dataset or Dataset()
+    faults = faults or Faults()
+    settings = settings or MockSettings()
+    mock = MockOpenWebUI(dataset, settings, faults)
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse({
+            **injector.get_stats(),
+            "fallbacks": dict(mock.fallbacks.most_common(50)),
+            "faults": faults.to_dict(),
+            "dataset": {
+                name: len(collection) for name, collection in (
+                    ("chats", dataset.chats), ("users", dataset.users), ("models", dataset.models),
+                    ("knowledge", dataset.knowledge), ("prompts", dataset.prompts),
+                    ("folders", dataset.folders), ("files", dataset.files),
+                )
+            },
+        })
+
+    async def configure_faults(request: Request) -> Response:
+        try:
+            faults.configure(**await _body(request))
+        except (TypeError, ValueError) as e:
+            return JSONResponse({"detail": str(e)}, status_code=400)
+        return JSONResponse(faults.to_dict())
+
+    routes = [
+        Route(f"{CONTROL_PREFIX}/stats", stats),
+        Route(f"{CONTROL_PREFIX}/faults", configure_faults, methods=["POST"]),
+        Route("/health", mock.health),
+        Route("/api/v1/chats/", mock.chats_list),
+        Route("/api/v1/chats/list", mock.chats_list),
+        Route("/api/v1/chats/list/user/{user_id}", mock.chats_by_user),
+        Route("/api/v1/chats/pinned", mock.chats_pinned),
+        Route("/api/v1/chats/archived", mock.chats_archived),
+        Route("/api/v1/chats/search", mock.chats_search),
+        Route("/api/v1/chats/folder/{folder_id}", mock.chats_in_folder),
+        Route("/api/v1/chats/new", mock.chat_new, methods=["POST"]),
+        Route("/api/v1/chats/import", mock.chat_import, methods=["POST"]),
+        Route("/api/v1/chats/tags", mock.chats_by_tag, methods=["POST"]),
+        Route("/api/v1/chats/{id}", mock.chat, methods=["GET", "POST", "DELETE"]),
+        Route("/api/v1/chats/{id}/{action:str}", mock.chat_action, methods=["POST"]),
+        Route("/api/v1/users/", mock.users_list),
+        Route("/api/v1/users/{id}", mock.user, methods=["GET", "DELETE"]),
+        Route("/api/v1/users/{id}/update", mock.user_update, methods=["POST"]),
+        Route("/api/v1/models/", mock.models_list),
+        Route("/api/v1/models/model", mock.model),
+        Route("/api/v1/models/create", mock.model_create, methods=["POST"]),
+        Route("/api/v1/models/model/update", mock.model_update, methods=["POST"]),
+        Route("/api/v1/models/model/delete", mock.model_delete, methods=["DELETE"]),
+        Route("/api/v1/knowledge/", mock.knowledge_list),
+        Route("/api/v1/knowledge/create", mock.knowledge_create, methods=["POST"]),
+        Route("/api/v1/knowledge/{id}", mock.knowledge),
+        Route("/api/v1/knowledge/{id}/update", mock.knowledge_update, methods=["POST"]),
+        Route("/api/v1/knowledge/{id}/delete", mock.knowledge_delete, methods=["DELETE"]),
+        Route("/api/v1/knowledge/{id}/file/{action:str}", mock.knowledge_file, methods=["POST"]),
+        Route("/api/v1/knowledge/{id}/files/batch/add", mock.knowledge_files_batch_add, methods=["POST"]),
+        Route("/api/v1/prompts/", mock.prompts_list),
+        Route("/api/v1/prompts/create", mock.prompt_create, methods=["POST"]),
+        Route("/api/v1/prompts/command/{command}", mock.prompt),
+        Route("/api/v1/prompts/command/{command}/update", mock.prompt_update, methods=["POST"]),
+        Route("/api/v1/prompts/command/{command}/delete", mock.prompt_delete, methods=["DELETE"]),
+        Route("/api/v1/folders/", mock.folders, methods=["GET", "POST"]),
+        Route("/api/v1/folders/{id}", mock.folder, methods=["GET", "DELETE"]),
+        Route("/api/v1/folders/{id}/update", mock.folder_update, methods=["POST"]),
+        Route("/api/v1/folders/{id}/update/{field:str}", mock.folder_update, methods=["POST"]),
+        Route("/api/v1/files/", mock.files, methods=["GET", "POST"]),
+        Route("/api/v1/files/{id}", mock.file, methods=["GET", "DELETE"]),
+        Route("/api/v1/files/{id}/content", mock.file_content),
+        Route("/api/v1/retrieval/query/doc", mock.retrieval_query, methods=["POST"]),
+        Route("/api/v1/retrieval/query/collection", mock.retrieval_query, methods=["POST"]),
+        Route("/api/v1/retrieval/process/text", mock.process_text, methods=["POST"]),
+        Route("/api/v1/retrieval/process/web", mock.process_web, methods=["POST"]),
+        Route("/api/v1/retrieval/process/youtube", mock.process_web, methods=["POST"]),
+        Route("/api/v1/retrieval/process/web/search", mock.process_web_search, methods=["POST"]),
+        Route("/api/v1/retrieval/process/files/batch", mock.process_files_batch, methods=["POST"]),
+        Route("/api/embeddings", mock.embeddings, methods=["POST"]),
+        Route("/ollama/api/embed", mock.ollama_embed, methods=["POST"]),
+        Route("/ollama/api/embed/{url_idx}", mock.ollama_embed, methods=["POST"]),
+        Route("/ollama/api/embeddings", mock.ollama_embeddings, methods=["POST"]),
+        Route("/ollama/api/chat", mock.ollama_chat, methods=["POST"]),
+        Route("/ollama/api/generate", mock.ollama_chat, methods=["POST"]),
+        Route("/openai/chat/completions", mock.openai_chat, methods=["POST"]),
+        Route("/api/chat/completions", mock.openai_chat, methods=["POST"]),
+        Route("/openai/audio/speech", mock.speech, methods=["POST"]),
+        Route("/{path:path}", mock.fallback, methods=["GET", "POST", "PUT", "PATCH", "DELETE"]),
+    ]
+    app = Starlette(routes=routes)
+    app.state.mock = mock
+    inner: Any = RequireAPIKey(app, settings.api_key) if settings.api_key else app
+    injector = FaultInjector(inner, faults)
+    injector.starlette = app
+    return injector
@@ -0,0 +1,613 @@
+"""Synthetic Open WebUI dataset generated on demand.
+
+Entities are derived from their index and the seed, so a dataset of 100k
+chats only costs memory for entities created, changed or deleted through
+the API. Listings are newest first: written entities, then synthetic ones
+by index (index 0 is the most recently updated).
+"""
+
+import bisect
+import random
+import time
+import uuid
+from typing import Any, Callable, Iterator
+
+# Synthetic timestamps count back from here, one minute per index
+EPOCH = 1_735_689_600  # 2025-01-01T00:00:00Z
+
+# Type codes in the first group of synthetic ids
+KIND_CODES = {
+    "chats": 1,
+    "users": 2,
+    "models": 3,
+    "knowledge": 4,
+    "prompts": 5,
+    "folders": 6,
+    "files": 7,
+}
+
+WORDS = (
+    "async", "batch", "cache", "deploy", "embedding", "failover", "gateway", "index", "json", "kernel",
+    "latency", "model", "network", "ollama", "pipeline", "query", "retrieval", "schema", "token", "upload",
+    "vector", "webhook", "yaml", "zone", "budget", "roadmap", "invoice", "travel", "recipe", "garden",
+    "history", "physics", "poetry", "review", "summary", "design", "backup", "migration", "release", "audit",
+)
+
+
+def synthetic_id(kind: str, index: int) -> str:
+    """Build the UUID-shaped id of a synthetic entity.
+
+    Args:
+        kind: Collection name
+        index: Entity index
+
+    Returns:
+        Id such as 00000001-0000-4000-8000-00000000002a
+    """
+    return f"{KIND_CODES[kind]:08x}-0000-4000-8000-{index:012x}"
+
+
+def synthetic_index(kind: str, key: str) -> int | None:
+    """Recover the index of a synthetic id.
+
+    Args:
+        kind: Collection name
+        key: Entity id
+
+    Returns:
+        Index, or None if the id is not a synthetic id of this kind
+    """
+    prefix = f"{KIND_CODES[kind]:08x}-0000-4000-8000-"
+    if not key.startswith(prefix) or len(key) != len(prefix) + 12:
+        return None
+    try:
+        return int(key[len(prefix):], 16)
+    except ValueError:
+        return None
+
+
+def words(index: int, count: int, salt: int = 0) -> str:
+    """Pick words deterministically without a random generator.
+
+    Args:
+        index: Entity index
+        count: Number of words
+        salt: Varies the selection between fields
+
+    Returns:
+        Space-separated words
+    """
+    return " ".join(WORDS[(index * (7 + 6 * n) + salt + n * 11) % len(WORDS)] for n in range(count))
+
+
+class Collection:
+    """One entity kind: a synthetic range plus an overlay of API writes.
+
+    Args:
+        kind: Collection name
+        count: Synthetic entities
+        make: Builds the synthetic entity at an index
+        key_field: Field holding the entity key
+        key_of: Maps an index to its key (default: synthetic_id)
+        index_of: Maps a key back to its index (default: synthetic_index)
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        count: int,
+        make: Callable[[int], dict[str, Any]],
+        key_field: str = "id",
+        key_of: Callable[[int], str] | None = None,
+        index_of: Callable[[str], int | None] | None = None
+    ) -> None:
+        """Initialize collection.
+
+        Args:
+            kind: Collection name
+            count: Synthetic entities
+            make: Synthetic entity builder
+            key_field: Key field
+            key_of: Index to key
+            index_of: Key to index
+        """
+        self.kind = kind
+        self.count = count
+        self.key_field = key_field
+        self._make = make
+        self._key_of = key_of or (lambda index: synthetic_id(kind, index))
+        self._index_of = index_of or (lambda key: synthetic_index(kind, key))
+        # Written entities, oldest write first
+        self._written: dict[str, dict[str, Any]] = {}
+        # Synthetic indexes hidden by a delete or superseded by a write
+        self._hidden: list[int] = []
+
+    def __len__(self) -> int:
+        """Count visible entities."""
+        return len(self._written) + self.count - len(self._hidden)
+
+    def key_of(self, index: int) -> str:
+        """Get the key of a synthetic index.
+
+        Args:
+            index: Entity index
+
+        Returns:
+            Entity key
+        """
+        return self._key_of(index)
+
+    def _synthetic(self, key: str) -> int | None:
+        """Resolve a key to a visible synthetic index.
+
+        Args:
+            key: Entity key
+
+        Returns:
+            Index, or None if not a visible synthetic entity
+        """
+        index = self._index_of(key)
+        if index is None or not 0 <= index < self.count:
+            return None
+        position = bisect.bisect_left(self._hidden, index)
+        if position < len(self._hidden) and self._hidden[position] == index:
+            return None
+        return index
+
+    def _hide(self, index: int) -> None:
+        """Hide a synthetic index.
+
+        Args:
+            index: Entity index
+        """
+        bisect.insort(self._hidden, index)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Get an entity.
+
+        Args:
+            key: Entity key
+
+        Returns:
+            Entity, or None if absent
+        """
+        if key in self._written:
+            return self._written[key]
+        index = self._synthetic(key)
+        return self._make(index) if index is not None else None
+
+    def at(self, index: int) -> dict[str, Any] | None:
+        """Get a synthetic entity by index unless hidden.
+
+        Args:
+            index: Entity index
+
+        Returns:
+            Entity, or None if out of range or hidden
+        """
+        return self.get(self.key_of(index)) if 0 <= index < self.count else None
+
+    def page(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        """List entities newest first.
+
+        Args:
+            offset: Entities to skip
+            limit: Maximum entities
+
+        Returns:
+            Entities
+        """
+        written = list(reversed(self._written.values()))
+        items = written[offset:offset + limit]
+        position = max(0, offset - len(written))
+        if len(items) < limit and position < self.count:
+            # Map the position among visible synthetic entities to an index
+            index = position
+            while True:
+                shifted = position + bisect.bisect_right(self._hidden, index)
+                if shifted == index:
+                    break
+                index = shifted
+            hidden = bisect.bisect_left(self._hidden, index)
+            while len(items) < limit and index < self.count:
+                if hidden < len(self._hidden) and self._hidden[hidden] == index:
+                    hidden += 1
+                else:
+                    items.append(self._make(index))
+                index += 1
+        return items
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Iterate every entity newest first."""
+        yield from reversed(list(self._written.values()))
+        hidden = set(self._hidden)
+        for index in range(self.count):
+            if index not in hidden:
+                yield self._make(index)
+
+    def written(self) -> list[dict[str, Any]]:
+        """List entities written through the API, newest first.
+
+        Returns:
+            Entities
+        """
+        return list(reversed(self._written.values()))
+
+    def create(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Add an entity.
+
+        Args:
+            data: Entity fields; a key is generated when missing
+
+        Returns:
+            Stored entity
+        """
+        now = int(time.time())
+        entity = {"created_at": now, **data, "updated_at": now}
+        entity.setdefault(self.key_field, str(uuid.uuid4()))
+        self._written[entity[self.key_field]] = entity
+        return entity
+
+    def update(self, key: str, data: dict[str, Any]) -> dict[str, Any] | None:
+        """Merge fields into an entity, making it the newest.
+
+        Args:
+            key: Entity key
+            data: Fields to change
+
+        Returns:
+            Updated entity, or None if absent
+        """
+        entity = self._written.pop(key, None)
+        if entity is None:
+            index = self._synthetic(key)
+            if index is None:
+                return None
+            entity = self._make(index)
+            self._hide(index)
+        entity = {**entity, **data, self.key_field: key, "updated_at": int(time.time())}
+        self._written[key] = entity
+        return entity
+
+    def delete(self, key: str) -> bool:
+        """Remove an entity.
+
+        Args:
+            key: Entity key
+
+        Returns:
+            True if it existed
+        """
+        if self._written.pop(key, None) is not None:
+            return True
+        index = self._synthetic(key)
+        if index is None:
+            return False
+        self._hide(index)
+        return True
+
+
+class Dataset:
+    """Synthetic users, chats, models, knowledge bases, prompts, folders and files.
+
+    Args:
+        chats: Synthetic chats
+        users: Synthetic users
+        models: Synthetic models
+        knowledge: Synthetic knowledge bases
+        files_per_knowledge: Files attached to each knowledge base
+        prompts: Synthetic prompts
+        folders: Synthetic folders
+        messages_per_chat: Messages in each synthetic chat
+        message_words: Words per synthetic message
+        file_size: Maximum synthetic file size in bytes
+        seed: Varies message text and file sizes
+    """
+
+    def __init__(
+        self,
+        chats: int = 1000,
+        users: int = 100,
+        models: int = 20,
+        knowledge: int = 10,
+        files_per_knowledge: int = 20,
+        prompts: int = 50,
+        folders: int = 20,
+        messages_per_chat: int = 6,
+        message_words: int = 40,
+        file_size: int = 64 * 1024,
+        seed: int = 0
+    ) -> None:
+        """Initialize dataset.
+
+        Args:
+            chats: Synthetic chats
+            users: Synthetic users
+            models: Synthetic models
+            knowledge: Synthetic knowledge bases
+            files_per_knowledge: Files per knowledge base
+            prompts: Synthetic prompts
+            folders: Synthetic folders
+            messages_per_chat: Messages per chat
+            message_words: Words per message
+            file_size: Maximum file size in bytes
+            seed: Random seed
+        """
+        self.files_per_knowledge = files_per_knowledge
+        self.messages_per_chat = messages_per_chat
+        self.message_words = message_words
+        self.file_size = file_size
+        self.seed = seed
+        self.chats = Collection("chats", chats, self._chat)
+        self.users = Collection("users", max(1, users), self._user)
+        self.models = Collection(
+            "models", models, self._model,
+            key_of=lambda index: f"mock-model-{index:04d}",
+            index_of=lambda key: _suffix_index(key, "mock-model-"),
+        )
+        self.knowledge = Collection("knowledge", knowledge, self._knowledge)
+        self.prompts = Collection(
+            "prompts", prompts, self._prompt, key_field="command",
+            key_of=lambda index: f"prompt-{index:06d}",
+            index_of=lambda key: _suffix_index(key, "prompt-"),
+        )
+        self.folders = Collection("folders", folders, self._folder)
+        self.files = Collection("files", knowledge * files_per_knowledge, self._file)
+        self.file_contents: dict[str, bytes] = {}
+        # Documents processed into each vector collection, by collection name
+        self.collections: dict[str, list[dict[str, Any]]] = {}
+
+    def _rng(self, kind: str, index: int) -> random.Random:
+        """Get the random generator of one entity.
+
+        Args:
+            kind: Collection name
+            index: Entity index
+
+        Returns:
+            Seeded generator
+        """
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    def _timestamps(self, index: int, count: int) -> dict[str, int]:
+        """Get timestamps that keep index 0 newest.
+
+        Args:
+            index: Entity index
+            count: Entities in the collection
+
+        Returns:
+            created_at and updated_at
+        """
+        updated = EPOCH + (count - index) * 60
+        return {"created_at": updated - 3600, "updated_at": updated}
+
+    def chat_folder_index(self, index: int) -> int | None:
+        """Get the folder of a synthetic chat (a quarter of chats are filed).
+
+        Args:
+            index: Chat index
+
+        Returns:
+            Folder index, or None if the chat is not in a folder
+        """
+        if not self.folders.count:
+            return None
+        slot = index % (self.folders.count * 4)
+        return slot if slot < self.folders.count else None
+
+    def chat_title(self, index: int) -> str:
+        """Get the title of a synthetic chat without building it.
+
+        Args:
+            index: Chat index
+
+        Returns:
+            Title
+        """
+        return words(index, 3).capitalize()
+
+    def chat_summary(self, chat: dict[str, Any]) -> dict[str, Any]:
+        """Reduce a chat to its list entry.
+
+        Args:
+            chat: Chat
+
+        Returns:
+            Chat list entry
+        """
+        return {key: chat.get(key) for key in ("id", "title", "updated_at", "created_at")}
+
+    def _chat(self, index: int) -> dict[str, Any]:
+        """Build a synthetic chat with a linear message history.
+
+        Args:
+            index: Chat index
+
+        Returns:
+            Chat
+        """
+        rng = self._rng("chats", index)
+        times = self._timestamps(index, self.chats.count)
+        model = f"mock-model-{index % max(1, self.models.count):04d}"
+        history: dict[str, dict[str, Any]] = {}
+        parent = None
+        for n in range(self.messages_per_chat):
+            message_id = f"{index:x}-{n}"
+            history[message_id] = {
+                "id": message_id,
+                "parentId": parent,
+                "childrenIds": [],
+                "role": "user" if n % 2 == 0 else "assistant",
+                "content": " ".join(rng.choice(WORDS) for _ in range(self.message_words)),
+                "timestamp": times["created_at"] + n * 30,
+                **({"model": model} if n % 2 else {}),
+            }
+            if parent is not None:
+                history[parent]["childrenIds"].append(message_id)
+            parent = message_id
+        folder = self.chat_folder_index(index)
+        title = self.chat_title(index)
+        return {
+            "id": synthetic_id("chats", index),
+            "user_id": synthetic_id("users", index % self.users.count),
+            "title": title,
+            "chat": {
+                "title": title,
+                "models": [model],
+                "history": {"messages": history, "currentId": parent},
+                "messages": list(history.values()),
+            },
+            **times,
+            "share_id": None,
+            "archived": False,
+            "pinned": index % 50 == 0,
+            "meta": {"tags": [WORDS[index % len(WORDS)]]},
+            "folder_id": synthetic_id("folders", folder) if folder is not None else None,
+        }
+
+    def _user(self, index: int) -> dict[str, Any]:
+        """Build a synthetic user.
+
+        Args:
+            index: User index
+
+        Returns:
+            User
+        """
+        times = self._timestamps(index, self.users.count)
+        return {
+            "id": synthetic_id("users", index),
+            "name": f"User {index}",
+            "email": f"user{index}@example.com",
+            "role": "admin" if index == 0 else "user",
+            "profile_image_url": "/user.png",
+            "last_active_at": times["updated_at"],
+            **times,
+        }
+
+    def _model(self, index: int) -> dict[str, Any]:
+        """Build a synthetic model.
+
+        Args:
+            index: Model index
+
+        Returns:
+            Model
+        """
+        return {
+            "id": f"mock-model-{index:04d}",
+            "name": f"Mock Model {index}",
+            "base_model_id": None,
+            "user_id": synthetic_id("users", 0),
+            "meta": {"description": words(index, 6, salt=3), "capabilities": {"vision": index % 3 == 0}},
+            "params": {},
+            "is_active": True,
+            **self._timestamps(index, self.models.count),
+        }
+
+    def _knowledge(self, index: int) -> dict[str, Any]:
+        """Build a synthetic knowledge base with its file list.
+
+        Args:
+            index: Knowledge base index
+
+        Returns:
+            Knowledge base
+        """
+        first = index * self.files_per_knowledge
+        files = [self._file(first + n) for n in range(self.files_per_knowledge)]
+        return {
+            "id": synthetic_id("knowledge", index),
+            "user_id": synthetic_id("users", 0),
+            "name": f"Knowledge {index}: {words(index, 2, salt=5)}",
+            "description": words(index, 8, salt=7),
+            "data": {"file_ids": [f["id"] for f in files]},
+            "files": [{"id": f["id"], "meta": f["meta"]} for f in files],
+            **self._timestamps(index, self.knowledge.count),
+        }
+
+    def _prompt(self, index: int) -> dict[str, Any]:
+        """Build a synthetic prompt.
+
+        Args:
+            index: Prompt index
+
+        Returns:
+            Prompt
+        """
+        return {
+            "command": f"prompt-{index:06d}",
+            "user_id": synthetic_id("users", 0),
+            "title": f"Prompt {index}",
+            "content": f"Write a {words(index, 4, salt=9)} about {{{{topic}}}}",
+            "access_control": None,
+            "timestamp": self._timestamps(index, self.prompts.count)["updated_at"],
+        }
+
+    def _folder(self, index: int) -> dict[str, Any]:
+        """Build a synthetic folder; every third folder nests under another.
+
+        Args:
+            index: Folder index
+
+        Returns:
+            Folder
+        """
+        parent = (index - 1) // 4 if index and index % 3 == 0 else None
+        return {
+            "id": synthetic_id("folders", index),
+            "name": f"Folder {index}",
+            "parent_id": synthetic_id("folders", parent) if parent is not None else None,
+            "user_id": synthetic_id("users", 0),
+            "is_expanded": False,
+            **self._timestamps(index, self.folders.count),
+        }
+
+    def _file(self, index: int) -> dict[str, Any]:
+        """Build synthetic file metadata.
+
+        Args:
+            index: File index
+
+        Returns:
+            File
+        """
+        size = self._rng("files", index).randint(min(1024, self.file_size), self.file_size)
+        name = f"{words(index, 2, salt=13).replace(' ', '-')}-{index}.txt"
+        return {
+            "id": synthetic_id("files", index),
+            "user_id": synthetic_id("users", 0),
+            "filename": name,
+            "meta": {"name": name, "content_type": "text/plain", "size": size},
+            **self._timestamps(index, self.files.count),
+        }
+
+    def file_content(self, file: dict[str, Any]) -> bytes:
+        """Get the bytes of a file.
+
+        Args:
+            file: File metadata
+
+        Returns:
+            Uploaded bytes, or synthetic text of the recorded size
+        """
+        if file["id"] in self.file_contents:
+            return self.file_contents[file["id"]]
+        size = file["meta"]["size"]
+        line = (words(size, 12, salt=17) + "\n").encode()
+        return (line * (size // len(line) + 1))[:size]
+
+
+def _suffix_index(key: str, prefix: str) -> int | None:
+    """Parse keys of the form <prefix><digits>.
+
+    Args:
+        key: Entity key
+        prefix: Key prefix
+
+    Returns:
+        Index, or None if the key does not match
+    """
+    suffix = key[len(prefix):] if key.startswith(prefix) else ""
+    return int(suffix) if suffix.isdigit() else None
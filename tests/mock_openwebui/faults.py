@@ -0,0 +1,268 @@
+"""Latency and fault injection for the mock Open WebUI server.
+
+Latency specs are strings so they fit on a command line:
+
+    fixed:20              always 20ms
+    uniform:5,50          5-50ms
+    normal:30,10          mean 30ms, standard deviation 10ms (clipped at 0)
+    lognormal:20,0.6      median 20ms, sigma 0.6 (long right tail)
+    pareto:10,2.5         minimum 10ms, shape 2.5 (heavy tail)
+
+FaultInjector is a plain ASGI middleware so it adds no per-request
+buffering, which matters when streaming responses are benchmarked.
+"""
+
+import asyncio
+import fnmatch
+import json
+import math
+import random
+from collections import Counter
+from typing import Any, Awaitable, Callable
+
+ASGIApp = Callable[[dict[str, Any], Callable[[], Awaitable[dict[str, Any]]], Callable[[dict[str, Any]], Awaitable[None]]], Awaitable[None]]
+
+# Paths under this prefix control the mock and are never delayed or failed
+CONTROL_PREFIX = "/__mock__"
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "pareto")
+
+
+class Latency:
+    """Random delay drawn from a distribution.
+
+    Args:
+        spec: Distribution spec such as "lognormal:20,0.6" (milliseconds)
+        rng: Random generator
+    """
+
+    def __init__(self, spec: str, rng: random.Random | None = None) -> None:
+        """Initialize latency model.
+
+        Args:
+            spec: Distribution spec
+            rng: Random generator
+
+        Raises:
+            ValueError: If the spec is malformed
+        """
+        name, _, raw = spec.partition(":")
+        name = name.strip().lower()
+        if name not in DISTRIBUTIONS:
+            raise ValueError(f"Latency distribution must be one of: {', '.join(DISTRIBUTIONS)}")
+        try:
+            self.params = tuple(float(p) for p in raw.split(",")) if raw.strip() else ()
+        except ValueError:
+            raise ValueError(f"Latency parameters must be numbers: {spec}")
+        expected = 1 if name == "fixed" else 2
+        if len(self.params) != expected or any(p < 0 for p in self.params):
+            raise ValueError(f"{name} latency takes {expected} non-negative parameter(s): {spec}")
+        self.spec = spec
+        self.name = name
+        self.rng = rng or random.Random()
+
+    def sample_ms(self) -> float:
+        """Draw one delay.
+
+        Returns:
+            Delay in milliseconds
+        """
+        p = self.params
+        if self.name == "fixed":
+            return p[0]
+        if self.name == "uniform":
+            return self.rng.uniform(p[0], p[1])
+        if self.name == "normal":
+            return max(0.0, self.rng.gauss(p[0], p[1]))
+        if self.name == "lognormal":
+            return self.rng.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        return p[0] * self.rng.paretovariate(p[1]) if p[1] > 0 else p[0]
+
+
+class Faults:
+    """Fault settings, adjustable at runtime through the control endpoint.
+
+    Args:
+        latency: Default latency spec (None: no delay)
+        route_latency: Latency specs by path glob, first match wins
+        error_rate: Fraction of requests failing with 500
+        rate_limit_rate: Fraction of requests rejected with 429
+        retry_after: Retry-After seconds sent with 429 responses
+        fault_routes: Path globs eligible for errors (default: all)
+        stream_delay_ms: Delay between streamed chunks
+        seed: Random seed (None: nondeterministic)
+    """
+
+    def __init__(
+        self,
+        latency: str | None = None,
+        route_latency: dict[str, str] | None = None,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 1,
+        fault_routes: list[str] | None = None,
+        stream_delay_ms: float = 0.0,
+        seed: int | None = None
+    ) -> None:
+        """Initialize fault settings.
+
+        Args:
+            latency: Default latency spec
+            route_latency: Latency specs by path glob
+            error_rate: 500 fraction
+            rate_limit_rate: 429 fraction
+            retry_after: Retry-After seconds
+            fault_routes: Path globs eligible for errors
+            stream_delay_ms: Delay between streamed chunks
+            seed: Random seed
+        """
+        self.rng = random.Random(seed)
+        self.configure(
+            latency=latency,
+            route_latency=route_latency or {},
+            error_rate=error_rate,
+            rate_limit_rate=rate_limit_rate,
+            retry_after=retry_after,
+            fault_routes=fault_routes or [],
+            stream_delay_ms=stream_delay_ms,
+        )
+
+    def configure(self, **settings: Any) -> None:
+        """Change settings; unknown names are rejected.
+
+        Args:
+            **settings: Settings by constructor argument name
+
+        Raises:
+            ValueError: If a setting is unknown or invalid
+        """
+        for name, value in settings.items():
+            if name == "latency":
+                self.latency = Latency(value, self.rng) if value else None
+            elif name == "route_latency":
+                self.route_latency = {glob: Latency(spec, self.rng) for glob, spec in dict(value).items()}
+            elif name in ("error_rate", "rate_limit_rate"):
+                if not 0.0 <= float(value) <= 1.0:
+                    raise ValueError(f"{name} must be between 0 and 1")
+                setattr(self, name, float(value))
+            elif name in ("retry_after", "stream_delay_ms"):
+                if float(value) < 0:
+                    raise ValueError(f"{name} must be >= 0")
+                setattr(self, name, int(value) if name == "retry_after" else float(value))
+            elif name == "fault_routes":
+                self.fault_routes = list(value)
+            else:
+                raise ValueError(f"Unknown fault setting: {name}")
+
+    def delay_ms(self, path: str) -> float:
+        """Draw the delay for a request.
+
+        Args:
+            path: Request path
+
+        Returns:
+            Delay in milliseconds
+        """
+        for glob, latency in self.route_latency.items():
+            if fnmatch.fnmatchcase(path, glob):
+                return latency.sample_ms()
+        return self.latency.sample_ms() if self.latency is not None else 0.0
+
+    def fault(self, path: str) -> int | None:
+        """Decide whether a request fails.
+
+        Args:
+            path: Request path
+
+        Returns:
+            429 or 500, or None to serve the request
+        """
+        if self.fault_routes and not any(fnmatch.fnmatchcase(path, glob) for glob in self.fault_routes):
+            return None
+        roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Export settings.
+
+        Returns:
+            Settings in constructor argument form
+        """
+        return {
+            "latency": self.latency.spec if self.latency is not None else None,
+            "route_latency": {glob: latency.spec for glob, latency in self.route_latency.items()},
+            "error_rate": self.error_rate,
+            "rate_limit_rate": self.rate_limit_rate,
+            "retry_after": self.retry_after,
+            "fault_routes": self.fault_routes,
+            "stream_delay_ms": self.stream_delay_ms,
+        }
+
+
+class FaultInjector:
+    """ASGI middleware delaying, failing and counting requests.
+
+    Args:
+        app: Wrapped application
+        faults: Fault settings
+    """
+
+    def __init__(self, app: ASGIApp, faults: Faults) -> None:
+        """Initialize middleware.
+
+        Args:
+            app: Wrapped application
+            faults: Fault settings
+        """
+        self.app = app
+        self.faults = faults
+        self.requests: Counter = Counter()
+        self.injected: Counter = Counter()
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        """Handle one ASGI connection.
+
+        Args:
+            scope: ASGI scope
+            receive: ASGI receive callable
+            send: ASGI send callable
+        """
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path.startswith(CONTROL_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        self.requests[scope["method"]] += 1
+        delay = self.faults.delay_ms(path)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        status = self.faults.fault(path)
+        if status is None:
+            await self.app(scope, receive, send)
+            return
+
+        self.injected[status] += 1
+        headers = [(b"content-type", b"application/json")]
+        if status == 429:
+            headers.append((b"retry-after", str(self.faults.retry_after).encode()))
+            body = {"detail": "Rate limit exceeded (injected)"}
+        else:
+            body = {"detail": "Internal server error (injected)"}
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+    def get_stats(self) -> dict[str, Any]:
+        """Export request and injected fault counts.
+
+        Returns:
+            Dict with counts by method and by injected status
+        """
+        return {
+            "requests": dict(self.requests),
+            "injected": {str(status): count for status, count in self.injected.items()},
+        }
@@ -0,0 +1,157 @@
+"""Tests for upstream record and replay cassettes."""
+
+import gzip
+import json
+import time
+import pytest
+import httpx
+import respx
+from src.config import Config
+from src.exceptions import HTTPError
+from src.services.cassette import RecordingTransport, ReplayTransport
+from src.services.client import OpenWebUIClient
+
+
+class _ChunkedStream(httpx.AsyncByteStream):
+    """Response body delivered in several chunks."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def upstream(request: httpx.Request) -> httpx.Response:
+    """Stand-in upstream used behind the recording transport."""
+    if request.url.path == "/stream":
+        return httpx.Response(200, headers={"content-type": "application/x-ndjson"},
+                              stream=_ChunkedStream([b'{"n":1}\n', b'{"n":2}\n']))
+    if request.url.path == "/binary":
+        return httpx.Response(200, content=b"\x00\xff\x10", headers={"content-type": "audio/mpeg"})
+    body = json.loads(request.content) if request.content else None
+    return httpx.Response(200, json={"path": request.url.path, "echo": body}, headers={"set-cookie": "s=1"})
+
+
+async def record(path, *requests) -> None:
+    """Send requests through a recording transport."""
+    async with httpx.AsyncClient(
+        base_url="http://upstream", transport=RecordingTransport(httpx.MockTransport(upstream), path)
+    ) as client:
+        for method, url, body in requests:
+            await client.request(method, url, json=body, headers={"Authorization": "Bearer secret"})
+
+
+def replay_client(path, scale: float = 0.0) -> httpx.AsyncClient:
+    """Create a client served from a cassette."""
+    return httpx.AsyncClient(base_url="http://upstream", transport=ReplayTransport(path, scale))
+
+
+class TestCassette:
+    """Test recording and replaying exchanges."""
+
+    async def test_round_trip(self, tmp_path):
+        """Test replayed responses match the recorded ones."""
+        path = tmp_path / "cassette.jsonl"
+        await record(path, ("GET", "/api/v1/chats/?page=1", None), ("POST", "/api/v1/chats/new", {"a": 1}))
+
+        async with replay_client(path) as client:
+            listed = await client.get("/api/v1/chats/?page=1")
+            created = await client.post("/api/v1/chats/new", json={"a": 1})
+
+        assert listed.json() == {"path": "/api/v1/chats/", "echo": None}
+        assert created.json()["echo"] == {"a": 1}
+        assert "set-cookie" not in created.headers
+
+    async def test_never_stores_request_headers(self, tmp_path):
+        """Test the API key does not reach the cassette."""
+        path = tmp_path / "cassette.jsonl"
+        await record(path, ("GET", "/health", None))
+
+        text = path.read_text()
+
+        assert "secret" not in text
+        assert json.loads(text.splitlines()[0]) == {"cassette": 1}
+
+    async def test_binary_streamed_and_gzip(self, tmp_path):
+        """Test binary bodies, chunk timing and gzip cassettes."""
+        path = tmp_path / "cassette.jsonl.gz"
+        await record(path, ("GET", "/binary", None), ("GET", "/stream", None))
+
+        entries = [json.loads(line) for line in gzip.open(path, "rt")][1:]
+        async with replay_client(path) as client:
+            binary = await client.get("/binary")
+            async with client.stream("GET", "/stream") as response:
+                chunks = [chunk async for chunk in response.aiter_raw()]
+
+        assert "body_b64" in entries[0]
+        assert len(entries[1]["chunks"]) == 2
+        assert binary.content == b"\x00\xff\x10"
+        assert chunks == [b'{"n":1}\n', b'{"n":2}\n']
+
+    async def test_matching_falls_back_and_cycles(self, tmp_path):
+        """Test body mismatches fall back to method and path, and repeats cycle."""
+        path = tmp_path / "cassette.jsonl"
+        await record(path, ("POST", "/echo", {"n": 1}), ("POST", "/echo", {"n": 2}))
+
+        async with replay_client(path) as client:
+            exact = await client.post("/echo", json={"n": 2})
+            loose = [(await client.post("/echo", json={"n": 3})).json()["echo"] for _ in range(3)]
+
+        assert exact.json()["echo"] == {"n": 2}
+        assert loose == [{"n": 1}, {"n": 2}, {"n": 1}]
+
+    async def test_unrecorded_request_fails(self, tmp_path):
+        """Test requests missing from the cassette fail as connection errors."""
+        path = tmp_path / "cassette.jsonl"
+        await record(path, ("GET", "/health", None))
+        transport = ReplayTransport(path, 0)
+
+        async with httpx.AsyncClient(base_url="http://upstream", transport=transport) as client:
+            with pytest.raises(httpx.ConnectError, match="GET /other"):
+                await client.get("/other")
+
+        assert transport.get_stats()["misses"] == 1
+
+    async def test_timing_scale(self, tmp_path):
+        """Test replay waits for the recorded time to headers times the scale."""
+        path = tmp_path / "cassette.jsonl"
+        entry = {"method": "GET", "path": "/slow", "body_hash": None, "status": 200, "headers": {},
+                 "ttfb_ms": 200.0, "body": "{}"}
+        path.write_text(json.dumps({"cassette": 1}) + "\n" + json.dumps(entry) + "\n")
+
+        async with replay_client(path, scale=0.25) as client:
+            start = time.monotonic()
+            await client.get("/slow")
+            elapsed = time.monotonic() - start
+
+        assert 0.04 <= elapsed < 0.2
+
+    def test_missing_cassette(self, tmp_path):
+        """Test a missing cassette raises ValueError."""
+        with pytest.raises(ValueError, match="Cannot read cassette"):
+            ReplayTransport(tmp_path / "missing.jsonl")
+
+    @respx.mock
+    async def test_client_record_then_replay(self, tmp_path):
+        """Test OpenWebUIClient records in record mode and replays offline."""
+        path = str(tmp_path / "cassette.jsonl")
+        respx.get("http://localhost:8080/api/v1/models/").mock(return_value=httpx.Response(200, json=[{"id": "m"}]))
+        recorder = OpenWebUIClient(Config(
+            OPENWEBUI_BASE_URL="http://localhost:8080", CASSETTE_MODE="record", CASSETTE_PATH=path
+        ))
+        assert await recorder.get("/api/v1/models/") == [{"id": "m"}]
+        await recorder.close()
+        respx.reset()
+
+        replayer = OpenWebUIClient(Config(
+            OPENWEBUI_BASE_URL="http://localhost:8080", CASSETTE_MODE="replay", CASSETTE_PATH=path,
+            CASSETTE_TIMING_SCALE=0
+        ))
+
+        assert await replayer.get("/api/v1/models/") == [{"id": "m"}]
+        with pytest.raises(HTTPError) as exc_info:
+            await replayer.get("/api/v1/users/")
+        assert exc_info.value.status_code == 0
+        await replayer.close()
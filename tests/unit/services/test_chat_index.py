@@ -0,0 +1,236 @@
+"""Tests for the offline chat search index."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.exceptions import NotFoundError
+from src.services.chat_index import ChatIndex, build_match, extract_messages
+
+
+def make_chat(chat_id, text, updated_at=100, tags=(), title=None, timestamp=None):
+    """Build a chat as returned by the chat detail endpoint."""
+    return {
+        "id": chat_id,
+        "title": title or f"Chat {chat_id}",
+        "updated_at": updated_at,
+        "meta": {"tags": list(tags)},
+        "chat": {
+            "history": {
+                "messages": {
+                    "m1": {"id": "m1", "role": "user", "content": text, "timestamp": timestamp or updated_at},
+                    "m2": {"id": "m2", "role": "assistant", "content": "Sure, here you go.",
+                           "timestamp": timestamp or updated_at},
+                }
+            }
+        },
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Create an index without background syncing."""
+    return ChatIndex(Mock(), tmp_path / "index.db", refresh_seconds=0)
+
+
+class TestBuildMatch:
+    """Tests for query parsing."""
+
+    def test_terms_phrases_and_prefixes(self):
+        """Test terms are quoted, phrases kept together and prefixes marked."""
+        assert build_match('kubernetes "rolling update" deploy*') == (
+            '"kubernetes" AND "rolling update" AND "deploy"*'
+        )
+        assert build_match("a OR b", match_all=False) == '"a" OR "OR" OR "b"'
+
+    def test_empty_query_rejected(self):
+        """Test queries without words are rejected."""
+        with pytest.raises(ValueError, match="at least one word"):
+            build_match('  - "" * ')
+
+
+class TestExtractMessages:
+    """Tests for message extraction."""
+
+    def test_history_branches_and_content_parts(self):
+        """Test every history branch and list content are indexed."""
+        chat = {
+            "id": "c1",
+            "title": "Plans",
+            "updated_at": 5,
+            "chat": {"history": {"messages": {
+                "a": {"id": "a", "role": "user", "content": [{"type": "text", "text": "first"}]},
+                "b": {"id": "b", "role": "assistant", "content": "second", "timestamp": 3},
+                "c": {"id": "c", "role": "assistant", "content": ""},
+            }}},
+        }
+
+        messages = extract_messages(chat)
+
+        assert [(m["role"], m["content"], m["ts"]) for m in messages] == [
+            ("title", "Plans", 5), ("user", "first", 5), ("assistant", "second", 3)
+        ]
+
+    def test_flat_message_list(self):
+        """Test chats without history fall back to the message list."""
+        chat = {"id": "c1", "chat": {"messages": [{"id": "a", "role": "user", "content": "hi"}]}}
+
+        assert [m["content"] for m in extract_messages(chat)] == ["hi"]
+
+
+class TestChatIndex:
+    """Tests for ChatIndex."""
+
+    @pytest.mark.asyncio
+    async def test_search_ranks_and_snippets(self, index):
+        """Test chats are ranked by relevance with message snippets."""
+        index.upsert([
+            make_chat("c1", "How do I configure the postgres connection pool?"),
+            make_chat("c2", "postgres postgres postgres replication lag"),
+            make_chat("c3", "Nothing relevant here"),
+        ])
+
+        result = await index.search("postgres")
+
+        assert [r["chat_id"] for r in result["results"]] == ["c2", "c1"]
+        top = result["results"][0]
+        assert top["score"] > 0
+        assert top["snippets"][0]["message_id"] == "m1"
+        assert "[postgres]" in top["snippets"][0]["snippet"]
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_phrase_query(self, index):
+        """Test quoted phrases only match adjacent words."""
+        index.upsert([
+            make_chat("c1", "the connection pool is full"),
+            make_chat("c2", "pool of connection objects"),
+        ])
+
+        result = await index.search('"connection pool"')
+
+        assert [r["chat_id"] for r in result["results"]] == ["c1"]
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_tag_and_date_filters(self, index):
+        """Test tag and date range filters restrict matches."""
+        index.upsert([
+            make_chat("c1", "deploy notes", tags=["Work", "ops"], timestamp=1000),
+            make_chat("c2", "deploy notes", tags=["work"], timestamp=2000),
+            make_chat("c3", "deploy notes", timestamp=3000),
+        ])
+
+        tagged = await index.search("deploy", tags=["work"])
+        both = await index.search("deploy", tags=["work", "ops"])
+        dated = await index.search("deploy", after=1500, before=3000)
+
+        assert sorted(r["chat_id"] for r in tagged["results"]) == ["c1", "c2"]
+        assert [r["chat_id"] for r in both["results"]] == ["c1"]
+        assert [r["chat_id"] for r in dated["results"]] == ["c2"]
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_upsert_replaces_chat(self, index):
+        """Test re-indexing a chat replaces its old messages."""
+        index.upsert([make_chat("c1", "old words")])
+        index.upsert([make_chat("c1", "new words", updated_at=200)])
+
+        assert (await index.search("old"))["results"] == []
+        assert len((await index.search("new"))["results"]) == 1
+        assert index.get_stats()["chats"] == 1
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_deleted_chat_hidden_before_sync(self, index):
+        """Test chats deleted through the client disappear from results at once."""
+        index.upsert([make_chat("c1", "secret plan")])
+
+        index.on_mutation("DELETE", "/api/v1/chats/c1", None, True)
+
+        assert (await index.search("secret"))["results"] == []
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_ingest_archive(self, index, tmp_path):
+        """Test an export archive builds the index and reruns skip indexed chats."""
+        archive = tmp_path / "chats.jsonl"
+        archive.write_text(
+            "\n".join(json.dumps(make_chat(f"c{i}", f"topic{i} text", updated_at=i)) for i in range(5)) + "\n"
+        )
+
+        first = await index.ingest_archive(archive, "none")
+        second = await index.ingest_archive(archive, "none")
+
+        assert first["indexed"] == 5
+        assert second["skipped"] == 5
+        assert index.get_stats()["watermark"] == 4
+        assert [r["chat_id"] for r in (await index.search("topic3"))["results"]] == ["c3"]
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_sync_fetches_only_changed_chats(self, tmp_path):
+        """Test incremental syncs re-fetch new, changed and written chats only."""
+        client = Mock()
+        index = ChatIndex(client, tmp_path / "index.db", refresh_seconds=0)
+        chats = {"c1": make_chat("c1", "alpha", 10), "c2": make_chat("c2", "beta", 20)}
+        fetched = []
+
+        async def get(endpoint, params=None):
+            if endpoint == "/api/v1/chats/list":
+                if params["page"] > 1:
+                    return []
+                listing = sorted(chats.values(), key=lambda c: -c["updated_at"])
+                return [{"id": c["id"], "updated_at": c["updated_at"]} for c in listing]
+            chat_id = endpoint.rsplit("/", 1)[-1]
+            fetched.append(chat_id)
+            if chat_id not in chats:
+                raise NotFoundError("gone")
+            return chats[chat_id]
+
+        client.get = AsyncMock(side_effect=get)
+
+        first = await index.sync()
+        assert first["full"] is True
+        assert sorted(fetched) == ["c1", "c2"]
+
+        fetched.clear()
+        chats["c1"] = make_chat("c1", "gamma", 30)
+        index.on_mutation("POST", "/api/v1/chats/c2/tags", {"name": "x"}, {})
+        second = await index.sync()
+
+        assert second["full"] is False
+        assert sorted(fetched) == ["c1", "c2"]
+        assert [r["chat_id"] for r in (await index.search("gamma"))["results"]] == ["c1"]
+        assert (await index.search("alpha"))["results"] == []
+
+        fetched.clear()
+        del chats["c2"]
+        index.on_mutation("DELETE", "/api/v1/chats/c2", None, True)
+        third = await index.sync()
+
+        assert fetched == []
+        assert third["removed"] == 1
+        assert index.get_stats()["chats"] == 1
+        await index.close()
+
+    @pytest.mark.asyncio
+    async def test_full_sync_drops_unlisted_chats(self, tmp_path):
+        """Test full syncs remove chats no longer listed upstream."""
+        client = Mock()
+        client.get = AsyncMock(return_value=[])
+        index = ChatIndex(client, tmp_path / "index.db", refresh_seconds=0)
+        index.upsert([make_chat("c1", "orphan")])
+
+        result = await index.sync(full=True)
+
+        assert result["removed"] == 1
+        assert index.get_stats()["chats"] == 0
+        await index.close()
+
+    def test_created_chats_marked_for_sync(self, index):
+        """Test chats created through the client are picked up by the next sync."""
+        index.on_mutation("POST", "/api/v1/chats/new", {"chat": {}}, {"id": "n1", "chat": {}})
+        index.on_mutation("POST", "/api/v1/folders/f1/update", {}, {})
+
+        assert index.get_stats()["pending_updates"] == 1
+        assert index._needs_full == 0.0
@@ -3,12 +3,16 @@
 Tests GET requests, error handling, rate limiting, and retry logic.
 """
 
+import gzip
+import json
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 import httpx
-from src.services.client import OpenWebUIClient
+from src.services.client import OpenWebUIClient, _InstrumentedTransport
 from src.config import Config
+from src.utils.metrics import UPSTREAM_DURATION, UPSTREAM_REQUESTS
 from src.utils.rate_limiter import RateLimiter
+from src.utils.tracing import start_trace
 from src.exceptions import (
     HTTPError,
     RateLimitError,
@@ -293,3 +297,176 @@ class TestOpenWebUIClient:
         client2 = client.client
 
         assert client1 is client2
+
+    @pytest.mark.asyncio
+    async def test_post_notifies_mutation_listeners(self, client):
+        """Test successful writes are reported to mutation listeners."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json = Mock(return_value={"id": "1"})
+        listener = Mock()
+        client.add_mutation_listener(listener)
+
+        client._client = Mock()
+        client._client.post = AsyncMock(return_value=mock_response)
+
+        await client.post("/api/v1/chats/new", json_data={"chat": {}})
+
+        listener.assert_called_once_with("POST", "/api/v1/chats/new", {"chat": {}}, {"id": "1"})
+
+    @pytest.mark.asyncio
+    async def test_mutation_listener_errors_do_not_fail_request(self, client):
+        """Test a failing listener does not break the request."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json = Mock(return_value={"ok": True})
+        client.add_mutation_listener(Mock(side_effect=RuntimeError("boom")))
+
+        client._client = Mock()
+        client._client.delete = AsyncMock(return_value=mock_response)
+
+        result = await client.delete("/api/v1/chats/1")
+
+        assert result == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_post_compresses_large_bodies(self, client):
+        """Test compress gzips bodies above the threshold only."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json = Mock(return_value={})
+        client._client = Mock()
+        client._client.post = AsyncMock(return_value=mock_response)
+
+        large = {"content": "x" * (70 * 1024)}
+        await client.post("/api/v1/retrieval/process/text", json_data=large, compress=True)
+
+        kwargs = client._client.post.call_args.kwargs
+        assert kwargs["headers"]["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(kwargs["content"])) == large
+
+        await client.post("/api/v1/retrieval/process/text", json_data={"content": "small"}, compress=True)
+
+        assert "Content-Encoding" not in client._client.post.call_args.kwargs["headers"]
+
+    @pytest.mark.asyncio
+    async def test_transport_records_upstream_metrics(self, client):
+        """Test upstream requests are counted and timed by route template."""
+        def handler(request):
+            return httpx.Response(404, json={"detail": "missing"})
+
+        client._client = httpx.AsyncClient(
+            base_url="http://localhost:8080",
+            transport=_InstrumentedTransport(httpx.MockTransport(handler))
+        )
+        labels = {"method": "GET", "route": "/api/v1/chats/{id}/tags", "status": "404"}
+        before = UPSTREAM_REQUESTS.get(**labels) or 0
+
+        with pytest.raises(NotFoundError):
+            await client.get("/api/v1/chats/3f2a9c1e-5b7d-4e8f-9a0b-1c2d3e4f5a6b/tags")
+
+        assert UPSTREAM_REQUESTS.get(**labels) == before + 1
+        assert UPSTREAM_DURATION.get(**labels).count >= 1
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_stats(self, client):
+        """Test pool stats are only reported once the HTTP client exists."""
+        assert client.get_pool_stats() is None
+
+        client.client
+        stats = client.get_pool_stats()
+
+        assert stats == {"max_connections": 100, "connections": 0, "active": 0, "idle": 0, "queued": 0}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_opens_connections(self, client, mock_rate_limiter):
+        """Test warm-up probes /health concurrently without the rate limiter."""
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if len(paths) == 3:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"status": True})
+
+        client._client = httpx.AsyncClient(base_url="http://localhost:8080", transport=httpx.MockTransport(handler))
+
+        assert await client.warm_up(3) == 2
+        assert await client.warm_up(0) == 0
+        assert paths == ["/health"] * 3
+        mock_rate_limiter.acquire.assert_not_called()
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_request_id_forwarded_upstream(self, client):
+        """Test the active request id is sent as X-Request-ID."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("X-Request-ID"))
+            return httpx.Response(200, json={})
+
+        client._client = httpx.AsyncClient(
+            base_url="http://localhost:8080",
+            transport=_InstrumentedTransport(httpx.MockTransport(handler))
+        )
+
+        with start_trace("tools/call demo") as trace:
+            await client.get("/api/v1/models")
+        await client.get("/api/v1/models")
+
+        assert seen == [trace.request_id, None]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_call_stats_counted(self, client):
+        """Test upstream time and bytes are counted per call; repeated requests are not retries."""
+        async def body():
+            yield json.dumps({"items": ["x" * 100]}).encode()
+
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Type": "application/json"}, content=body())
+
+        client._client = httpx.AsyncClient(
+            base_url="http://localhost:8080",
+            transport=_InstrumentedTransport(httpx.MockTransport(handler))
+        )
+
+        with start_trace("tools/call demo") as trace:
+            await client.post("/api/v1/chats/new", json_data={"chat": {}})
+            await client.post("/api/v1/chats/new", json_data={"chat": {}})
+
+        stats = trace.stats
+        assert stats.upstream_requests == 2
+        assert stats.retries == 0
+        assert stats.bytes_out > 0
+        assert stats.bytes_in > 100
+        assert list(stats.route_ms) == ["/api/v1/chats/new"]
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_post_with_file_uploads_contents(self, client, tmp_path):
+        """Test uploads are validated and sent as multipart form data."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.read())
+            return httpx.Response(200, json={"id": "file-1"})
+
+        client._client = httpx.AsyncClient(
+            base_url="http://localhost:8080",
+            transport=_InstrumentedTransport(httpx.MockTransport(handler))
+        )
+        upload = tmp_path / "notes.txt"
+        upload.write_text("hello upload")
+
+        result = await client.post_with_file("/api/v1/files/", str(upload))
+
+        assert result == {"id": "file-1"}
+        assert b"hello upload" in seen[0]
+        assert b'filename="notes.txt"' in seen[0]
+        with pytest.raises(ValidationError, match="Invalid file path"):
+            await client.post_with_file("/api/v1/files/", str(tmp_path / "missing.txt"))
+        await client.close()
@@ -0,0 +1,187 @@
+"""Tests for the embedding micro-batcher.
+
+Tests coalescing of concurrent requests, batch limits, response splitting,
+immediate flushing and error isolation.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, Mock
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.exceptions import HTTPError, RateLimitError, ServerError, ValidationError
+
+
+class TestEmbeddingBatcher:
+    """Test embedding request coalescing."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock client returning one vector per input."""
+        client = Mock()
+
+        async def post(endpoint, json_data=None, params=None):
+            return {"embeddings": [[float(len(text))] for text in json_data["input"]]}
+
+        client.post = AsyncMock(side_effect=post)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_upstream_call(self, mock_client):
+        """Test concurrent texts for the same model are sent together."""
+        batcher = EmbeddingBatcher(mock_client, window_ms=5, max_batch_size=64)
+
+        vectors = await asyncio.gather(
+            *(batcher.embed("/ollama/api/embed", "nomic", "x" * n) for n in range(1, 6))
+        )
+
+        assert vectors == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        mock_client.post.assert_called_once()
+        body = mock_client.post.call_args.kwargs["json_data"]
+        assert body["model"] == "nomic"
+        assert len(body["input"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_splits_batches(self, mock_client):
+        """Test a full batch is flushed immediately."""
+        batcher = EmbeddingBatcher(mock_client, window_ms=50, max_batch_size=2)
+
+        await asyncio.gather(*(batcher.embed("/ollama/api/embed", "m", "t") for _ in range(5)))
+
+        sizes = [len(c.kwargs["json_data"]["input"]) for c in mock_client.post.call_args_list]
+        assert sorted(sizes) == [1, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_different_models_are_not_mixed(self, mock_client):
+        """Test batches are keyed by model."""
+        batcher = EmbeddingBatcher(mock_client, window_ms=5)
+
+        await asyncio.gather(
+            batcher.embed("/ollama/api/embed", "a", "t"),
+            batcher.embed("/ollama/api/embed", "b", "t"),
+        )
+
+        assert mock_client.post.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_openai_style_orders_by_index(self):
+        """Test OpenAI responses are reordered by index."""
+        client = Mock()
+        client.post = AsyncMock(return_value={
+            "data": [{"index": 1, "embedding": [2.0]}, {"index": 0, "embedding": [1.0]}]
+        })
+        batcher = EmbeddingBatcher(client, window_ms=5)
+
+        vectors = await asyncio.gather(
+            batcher.embed("/api/embeddings", "m", "first", style="openai"),
+            batcher.embed("/api/embeddings", "m", "second", style="openai"),
+        )
+
+        assert vectors == [[1.0], [2.0]]
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_callers(self):
+        """Test upstream failure is raised to every caller in the batch."""
+        client = Mock()
+        client.post = AsyncMock(side_effect=ServerError("down"))
+        batcher = EmbeddingBatcher(client, window_ms=5)
+
+        results = await asyncio.gather(
+            batcher.embed("/ollama/api/embed", "m", "a"),
+            batcher.embed("/ollama/api/embed", "m", "b"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ServerError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_vector_count_mismatch(self):
+        """Test a short response fails the callers left without a vector."""
+        client = Mock()
+        client.post = AsyncMock(return_value={"embeddings": []})
+        batcher = EmbeddingBatcher(client, window_ms=5)
+
+        with pytest.raises(HTTPError, match="0 vectors for 1 inputs"):
+            await asyncio.gather(
+                batcher.embed("/ollama/api/embed", "m", "a"),
+                batcher.embed("/ollama/api/embed", "m", "b"),
+            )
+
+    @pytest.mark.asyncio
+    async def test_bad_input_fails_only_its_caller(self, mock_client):
+        """Test a batch failing on one input is split so the others still succeed."""
+        async def post(endpoint, json_data=None, params=None):
+            if "too long" in json_data["input"]:
+                raise ValidationError("input exceeds context length")
+            return {"embeddings": [[float(len(text))] for text in json_data["input"]]}
+
+        mock_client.post.side_effect = post
+        batcher = EmbeddingBatcher(mock_client, window_ms=5)
+
+        results = await asyncio.gather(
+            *(batcher.embed("/ollama/api/embed", "m", text) for text in ["a", "bb", "too long", "dddd"]),
+            return_exceptions=True
+        )
+
+        assert results[:2] == [[1.0], [2.0]] and results[3] == [4.0]
+        assert isinstance(results[2], ValidationError)
+        assert batcher.get_stats()["splits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_wide_errors_are_not_split(self):
+        """Test errors unrelated to the inputs fail the batch without retries."""
+        client = Mock()
+        client.post = AsyncMock(side_effect=RateLimitError("slow down"))
+        batcher = EmbeddingBatcher(client, window_ms=5)
+
+        results = await asyncio.gather(
+            *(batcher.embed("/ollama/api/embed", "m", text) for text in "abcd"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RateLimitError) for r in results)
+        client.post.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_lone_caller_skips_window(self, mock_client):
+        """Test a caller with nothing else in flight does not wait for the window."""
+        batcher = EmbeddingBatcher(mock_client, window_ms=10_000)
+
+        vector = await asyncio.wait_for(batcher.embed("/ollama/api/embed", "m", "abc"), 1)
+
+        assert vector == [3.0]
+        assert batcher.get_stats()["immediate_flushes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_callers_behind_a_busy_batch_wait_for_window(self, mock_client):
+        """Test texts arriving while a batch is in flight are coalesced."""
+        release = asyncio.Event()
+
+        async def post(endpoint, json_data=None, params=None):
+            await release.wait()
+            return {"embeddings": [[1.0] for _ in json_data["input"]]}
+
+        mock_client.post.side_effect = post
+        batcher = EmbeddingBatcher(mock_client, window_ms=20)
+
+        first = asyncio.ensure_future(batcher.embed("/ollama/api/embed", "m", "a"))
+        await asyncio.sleep(0.005)
+        later = [asyncio.ensure_future(batcher.embed("/ollama/api/embed", "m", t)) for t in "bc"]
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(first, *later)
+
+        sizes = [len(c.kwargs["json_data"]["input"]) for c in mock_client.post.call_args_list]
+        assert sizes == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_stats(self, mock_client):
+        """Test stats expose batch-size and latency histograms."""
+        batcher = EmbeddingBatcher(mock_client, window_ms=5)
+        await asyncio.gather(*(batcher.embed("/ollama/api/embed", "m", "t") for _ in range(3)))
+
+        stats = batcher.get_stats()
+
+        assert stats["requests"] == 3
+        assert stats["upstream_requests"] == 1
+        assert stats["batch_size"]["count"] == 1
+        assert stats["caller_latency_ms"]["count"] == 3
@@ -0,0 +1,168 @@
+"""Tests for the persistent embedding cache."""
+
+import queue
+import pytest
+from unittest.mock import AsyncMock
+from src.exceptions import HTTPError
+from src.services.embedding_cache import EmbeddingCache, make_key, normalize_text
+from src.utils.deferred_write import attach_writer_queue, detach_writer_queue
+
+
+class TestEmbeddingCacheKeys:
+    """Tests for key construction."""
+
+    def test_normalize_text(self):
+        """Test whitespace and unicode forms are normalized."""
+        assert normalize_text("  hello \n\t world ") == "hello world"
+        assert normalize_text("café") == normalize_text("café")
+
+    def test_make_key_scoped_by_endpoint_and_model(self):
+        """Test keys differ by endpoint and model but not whitespace."""
+        key = make_key("/api/embeddings", "m", "text")
+
+        assert key == make_key("/api/embeddings", "m", " text ")
+        assert key != make_key("/api/embeddings", "other", "text")
+        assert key != make_key("/ollama/api/embed", "m", "text")
+
+    def test_make_key_scoped_by_request_options(self):
+        """Test fields that change the vector are part of the key."""
+        key = make_key("/api/embeddings", "m", "text")
+
+        assert key == make_key("/api/embeddings", "m", "text", {"dimensions": None})
+        assert key != make_key("/api/embeddings", "m", "text", {"dimensions": 256})
+        assert make_key("/e", "m", "t", {"truncate": True, "url_idx": 0}) == make_key(
+            "/e", "m", "t", {"url_idx": 0, "truncate": True}
+        )
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    def test_put_and_get(self, tmp_path):
+        """Test vectors round-trip as float32."""
+        cache = EmbeddingCache(tmp_path)
+
+        assert cache.put("k", [0.5, -1.25, 3.0])
+        assert cache.get("k") == [0.5, -1.25, 3.0]
+        assert cache.get("missing") is None
+        assert cache.get_stats()["hit_rate"] == 0.5
+
+    def test_put_existing_key_is_noop(self, tmp_path):
+        """Test duplicate keys are not appended twice."""
+        cache = EmbeddingCache(tmp_path)
+        cache.put("k", [1.0])
+
+        assert not cache.put("k", [2.0])
+        assert cache.get_stats()["size_bytes"] == 4
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test index and vectors are reloaded from disk."""
+        first = EmbeddingCache(tmp_path)
+        first.put("a", [1.0, 2.0])
+        first.get("a")
+        first.put("b", [3.0])
+        first.close()
+
+        cache = EmbeddingCache(tmp_path)
+
+        assert cache.get("a") == [1.0, 2.0]
+        assert cache.get("b") == [3.0]
+
+    def test_queued_writes_are_served_until_written(self, tmp_path):
+        """Test vectors handed to the writer thread are readable before they land."""
+        writes = queue.Queue()
+        attach_writer_queue(writes)
+        try:
+            cache = EmbeddingCache(tmp_path)
+            cache.put("a", [1.0, 2.0])
+
+            assert not cache.vectors_path.exists()
+            assert cache.get("a") == [1.0, 2.0]
+            assert cache.put("a", [9.0]) is False
+        finally:
+            detach_writer_queue()
+
+        writes.get_nowait().run()
+
+        assert cache.get("a") == [1.0, 2.0]
+        assert EmbeddingCache(tmp_path).get("a") == [1.0, 2.0]
+
+    def test_invalidation_discards_queued_writes(self, tmp_path):
+        """Test writes queued before an invalidation never reach the new files."""
+        writes = queue.Queue()
+        attach_writer_queue(writes)
+        try:
+            cache = EmbeddingCache(tmp_path)
+            cache.put("a", [1.0])
+            cache.invalidate()
+        finally:
+            detach_writer_queue()
+
+        writes.get_nowait().run()
+
+        assert cache.get("a") is None
+        assert cache.vectors_path.stat().st_size == 0
+
+    def test_drops_torn_index_entries(self, tmp_path):
+        """Test index entries past the end of the data file are ignored."""
+        cache = EmbeddingCache(tmp_path)
+        cache.put("a", [1.0])
+        with open(cache.index_path, "a", encoding="utf-8") as f:
+            f.write("b 4 8\n")
+
+        reloaded = EmbeddingCache(tmp_path)
+
+        assert reloaded.get_stats()["entries"] == 1
+
+    def test_max_bytes_stops_inserts(self, tmp_path):
+        """Test the cache stops growing at max_bytes."""
+        cache = EmbeddingCache(tmp_path, max_bytes=8)
+
+        assert cache.put("a", [1.0, 2.0])
+        assert not cache.put("b", [3.0])
+        assert cache.get("b") is None
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_only_computes_misses(self, tmp_path):
+        """Test only uncached texts reach the compute callable."""
+        cache = EmbeddingCache(tmp_path)
+        cache.put(make_key("/e", "m", "b"), [2.0])
+        compute = AsyncMock(return_value=[[1.0], [3.0]])
+
+        vectors = await cache.get_or_compute("/e", "m", ["a", "b", "c"], compute)
+
+        assert vectors == [[1.0], [2.0], [3.0]]
+        compute.assert_awaited_once_with(["a", "c"])
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_rejects_count_mismatch(self, tmp_path):
+        """Test a short upstream response raises instead of misaligning vectors."""
+        cache = EmbeddingCache(tmp_path)
+
+        with pytest.raises(HTTPError):
+            await cache.get_or_compute("/e", "m", ["a", "b"], AsyncMock(return_value=[[1.0]]))
+
+    def test_model_change_invalidates(self, tmp_path):
+        """Test changing the embedding model clears the cache."""
+        cache = EmbeddingCache(tmp_path)
+        cache.on_mutation("POST", "/api/v1/retrieval/embedding/update", {}, {"embedding_model": "a"})
+        cache.put("k", [1.0])
+
+        cache.on_mutation("POST", "/api/v1/retrieval/embedding/update", {}, {"embedding_model": "a"})
+        assert cache.get("k") == [1.0]
+
+        cache.on_mutation(
+            "POST", "/api/v1/retrieval/embedding/update", {"RAG_EMBEDDING_MODEL": "b"}, {}
+        )
+        assert cache.get("k") is None
+        assert cache.embedding_model == "b"
+        assert EmbeddingCache(tmp_path).embedding_model == "b"
+
+    def test_other_mutations_ignored(self, tmp_path):
+        """Test unrelated writes leave the cache alone."""
+        cache = EmbeddingCache(tmp_path)
+        cache.put("k", [1.0])
+
+        cache.on_mutation("POST", "/api/v1/chats/new", {}, {})
+
+        assert cache.get_stats()["invalidations"] == 0
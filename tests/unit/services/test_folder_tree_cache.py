@@ -0,0 +1,76 @@
+"""Tests for the folder tree cache."""
+
+from unittest.mock import patch
+from src.services.folder_tree_cache import FolderTreeCache
+
+
+def filled_cache():
+    """Create a cache holding folders f1 and f2 with one chat each."""
+    cache = FolderTreeCache(ttl_seconds=60)
+    cache.put_folders([{"id": "f1"}, {"id": "f2"}], cache.generation)
+    cache.put_chats("f1", [{"id": "c1"}], cache.generation)
+    cache.put_chats("f2", [{"id": "c2"}], cache.generation)
+    return cache
+
+
+class TestFolderTreeCache:
+    """Tests for FolderTreeCache."""
+
+    def test_get_put_and_ttl(self):
+        """Test entries expire after the TTL."""
+        cache = FolderTreeCache(ttl_seconds=10)
+        with patch("src.services.folder_tree_cache.time.monotonic", return_value=100.0):
+            cache.put_chats("f1", [{"id": "c1"}], 0)
+            assert cache.get_chats("f1") == [{"id": "c1"}]
+        with patch("src.services.folder_tree_cache.time.monotonic", return_value=111.0):
+            assert cache.get_chats("f1") is None
+
+    def test_folder_write_clears_everything(self):
+        """Test folder writes drop the folder list and all chat lists."""
+        cache = filled_cache()
+
+        cache.on_mutation("POST", "/api/v1/folders/f1/update/parent", {"parent_id": "f2"}, {})
+
+        assert cache.get_folders() is None
+        assert cache.get_chats("f2") is None
+
+    def test_chat_move_drops_source_and_target(self):
+        """Test moving a chat drops only the two folders involved."""
+        cache = filled_cache()
+        cache.put_chats("f3", [], cache.generation)
+
+        cache.on_mutation("POST", "/api/v1/chats/c1/folder", {"folder_id": "f3"}, {})
+
+        assert cache.get_chats("f1") is None
+        assert cache.get_chats("f3") is None
+        assert cache.get_chats("f2") == [{"id": "c2"}]
+        assert cache.get_folders() is not None
+
+    def test_write_to_unfoldered_chat_keeps_cache(self):
+        """Test writes to chats outside cached folders keep every entry."""
+        cache = filled_cache()
+
+        cache.on_mutation("POST", "/api/v1/chats/c9/pin", {}, {})
+        cache.on_mutation("POST", "/api/v1/chats/new", {"chat": {}}, {"id": "c10"})
+
+        assert cache.get_chats("f1") == [{"id": "c1"}]
+        assert cache.invalidations == 0
+
+    def test_bulk_chat_write_drops_chat_lists(self):
+        """Test bulk chat writes drop every chat list."""
+        cache = filled_cache()
+
+        cache.on_mutation("DELETE", "/api/v1/chats/", None, True)
+
+        assert cache.get_chats("f1") is None
+        assert cache.get_folders() is not None
+
+    def test_in_flight_fetch_not_cached_after_invalidation(self):
+        """Test a fetch racing a write is not cached."""
+        cache = FolderTreeCache()
+        generation = cache.generation
+
+        cache.on_mutation("POST", "/api/v1/folders/", {"name": "x"}, {})
+        cache.put_folders([{"id": "f1"}], generation)
+
+        assert cache.get_folders() is None
@@ -0,0 +1,69 @@
+"""Tests for the event loop monitor."""
+
+import asyncio
+import time
+import pytest
+from src.services.loop_monitor import LoopMonitor
+
+
+def block(seconds):
+    """Hold the event loop thread."""
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    """Tests for lag measurement and blocking detection."""
+
+    def test_observe_and_percentiles(self):
+        """Test percentiles over the window and the blocking threshold."""
+        monitor = LoopMonitor(interval=0.1, threshold=0.05, window=100)
+
+        for lag in range(100):
+            assert monitor.observe(lag / 10000) is None
+        event = monitor.observe(0.08)
+
+        assert event["blocked_ms"] == 80.0
+        assert event["stack"] is None
+        assert monitor.percentiles()[0.5] == pytest.approx(0.0051)
+        stats = monitor.get_stats()
+        assert stats["samples"] == 100
+        assert stats["blocked_total"] == 1
+        assert stats["max_lag_ms"] == 80.0
+
+    def test_negative_lag_clamped(self):
+        """Test early wake-ups count as zero lag."""
+        monitor = LoopMonitor(threshold=0)
+
+        assert monitor.observe(-0.001) is None
+        assert monitor.lags[0] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_captured_with_stack(self):
+        """Test a blocking callback is reported with its stack."""
+        monitor = LoopMonitor(interval=0.01, threshold=0.05)
+        monitor.ensure_started()
+        try:
+            await asyncio.sleep(0.03)
+            block(0.2)
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.stop()
+
+        assert monitor.blocked_total == 1
+        event = monitor.blocked[0]
+        assert event["blocked_ms"] >= 150
+        assert "in block" in event["stack"]
+        assert monitor.get_stats()["lag_ms"]["p50"] < 50
+
+    @pytest.mark.asyncio
+    async def test_ensure_started_is_idempotent(self):
+        """Test repeated starts share one ticker."""
+        monitor = LoopMonitor(interval=0.01, threshold=0)
+        monitor.ensure_started()
+        task = monitor._task
+        monitor.ensure_started()
+        try:
+            assert monitor._task is task
+            assert monitor._watchdog is None
+        finally:
+            await monitor.stop()
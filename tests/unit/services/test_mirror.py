@@ -0,0 +1,269 @@
+"""Tests for the SQLite entity mirror."""
+
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.exceptions import NotFoundError
+from src.services.mirror import EntityMirror
+
+
+def make_mirror(tmp_path, client=None, **kwargs):
+    """Create a mirror without background refreshing."""
+    kwargs.setdefault("refresh_seconds", 0)
+    return EntityMirror(
+        client or Mock(),
+        tmp_path / "mirror.db",
+        kwargs.pop("kinds", ["chats", "knowledge", "prompts", "folders", "models"]),
+        **kwargs
+    )
+
+
+class TestEntityMirror:
+    """Tests for EntityMirror."""
+
+    @pytest.mark.asyncio
+    async def test_store_and_lookup(self, tmp_path):
+        """Test stored entities are served within the staleness bound."""
+        mirror = make_mirror(tmp_path)
+        mirror.store("chats", "c1", {"id": "c1", "updated_at": 5}, time.time())
+
+        assert mirror.lookup("chats", "c1", 60) == {"id": "c1", "updated_at": 5}
+        assert mirror.lookup("chats", "c2", 60) is None
+
+        mirror.store("chats", "c3", {"id": "c3"}, time.time() - 100)
+        assert mirror.lookup("chats", "c3", 60) is None
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_read_through_hit_and_miss(self, tmp_path):
+        """Test the second read is served from the mirror."""
+        mirror = make_mirror(tmp_path)
+        fetch = AsyncMock(return_value={"id": "k1", "name": "Docs"})
+
+        first = await mirror.read_through("get_knowledge", "knowledge", "k1", fetch)
+        second = await mirror.read_through("get_knowledge", "knowledge", "k1", fetch)
+
+        assert first == second == {"id": "k1", "name": "Docs"}
+        fetch.assert_awaited_once()
+        assert mirror.get_stats()["hits"] == 1
+        assert mirror.get_stats()["misses"] == 1
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_read_through_tool_staleness_zero_bypasses(self, tmp_path):
+        """Test tools with a zero staleness bound always read upstream."""
+        mirror = make_mirror(tmp_path, tool_staleness={"chat_get": 0})
+        fetch = AsyncMock(return_value={"id": "c1"})
+
+        await mirror.read_through("chat_get", "chats", "c1", fetch)
+        await mirror.read_through("chat_get", "chats", "c1", fetch)
+
+        assert fetch.await_count == 2
+        assert mirror.bypassed == 2
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_read_through_unmirrored_kind_or_empty_key(self, tmp_path):
+        """Test reads outside the mirror go straight upstream."""
+        mirror = make_mirror(tmp_path, kinds=["chats"])
+        fetch = AsyncMock(return_value={"id": "u1"})
+
+        await mirror.read_through("get_user", "users", "u1", fetch)
+        await mirror.read_through("chat_get", "chats", "", fetch)
+
+        assert fetch.await_count == 2
+        assert mirror.get_stats()["entities"] == {"chats": 0}
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_prompt_keys_normalized(self, tmp_path):
+        """Test prompt commands match with or without the leading slash."""
+        mirror = make_mirror(tmp_path)
+        fetch = AsyncMock(return_value={"command": "/summary"})
+
+        await mirror.read_through("get_prompt", "prompts", "summary", fetch)
+
+        assert mirror.lookup("prompts", "/summary", 60) == {"command": "/summary"}
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_mutation_invalidates_entity_and_list(self, tmp_path):
+        """Test a write to one entity invalidates it and the kind's list only."""
+        mirror = make_mirror(tmp_path)
+        verified = time.time() - 1
+        mirror.store("chats", "c1", {"id": "c1"}, verified)
+        mirror.store("chats", "c2", {"id": "c2"}, verified)
+        mirror.store("folders", None, [{"id": "f1"}], verified)
+        mirror.store("folders", "f1", {"id": "f1"}, verified)
+
+        mirror.on_mutation("POST", "/api/v1/chats/c1/pin", {}, {})
+        mirror.on_mutation("POST", "/api/v1/folders/new", {"name": "x"}, {})
+
+        assert mirror.lookup("chats", "c1", 60) is None
+        assert mirror.lookup("chats", "c2", 60) == {"id": "c2"}
+        assert mirror.lookup("folders", None, 60) is None
+        assert mirror.lookup("folders", "f1", 60) == {"id": "f1"}
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_bulk_mutation_invalidates_kind(self, tmp_path):
+        """Test writes without an entity key invalidate the whole kind."""
+        mirror = make_mirror(tmp_path)
+        verified = time.time() - 1
+        mirror.store("chats", "c1", {"id": "c1"}, verified)
+
+        mirror.on_mutation("DELETE", "/api/v1/chats/", None, True)
+
+        assert mirror.lookup("chats", "c1", 60) is None
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_folder_delete_invalidates_chats(self, tmp_path):
+        """Test deleting a folder distrusts mirrored chats."""
+        mirror = make_mirror(tmp_path)
+        mirror.store("chats", "c1", {"id": "c1"}, time.time() - 1)
+
+        mirror.on_mutation("DELETE", "/api/v1/folders/f1", None, True)
+
+        assert mirror.lookup("chats", "c1", 60) is None
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_read_racing_write_not_served(self, tmp_path):
+        """Test data fetched before a write is not served after it."""
+        mirror = make_mirror(tmp_path)
+
+        async def fetch():
+            mirror.on_mutation("POST", "/api/v1/knowledge/k1/update", {}, {})
+            return {"id": "k1", "name": "old"}
+
+        await mirror.read_through("get_knowledge", "knowledge", "k1", fetch)
+
+        assert mirror.lookup("knowledge", "k1", 60) is None
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_unpaged_kind(self, tmp_path):
+        """Test refresh re-fetches changed entities and drops removed ones."""
+        client = Mock()
+        mirror = make_mirror(tmp_path, client=client)
+        old = time.time() - 1000
+        mirror.store("knowledge", "k1", {"id": "k1", "updated_at": 1}, old)
+        mirror.store("knowledge", "k2", {"id": "k2", "updated_at": 1}, old)
+        mirror.store("knowledge", "k3", {"id": "k3", "updated_at": 1}, old)
+        listing = [{"id": "k1", "updated_at": 1}, {"id": "k2", "updated_at": 2}]
+
+        async def get(endpoint, params=None):
+            if endpoint == "/api/v1/knowledge/":
+                return listing
+            return {"id": "k2", "updated_at": 2, "name": "new"}
+
+        client.get = AsyncMock(side_effect=get)
+
+        result = await mirror.refresh("knowledge")
+
+        assert result["updated"] == 1
+        assert result["removed"] == 1
+        assert client.get.await_count == 2
+        assert mirror.lookup("knowledge", "k1", 60) == {"id": "k1", "updated_at": 1}
+        assert mirror.lookup("knowledge", "k2", 60)["name"] == "new"
+        assert mirror.lookup("knowledge", "k3", 60) is None
+        assert mirror.lookup("knowledge", None, 60) == listing
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_drops_entities_gone_upstream(self, tmp_path):
+        """Test changed entities that 404 on re-fetch are removed."""
+        client = Mock()
+        mirror = make_mirror(tmp_path, client=client)
+        mirror.store("folders", "f1", {"id": "f1", "updated_at": 1}, time.time())
+
+        async def get(endpoint, params=None):
+            if endpoint == "/api/v1/folders/":
+                return [{"id": "f1", "updated_at": 2}]
+            raise NotFoundError("gone")
+
+        client.get = AsyncMock(side_effect=get)
+
+        result = await mirror.refresh("folders")
+
+        assert result["removed"] == 1
+        assert mirror.lookup("folders", "f1", 60) is None
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_stops_at_watermark(self, tmp_path):
+        """Test chat refreshes after the first list only pages changed since the watermark."""
+        client = Mock()
+        mirror = make_mirror(tmp_path, client=client)
+        pages = {1: [{"id": "c2", "updated_at": 20}, {"id": "c1", "updated_at": 10}]}
+        requested = []
+
+        async def get(endpoint, params=None):
+            if endpoint == "/api/v1/chats/list":
+                requested.append(params["page"])
+                return pages.get(params["page"], [])
+            return {"id": endpoint.rsplit("/", 1)[-1], "updated_at": 30}
+
+        client.get = AsyncMock(side_effect=get)
+        mirror.store("chats", "c1", {"id": "c1", "updated_at": 10}, time.time())
+
+        first = await mirror.refresh("chats")
+        assert first["full"] is True
+        assert first["updated"] == 0
+
+        pages = {
+            1: [{"id": "c1", "updated_at": 30}, {"id": "c2", "updated_at": 20}],
+            2: [{"id": "c0", "updated_at": 5}],
+        }
+        requested.clear()
+        second = await mirror.refresh("chats")
+
+        assert second["full"] is False
+        assert second["updated"] == 1
+        assert mirror.lookup("chats", "c1", 60)["updated_at"] == 30
+        assert 3 not in requested
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_only_verifies_listed_entities(self, tmp_path):
+        """Test entities below the watermark are not marked verified by an incremental refresh."""
+        client = Mock()
+        mirror = make_mirror(tmp_path, client=client)
+        page = [{"id": "c2", "updated_at": 20}, {"id": "c1", "updated_at": 10}]
+
+        async def get(endpoint, params=None):
+            return page if params["page"] == 1 else []
+
+        client.get = AsyncMock(side_effect=get)
+        await mirror.refresh("chats")
+        old = time.time() - 120
+        mirror.store("chats", "c1", {"id": "c1", "updated_at": 10}, old)
+        mirror.store("chats", "c2", {"id": "c2", "updated_at": 20}, old)
+
+        # c1 was deleted upstream; the incremental listing stops before reaching it
+        page = [{"id": "c2", "updated_at": 20}]
+        result = await mirror.refresh("chats")
+
+        assert result["full"] is False
+        assert mirror.lookup("chats", "c2", 60) is not None
+        assert mirror.lookup("chats", "c1", 60) is None
+        await mirror.close()
+
+    @pytest.mark.asyncio
+    async def test_refresh_all_records_errors(self, tmp_path):
+        """Test a failing kind does not stop the other refreshes."""
+        client = Mock()
+        client.get = AsyncMock(side_effect=RuntimeError("down"))
+        mirror = make_mirror(tmp_path, client=client, kinds=["knowledge", "folders"])
+
+        summary = await mirror.refresh_all()
+
+        assert summary["knowledge"] == {"error": "down"}
+        assert mirror.refresh_errors == 2
+        await mirror.close()
+
+    def test_unknown_kind_rejected(self, tmp_path):
+        """Test unknown kinds are rejected."""
+        with pytest.raises(ValueError, match="Unknown mirror kinds"):
+            EntityMirror(Mock(), tmp_path / "m.db", ["widgets"])
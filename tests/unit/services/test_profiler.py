@@ -0,0 +1,110 @@
+"""Tests for the on-demand profiler."""
+
+import asyncio
+import time
+import tracemalloc
+import pytest
+from collections import Counter
+from src.services.profiler import MemoryTracker, SamplingProfiler
+
+
+def burn(seconds):
+    """Keep the event loop thread busy."""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """Tests for the sampling profiler."""
+
+    @pytest.mark.asyncio
+    async def test_profile_writes_collapsed_stacks(self, tmp_path):
+        """Test busy tasks show up in the profile with their task name."""
+        profiler = SamplingProfiler(tmp_path)
+
+        async def busy():
+            for _ in range(4):
+                burn(0.05)
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(busy())
+        result = await profiler.profile(0.3, interval_ms=5, mode="cpu")
+        await task
+
+        lines = open(result["path"], encoding="utf-8").read().splitlines()
+        assert result["samples"] > 0
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+        assert any("task:TestSamplingProfiler" in line and "burn" in line for line in lines)
+        assert any("burn" in f["function"] for f in result["top_functions"])
+        assert not profiler.running
+
+    @pytest.mark.asyncio
+    async def test_profile_rejects_concurrent_and_unknown_mode(self, tmp_path):
+        """Test only one profile runs at a time and modes are checked."""
+        profiler = SamplingProfiler(tmp_path)
+        with pytest.raises(ValueError, match="mode"):
+            await profiler.profile(1, mode="gpu")
+
+        profiler.running = True
+        with pytest.raises(ValueError, match="already running"):
+            await profiler.profile(1)
+
+    def test_summarize(self):
+        """Test self and total samples and task totals."""
+        stacks = Counter({
+            "thread:Main;task:handler;a;b": 3,
+            "thread:Main;task:handler;a": 1,
+            "thread:worker;c": 4,
+        })
+
+        summary = SamplingProfiler.summarize(stacks)
+
+        functions = {f["function"]: f for f in summary["top_functions"]}
+        assert functions["b"]["self_samples"] == 3
+        assert functions["a"] == {"function": "a", "self_samples": 1, "self_pct": 12.5, "total_samples": 4}
+        assert summary["top_tasks"] == [{"task": "handler", "samples": 4}]
+
+
+class TestMemoryTracker:
+    """Tests for tracemalloc snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_and_diff(self):
+        """Test a diff shows the allocation site that grew."""
+        tracker = MemoryTracker()
+        with pytest.raises(ValueError, match="not running"):
+            await tracker.snapshot()
+
+        tracker.start(frames=5)
+        try:
+            base = await tracker.snapshot(top=5)
+            hoard = [bytearray(1024) for _ in range(2000)]
+            diff = await tracker.diff(base["snapshot_id"], top=5)
+
+            assert base["tracing"] is True
+            assert diff["size_diff_kb"] > 1000
+            assert "test_profiler.py" in diff["top"][0]["site"][0]
+            assert diff["top"][0]["count_diff"] >= 2000
+            with pytest.raises(ValueError, match="Unknown snapshot"):
+                await tracker.diff(99)
+            del hoard
+        finally:
+            stats = tracker.stop()
+
+        assert stats["tracing"] is False
+        assert stats["snapshots"] == []
+        assert not tracemalloc.is_tracing()
+
+    @pytest.mark.asyncio
+    async def test_snapshots_are_bounded(self):
+        """Test the oldest snapshots are dropped."""
+        tracker = MemoryTracker()
+        tracker.start()
+        try:
+            for _ in range(7):
+                result = await tracker.snapshot(group_by="filename", top=1)
+        finally:
+            tracker.stop()
+
+        assert result["snapshots"] == [3, 4, 5, 6, 7]
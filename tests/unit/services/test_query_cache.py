@@ -0,0 +1,112 @@
+"""Tests for the retrieval query result cache."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.services.query_cache import MEMORY_COLLECTION, QueryCache
+
+
+class TestQueryCache:
+    """Tests for QueryCache."""
+
+    def test_key_normalizes_query_and_orders_collections(self):
+        """Test equivalent queries share a key."""
+        key = QueryCache.make_key("collection", ["a", "b"], "what  is rag", {"k": 4})
+
+        assert key == QueryCache.make_key("collection", ["b", "a"], " what is rag ", {"k": 4})
+        assert key != QueryCache.make_key("collection", ["a", "b"], "what is rag", {"k": 5})
+
+    def test_get_put_and_ttl(self):
+        """Test entries expire after the TTL."""
+        cache = QueryCache(ttl_seconds=10)
+        with patch("src.services.query_cache.time.monotonic", return_value=100.0):
+            cache.put("k", ["a"], {"ids": []})
+            assert cache.get("k") == {"ids": []}
+        with patch("src.services.query_cache.time.monotonic", return_value=111.0):
+            assert cache.get("k") is None
+        assert cache.get_stats()["hit_rate"] == 0.5
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = QueryCache(max_entries=2)
+        cache.put("a", ["c"], 1)
+        cache.put("b", ["c"], 2)
+        cache.get("a")
+        cache.put("c", ["c"], 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_caches(self):
+        """Test repeated queries hit the cache."""
+        cache = QueryCache()
+        fetch = AsyncMock(return_value={"ids": [["1"]]})
+
+        await cache.get_or_fetch("doc", ["a"], "q", {"k": 1}, fetch)
+        result = await cache.get_or_fetch("doc", ["a"], "q", {"k": 1}, fetch)
+
+        assert result == {"ids": [["1"]]}
+        fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_result_not_cached_after_invalidation(self):
+        """Test a query racing an ingestion does not cache stale results."""
+        cache = QueryCache()
+
+        async def fetch():
+            cache.invalidate_collection("a")
+            return {"ids": []}
+
+        await cache.get_or_fetch("doc", ["a"], "q", {}, fetch)
+
+        assert cache.get_stats()["entries"] == 0
+
+    def test_process_invalidates_collection(self):
+        """Test processing into a collection drops only its results."""
+        cache = QueryCache()
+        cache.put("a", ["docs"], 1)
+        cache.put("b", ["other"], 2)
+
+        cache.on_mutation("POST", "/api/v1/retrieval/process/text", {"collection_name": "docs"}, {})
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_process_file_default_collection(self):
+        """Test files processed without a collection invalidate their own."""
+        cache = QueryCache()
+        cache.put("a", ["file-f1"], 1)
+
+        cache.on_mutation("POST", "/api/v1/retrieval/process/file", {"file_id": "f1"}, {})
+
+        assert cache.get("a") is None
+
+    def test_knowledge_write_invalidates_knowledge_collection(self):
+        """Test knowledge file changes invalidate the knowledge collection."""
+        cache = QueryCache()
+        cache.put("a", ["kb1", "kb2"], 1)
+
+        cache.on_mutation("POST", "/api/v1/knowledge/kb1/file/remove", {"file_id": "f"}, {})
+
+        assert cache.get("a") is None
+
+    def test_memory_write_invalidates_memory_queries(self):
+        """Test memory changes invalidate memory queries but queries do not."""
+        cache = QueryCache()
+        cache.put("a", [MEMORY_COLLECTION], 1)
+
+        cache.on_mutation("POST", "/api/v1/memories/query", {"content": "q"}, {})
+        assert cache.get("a") == 1
+
+        cache.on_mutation("POST", "/api/v1/memories/add", {"content": "fact"}, {})
+        assert cache.get("a") is None
+
+    def test_reset_db_clears_everything(self):
+        """Test vector DB reset drops all results."""
+        cache = QueryCache()
+        cache.put("a", ["x"], 1)
+        cache.put("b", ["y"], 2)
+
+        cache.on_mutation("POST", "/api/v1/retrieval/reset/db", None, {})
+
+        assert cache.get_stats()["entries"] == 0
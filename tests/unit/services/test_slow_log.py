@@ -0,0 +1,80 @@
+"""Tests for the slow-call log."""
+
+import json
+from src.services.slow_log import SlowCallLog, argument_shape
+from src.utils.tracing import CallStats
+
+
+class TestArgumentShape:
+    """Tests for argument shape extraction."""
+
+    def test_sizes_not_values(self):
+        """Test strings and lists are reduced to their sizes."""
+        shape = argument_shape({
+            "query": "secret text",
+            "ids": ["a", "b"],
+            "limit": 10,
+            "exact": True,
+            "filter": {"tags": ["x"], "after": None},
+        })
+
+        assert shape == {
+            "query": "str(11)",
+            "ids": "list(2)",
+            "limit": "int",
+            "exact": "bool",
+            "filter": {"tags": "list(1)", "after": "null"},
+        }
+
+
+class TestSlowCallLog:
+    """Tests for SlowCallLog."""
+
+    def test_thresholds_exact_pattern_default(self):
+        """Test exact names win over patterns, which win over the default."""
+        slow_log = SlowCallLog(1000, {"chat_export": 60000, "chat_*": 3000, "admin_*": 0})
+
+        assert slow_log.threshold_for("chat_export") == 60000
+        assert slow_log.threshold_for("chat_list") == 3000
+        assert slow_log.threshold_for("admin_health") == 0
+        assert slow_log.threshold_for("model_list") == 1000
+
+    def test_records_only_slow_calls(self, tmp_path):
+        """Test fast calls are ignored and slow ones buffered and written."""
+        path = tmp_path / "slow.jsonl"
+        slow_log = SlowCallLog(100, path=path)
+        stats = CallStats()
+        stats.add_request(0)
+        stats.add_request(0)
+        stats.retries = 1
+        stats.add_upstream_time("/api/v1/chats/{id}", 80.0)
+        stats.queue_ms = 12.0
+        stats.bytes_in = 2048
+
+        assert slow_log.observe("chat_get", {"chat_id": "1"}, 50.0, stats) is None
+        record = slow_log.observe("chat_get", {"chat_id": "1"}, 150.0, stats, request_id="r1")
+
+        assert record["route"] == "/api/v1/chats/{id}"
+        assert record["arguments"] == {"chat_id": "str(1)"}
+        assert (record["queue_ms"], record["upstream_ms"], record["retries"]) == (12.0, 80.0, 1)
+        assert record["bytes_in"] == 2048
+        assert json.loads(path.read_text())["request_id"] == "r1"
+        assert slow_log.get_stats()["recorded"] == 1
+
+    def test_ring_buffer_query_and_summary(self):
+        """Test the buffer keeps the newest calls and summarizes routes."""
+        slow_log = SlowCallLog(1, capacity=3)
+        for i, tool in enumerate(["chat_list", "chat_get", "model_list", "chat_get"]):
+            stats = CallStats()
+            stats.add_upstream_time(f"/api/v1/{tool}", 10.0 * (i + 1))
+            slow_log.observe(tool, {}, 100.0 + i, stats)
+
+        calls = slow_log.query()
+        chats = slow_log.query(tool="chat_*")
+        summary = slow_log.summarize(calls)
+
+        assert [c["tool"] for c in calls] == ["chat_get", "model_list", "chat_get"]
+        assert len(chats) == 2
+        assert summary["by_tool"]["chat_get"]["calls"] == 2
+        assert list(summary["by_route"]) == ["/api/v1/chat_get", "/api/v1/model_list"]
+        assert slow_log.clear() == 3
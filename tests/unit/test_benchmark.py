@@ -0,0 +1,111 @@
+"""Tests for the benchmark workload, trace parsing and baseline comparison."""
+
+import json
+import pytest
+from src.utils.tracing import Span, Trace
+from tests.benchmark import TOOL_CLASSES, Workload, compare, parse_mix, read_traces, summarize
+from tests.benchmark.report import distribution, percentile
+
+SIZES = {"chats": 100, "users": 10, "knowledge": 2, "files": 40}
+
+
+def call(tool_class: str, tool: str, latency_ms: float, error: bool = False) -> dict:
+    """Build a client-side call record."""
+    return {"tool_class": tool_class, "tool": tool, "latency_ms": latency_ms, "error": error}
+
+
+def results_with(p95: float, calls_per_sec: float, memory_kb: float) -> dict:
+    """Build a minimal results document."""
+    totals = {"calls_per_sec": calls_per_sec, "latency_ms": {"p50": 10.0, "p95": p95, "p99": p95}}
+    return {"totals": totals, "classes": {"get": totals}, "resources": {"memory_per_session_kb": memory_kb}}
+
+
+class TestWorkload:
+    """Test the tool class mix."""
+
+    def test_parse_mix(self):
+        """Test weights are parsed and default to 1."""
+        assert parse_mix("list=4, get") == {"list": 4.0, "get": 1.0}
+
+    @pytest.mark.parametrize("spec", ["unknown=1", "list=x", "list=0", ""])
+    def test_parse_mix_rejects_bad_specs(self, spec):
+        """Test unknown classes and invalid weights raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_mix(spec)
+
+    def test_calls_follow_mix(self):
+        """Test only classes in the mix are called and sequences are seeded."""
+        first = [Workload({"get": 1.0}, SIZES, seed=3).next_call() for _ in range(5)]
+        workload = Workload({"get": 1.0}, SIZES, seed=3)
+
+        assert {tool_class for tool_class, _, _ in first} == {"get"}
+        assert workload.next_call() == first[0]
+
+    def test_every_call_covers_each_tool(self):
+        """Test warm-up calls include every tool of the mixed classes."""
+        calls = Workload({"list": 1.0, "binary": 1.0}, SIZES).every_call()
+
+        assert len(calls) == len(TOOL_CLASSES["list"]) + len(TOOL_CLASSES["binary"])
+
+
+class TestReport:
+    """Test result aggregation."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) is None
+        assert distribution([2.0, 4.0])["mean"] == 3.0
+
+    def test_read_traces_splits_upstream_time(self, tmp_path):
+        """Test server time is split into upstream stages and overhead."""
+        trace = Trace("tools/call chat_get", "a" * 32, attributes={"mcp.tool.name": "chat_get"})
+        trace.root.start_ns, trace.root.end_ns = 1_000_000_000, 1_050_000_000
+        server = Span("server", trace.root.span_id)
+        server.start_ns, server.end_ns = 1_010_000_000, 1_040_000_000
+        trace.spans.append(server)
+        path = tmp_path / "traces.jsonl"
+        path.write_text(json.dumps(trace.to_otlp()) + "\n")
+
+        calls = read_traces(path)
+
+        assert calls == [{"tool": "chat_get", "server_ms": 50.0, "upstream_ms": 30.0, "overhead_ms": 20.0}]
+        assert read_traces(path, since_ns=2_000_000_000) == []
+        assert read_traces(tmp_path / "missing.jsonl") == []
+
+    def test_summarize_groups_by_class_and_tool(self):
+        """Test totals, classes and tools are summarized."""
+        calls = [call("get", "chat_get", 10.0), call("get", "chat_get", 30.0, error=True), call("list", "chat_list", 5.0)]
+        traces = [{"tool": "chat_get", "server_ms": 9.0, "upstream_ms": 6.0, "overhead_ms": 3.0}]
+
+        results = summarize(calls, traces, elapsed=2.0, resources={}, config={})
+
+        assert results["totals"]["calls_per_sec"] == 1.5
+        assert results["classes"]["get"]["errors"] == 1
+        assert results["classes"]["get"]["overhead_ms"]["p50"] == 3.0
+        assert "overhead_ms" not in results["classes"]["list"]
+        assert results["tools"]["chat_list"]["latency_ms"]["p99"] == 5.0
+
+
+class TestCompare:
+    """Test baseline comparison."""
+
+    def test_flags_regressions_beyond_tolerance(self):
+        """Test worse latency, throughput and memory are flagged."""
+        comparison = compare(results_with(150.0, 50.0, 400.0), results_with(100.0, 100.0, 200.0))
+        regressions = {entry["metric"] for entry in comparison if entry["regression"]}
+
+        assert "totals.latency_ms.p95" in regressions
+        assert "totals.calls_per_sec" in regressions
+        assert "resources.memory_per_session_kb" in regressions
+        assert "totals.latency_ms.p50" not in regressions
+
+    def test_ignores_noise_and_improvements(self):
+        """Test changes within tolerance or the noise floor and improvements pass."""
+        small = compare(results_with(1.5, 100.0, 200.0), results_with(1.0, 100.0, 200.0))
+        better = compare(results_with(50.0, 200.0, 100.0), results_with(100.0, 100.0, 200.0))
+
+        assert not any(entry["regression"] for entry in small + better)
@@ -77,6 +77,109 @@ class TestConfig:
                 OPENWEBUI_RATE_LIMIT=0
             )
 
+    def test_config_invalid_embedding_batch_settings(self):
+        """Test config rejects invalid embedding batch settings."""
+        with pytest.raises(ValidationError, match="EMBEDDING_BATCH_WINDOW_MS"):
+            Config(
+                OPENWEBUI_BASE_URL="http://localhost:8080",
+                EMBEDDING_BATCH_WINDOW_MS=-1
+            )
+
+        with pytest.raises(ValidationError, match="EMBEDDING_BATCH_MAX_SIZE"):
+            Config(
+                OPENWEBUI_BASE_URL="http://localhost:8080",
+                EMBEDDING_BATCH_MAX_SIZE=0
+            )
+
+        with pytest.raises(ValidationError, match="EMBEDDING_CACHE_MAX_MB"):
+            Config(
+                OPENWEBUI_BASE_URL="http://localhost:8080",
+                EMBEDDING_CACHE_MAX_MB=0
+            )
+
+        with pytest.raises(ValidationError, match="QUERY_CACHE_TTL_SECONDS"):
+            Config(
+                OPENWEBUI_BASE_URL="http://localhost:8080",
+                QUERY_CACHE_TTL_SECONDS=-1
+            )
+
+        with pytest.raises(ValidationError, match="CHAT_INDEX_REFRESH_SECONDS"):
+            Config(
+                OPENWEBUI_BASE_URL="http://localhost:8080",
+                CHAT_INDEX_REFRESH_SECONDS=-1
+            )
+
+    def test_config_slow_call_settings(self):
+        """Test slow-call thresholds are parsed and validated."""
+        config = Config(
+            OPENWEBUI_BASE_URL="http://localhost:8080",
+            SLOW_CALL_THRESHOLDS="chat_export=60000, retrieval_*=5000"
+        )
+
+        assert config.slow_call_thresholds == {"chat_export": 60000, "retrieval_*": 5000}
+
+        with pytest.raises(ValidationError, match="SLOW_CALL_THRESHOLDS"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", SLOW_CALL_THRESHOLDS="chat_list=fast")
+
+        with pytest.raises(ValidationError, match="SLOW_CALL_BUFFER_SIZE"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", SLOW_CALL_BUFFER_SIZE=0)
+
+    def test_config_log_settings(self):
+        """Test log sampling rates are parsed and validated."""
+        config = Config(
+            OPENWEBUI_BASE_URL="http://localhost:8080",
+            LOG_SAMPLING="src.services.client=0.1, *=1"
+        )
+
+        assert config.log_sample_rates == {"src.services.client": 0.1, "*": 1.0}
+
+        with pytest.raises(ValidationError, match="LOG_SAMPLING"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", LOG_SAMPLING="src=2")
+
+        with pytest.raises(ValidationError, match="LOG_QUEUE_SIZE"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", LOG_QUEUE_SIZE=-1)
+
+    def test_config_cassette_settings(self):
+        """Test cassette modes require a path and a non-negative timing scale."""
+        with pytest.raises(ValidationError, match="CASSETTE_PATH"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", CASSETTE_MODE="replay")
+
+        with pytest.raises(ValidationError, match="CASSETTE_TIMING_SCALE"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", CASSETTE_TIMING_SCALE=-0.5)
+
+    def test_config_lifecycle_settings(self):
+        """Test warm-up and drain settings reject negative values."""
+        with pytest.raises(ValidationError, match="WARMUP_CONNECTIONS"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", WARMUP_CONNECTIONS=-1)
+
+        with pytest.raises(ValidationError, match="SHUTDOWN_DRAIN_SECONDS"):
+            Config(OPENWEBUI_BASE_URL="http://localhost:8080", SHUTDOWN_DRAIN_SECONDS=-1)
+
+    def test_config_mirror_settings(self):
+        """Test mirror kinds and per-tool staleness are parsed."""
+        config = Config(
+            OPENWEBUI_BASE_URL="http://localhost:8080",
+            MIRROR_KINDS="chats, models",
+            MIRROR_TOOL_STALENESS="chat_get=0, get_models_models=300"
+        )
+
+        assert config.mirror_kinds == ["chats", "models"]
+        assert config.mirror_tool_staleness == {"chat_get": 0, "get_models_models": 300}
+
+    def test_config_invalid_mirror_settings(self):
+        """Test config rejects invalid mirror settings."""
+        with pytest.raises(ValidationError, match="MIRROR_REFRESH_SECONDS"):
+            Config(
+                OPENWEBUI_BASE_URL="http://localhost:8080",
+                MIRROR_REFRESH_SECONDS=-1
+            )
+
+        with pytest.raises(ValidationError, match="MIRROR_TOOL_STALENESS"):
+            Config(
+                OPENWEBUI_BASE_URL="http://localhost:8080",
+                MIRROR_TOOL_STALENESS="chat_get"
+            )
+
     def test_config_https_url(self):
         """Test config accepts HTTPS URLs."""
         config = Config(OPENWEBUI_BASE_URL="https://secure.example.com")
@@ -0,0 +1,361 @@
+"""Tests for the mock Open WebUI server used in offline benchmarks.
+
+Drives OpenWebUIClient against the app in-process through httpx.ASGITransport.
+"""
+
+import json
+import pytest
+import httpx
+from src.config import Config
+from src.exceptions import NotFoundError, RateLimitError, ServerError
+from src.services.client import OpenWebUIClient
+from tests.mock_openwebui import Dataset, Faults, Latency, MockSettings, create_app, synthetic_id
+from tests.mock_openwebui.dataset import synthetic_index
+
+API_KEY = "sk-test-key-1234567890abcdef"
+
+
+def make_client(app) -> OpenWebUIClient:
+    """Create a client whose HTTP calls are served by the app."""
+    client = OpenWebUIClient(Config(OPENWEBUI_BASE_URL="http://mock", OPENWEBUI_API_KEY=API_KEY))
+    client._client = httpx.AsyncClient(
+        base_url="http://mock",
+        headers=client._build_headers(),
+        transport=httpx.ASGITransport(app=app)
+    )
+    return client
+
+
+class TestDataset:
+    """Test synthetic dataset generation and API writes."""
+
+    def test_synthetic_id_round_trip(self):
+        """Test synthetic ids map back to their index."""
+        key = synthetic_id("chats", 42)
+
+        assert synthetic_index("chats", key) == 42
+        assert synthetic_index("users", key) is None
+        assert synthetic_index("chats", "not-an-id") is None
+
+    def test_entities_are_deterministic(self):
+        """Test the same index and seed build the same entity."""
+        assert Dataset(chats=10).chats.at(3) == Dataset(chats=10).chats.at(3)
+        assert Dataset(chats=10, seed=1).chats.at(3) != Dataset(chats=10).chats.at(3)
+
+    def test_page_lists_newest_first(self):
+        """Test pages put writes first, then synthetic entities by index."""
+        dataset = Dataset(chats=5)
+        chats = dataset.chats
+        chats.update(synthetic_id("chats", 2), {"title": "Renamed"})
+        chats.delete(synthetic_id("chats", 0))
+        created = chats.create({"title": "New"})
+
+        ids = [chat["id"] for chat in chats.page(0, 10)]
+
+        assert ids == [
+            created["id"],
+            synthetic_id("chats", 2),
+            synthetic_id("chats", 1),
+            synthetic_id("chats", 3),
+            synthetic_id("chats", 4),
+        ]
+        assert len(chats) == 5
+        assert [chat["id"] for chat in chats.page(3, 2)] == ids[3:]
+        assert chats.get(synthetic_id("chats", 0)) is None
+
+    def test_large_dataset_is_lazy(self):
+        """Test a large dataset builds only the entities requested."""
+        dataset = Dataset(chats=100_000, users=10_000)
+
+        page = dataset.chats.page(99_990, 60)
+
+        assert len(dataset.chats) == 100_000
+        assert len(page) == 10
+        assert page[-1]["id"] == synthetic_id("chats", 99_999)
+
+
+class TestFaults:
+    """Test latency specs and fault settings."""
+
+    def test_latency_specs(self):
+        """Test each distribution parses and draws non-negative delays."""
+        assert Latency("fixed:20").sample_ms() == 20
+        for spec in ("uniform:5,50", "normal:30,10", "lognormal:20,0.6", "pareto:10,2.5"):
+            assert Latency(spec).sample_ms() >= 0
+
+    @pytest.mark.parametrize("spec", ["gamma:1,2", "fixed:a", "uniform:5", "normal:-1,2"])
+    def test_latency_rejects_bad_specs(self, spec):
+        """Test malformed specs raise ValueError."""
+        with pytest.raises(ValueError):
+            Latency(spec)
+
+    def test_route_latency_first_match_wins(self):
+        """Test route latency overrides the default latency."""
+        faults = Faults(latency="fixed:5", route_latency={"/api/v1/chats/*": "fixed:50"})
+
+        assert faults.delay_ms("/api/v1/chats/list") == 50
+        assert faults.delay_ms("/api/v1/users/") == 5
+
+    def test_configure_validates(self):
+        """Test configure rejects unknown and out-of-range settings."""
+        faults = Faults()
+
+        with pytest.raises(ValueError, match="Unknown"):
+            faults.configure(jitter=1)
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            faults.configure(error_rate=2)
+
+    def test_fault_routes_limit_errors(self):
+        """Test errors are only injected on matching paths."""
+        faults = Faults(error_rate=1.0, fault_routes=["/api/v1/files/*"])
+
+        assert faults.fault("/api/v1/files/x") == 500
+        assert faults.fault("/api/v1/chats/") is None
+
+
+class TestMockServer:
+    """Test the mock server through OpenWebUIClient."""
+
+    async def test_chat_list_pages_until_empty(self):
+        """Test chat list pages hold page_size entries until exhausted."""
+        client = make_client(create_app(Dataset(chats=130)))
+
+        pages = [await client.get("/api/v1/chats/list", params={"page": page}) for page in (1, 2, 3, 4)]
+
+        assert [len(page) for page in pages] == [60, 60, 10, 0]
+        assert set(pages[0][0]) == {"id", "title", "updated_at", "created_at"}
+        await client.close()
+
+    async def test_chat_crud(self):
+        """Test created and updated chats are visible and deleted ones are gone."""
+        client = make_client(create_app(Dataset(chats=10)))
+
+        created = await client.post("/api/v1/chats/new", json_data={"chat": {"title": "Bench"}})
+        updated = await client.post(f"/api/v1/chats/{created['id']}", json_data={"chat": {"title": "Renamed"}})
+        first = await client.get("/api/v1/chats/list", params={"page": 1})
+        deleted = await client.delete(f"/api/v1/chats/{created['id']}")
+
+        assert updated["title"] == "Renamed"
+        assert first[0]["id"] == created["id"]
+        assert deleted == {"result": True}
+        with pytest.raises(NotFoundError):
+            await client.get(f"/api/v1/chats/{created['id']}")
+        await client.close()
+
+    async def test_users_and_binary_file_content(self):
+        """Test users report the total and file content is served as bytes."""
+        dataset = Dataset(users=250, knowledge=1, files_per_knowledge=2, file_size=4096)
+        app = create_app(dataset)
+        client = make_client(app)
+
+        users = await client.get("/api/v1/users/", params={"page": 2})
+        response = await client.client.get(f"/api/v1/files/{synthetic_id('files', 1)}/content")
+
+        assert users["total"] == 250
+        assert len(users["users"]) == 60
+        assert response.headers["content-type"].startswith("text/plain")
+        assert len(response.content) == dataset.files.at(1)["meta"]["size"]
+        await client.close()
+
+    async def test_injected_rate_limit(self):
+        """Test injected 429s carry Retry-After and become RateLimitError."""
+        client = make_client(create_app(Dataset(chats=1), Faults(rate_limit_rate=1.0, retry_after=7)))
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await client.get("/api/v1/chats/list")
+
+        assert exc_info.value.retry_after == 7
+        await client.close()
+
+    async def test_injected_server_error_and_runtime_config(self):
+        """Test the control endpoint switches fault injection at runtime."""
+        app = create_app(Dataset(chats=1))
+        client = make_client(app)
+
+        await client.post("/__mock__/faults", json_data={"error_rate": 1.0})
+        with pytest.raises(ServerError):
+            await client.get("/api/v1/chats/list")
+        await client.post("/__mock__/faults", json_data={"error_rate": 0.0})
+        stats = await client.get("/__mock__/stats")
+
+        assert stats["injected"] == {"500": 1}
+        assert stats["dataset"]["chats"] == 1
+        await client.close()
+
+    async def test_api_key_required(self):
+        """Test requests without the configured bearer token are rejected."""
+        app = create_app(settings=MockSettings(api_key="other-key"))
+        client = make_client(app)
+
+        response = await client.client.get("/api/v1/models/")
+
+        assert response.status_code == 401
+        await client.close()
+
+    async def test_ollama_chat_streams_ndjson(self):
+        """Test Ollama chat streams one JSON line per token and a final done line."""
+        client = make_client(create_app(settings=MockSettings(completion_tokens=5)))
+
+        async with client.client.stream(
+            "POST", "/ollama/api/chat", json={"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+        ) as response:
+            lines = [json.loads(line) async for line in response.aiter_lines() if line]
+
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert len(lines) == 6
+        assert lines[-1]["done"] is True
+        assert all("content" in line["message"] for line in lines)
+        await client.close()
+
+    async def test_openai_chat_streams_sse(self):
+        """Test OpenAI chat completions stream SSE chunks ending in [DONE]."""
+        client = make_client(create_app(settings=MockSettings(completion_tokens=3)))
+
+        async with client.client.stream(
+            "POST", "/openai/chat/completions", json={"model": "m", "messages": [], "stream": True}
+        ) as response:
+            events = [line[len("data: "):] async for line in response.aiter_lines() if line.startswith("data: ")]
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert events[-1] == "[DONE]"
+        assert json.loads(events[-2])["choices"][0]["finish_reason"] == "stop"
+        assert len(events) == 5
+        await client.close()
+
+    async def test_embeddings_are_deterministic(self):
+        """Test embeddings depend only on the input text."""
+        client = make_client(create_app(settings=MockSettings(embedding_dim=8)))
+
+        result = await client.post("/api/embeddings", json_data={"model": "m", "input": ["a", "b", "a"]})
+        vectors = [item["embedding"] for item in result["data"]]
+
+        assert len(vectors[0]) == 8
+        assert vectors[0] == vectors[2] != vectors[1]
+        await client.close()
+
+    async def test_unknown_paths_fall_back(self):
+        """Test unimplemented endpoints answer {} and are counted."""
+        client = make_client(create_app())
+
+        result = await client.get("/api/v1/tools/")
+        stats = await client.get("/__mock__/stats")
+
+        assert result == {}
+        assert stats["fallbacks"] == {"GET /api/v1/tools/": 1}
+        await client.close()
+
+    async def test_unknown_chat_action_is_not_a_clone(self):
+        """Test unsupported chat actions 404 instead of creating chats."""
+        dataset = Dataset(chats=1)
+        client = make_client(create_app(dataset))
+        chat_id = synthetic_id("chats", 0)
+
+        with pytest.raises(NotFoundError):
+            await client.post(f"/api/v1/chats/{chat_id}/share-all", json_data={})
+        tags = await client.post(f"/api/v1/chats/{chat_id}/tags", json_data={"name": "Work Notes"})
+
+        assert tags[-1]["id"] == "work_notes"
+        assert dataset.chats.get(chat_id)["meta"]["tags"][-1] == "work_notes"
+        assert dataset.chats.written() == [dataset.chats.get(chat_id)]
+        await client.close()
+
+    async def test_chat_import_creates_each_chat(self):
+        """Test the batch import route is not taken for a chat id."""
+        dataset = Dataset(chats=0)
+        client = make_client(create_app(dataset))
+
+        created = await client.post("/api/v1/chats/import", json_data={
+            "chats": [{"chat": {"title": "A"}}, {"chat": {"title": "B"}, "pinned": True}],
+        })
+
+        assert [chat["title"] for chat in created] == ["A", "B"]
+        assert created[1]["pinned"] is True
+        assert len(dataset.chats) == 2
+        await client.close()
+
+    async def test_ollama_embed_returns_one_vector_per_input(self):
+        """Test /ollama/api/embed answers batched input, also with a url_idx."""
+        client = make_client(create_app(settings=MockSettings(embedding_dim=4)))
+
+        result = await client.post("/ollama/api/embed", json_data={"model": "m", "input": ["a", "b"]})
+        single = await client.post("/ollama/api/embed/0", json_data={"model": "m", "input": "a"})
+
+        assert len(result["embeddings"]) == 2
+        assert single["embeddings"] == result["embeddings"][:1]
+        await client.close()
+
+    async def test_process_text_does_not_append_to_existing_collection(self):
+        """Test process/text leaves an existing collection unchanged, like Open WebUI."""
+        dataset = Dataset()
+        client = make_client(create_app(dataset))
+
+        for content in ("first", "second"):
+            await client.post("/api/v1/retrieval/process/text", json_data={
+                "name": "doc", "content": content, "collection_name": "c",
+            })
+
+        assert [doc["content"] for doc in dataset.collections["c"]] == ["first"]
+        await client.close()
+
+    async def test_chats_by_tag_pages_with_skip_limit(self):
+        """Test /chats/tags pages over written and synthetic chats carrying the tag."""
+        dataset = Dataset(chats=200)
+        client = make_client(create_app(dataset))
+        tag = dataset.chats.at(0)["meta"]["tags"][0]
+        tagged = await client.post(f"/api/v1/chats/{synthetic_id('chats', 1)}/tags", json_data={"name": tag})
+
+        first = await client.post("/api/v1/chats/tags", json_data={"name": tag, "skip": 0, "limit": 2})
+        rest = await client.post("/api/v1/chats/tags", json_data={"name": tag, "skip": 2, "limit": 50})
+
+        ids = [chat["id"] for chat in first + rest]
+        assert tagged[-1]["id"] == tag
+        assert ids[:2] == [synthetic_id("chats", 1), synthetic_id("chats", 0)]
+        assert len(ids) == len(set(ids)) == 1 + sum(
+            tag in dataset.chats.at(i)["meta"]["tags"] for i in range(200) if i != 1
+        )
+        await client.close()
+
+    async def test_process_web_overwrites_collection(self):
+        """Test process/web, /youtube and /web/search replace the collection, like Open WebUI."""
+        dataset = Dataset()
+        client = make_client(create_app(dataset))
+
+        web = await client.post("/api/v1/retrieval/process/web", json_data={
+            "url": "https://a.example/", "collection_name": "c",
+        })
+        await client.post("/api/v1/retrieval/process/youtube", json_data={
+            "url": "https://youtu.be/x", "collection_name": "c",
+        })
+        search = await client.post("/api/v1/retrieval/process/web/search", json_data={
+            "queries": ["what is rag"], "collection_name": "s",
+        })
+
+        assert web["status"] is True and web["collection_name"] == "c"
+        assert web["file"]["data"]["content"]
+        assert [doc["metadata"]["source"] for doc in dataset.collections["c"]] == ["https://youtu.be/x"]
+        assert dataset.collections["s"][0]["content"] == search["file"]["data"]["content"]
+        await client.close()
+
+    async def test_batch_processing_and_knowledge_attach(self):
+        """Test batch processing appends to collections and reports failing files."""
+        dataset = Dataset(knowledge=1, files_per_knowledge=2, file_size=256)
+        client = make_client(create_app(dataset))
+        empty = dataset.files.create({"filename": "empty.txt", "meta": {"name": "empty.txt", "size": 0}})
+        dataset.file_contents[empty["id"]] = b""
+        file_ids = [synthetic_id("files", 0), synthetic_id("files", 1)]
+
+        batch = await client.post("/api/v1/retrieval/process/files/batch", json_data={
+            "files": [{"id": file_ids[0]}, {"id": empty["id"]}], "collection_name": "c",
+        })
+        knowledge_id = synthetic_id("knowledge", 0)
+        attached = await client.post(f"/api/v1/knowledge/{knowledge_id}/files/batch/add", json_data=[
+            {"file_id": file_ids[1]}, {"file_id": empty["id"]},
+        ])
+
+        assert [r["file_id"] for r in batch["results"]] == [file_ids[0]]
+        assert [e["file_id"] for e in batch["errors"]] == [empty["id"]]
+        assert attached["warnings"]["errors"] == [f"{empty['id']}: No content extracted"]
+        assert file_ids[1] in attached["data"]["file_ids"]
+        assert empty["id"] not in attached["data"]["file_ids"]
+        assert len(dataset.collections[knowledge_id]) == 1
+        await client.close()
@@ -0,0 +1,49 @@
+"""Tests for AdminCpuProfileTool."""
+
+import pytest
+from unittest.mock import Mock
+from src.exceptions import ValidationError
+from src.services.profiler import SamplingProfiler
+from src.tools.admin.admin_cpu_profile_tool import AdminCpuProfileTool
+
+
+class TestAdminCpuProfileTool:
+    """Tests for admin_cpu_profile."""
+
+    def make_tool(self, profiler):
+        services = Mock()
+        services.get_service.side_effect = {"profiler": profiler}.get
+        return AdminCpuProfileTool(client=Mock(), config=Mock(), services=services)
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        tool = AdminCpuProfileTool(client=Mock(), config=Mock())
+
+        assert tool.get_definition()["name"] == "admin_cpu_profile"
+
+    @pytest.mark.asyncio
+    async def test_execute_disabled(self):
+        """Test tool reports disabled profiling."""
+        assert await self.make_tool(None).execute({}) == {"enabled": False}
+
+    @pytest.mark.asyncio
+    async def test_execute_profiles(self, tmp_path):
+        """Test a short profile is written and summarized."""
+        result = await self.make_tool(SamplingProfiler(tmp_path)).execute(
+            {"duration_seconds": 1, "interval_ms": 20}
+        )
+
+        assert result["enabled"] is True
+        assert result["mode"] == "wall"
+        assert result["path"].startswith(str(tmp_path))
+        assert result["samples"] > 0
+
+    @pytest.mark.asyncio
+    async def test_execute_invalid_arguments(self, tmp_path):
+        """Test invalid mode and duration are rejected."""
+        tool = self.make_tool(SamplingProfiler(tmp_path))
+
+        with pytest.raises(ValidationError):
+            await tool.execute({"duration_seconds": 600})
+        with pytest.raises(ValidationError, match="mode"):
+            await tool.execute({"duration_seconds": 1, "mode": "gpu"})
@@ -0,0 +1,41 @@
+"""Tests for AdminEmbeddingStatsTool."""
+
+import pytest
+from unittest.mock import Mock
+from src.tools.admin.admin_embedding_stats_tool import AdminEmbeddingStatsTool
+
+
+class TestAdminEmbeddingStatsTool:
+    """Tests for admin_embedding_stats."""
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        tool = AdminEmbeddingStatsTool(client=Mock(), config=Mock())
+
+        assert tool.get_definition()["name"] == "admin_embedding_stats"
+
+    @pytest.mark.asyncio
+    async def test_execute_reports_batcher_stats(self):
+        """Test stats come from the shared batcher service."""
+        batcher = Mock()
+        batcher.get_stats.return_value = {"requests": 3}
+        cache = Mock()
+        cache.get_stats.return_value = {"hit_rate": 0.5}
+        services = Mock()
+        services.get_service.side_effect = {"embedding_batcher": batcher, "embedding_cache": cache}.get
+        tool = AdminEmbeddingStatsTool(client=Mock(), config=Mock(), services=services)
+
+        result = await tool.execute({})
+
+        assert result["batcher"] == {"requests": 3}
+        assert result["cache"] == {"hit_rate": 0.5}
+
+    @pytest.mark.asyncio
+    async def test_execute_without_services(self):
+        """Test tool works standalone without a service provider."""
+        tool = AdminEmbeddingStatsTool(client=Mock(), config=Mock())
+
+        result = await tool.execute({})
+
+        assert result["batcher"] is None
+        assert result["cache"] is None
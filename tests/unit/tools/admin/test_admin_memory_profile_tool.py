@@ -0,0 +1,56 @@
+"""Tests for AdminMemoryProfileTool."""
+
+import pytest
+from unittest.mock import Mock
+from src.exceptions import ValidationError
+from src.services.profiler import MemoryTracker
+from src.tools.admin.admin_memory_profile_tool import AdminMemoryProfileTool
+
+
+class TestAdminMemoryProfileTool:
+    """Tests for admin_memory_profile."""
+
+    def make_tool(self, tracker):
+        services = Mock()
+        services.get_service.side_effect = {"memory_tracker": tracker}.get
+        return AdminMemoryProfileTool(client=Mock(), config=Mock(), services=services)
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        tool = AdminMemoryProfileTool(client=Mock(), config=Mock())
+
+        assert tool.get_definition()["name"] == "admin_memory_profile"
+
+    @pytest.mark.asyncio
+    async def test_execute_disabled(self):
+        """Test tool reports disabled profiling."""
+        assert await self.make_tool(None).execute({}) == {"enabled": False}
+
+    @pytest.mark.asyncio
+    async def test_execute_snapshot_diff_cycle(self):
+        """Test start, snapshot, diff and stop actions."""
+        tool = self.make_tool(MemoryTracker())
+
+        assert (await tool.execute({"action": "start", "frames": 3}))["tracing"] is True
+        try:
+            snapshot = await tool.execute({"action": "snapshot", "top": 3})
+            diff = await tool.execute({"action": "diff", "base_id": snapshot["snapshot_id"], "top": 3})
+        finally:
+            stopped = await tool.execute({"action": "stop"})
+
+        assert len(snapshot["top"]) <= 3
+        assert diff["base_id"] == snapshot["snapshot_id"]
+        assert diff["target_id"] == snapshot["snapshot_id"] + 1
+        assert stopped["tracing"] is False
+
+    @pytest.mark.asyncio
+    async def test_execute_errors(self):
+        """Test snapshots need tracing and diffs need a base."""
+        tool = self.make_tool(MemoryTracker())
+
+        with pytest.raises(ValidationError, match="not running"):
+            await tool.execute({"action": "snapshot"})
+        with pytest.raises(ValidationError, match="base_id"):
+            await tool.execute({"action": "diff"})
+        with pytest.raises(ValidationError, match="action"):
+            await tool.execute({"action": "dump"})
@@ -0,0 +1,59 @@
+"""Tests for AdminMirrorStatusTool."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.exceptions import ValidationError
+from src.tools.admin.admin_mirror_status_tool import AdminMirrorStatusTool
+
+
+class TestAdminMirrorStatusTool:
+    """Tests for admin_mirror_status."""
+
+    @pytest.fixture
+    def mirror(self):
+        """Create a mock mirror."""
+        mirror = Mock()
+        mirror.kinds = ["chats", "models"]
+        mirror.get_stats.return_value = {"hit_rate": 0.75}
+        mirror.refresh = AsyncMock(return_value={"updated": 1})
+        return mirror
+
+    def make_tool(self, mirror):
+        services = Mock()
+        services.get_service.side_effect = {"mirror": mirror}.get
+        return AdminMirrorStatusTool(client=Mock(), config=Mock(), services=services)
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        tool = AdminMirrorStatusTool(client=Mock(), config=Mock())
+
+        assert tool.get_definition()["name"] == "admin_mirror_status"
+
+    @pytest.mark.asyncio
+    async def test_execute_disabled(self):
+        """Test tool reports a disabled mirror."""
+        result = await self.make_tool(None).execute({})
+
+        assert result == {"enabled": False}
+
+    @pytest.mark.asyncio
+    async def test_execute_reports_stats(self, mirror):
+        """Test stats come from the mirror service."""
+        result = await self.make_tool(mirror).execute({})
+
+        assert result == {"enabled": True, "hit_rate": 0.75}
+        mirror.refresh.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_execute_refresh(self, mirror):
+        """Test refresh runs for the requested kinds."""
+        result = await self.make_tool(mirror).execute({"refresh": True, "kinds": ["models"]})
+
+        assert result["refreshed"] == {"models": {"updated": 1}}
+        mirror.refresh.assert_awaited_once_with("models")
+
+    @pytest.mark.asyncio
+    async def test_execute_refresh_unmirrored_kind(self, mirror):
+        """Test refreshing a kind that is not mirrored fails."""
+        with pytest.raises(ValidationError, match="users"):
+            await self.make_tool(mirror).execute({"refresh": True, "kinds": ["users"]})
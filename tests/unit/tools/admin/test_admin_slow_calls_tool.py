@@ -0,0 +1,49 @@
+"""Tests for AdminSlowCallsTool."""
+
+import pytest
+from unittest.mock import Mock
+from src.exceptions import ValidationError
+from src.services.slow_log import SlowCallLog
+from src.tools.admin.admin_slow_calls_tool import AdminSlowCallsTool
+
+
+class TestAdminSlowCallsTool:
+    """Tests for admin_slow_calls."""
+
+    def make_tool(self, slow_log):
+        services = Mock()
+        services.get_service.side_effect = {"slow_log": slow_log}.get
+        return AdminSlowCallsTool(client=Mock(), config=Mock(), services=services)
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        tool = AdminSlowCallsTool(client=Mock(), config=Mock())
+
+        assert tool.get_definition()["name"] == "admin_slow_calls"
+
+    @pytest.mark.asyncio
+    async def test_execute_disabled(self):
+        """Test tool reports a disabled slow log."""
+        assert await self.make_tool(None).execute({}) == {"enabled": False}
+
+    @pytest.mark.asyncio
+    async def test_execute_filters_and_clears(self):
+        """Test calls are filtered, limited and optionally cleared."""
+        slow_log = SlowCallLog(1)
+        for tool, duration in [("chat_list", 50), ("chat_get", 500), ("model_list", 900)]:
+            slow_log.observe(tool, {}, duration)
+
+        result = await self.make_tool(slow_log).execute(
+            {"tool": "chat_*", "min_duration_ms": 100, "limit": 5, "clear": True}
+        )
+
+        assert [c["tool"] for c in result["calls"]] == ["chat_get"]
+        assert result["summary"]["by_tool"]["chat_get"]["calls"] == 1
+        assert result["cleared"] == 3
+        assert slow_log.query() == []
+
+    @pytest.mark.asyncio
+    async def test_execute_invalid_min_duration(self):
+        """Test negative durations are rejected."""
+        with pytest.raises(ValidationError, match="min_duration_ms"):
+            await self.make_tool(SlowCallLog(1)).execute({"min_duration_ms": -1})
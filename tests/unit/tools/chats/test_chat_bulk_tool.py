@@ -0,0 +1,138 @@
+"""Tests for ChatBulkTool."""
+
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.tools.chats.chat_bulk_tool import ChatBulkTool
+from src.exceptions import NotFoundError, ValidationError
+
+NOW = time.time()
+DAY = 86400
+
+CHATS = [
+    {"id": "c1", "title": "Weekly report", "updated_at": NOW - 40 * DAY},
+    {"id": "c2", "title": "Trip planning", "updated_at": NOW - 2 * DAY},
+    {"id": "c3", "title": "Monthly report", "updated_at": NOW - 90 * DAY},
+]
+
+
+class TestChatBulkTool:
+    """Tests for chat_bulk."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock client serving one page of chats."""
+        client = Mock()
+
+        async def get(endpoint, params=None):
+            if endpoint == "/api/v1/chats/list":
+                return CHATS if params["page"] == 1 else []
+            if endpoint == "/api/v1/chats/pinned":
+                return [{"id": "c3"}]
+            if endpoint == "/api/v1/chats/folder/f1":
+                return [{"id": "c2", "title": "Trip planning", "updated_at": NOW}]
+            raise AssertionError(endpoint)
+
+        client.get = AsyncMock(side_effect=get)
+        client.post = AsyncMock(return_value={"id": "clone"})
+        client.delete = AsyncMock(return_value=True)
+        return client
+
+    @pytest.fixture
+    def tool(self, mock_client):
+        """Create tool instance."""
+        return ChatBulkTool(client=mock_client, config=Mock())
+
+    def test_get_definition(self, tool):
+        """Test tool definition structure."""
+        definition = tool.get_definition()
+
+        assert definition["name"] == "chat_bulk"
+        assert definition["inputSchema"]["required"] == ["action", "filter"]
+
+    @pytest.mark.asyncio
+    async def test_dry_run_plans_without_changes(self, tool, mock_client):
+        """Test dry run combines conditions and changes nothing."""
+        result = await tool.execute({
+            "action": "delete",
+            "filter": {"older_than_days": 30, "title_regex": "REPORT"},
+            "dry_run": True,
+        })
+
+        assert result["chat_ids"] == ["c1", "c3"]
+        assert result["plan"]["matched"] == 2
+        mock_client.delete.assert_not_called()
+        assert mock_client.get.call_args_list[0].kwargs["params"]["include_pinned"] == "true"
+
+    @pytest.mark.asyncio
+    async def test_partial_failures_return_retry_list(self, tool, mock_client):
+        """Test failed chats are reported with a retry list."""
+        async def delete(endpoint, params=None):
+            if endpoint.endswith("/c3"):
+                raise NotFoundError("Chat not found")
+            return True
+
+        mock_client.delete.side_effect = delete
+
+        result = await tool.execute({
+            "action": "delete",
+            "filter": {"older_than_days": 30},
+            "max_retries": 0,
+        })
+
+        assert result["succeeded"] == 1
+        assert result["retry_ids"] == ["c3"]
+        assert "not found" in result["failed"][0]["error"].lower()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("action", ["archive", "pin", "clone"])
+    async def test_non_idempotent_actions_are_not_retried(self, tool, mock_client, action):
+        """Test toggles and clones fail once instead of being sent again."""
+        mock_client.post.side_effect = NotFoundError("Chat not found")
+
+        result = await tool.execute({"action": action, "filter": {"chat_ids": ["c1"]}, "max_retries": 3})
+
+        assert result["retry_ids"] == ["c1"]
+        mock_client.post.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pin_skips_already_pinned(self, tool, mock_client):
+        """Test pin only toggles chats that are not pinned yet."""
+        result = await tool.execute({"action": "pin", "filter": {"title_regex": "report"}})
+
+        assert result["succeeded"] == 1
+        mock_client.post.assert_called_once_with("/api/v1/chats/c1/pin", json_data={})
+
+    @pytest.mark.asyncio
+    async def test_folder_filter_and_move(self, tool, mock_client):
+        """Test folder filter uses the folder listing and move sets the folder."""
+        result = await tool.execute({
+            "action": "move",
+            "filter": {"folder_id": "f1"},
+            "target_folder_id": "f2",
+        })
+
+        assert result["succeeded"] == 1
+        mock_client.post.assert_called_once_with(
+            "/api/v1/chats/c2/folder", json_data={"folder_id": "f2"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_chat_ids_only_skips_listing(self, tool, mock_client):
+        """Test an id-only filter does not list chats."""
+        result = await tool.execute({"action": "clone", "filter": {"chat_ids": ["c9"]}})
+
+        assert result["clones"] == [{"id": "c9", "clone_id": "clone"}]
+        mock_client.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_max_chats_guard(self, tool):
+        """Test runs larger than max_chats are refused."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"action": "archive", "filter": {"title_regex": "."}, "max_chats": 2})
+
+    @pytest.mark.asyncio
+    async def test_tag_requires_name(self, tool):
+        """Test tag action requires tag_name."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"action": "tag", "filter": {"tag": "x"}})
@@ -0,0 +1,81 @@
+"""Tests for ChatExportTool."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.tools.chats.chat_export_tool import ChatExportTool
+from src.exceptions import NotFoundError, ValidationError
+from src.utils.jsonl_archive import iter_jsonl
+
+
+def fake_get(listing, missing=()):
+    """Build a client.get side effect serving a chat listing and full chats."""
+    async def get(endpoint, params=None):
+        if endpoint == "/api/v1/chats/list":
+            page = params["page"]
+            return listing[(page - 1) * 2:page * 2]
+        chat_id = endpoint.rsplit("/", 1)[-1]
+        if chat_id in missing:
+            raise NotFoundError("Chat not found")
+        return {"id": chat_id, "chat": {"messages": [{"content": f"hello {chat_id}"}]}}
+    return get
+
+
+class TestChatExportTool:
+    """Tests for chat_export."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock HTTP client."""
+        client = Mock()
+        client.get = AsyncMock()
+        return client
+
+    @pytest.fixture
+    def tool(self, mock_client):
+        """Create tool instance."""
+        return ChatExportTool(client=mock_client, config=Mock())
+
+    def test_get_definition(self, tool):
+        """Test tool definition structure."""
+        definition = tool.get_definition()
+
+        assert definition["name"] == "chat_export"
+        assert definition["inputSchema"]["required"] == ["output_path"]
+
+    @pytest.mark.asyncio
+    async def test_exports_all_chats(self, tool, mock_client, tmp_path):
+        """Test every listed chat is written with its messages."""
+        mock_client.get.side_effect = fake_get([{"id": c} for c in "abc"])
+        path = tmp_path / "chats.jsonl.gz"
+
+        result = await tool.execute({"output_path": str(path), "batch_size": 2})
+
+        records = list(iter_jsonl(path))
+        assert sorted(r["id"] for r in records) == ["a", "b", "c"]
+        assert records[0]["chat"]["messages"][0]["content"].startswith("hello")
+        assert result["exported"] == 3
+        assert result["compression"] == "gzip"
+        assert result["complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_failures_keep_checkpoint_for_resume(self, tool, mock_client, tmp_path):
+        """Test failed chats are retried by a resumed export."""
+        path = tmp_path / "chats.jsonl"
+        listing = [{"id": c} for c in "abc"]
+        mock_client.get.side_effect = fake_get(listing, missing={"b"})
+
+        first = await tool.execute({"output_path": str(path)})
+        mock_client.get.side_effect = fake_get(listing)
+        second = await tool.execute({"output_path": str(path)})
+
+        assert first["failed"] == 1 and first["failures"][0]["id"] == "b"
+        assert first["complete"] is False
+        assert second["resumed"] is True
+        assert second["skipped"] == 2 and second["exported"] == 1
+        assert sorted(r["id"] for r in iter_jsonl(path)) == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_compression(self, tool, tmp_path):
+        """Test unknown compression is rejected."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"output_path": str(tmp_path / "x.jsonl"), "compression": "lz4"})
@@ -0,0 +1,204 @@
+"""Tests for ChatImportTool."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.tools.chats import chat_import_tool
+from src.tools.chats.chat_import_tool import ChatImportTool
+from src.exceptions import HTTPError, RateLimitError, ValidationError
+from src.utils.chat_import_ledger import ChatImportLedger
+from src.utils.jsonl_archive import ArchiveWriter
+from src.utils.tracing import start_trace
+
+
+def write_archive(path, records):
+    """Write records to an archive."""
+    writer = ArchiveWriter(path, "gzip" if path.suffix == ".gz" else "none")
+    writer.open(resume=False)
+    writer.write_block(records)
+    writer.close(complete=True)
+
+
+class FakeServer:
+    """Minimal import/folder/tag endpoints."""
+
+    def __init__(self, fail_tags=False):
+        self.imported = []
+        self.folders = {}
+        self.tags = {}
+        self.fail_tags = fail_tags
+
+    async def post(self, endpoint, json_data=None):
+        if endpoint == "/api/v1/chats/import":
+            created = []
+            for form in json_data["chats"]:
+                chat_id = f"new-{len(self.imported)}"
+                self.imported.append(form)
+                created.append({"id": chat_id, "title": form["chat"].get("title")})
+            return created
+        chat_id, action = endpoint.split("/")[-2:]
+        if action == "folder":
+            self.folders[chat_id] = json_data["folder_id"]
+        elif action == "tags":
+            if self.fail_tags:
+                raise RuntimeError("tag service down")
+            self.tags.setdefault(chat_id, []).append(json_data["name"])
+        return {}
+
+
+class TestChatImportTool:
+    """Tests for chat_import."""
+
+    @pytest.fixture(autouse=True)
+    def ledger_dir(self, tmp_path, monkeypatch):
+        """Keep ledgers inside a temporary cache directory."""
+        monkeypatch.setattr(chat_import_tool, "LEDGER_DIR", str(tmp_path))
+
+    @pytest.fixture
+    def server(self):
+        """Create fake server."""
+        return FakeServer()
+
+    @pytest.fixture
+    def tool(self, server):
+        """Create tool instance."""
+        client = Mock()
+        client.post = AsyncMock(side_effect=server.post)
+        return ChatImportTool(client=client, config=Mock())
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        """Create an archive of three exported chats."""
+        path = tmp_path / "chats.jsonl.gz"
+        write_archive(path, [
+            {"id": "a", "chat": {"title": "A"}, "folder_id": "f-src", "meta": {"tags": ["work"]}},
+            {"id": "b", "chat": {"title": "B"}, "meta": {"tags": ["old", "misc"]}},
+            {"id": "c", "chat": {"title": "C"}, "pinned": True},
+        ])
+        return path
+
+    def test_get_definition(self, tool):
+        """Test tool definition structure."""
+        definition = tool.get_definition()
+
+        assert definition["name"] == "chat_import"
+        assert definition["inputSchema"]["required"] == ["input_path"]
+
+    @pytest.mark.asyncio
+    async def test_imports_and_applies_mappings(self, tool, server, archive, tmp_path):
+        """Test chats are imported in batches with folders and tags mapped."""
+        result = await tool.execute({
+            "input_path": str(archive),
+            "ledger_path": str(tmp_path / "ledger.jsonl"),
+            "folder_map": {"f-src": "f-dst"},
+            "tag_map": {"old": "new", "misc": None},
+            "chats_per_request": 3,
+        })
+
+        assert result["imported"] == 3
+        assert result["failed"] == 0
+        assert [form["chat"]["title"] for form in server.imported] == ["A", "B", "C"]
+        assert "tags" not in server.imported[0]["meta"]
+        assert server.imported[2]["pinned"] is True
+        by_title = {form["chat"]["title"]: f"new-{i}" for i, form in enumerate(server.imported)}
+        assert server.folders == {by_title["A"]: "f-dst"}
+        assert server.tags == {by_title["A"]: ["work"], by_title["B"]: ["new"]}
+
+    @pytest.mark.asyncio
+    async def test_rerun_skips_imported_chats(self, tool, server, archive, tmp_path):
+        """Test the ledger makes a second run a no-op."""
+        args = {"input_path": str(archive), "ledger_path": str(tmp_path / "ledger.jsonl")}
+
+        await tool.execute(args)
+        second = await tool.execute(args)
+
+        assert len(server.imported) == 3
+        assert second["skipped"] == 3
+        assert second["imported"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_tagging_resumes_without_reimport(self, archive, tmp_path):
+        """Test chats whose tags failed are tagged, not re-imported, on rerun."""
+        server = FakeServer(fail_tags=True)
+        client = Mock()
+        client.post = AsyncMock(side_effect=server.post)
+        tool = ChatImportTool(client=client, config=Mock())
+        ledger_path = tmp_path / "ledger.jsonl"
+        args = {"input_path": str(archive), "ledger_path": str(ledger_path), "max_retries": 0}
+
+        first = await tool.execute(args)
+        server.fail_tags = False
+        second = await tool.execute(args)
+
+        assert first["failed"] == 2
+        assert {f["stage"] for f in first["failures"]} == {"organize"}
+        assert len(server.imported) == 3
+        assert second["imported"] == 0 and second["organized"] == 2
+        ledger = ChatImportLedger(ledger_path)
+        ledger.load()
+        assert all(entry["organized"] for entry in ledger.entries.values())
+
+    @pytest.mark.asyncio
+    async def test_import_not_retried_after_it_may_have_committed(self, tool, server, archive, tmp_path):
+        """Test a timed-out import request is failed rather than sent again."""
+        tool.client.post.side_effect = HTTPError("Request timeout", status_code=408)
+
+        result = await tool.execute({"input_path": str(archive), "ledger_path": str(tmp_path / "l.jsonl")})
+
+        assert result["failed"] == 3
+        assert tool.client.post.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_import_is_retried(self, tool, server, archive, tmp_path, monkeypatch):
+        """Test a rejected-before-commit import request is retried."""
+        monkeypatch.setattr("src.tools.chats.chat_import_tool.IMPORT_RETRY_DELAY", 0)
+        calls = []
+
+        async def post(endpoint, json_data=None):
+            calls.append(endpoint)
+            if len(calls) == 1:
+                raise RateLimitError("slow down")
+            return await server.post(endpoint, json_data)
+
+        tool.client.post.side_effect = post
+
+        with start_trace("tools/call chat_import") as trace:
+            result = await tool.execute({"input_path": str(archive), "ledger_path": str(tmp_path / "l.jsonl")})
+
+        assert result["imported"] == 3
+        assert calls.count("/api/v1/chats/import") == 2
+        assert trace.stats.retries == 1
+        assert len(server.imported) == 3
+
+    @pytest.mark.asyncio
+    async def test_count_mismatch_reports_created_chats(self, tool, archive, tmp_path):
+        """Test a short import response fails the batch once and reports what was created."""
+        tool.client.post.side_effect = None
+        tool.client.post.return_value = [{"id": "new-0"}]
+
+        result = await tool.execute({"input_path": str(archive), "ledger_path": str(tmp_path / "l.jsonl")})
+
+        assert tool.client.post.call_count == 1
+        assert result["failed"] == 3
+        assert result["unrecorded_chat_ids"] == ["new-0"]
+        assert "created: new-0" in result["failures"][0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_ledger_outside_cache_dir(self, tool, server, archive, tmp_path):
+        """Test ledger_path cannot point outside the cache directory."""
+        for path in ["../ledger.jsonl", str(tmp_path.parent / "ledger.jsonl"), ".", 5]:
+            with pytest.raises(ValidationError, match="ledger_path"):
+                await tool.execute({"input_path": str(archive), "ledger_path": path})
+
+        assert server.imported == []
+
+    @pytest.mark.asyncio
+    async def test_missing_archive(self, tool, tmp_path):
+        """Test a missing archive is rejected."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"input_path": str(tmp_path / "missing.jsonl")})
+
+    @pytest.mark.asyncio
+    async def test_invalid_mapping(self, tool, archive):
+        """Test malformed mappings are rejected."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"input_path": str(archive), "tag_map": {"a": 1}})
@@ -0,0 +1,74 @@
+"""Tests for ChatIndexSearchTool."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.exceptions import ValidationError
+from src.tools.chats.chat_index_search_tool import ChatIndexSearchTool
+
+
+class TestChatIndexSearchTool:
+    """Tests for chat_index_search."""
+
+    @pytest.fixture
+    def index(self):
+        """Create a mock chat index."""
+        index = Mock()
+        index.search = AsyncMock(return_value={"results": [], "took_ms": 0.1})
+        return index
+
+    def make_tool(self, index):
+        services = Mock()
+        services.get_service.side_effect = {"chat_index": index}.get
+        return ChatIndexSearchTool(client=Mock(), config=Mock(), services=services)
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        definition = ChatIndexSearchTool(client=Mock(), config=Mock()).get_definition()
+
+        assert definition["name"] == "chat_index_search"
+        assert definition["inputSchema"]["required"] == ["query"]
+
+    @pytest.mark.asyncio
+    async def test_execute_parses_filters(self, index):
+        """Test date filters accept ISO dates and Unix seconds."""
+        tool = self.make_tool(index)
+
+        await tool.execute({
+            "query": "deploy",
+            "tags": ["work"],
+            "after": "2024-01-01",
+            "before": 1735689600,
+            "match": "any",
+            "limit": 5,
+        })
+
+        index.search.assert_awaited_once_with(
+            "deploy", tags=["work"], after=1704067200, before=1735689600,
+            match_all=False, limit=5, snippets_per_chat=3
+        )
+
+    @pytest.mark.asyncio
+    async def test_execute_invalid_arguments(self, index):
+        """Test invalid arguments are rejected."""
+        tool = self.make_tool(index)
+
+        with pytest.raises(ValidationError, match="query"):
+            await tool.execute({"query": " "})
+        with pytest.raises(ValidationError, match="after"):
+            await tool.execute({"query": "x", "after": "last tuesday"})
+        with pytest.raises(ValidationError, match="tags"):
+            await tool.execute({"query": "x", "tags": "work"})
+
+    @pytest.mark.asyncio
+    async def test_execute_query_without_words(self, index):
+        """Test index query errors become validation errors."""
+        index.search.side_effect = ValueError("query must contain at least one word")
+
+        with pytest.raises(ValidationError, match="at least one word"):
+            await self.make_tool(index).execute({"query": "*"})
+
+    @pytest.mark.asyncio
+    async def test_execute_disabled(self):
+        """Test a helpful error when the index is not configured."""
+        with pytest.raises(ValidationError, match="CHAT_INDEX_PATH"):
+            await self.make_tool(None).execute({"query": "x"})
@@ -0,0 +1,63 @@
+"""Tests for ChatIndexSyncTool."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.exceptions import ValidationError
+from src.tools.chats.chat_index_sync_tool import ChatIndexSyncTool
+
+
+class TestChatIndexSyncTool:
+    """Tests for chat_index_sync."""
+
+    @pytest.fixture
+    def index(self):
+        """Create a mock chat index."""
+        index = Mock()
+        index.sync = AsyncMock(return_value={"updated": 2})
+        index.ingest_archive = AsyncMock(return_value={"indexed": 5})
+        index.get_stats.return_value = {"chats": 5}
+        return index
+
+    def make_tool(self, index):
+        services = Mock()
+        services.get_service.side_effect = {"chat_index": index}.get
+        return ChatIndexSyncTool(client=Mock(), config=Mock(), services=services)
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        tool = ChatIndexSyncTool(client=Mock(), config=Mock())
+
+        assert tool.get_definition()["name"] == "chat_index_sync"
+
+    @pytest.mark.asyncio
+    async def test_execute_syncs_upstream(self, index):
+        """Test syncing with Open WebUI by default."""
+        result = await self.make_tool(index).execute({"full": True, "concurrency": 4})
+
+        assert result == {"sync": {"updated": 2}, "index": {"chats": 5}}
+        assert index.sync.await_args.kwargs["full"] is True
+        assert index.sync.await_args.kwargs["concurrency"] == 4
+
+    @pytest.mark.asyncio
+    async def test_execute_ingests_archive(self, index, tmp_path):
+        """Test indexing an export archive with inferred compression."""
+        archive = tmp_path / "chats.jsonl.gz"
+        archive.write_bytes(b"")
+
+        result = await self.make_tool(index).execute({"archive_path": str(archive)})
+
+        assert result["sync"] == {"indexed": 5}
+        assert index.ingest_archive.await_args.args == (archive, "gzip")
+        index.sync.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_execute_missing_archive(self, index, tmp_path):
+        """Test a missing archive is rejected."""
+        with pytest.raises(ValidationError, match="Archive not found"):
+            await self.make_tool(index).execute({"archive_path": str(tmp_path / "none.jsonl")})
+
+    @pytest.mark.asyncio
+    async def test_execute_disabled(self):
+        """Test a helpful error when the index is not configured."""
+        with pytest.raises(ValidationError, match="CHAT_INDEX_PATH"):
+            await self.make_tool(None).execute({})
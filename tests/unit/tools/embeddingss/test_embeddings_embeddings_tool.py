@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import AsyncMock, Mock
 from src.tools.embeddingss.embeddings_embeddings_tool import EmbeddingsEmbeddingsTool
 from src.exceptions import ValidationError, NotFoundError, HTTPError
+from src.services.embedding_cache import EmbeddingCache, make_key
 
 
 class TestEmbeddingsEmbeddingsTool:
@@ -60,4 +61,43 @@ class TestEmbeddingsEmbeddingsTool:
         mock_client.post.side_effect = HTTPError("Server error", status_code=500)
 
         with pytest.raises(HTTPError):
-            await tool.execute({})
\ No newline at end of file
+            await tool.execute({})
+
+    @pytest.mark.asyncio
+    async def test_execute_forwards_model_and_input(self, tool, mock_client):
+        """Test request body carries model and input."""
+        await tool.execute({"model": "text-embedding-3-small", "input": ["a", "b"]})
+
+        json_data = mock_client.post.call_args.kwargs["json_data"]
+        assert json_data == {"model": "text-embedding-3-small", "input": ["a", "b"]}
+
+    @pytest.mark.asyncio
+    async def test_execute_single_text_uses_batcher(self, mock_client, mock_config):
+        """Test single-text requests go through the embedding batcher."""
+        batcher = Mock()
+        batcher.embed = AsyncMock(return_value=[0.1, 0.2])
+        services = Mock()
+        services.get_service.side_effect = {"embedding_batcher": batcher}.get
+        tool = EmbeddingsEmbeddingsTool(client=mock_client, config=mock_config, services=services)
+
+        result = await tool.execute({"model": "m", "input": "hello"})
+
+        assert result["data"][0]["embedding"] == [0.1, 0.2]
+        mock_client.post.assert_not_called()
+        assert batcher.embed.call_args.kwargs["style"] == "openai"
+
+    @pytest.mark.asyncio
+    async def test_execute_embeds_only_cache_misses(self, mock_client, mock_config, tmp_path):
+        """Test cached texts are served locally and only misses go upstream."""
+        cache = EmbeddingCache(tmp_path)
+        cache.put(make_key("/api/embeddings", "m", "cached"), [1.0, 2.0])
+        mock_client.post.return_value = {"data": [{"index": 0, "embedding": [3.0, 4.0]}]}
+        services = Mock()
+        services.get_service.side_effect = {"embedding_cache": cache}.get
+        tool = EmbeddingsEmbeddingsTool(client=mock_client, config=mock_config, services=services)
+
+        result = await tool.execute({"model": "m", "input": ["cached", "fresh"]})
+
+        assert [item["embedding"] for item in result["data"]] == [[1.0, 2.0], [3.0, 4.0]]
+        assert mock_client.post.call_args.kwargs["json_data"]["input"] == ["fresh"]
+        assert cache.get(make_key("/api/embeddings", "m", "fresh")) == [3.0, 4.0]
@@ -0,0 +1,146 @@
+"""Tests for FolderTreeTool."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.exceptions import AuthError, HTTPError, ValidationError
+from src.services.folder_tree_cache import FolderTreeCache
+from src.tools.folders.folder_tree_tool import FolderTreeTool, link_folders
+
+FOLDERS = [
+    {"id": "f1", "name": "Work", "parent_id": None},
+    {"id": "f2", "name": "Clients", "parent_id": "f1"},
+    {"id": "f3", "name": "Acme", "parent_id": "f2"},
+    {"id": "f4", "name": "Personal", "parent_id": None},
+]
+CHATS = {"f1": ["a"], "f2": ["b", "c"], "f3": ["d"], "f4": []}
+
+
+def make_client():
+    """Create a client serving FOLDERS and CHATS."""
+    client = Mock()
+
+    async def get(endpoint, params=None):
+        if endpoint == "/api/v1/folders/":
+            return FOLDERS
+        folder_id = endpoint.rsplit("/", 1)[-1]
+        return [{"id": c, "title": c.upper()} for c in CHATS[folder_id]]
+
+    client.get = AsyncMock(side_effect=get)
+    return client
+
+
+def make_tool(client, cache=None):
+    services = Mock()
+    services.get_service.side_effect = {"folder_tree_cache": cache}.get
+    return FolderTreeTool(client=client, config=Mock(), services=services)
+
+
+class TestLinkFolders:
+    """Tests for hierarchy building."""
+
+    def test_orphans_and_cycles_become_roots(self):
+        """Test folders with missing parents or parent cycles are roots."""
+        roots, nodes = link_folders([
+            {"id": "a", "parent_id": "missing"},
+            {"id": "b", "parent_id": "c"},
+            {"id": "c", "parent_id": "b"},
+        ])
+
+        assert sorted(n["id"] for n in roots) == ["a", "b"]
+        assert [n["id"] for n in nodes["b"]["children"]] == ["c"]
+
+
+class TestFolderTreeTool:
+    """Tests for folder_tree."""
+
+    def test_get_definition(self):
+        """Test tool definition structure."""
+        assert FolderTreeTool(client=Mock(), config=Mock()).get_definition()["name"] == "folder_tree"
+
+    @pytest.mark.asyncio
+    async def test_execute_builds_tree_with_counts(self):
+        """Test hierarchy and per-subtree counts."""
+        result = await make_tool(make_client()).execute({})
+
+        work, personal = result["tree"]
+        assert work["subtree_folder_count"] == 2
+        assert work["subtree_chat_count"] == 4
+        assert work["children"][0]["chat_count"] == 2
+        assert personal["subtree_chat_count"] == 0
+        assert result["folders"] == 4
+        assert result["chats"] == 4
+        assert "chats" not in work
+
+    @pytest.mark.asyncio
+    async def test_execute_subtree_list_mode(self):
+        """Test a subtree only fetches its own folders."""
+        client = make_client()
+
+        result = await make_tool(client).execute({"root_id": "f2", "chats": "list"})
+
+        assert [n["id"] for n in result["tree"]] == ["f2"]
+        assert result["tree"][0]["chats"][0] == {"id": "b", "title": "B", "updated_at": None}
+        assert client.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_execute_without_chats(self):
+        """Test chats mode none only lists folders."""
+        client = make_client()
+
+        result = await make_tool(client).execute({"chats": "none"})
+
+        assert result["chats"] is None
+        assert "subtree_chat_count" not in result["tree"][0]
+        client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_execute_uses_cache_until_invalidated(self):
+        """Test repeated calls are served from cache and chat writes invalidate one folder."""
+        client = make_client()
+        cache = FolderTreeCache()
+        tool = make_tool(client, cache)
+
+        await tool.execute({})
+        second = await tool.execute({})
+        assert client.get.await_count == 5
+        assert second["cached"] == {"folders": True, "chat_lists": 4}
+
+        cache.on_mutation("DELETE", "/api/v1/chats/d", None, True)
+        third = await tool.execute({})
+
+        assert client.get.await_count == 6
+        assert third["cached"]["chat_lists"] == 3
+
+    @pytest.mark.asyncio
+    async def test_execute_records_folder_errors(self):
+        """Test a failing folder is reported without failing the tree."""
+        client = make_client()
+        client.get.side_effect = lambda endpoint, params=None: (
+            FOLDERS if endpoint == "/api/v1/folders/" else _raise(HTTPError("boom", status_code=500))
+        )
+
+        result = await make_tool(client).execute({"root_id": "f4"})
+
+        assert result["errors"] == 1
+        assert "boom" in result["tree"][0]["chats_error"]
+
+    @pytest.mark.asyncio
+    async def test_execute_auth_error_raised(self):
+        """Test auth errors abort the tree."""
+        client = make_client()
+        client.get.side_effect = lambda endpoint, params=None: (
+            FOLDERS if endpoint == "/api/v1/folders/" else _raise(AuthError("denied"))
+        )
+
+        with pytest.raises(AuthError):
+            await make_tool(client).execute({})
+
+    @pytest.mark.asyncio
+    async def test_execute_unknown_root(self):
+        """Test an unknown root folder is rejected."""
+        with pytest.raises(ValidationError, match="Folder not found"):
+            await make_tool(make_client()).execute({"root_id": "nope"})
+
+
+def _raise(error):
+    raise error
@@ -0,0 +1,98 @@
+"""Tests for KnowledgeIngestTool."""
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.tools.knowledge.knowledge_ingest_tool import KnowledgeIngestTool
+from src.exceptions import ValidationError, ServerError
+
+
+class TestKnowledgeIngestTool:
+    """Tests for knowledge_ingest."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock HTTP client with upload and attach responses."""
+        client = Mock()
+
+        async def upload(endpoint, file_path, params=None):
+            return {"id": f"file-{file_path.strip('/').replace('/', '-')}", "filename": file_path}
+
+        async def post(endpoint, json_data=None):
+            return {"id": "kb-1", "files": json_data}
+
+        client.post_with_file = AsyncMock(side_effect=upload)
+        client.post = AsyncMock(side_effect=post)
+        return client
+
+    @pytest.fixture
+    def mock_config(self):
+        """Create mock config."""
+        return Mock()
+
+    @pytest.fixture
+    def tool(self, mock_client, mock_config):
+        """Create tool instance."""
+        return KnowledgeIngestTool(client=mock_client, config=mock_config)
+
+    def test_get_definition(self, tool):
+        """Test tool definition structure."""
+        definition = tool.get_definition()
+
+        assert definition["name"] == "knowledge_ingest"
+        assert definition["inputSchema"]["required"] == ["id", "file_paths"]
+
+    @pytest.mark.asyncio
+    async def test_execute_success(self, tool, mock_client):
+        """Test all files flow through upload and attach, processed only once."""
+        result = await tool.execute({"id": "kb-1", "file_paths": ["/a", "/b", "/c"], "batch_size": 2})
+
+        assert sorted(item["file_id"] for item in result["attached"]) == ["file-a", "file-b", "file-c"]
+        assert result["failed"] == []
+        assert [stage["stage"] for stage in result["stages"]] == ["upload", "attach"]
+        assert mock_client.post_with_file.call_count == 3
+        assert all(c.kwargs["params"] == {"process": False} for c in mock_client.post_with_file.call_args_list)
+        assert not any("/retrieval/process" in c.args[0] for c in mock_client.post.call_args_list)
+        attach_calls = [c for c in mock_client.post.call_args_list if "/knowledge/kb-1/files/batch/add" in c.args[0]]
+        assert sum(len(c.kwargs["json_data"]) for c in attach_calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_execute_retries_only_failed_processing(self, tool, mock_client):
+        """Test processing errors reported by attach retry only the failed file."""
+        attach_calls = []
+
+        async def post(endpoint, json_data=None):
+            ids = [entry["file_id"] for entry in json_data]
+            attach_calls.append(ids)
+            if len(attach_calls) == 1:
+                return {"id": "kb-1", "warnings": {
+                    "message": "Some files failed to process", "errors": ["file-a: embed failed"]
+                }}
+            return {"id": "kb-1"}
+
+        mock_client.post.side_effect = post
+
+        result = await tool.execute({"id": "kb-1", "file_paths": ["/a", "/b"], "batch_size": 2, "max_retries": 1})
+
+        assert attach_calls == [["file-a", "file-b"], ["file-a"]]
+        assert len(result["attached"]) == 2
+        assert result["stages"][1]["retried"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_reports_upload_failures(self, tool, mock_client):
+        """Test failed uploads are reported with their path."""
+        mock_client.post_with_file.side_effect = ServerError("Server error")
+
+        result = await tool.execute({"id": "kb-1", "file_paths": ["/a"], "max_retries": 0})
+
+        assert result["attached"] == []
+        assert result["failed"][0]["stage"] == "upload"
+        assert result["failed"][0]["path"] == "/a"
+
+    @pytest.mark.asyncio
+    async def test_execute_validates_arguments(self, tool):
+        """Test invalid arguments raise ValidationError."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"id": "kb-1", "file_paths": []})
+
+        with pytest.raises(ValidationError):
+            await tool.execute({"id": "kb-1", "file_paths": ["/a"], "batch_size": 0})
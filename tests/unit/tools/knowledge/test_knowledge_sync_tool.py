@@ -0,0 +1,146 @@
+"""Tests for KnowledgeSyncTool."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.tools.knowledge.knowledge_sync_tool import KnowledgeSyncTool
+from src.exceptions import ValidationError, NotFoundError
+
+
+class TestKnowledgeSyncTool:
+    """Tests for knowledge_sync."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock HTTP client."""
+        client = Mock()
+        uploads = iter(range(1, 1000))
+        client.post_with_file = AsyncMock(side_effect=lambda *a, **kw: {"id": f"file-{next(uploads)}"})
+        client.post = AsyncMock(return_value={})
+        return client
+
+    @pytest.fixture
+    def tool(self, mock_client):
+        """Create tool instance."""
+        return KnowledgeSyncTool(client=mock_client, config=Mock())
+
+    @pytest.fixture
+    def docs(self, tmp_path):
+        """Create a docs directory."""
+        (tmp_path / "a.md").write_text("alpha")
+        (tmp_path / "b.md").write_text("beta")
+        return tmp_path
+
+    def _posted(self, mock_client, suffix):
+        """Return POST calls whose endpoint ends with suffix."""
+        return [c for c in mock_client.post.call_args_list if c.args[0].endswith(suffix)]
+
+    def test_get_definition(self, tool):
+        """Test tool definition structure."""
+        definition = tool.get_definition()
+
+        assert definition["name"] == "knowledge_sync"
+        assert definition["inputSchema"]["required"] == ["id", "directory"]
+
+    @pytest.mark.asyncio
+    async def test_initial_sync_uploads_everything(self, tool, mock_client, docs):
+        """Test first sync uploads and attaches all files and writes the manifest."""
+        result = await tool.execute({"id": "kb-1", "directory": str(docs)})
+
+        assert result["applied"] == {"added": 2, "modified": 0, "deleted": 0}
+        assert mock_client.post_with_file.call_count == 2
+        assert all(c.kwargs["params"] == {"process": False} for c in mock_client.post_with_file.call_args_list)
+        assert len(self._posted(mock_client, "/knowledge/kb-1/file/add")) == 2
+        manifest = json.loads((docs / ".openwebui-sync.json").read_text())
+        assert set(manifest["files"]) == {"a.md", "b.md"}
+
+    @pytest.mark.asyncio
+    async def test_resync_only_sends_changes(self, tool, mock_client, docs):
+        """Test second sync touches only modified and deleted files."""
+        await tool.execute({"id": "kb-1", "directory": str(docs)})
+        mock_client.post_with_file.reset_mock()
+        mock_client.post.reset_mock()
+
+        (docs / "a.md").write_text("alpha v2")
+        (docs / "b.md").unlink()
+
+        result = await tool.execute({"id": "kb-1", "directory": str(docs)})
+
+        assert result["applied"] == {"added": 0, "modified": 1, "deleted": 1}
+        # The modified file is replaced, so only file/add processes it
+        assert mock_client.post_with_file.call_count == 1
+        assert self._posted(mock_client, "/data/content/update") == []
+        assert self._posted(mock_client, "/knowledge/kb-1/file/update") == []
+        assert len(self._posted(mock_client, "/knowledge/kb-1/file/add")) == 1
+        assert len(self._posted(mock_client, "/knowledge/kb-1/file/remove")) == 2
+
+    @pytest.mark.asyncio
+    async def test_modified_retry_does_not_remove_twice(self, tool, mock_client, docs):
+        """Test a retried replacement reuses the removal and the upload."""
+        await tool.execute({"id": "kb-1", "directory": str(docs)})
+        (docs / "a.md").write_text("alpha v2")
+        mock_client.post_with_file.reset_mock()
+        mock_client.post.reset_mock()
+        attempts = []
+
+        async def post(endpoint, json_data=None):
+            if endpoint.endswith("/file/add"):
+                attempts.append(json_data["file_id"])
+                if len(attempts) == 1:
+                    raise NotFoundError("Knowledge busy")
+            return {}
+
+        mock_client.post.side_effect = post
+
+        result = await tool.execute({"id": "kb-1", "directory": str(docs), "max_retries": 1})
+
+        assert result["applied"]["modified"] == 1
+        assert mock_client.post_with_file.call_count == 1
+        assert len(self._posted(mock_client, "/knowledge/kb-1/file/remove")) == 1
+        assert attempts[0] == attempts[1]
+
+    @pytest.mark.asyncio
+    async def test_no_changes_makes_no_requests(self, tool, mock_client, docs):
+        """Test an unchanged tree issues no upstream calls."""
+        await tool.execute({"id": "kb-1", "directory": str(docs)})
+        mock_client.post.reset_mock()
+
+        result = await tool.execute({"id": "kb-1", "directory": str(docs)})
+
+        assert result["changes"]["unchanged"] == 2
+        mock_client.post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dry_run(self, tool, mock_client, docs):
+        """Test dry run reports the plan without uploading."""
+        result = await tool.execute({"id": "kb-1", "directory": str(docs), "dry_run": True})
+
+        assert result["changes"]["added"] == ["a.md", "b.md"]
+        mock_client.post_with_file.assert_not_called()
+        assert not (docs / ".openwebui-sync.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_remove_tolerates_not_found(self, tool, mock_client, docs):
+        """Test removing a file already gone upstream still succeeds."""
+        await tool.execute({"id": "kb-1", "directory": str(docs)})
+        (docs / "b.md").unlink()
+        mock_client.post.side_effect = NotFoundError("Not found")
+
+        result = await tool.execute({"id": "kb-1", "directory": str(docs)})
+
+        assert result["applied"]["deleted"] == 1
+        assert result["failed"] == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_manifest_of_other_knowledge(self, tool, docs):
+        """Test manifest is bound to one knowledge base."""
+        await tool.execute({"id": "kb-1", "directory": str(docs)})
+
+        with pytest.raises(ValidationError, match="belongs to knowledge base kb-1"):
+            await tool.execute({"id": "kb-2", "directory": str(docs)})
+
+    @pytest.mark.asyncio
+    async def test_missing_directory(self, tool, tmp_path):
+        """Test missing directory raises ValidationError."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"id": "kb-1", "directory": str(tmp_path / "nope")})
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import AsyncMock, Mock
 from src.tools.ollama.embed_ollama_embed_tool import EmbedOllamaEmbedTool
 from src.exceptions import ValidationError, NotFoundError, HTTPError
+from src.services.embedding_cache import EmbeddingCache, make_key
 
 
 class TestEmbedOllamaEmbedTool:
@@ -60,4 +61,48 @@ class TestEmbedOllamaEmbedTool:
         mock_client.post.side_effect = HTTPError("Server error", status_code=500)
 
         with pytest.raises(HTTPError):
-            await tool.execute({})
\ No newline at end of file
+            await tool.execute({})
+
+    @pytest.mark.asyncio
+    async def test_execute_embeds_only_cache_misses(self, mock_client, mock_config, tmp_path):
+        """Test cached texts are served locally and only misses go upstream."""
+        cache = EmbeddingCache(tmp_path)
+        cache.put(make_key("/ollama/api/embed", "m", "cached"), [1.0])
+        mock_client.post.return_value = {"embeddings": [[2.0], [3.0]]}
+        services = Mock()
+        services.get_service.side_effect = {"embedding_cache": cache}.get
+        tool = EmbedOllamaEmbedTool(client=mock_client, config=mock_config, services=services)
+
+        result = await tool.execute({"model": "m", "input": ["a", "cached", "b"]})
+
+        assert result["embeddings"] == [[2.0], [1.0], [3.0]]
+        assert mock_client.post.call_args.kwargs["json_data"]["input"] == ["a", "b"]
+
+        mock_client.post.reset_mock()
+        result = await tool.execute({"model": "m", "input": "  a "})
+
+        assert result["embeddings"] == [[2.0]]
+        mock_client.post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_caches_per_request_options(self, mock_client, mock_config, tmp_path):
+        """Test truncate, options and url_idx are part of the cache key."""
+        cache = EmbeddingCache(tmp_path)
+        mock_client.post.return_value = {"embeddings": [[2.0]]}
+        services = Mock()
+        services.get_service.side_effect = {"embedding_cache": cache}.get
+        tool = EmbedOllamaEmbedTool(client=mock_client, config=mock_config, services=services)
+
+        variants = [
+            {},
+            {"options": {"num_ctx": 512}},
+            {"truncate": False},
+            {"url_idx": 1},
+        ]
+        for extra in variants:
+            await tool.execute({"model": "m", "input": ["a"], **extra})
+        for extra in variants:
+            await tool.execute({"model": "m", "input": ["a"], **extra})
+
+        assert mock_client.post.call_count == len(variants)
+        assert cache.get_stats()["entries"] == len(variants)
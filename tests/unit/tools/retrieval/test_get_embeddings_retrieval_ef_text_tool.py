@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import AsyncMock, Mock
 from src.tools.retrieval.get_embeddings_retrieval_ef_text_tool import GetEmbeddingsRetrievalEfTextTool
 from src.exceptions import ValidationError, NotFoundError, HTTPError
+from src.services.embedding_cache import EmbeddingCache
 
 
 class TestGetEmbeddingsRetrievalEfTextTool:
@@ -60,4 +61,18 @@ class TestGetEmbeddingsRetrievalEfTextTool:
         mock_client.get.side_effect = HTTPError("Server error", status_code=500)
 
         with pytest.raises(HTTPError):
-            await tool.execute({})
\ No newline at end of file
+            await tool.execute({})
+
+    @pytest.mark.asyncio
+    async def test_execute_uses_embedding_cache(self, mock_client, mock_config, tmp_path):
+        """Test repeated texts are served from the embedding cache."""
+        mock_client.get.return_value = {"result": [0.5, 0.25]}
+        services = Mock()
+        services.get_service.side_effect = {"embedding_cache": EmbeddingCache(tmp_path)}.get
+        tool = GetEmbeddingsRetrievalEfTextTool(client=mock_client, config=mock_config, services=services)
+
+        await tool.execute({"text": "hello"})
+        result = await tool.execute({"text": "hello"})
+
+        assert result == {"result": [0.5, 0.25]}
+        mock_client.get.assert_called_once()
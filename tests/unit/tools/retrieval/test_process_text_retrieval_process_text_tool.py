@@ -1,9 +1,13 @@
 """Tests for ProcessTextRetrievalProcessTextTool."""
 
 import pytest
+import httpx
 from unittest.mock import AsyncMock, Mock
+from src.config import Config
+from src.services.client import OpenWebUIClient
 from src.tools.retrieval.process_text_retrieval_process_text_tool import ProcessTextRetrievalProcessTextTool
 from src.exceptions import ValidationError, NotFoundError, HTTPError
+from tests.mock_openwebui import Dataset, create_app
 
 
 class TestProcessTextRetrievalProcessTextTool:
@@ -60,4 +64,69 @@ class TestProcessTextRetrievalProcessTextTool:
         mock_client.post.side_effect = HTTPError("Server error", status_code=500)
 
         with pytest.raises(HTTPError):
-            await tool.execute({})
\ No newline at end of file
+            await tool.execute({})
+
+    @pytest.mark.asyncio
+    async def test_execute_chunked_submits_segments(self, tool, mock_client):
+        """Test chunked mode submits boundary-aligned segments into per-segment collections."""
+        content = ("A" * 900 + ".\n\n") * 3
+
+        result = await tool.execute({
+            "name": "transcript", "content": content, "chunked": True, "segment_size": 1000
+        })
+
+        bodies = [call.kwargs["json_data"] for call in mock_client.post.call_args_list]
+        assert len(bodies) == 3
+        assert sorted(body["collection_name"] for body in bodies) == result["collection_names"]
+        assert result["collection_names"][0] == f"{result['collection_name']}-part-1"
+        assert "".join(body["content"] for body in sorted(bodies, key=lambda b: b["name"])) == content
+        assert result["segments"][1]["name"] == "transcript (part 2/3)"
+        assert result["segments"][1]["offset"] == 903
+        assert result["summary"]["succeeded"] == 3
+
+    @pytest.mark.asyncio
+    async def test_execute_chunked_stores_every_segment(self, mock_config):
+        """Test every segment is stored upstream, not only the first one."""
+        dataset = Dataset()
+        client = OpenWebUIClient(Config(
+            OPENWEBUI_BASE_URL="http://mock", OPENWEBUI_API_KEY="sk-test-key-1234567890abcdef"
+        ))
+        client._client = httpx.AsyncClient(
+            base_url="http://mock", headers=client._build_headers(),
+            transport=httpx.ASGITransport(app=create_app(dataset))
+        )
+        tool = ProcessTextRetrievalProcessTextTool(client=client, config=mock_config)
+        content = ("B" * 900 + ".\n\n") * 4
+
+        result = await tool.execute({
+            "name": "doc", "content": content, "chunked": True, "segment_size": 1000, "collection_name": "c"
+        })
+
+        stored = [dataset.collections[name] for name in result["collection_names"]]
+        assert len(stored) == 4
+        assert "".join(docs[0]["content"] for docs in stored) == content
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_execute_chunked_retries_failed_segment(self, tool, mock_client):
+        """Test a failing segment is retried on its own."""
+        calls = []
+
+        async def post(endpoint, json_data, compress=False):
+            calls.append(json_data["name"])
+            if json_data["name"].endswith("(part 1/2)") and calls.count(json_data["name"]) == 1:
+                raise HTTPError("Timeout", status_code=408)
+            return {}
+
+        mock_client.post.side_effect = post
+
+        result = await tool.execute({
+            "name": "doc", "content": "x" * 1500, "chunked": True, "segment_size": 1000,
+            "collection_name": "c"
+        })
+
+        assert calls.count("doc (part 1/2)") == 2
+        assert calls.count("doc (part 2/2)") == 1
+        assert result["segments"][0]["attempts"] == 2
+        assert result["summary"]["failed"] == 0
+        assert result["summary"]["retried"] == 1
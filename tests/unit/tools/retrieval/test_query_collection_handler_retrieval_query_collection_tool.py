@@ -60,4 +60,45 @@ class TestQueryCollectionHandlerRetrievalQueryCollectionTool:
         mock_client.post.side_effect = HTTPError("Server error", status_code=500)
 
         with pytest.raises(HTTPError):
-            await tool.execute({})
\ No newline at end of file
+            await tool.execute({})
+    @pytest.mark.asyncio
+    async def test_execute_fan_out_merges_top_k(self, tool, mock_client):
+        """Test fan-out queries each collection and merges by score."""
+        responses = {
+            "a": {"ids": [["a1", "a2"]], "documents": [["x", "y"]], "metadatas": [[{}, {}]], "distances": [[0.9, 0.4]]},
+            "b": {"ids": [["b1", "b2"]], "documents": [["x", "z"]], "metadatas": [[{}, {}]], "distances": [[0.5, 0.8]]},
+        }
+        mock_client.post.side_effect = lambda endpoint, json_data: responses[json_data["collection_name"]]
+
+        result = await tool.execute({"collection_names": ["a", "b"], "query": "q", "k": 2, "fan_out": True})
+
+        assert result["ids"] == [["a1", "b2"]]
+        assert result["collection_names"] == [["a", "b"]]
+        assert result["duplicates_removed"] == 1
+        assert set(result["collections"]) == {"a", "b"}
+        assert "latency_ms" in result["collections"]["a"]
+        endpoints = {call.args[0] for call in mock_client.post.call_args_list}
+        assert endpoints == {"/api/v1/retrieval/query/doc"}
+
+    @pytest.mark.asyncio
+    async def test_execute_fan_out_reports_partial_failures(self, tool, mock_client):
+        """Test one failing collection does not fail the whole query."""
+        async def post(endpoint, json_data):
+            if json_data["collection_name"] == "bad":
+                raise NotFoundError("Collection not found")
+            return {"ids": [["g1"]], "documents": [["doc"]], "metadatas": [[{}]], "distances": [[0.7]]}
+
+        mock_client.post.side_effect = post
+
+        result = await tool.execute({"collection_names": ["good", "bad"], "query": "q", "fan_out": True})
+
+        assert result["ids"] == [["g1"]]
+        assert "Collection not found" in result["collections"]["bad"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_execute_fan_out_all_failed_raises(self, tool, mock_client):
+        """Test the upstream error surfaces when every collection fails."""
+        mock_client.post.side_effect = HTTPError("Server error", status_code=500)
+
+        with pytest.raises(HTTPError):
+            await tool.execute({"collection_names": ["a"], "query": "q", "fan_out": True})
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import AsyncMock, Mock
 from src.tools.retrieval.query_doc_handler_retrieval_query_doc_tool import QueryDocHandlerRetrievalQueryDocTool
 from src.exceptions import ValidationError, NotFoundError, HTTPError
+from src.services.query_cache import QueryCache
 
 
 class TestQueryDocHandlerRetrievalQueryDocTool:
@@ -60,4 +61,25 @@ class TestQueryDocHandlerRetrievalQueryDocTool:
         mock_client.post.side_effect = HTTPError("Server error", status_code=500)
 
         with pytest.raises(HTTPError):
-            await tool.execute({})
\ No newline at end of file
+            await tool.execute({})
+
+    @pytest.mark.asyncio
+    async def test_execute_uses_query_cache(self, mock_client, mock_config):
+        """Test repeated queries are served from cache until the collection changes."""
+        cache = QueryCache()
+        mock_client.post.return_value = {"ids": [["1"]]}
+        services = Mock()
+        services.get_service.side_effect = {"query_cache": cache}.get
+        tool = QueryDocHandlerRetrievalQueryDocTool(client=mock_client, config=mock_config, services=services)
+        arguments = {"collection_name": "docs", "query": "q", "k": 3}
+
+        await tool.execute(arguments)
+        result = await tool.execute(arguments)
+
+        assert result == {"ids": [["1"]]}
+        assert mock_client.post.call_count == 1
+
+        cache.on_mutation("POST", "/api/v1/retrieval/process/text", {"collection_name": "docs"}, {})
+        await tool.execute(arguments)
+
+        assert mock_client.post.call_count == 2
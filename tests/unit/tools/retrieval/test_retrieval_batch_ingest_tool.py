@@ -0,0 +1,242 @@
+"""Tests for RetrievalBatchIngestTool."""
+
+import asyncio
+from pathlib import Path
+import httpx
+import pytest
+from unittest.mock import AsyncMock, Mock
+from mcp.server.lowlevel.server import request_ctx
+from src.config import Config
+from src.services.client import OpenWebUIClient
+from src.tools.retrieval import retrieval_batch_ingest_tool
+from src.tools.retrieval.retrieval_batch_ingest_tool import RetrievalBatchIngestTool
+from src.utils.ingest_ledger import IngestLedger
+from src.exceptions import ValidationError, HTTPError
+from tests.mock_openwebui import Dataset, create_app
+
+
+class TestRetrievalBatchIngestTool:
+    """Tests for retrieval_batch_ingest."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock HTTP client."""
+        client = Mock()
+        client.post = AsyncMock(side_effect=lambda endpoint, json_data: {
+            "status": True, "file": {"data": {"content": str(json_data)}}
+        })
+        return client
+
+    @pytest.fixture
+    def tool(self, mock_client):
+        """Create tool instance."""
+        return RetrievalBatchIngestTool(client=mock_client, config=Mock())
+
+    @pytest.fixture
+    def ledger_path(self, tmp_path, monkeypatch):
+        """Ledger location inside a temporary cache directory."""
+        monkeypatch.setattr(retrieval_batch_ingest_tool, "LEDGER_DIR", str(tmp_path))
+        return str(tmp_path / "ledger.json")
+
+    def test_get_definition(self, tool):
+        """Test tool definition structure."""
+        definition = tool.get_definition()
+
+        assert definition["name"] == "retrieval_batch_ingest"
+        assert definition["inputSchema"]["required"] == ["items", "collection_name"]
+
+    @pytest.mark.asyncio
+    async def test_execute_ingests_and_skips_known(self, tool, mock_client, ledger_path):
+        """Test sources are ingested once and skipped on the next run."""
+        arguments = {
+            "items": ["https://a.example/1", "https://b.example/2", "https://a.example/1"],
+            "collection_name": "docs",
+            "ledger_path": ledger_path,
+        }
+
+        first = await tool.execute(arguments)
+        second = await tool.execute(arguments)
+
+        assert sorted(first["ingested"]) == ["https://a.example/1", "https://b.example/2"]
+        assert first["summary"]["hosts"] == 2
+        assert second["ingested"] == []
+        assert sorted(second["skipped"]) == ["https://a.example/1", "https://b.example/2"]
+        assert mock_client.post.call_count == 2
+        calls = mock_client.post.call_args_list
+        collections = sorted(call.kwargs["json_data"]["collection_name"] for call in calls)
+        assert collections == sorted(first["collection_names"]) == sorted(second["collection_names"])
+        assert all(name.startswith("docs-") and len(name) == 17 for name in collections)
+
+    @pytest.mark.asyncio
+    async def test_execute_keeps_every_source_when_process_overwrites(self, mock_config, ledger_path):
+        """Test each source lands in its own collection, since process/web overwrites."""
+        dataset = Dataset()
+        client = OpenWebUIClient(Config(
+            OPENWEBUI_BASE_URL="http://mock", OPENWEBUI_API_KEY="sk-test-key-1234567890abcdef"
+        ))
+        client._client = httpx.AsyncClient(
+            base_url="http://mock", headers=client._build_headers(),
+            transport=httpx.ASGITransport(app=create_app(dataset))
+        )
+        tool = RetrievalBatchIngestTool(client=client, config=mock_config)
+        urls = [f"https://site{i}.example/" for i in range(5)]
+
+        result = await tool.execute({"items": urls, "collection_name": "docs", "ledger_path": ledger_path})
+
+        stored = [dataset.collections[name] for name in result["collection_names"]]
+        assert sorted(docs[0]["metadata"]["source"] for docs in stored) == urls
+        ledger = IngestLedger(Path(ledger_path))
+        ledger.load()
+        assert all(ledger.contains(name, url) for name, url in zip(result["collection_names"], urls))
+        await client.close()
+
+    def test_source_collection_within_name_limit(self):
+        """Test long base names are cut so the per-source name fits 63 characters."""
+        name = RetrievalBatchIngestTool._source_collection("c" * 80, "https://a.example/")
+
+        assert len(name) == 63
+        assert name.startswith("c" * 50 + "-")
+
+    @pytest.mark.asyncio
+    async def test_execute_force_reingests(self, tool, mock_client, ledger_path):
+        """Test force ignores the ledger."""
+        arguments = {"items": ["https://a.example/"], "collection_name": "docs", "ledger_path": ledger_path}
+        await tool.execute(arguments)
+
+        result = await tool.execute({**arguments, "force": True})
+
+        assert result["ingested"] == ["https://a.example/"]
+
+    @pytest.mark.asyncio
+    async def test_execute_web_search_sends_queries(self, tool, mock_client, ledger_path):
+        """Test web search items are sent as single-query requests."""
+        await tool.execute({
+            "items": ["what is rag"], "kind": "web_search",
+            "collection_name": "search", "ledger_path": ledger_path,
+        })
+
+        endpoint = mock_client.post.call_args.args[0]
+        assert endpoint == "/api/v1/retrieval/process/web/search"
+        assert mock_client.post.call_args.kwargs["json_data"]["queries"] == ["what is rag"]
+
+    @pytest.mark.asyncio
+    async def test_execute_respects_per_host_limit(self, tool, mock_client, ledger_path):
+        """Test no host sees more concurrent requests than per_host_limit."""
+        active = {"now": 0, "peak": 0}
+
+        async def post(endpoint, json_data):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return {}
+
+        mock_client.post.side_effect = post
+
+        await tool.execute({
+            "items": [f"https://same.example/{i}" for i in range(6)],
+            "collection_name": "docs", "concurrency": 6, "per_host_limit": 2,
+            "ledger_path": ledger_path,
+        })
+
+        assert active["peak"] == 2
+
+    @pytest.mark.asyncio
+    async def test_execute_busy_host_does_not_starve_others(self, tool, mock_client, ledger_path):
+        """Test other hosts proceed while one host's sources fill its limit."""
+        order = []
+
+        async def post(endpoint, json_data):
+            order.append(json_data["url"])
+            await asyncio.sleep(0.05 if "busy" in json_data["url"] else 0)
+            return {}
+
+        mock_client.post.side_effect = post
+
+        await tool.execute({
+            "items": [f"https://busy.example/{i}" for i in range(8)] + ["https://a.example/", "https://b.example/"],
+            "collection_name": "docs", "concurrency": 4, "per_host_limit": 1,
+            "ledger_path": ledger_path,
+        })
+
+        assert set(order[:3]) == {"https://busy.example/0", "https://a.example/", "https://b.example/"}
+
+    @pytest.mark.asyncio
+    async def test_execute_retry_keeps_host_slot(self, tool, mock_client, ledger_path):
+        """Test a source being retried still counts against its host's limit."""
+        active = {"now": 0, "peak": 0}
+        failed_once = set()
+
+        async def post(endpoint, json_data):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            if json_data["url"] not in failed_once:
+                failed_once.add(json_data["url"])
+                raise HTTPError("Flaky", status_code=503)
+            return {}
+
+        mock_client.post.side_effect = post
+
+        result = await tool.execute({
+            "items": [f"https://same.example/{i}" for i in range(4)],
+            "collection_name": "docs", "concurrency": 4, "per_host_limit": 1,
+            "max_retries": 1, "ledger_path": ledger_path,
+        })
+
+        assert result["summary"]["ingested"] == 4
+        assert active["peak"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_rejects_ledger_outside_cache_dir(self, tool, mock_client, ledger_path, tmp_path):
+        """Test ledger_path cannot point outside the cache directory."""
+        for path in ["../ledger.json", str(tmp_path.parent / "ledger.json"), "."]:
+            with pytest.raises(ValidationError, match="ledger_path"):
+                await tool.execute({"items": ["https://a.example/"], "collection_name": "docs", "ledger_path": path})
+
+        mock_client.post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_reports_failures(self, tool, mock_client, ledger_path):
+        """Test invalid URLs and upstream errors are reported, not recorded."""
+        async def post(endpoint, json_data):
+            raise HTTPError("Fetch failed", status_code=500)
+
+        mock_client.post.side_effect = post
+
+        result = await tool.execute({
+            "items": ["not-a-url", "https://down.example/"], "collection_name": "docs",
+            "max_retries": 0, "ledger_path": ledger_path,
+        })
+
+        assert result["summary"]["failed"] == 2
+        ledger = IngestLedger(Path(ledger_path))
+        ledger.load()
+        collection = RetrievalBatchIngestTool._source_collection("docs", "https://down.example/")
+        assert not ledger.contains(collection, "https://down.example/")
+
+    @pytest.mark.asyncio
+    async def test_execute_sends_progress_notifications(self, tool, ledger_path):
+        """Test MCP progress is reported when the caller sent a progress token."""
+        session = Mock()
+        session.send_progress_notification = AsyncMock()
+        ctx = Mock(meta=Mock(progressToken="tok"), session=session)
+        token = request_ctx.set(ctx)
+        try:
+            await tool.execute({
+                "items": ["https://a.example/", "https://b.example/"],
+                "collection_name": "docs", "ledger_path": ledger_path,
+            })
+        finally:
+            request_ctx.reset(token)
+
+        last = session.send_progress_notification.call_args
+        assert last.args[:2] == ("tok", 2)
+        assert last.kwargs["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_execute_invalid_kind(self, tool, ledger_path):
+        """Test unknown kinds are rejected."""
+        with pytest.raises(ValidationError, match="kind"):
+            await tool.execute({"items": [], "kind": "ftp", "collection_name": "c", "ledger_path": ledger_path})
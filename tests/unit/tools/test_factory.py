@@ -50,6 +50,122 @@ class TestToolFactory:
 
         assert limiter1 is limiter2
 
+    def test_get_service_embedding_batcher(self, factory):
+        """Test embedding batcher uses config and the shared client."""
+        batcher = factory.get_service('embedding_batcher')
+
+        assert batcher.client is factory.client
+        assert batcher.max_batch_size == factory.config.EMBEDDING_BATCH_MAX_SIZE
+        assert factory.get_service('embedding_batcher') is batcher
+
+    def test_get_service_embedding_cache_disabled_by_default(self, factory):
+        """Test embedding cache is opt-in."""
+        assert factory.get_service('embedding_cache') is None
+
+    def test_get_service_embedding_cache(self, config, tmp_path):
+        """Test configured embedding cache listens for client mutations."""
+        config.EMBEDDING_CACHE_DIR = str(tmp_path)
+        factory = ToolFactory(config)
+
+        cache = factory.get_service('embedding_cache')
+
+        assert cache.directory == tmp_path
+        assert cache.on_mutation in factory.client._mutation_listeners
+
+    def test_get_service_query_cache(self, factory):
+        """Test query cache uses config and listens for client mutations."""
+        cache = factory.get_service('query_cache')
+
+        assert cache.ttl == factory.config.QUERY_CACHE_TTL_SECONDS
+        assert cache.on_mutation in factory.client._mutation_listeners
+
+    def test_get_service_folder_tree_cache(self, factory):
+        """Test folder tree cache uses config and listens for client mutations."""
+        cache = factory.get_service('folder_tree_cache')
+
+        assert cache.ttl == factory.config.FOLDER_TREE_CACHE_TTL_SECONDS
+        assert cache.on_mutation in factory.client._mutation_listeners
+
+    def test_get_service_mirror_disabled_by_default(self, factory):
+        """Test entity mirror is opt-in."""
+        assert factory.get_service('mirror') is None
+
+    def test_get_service_mirror(self, config, tmp_path):
+        """Test configured mirror listens for client mutations."""
+        config.MIRROR_DB_PATH = str(tmp_path / "mirror.db")
+        factory = ToolFactory(config)
+
+        mirror = factory.get_service('mirror')
+
+        assert mirror.path == tmp_path / "mirror.db"
+        assert mirror.kinds == config.mirror_kinds
+        assert mirror.on_mutation in factory.client._mutation_listeners
+
+    def test_get_service_chat_index(self, config, tmp_path):
+        """Test configured chat index listens for client mutations."""
+        assert ToolFactory(config).get_service('chat_index') is None
+
+        config.CHAT_INDEX_PATH = str(tmp_path / "index.db")
+        factory = ToolFactory(config)
+
+        index = factory.get_service('chat_index')
+
+        assert index.path == tmp_path / "index.db"
+        assert index.on_mutation in factory.client._mutation_listeners
+
+    def test_get_service_slow_log(self, config):
+        """Test slow log uses configured thresholds and is disabled without any."""
+        config.SLOW_CALL_THRESHOLDS = "chat_*=500"
+        slow_log = ToolFactory(config).get_service('slow_log')
+
+        assert slow_log.threshold_for("chat_list") == 500
+        assert slow_log.capacity == config.SLOW_CALL_BUFFER_SIZE
+
+        config.SLOW_CALL_THRESHOLD_MS = 0
+        config.SLOW_CALL_THRESHOLDS = ""
+        assert ToolFactory(config).get_service('slow_log') is None
+
+    def test_get_service_loop_monitor(self, config):
+        """Test loop monitor uses configured timings and is disabled at interval 0."""
+        config.LOOP_BLOCK_THRESHOLD_MS = 500
+        monitor = ToolFactory(config).get_service('loop_monitor')
+
+        assert monitor.interval == config.LOOP_MONITOR_INTERVAL_MS / 1000
+        assert monitor.threshold == 0.5
+
+        config.LOOP_MONITOR_INTERVAL_MS = 0
+        assert ToolFactory(config).get_service('loop_monitor') is None
+
+    def test_get_service_profiler(self, config, tmp_path):
+        """Test profiling services are opt-in and use the configured directory."""
+        assert ToolFactory(config).get_service('profiler') is None
+        assert ToolFactory(config).get_service('memory_tracker') is None
+
+        config.PROFILING_ENABLED = True
+        config.PROFILE_DIR = str(tmp_path)
+        factory = ToolFactory(config)
+
+        assert factory.get_service('profiler').output_dir == tmp_path
+        assert factory.get_service('memory_tracker') is not None
+
+    def test_active_services_skip_disabled(self, factory):
+        """Test active services list created, enabled services only."""
+        factory.get_service('query_cache')
+        factory.get_service('mirror')
+
+        assert set(factory.active_services()) == {'query_cache', 'rate_limiter'}
+
+    def test_pool_stats_do_not_create_client(self, factory):
+        """Test pool stats are None until the client exists."""
+        assert factory.get_pool_stats() is None
+        assert factory._client is None
+
+    def test_create_tool_injects_services(self, factory):
+        """Test created tools can reach shared services."""
+        tool = factory.create_tool("chat_list")
+
+        assert tool.get_service('rate_limiter') is factory.get_service('rate_limiter')
+
     def test_get_service_unknown(self, factory):
         """Test getting unknown service raises error."""
         with pytest.raises(ValueError, match="Unknown service"):
@@ -170,6 +286,22 @@ class TestToolFactory:
         # Should not raise error
         await factory.cleanup()
 
+    @pytest.mark.asyncio
+    async def test_factory_cleanup_closes_services(self, factory):
+        """Test cleanup closes services and stops the loop monitor."""
+        mirror = Mock(close=AsyncMock())
+        cache = Mock(close=Mock(side_effect=OSError("busy")))
+        monitor = factory.get_service("loop_monitor")
+        factory._services.update({"mirror": mirror, "embedding_cache": cache})
+
+        with patch.object(monitor, "stop", new_callable=AsyncMock) as mock_stop:
+            await factory.cleanup()
+
+        mirror.close.assert_awaited_once()
+        cache.close.assert_called_once()
+        mock_stop.assert_awaited_once()
+        assert factory.active_services() == {}
+
     def test_factory_isolates_tools(self, factory):
         """Test tools don't share mutable state."""
         tool1 = factory.create_tool("chat_list")
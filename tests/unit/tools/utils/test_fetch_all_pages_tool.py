@@ -0,0 +1,133 @@
+"""Tests for FetchAllPagesTool."""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.tools.utils import fetch_all_pages_tool
+from src.tools.utils.fetch_all_pages_tool import FetchAllPagesTool
+from src.exceptions import ValidationError
+
+
+def pages_of(pages):
+    """Build a client.get side effect serving pages by page number."""
+    async def get(endpoint, params=None):
+        return pages.get(params.get("page"), [])
+    return get
+
+
+class TestFetchAllPagesTool:
+    """Tests for fetch_all_pages."""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock HTTP client."""
+        client = Mock()
+        client.get = AsyncMock(return_value=[])
+        client.post = AsyncMock(return_value=[])
+        return client
+
+    @pytest.fixture
+    def tool(self, mock_client):
+        """Create tool instance."""
+        return FetchAllPagesTool(client=mock_client, config=Mock())
+
+    def test_get_definition(self, tool):
+        """Test tool definition structure."""
+        definition = tool.get_definition()
+
+        assert definition["name"] == "fetch_all_pages"
+        assert "get_session_user_chat_list_chats_list" in definition["inputSchema"]["properties"]["tool"]["enum"]
+        assert definition["inputSchema"]["required"] == ["tool"]
+
+    @pytest.mark.asyncio
+    async def test_fetches_all_pages(self, tool, mock_client):
+        """Test items from every page are returned in order."""
+        mock_client.get.side_effect = pages_of({1: [{"id": "a"}, {"id": "b"}], 2: [{"id": "c"}]})
+
+        result = await tool.execute({"tool": "get_session_user_chat_list_chats_list"})
+
+        assert [item["id"] for item in result["items"]] == ["a", "b", "c"]
+        assert result["count"] == 3
+        assert result["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_path_params_and_filters(self, tool, mock_client):
+        """Test path parameters fill the endpoint and filters pass through."""
+        mock_client.get.side_effect = pages_of({1: [{"id": "m1"}]})
+
+        await tool.execute({
+            "tool": "get_channel_messages_channels_id_messages",
+            "arguments": {"id": "chan-1", "skip": 99},
+            "lookahead": 1,
+        })
+
+        endpoint, = mock_client.get.call_args_list[0].args
+        assert endpoint == "/api/v1/channels/chan-1/messages"
+        assert mock_client.get.call_args_list[0].kwargs["params"] == {"skip": 0, "limit": 50}
+
+    @pytest.mark.asyncio
+    async def test_missing_path_param(self, tool):
+        """Test a missing path parameter is rejected."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"tool": "get_channel_messages_channels_id_messages"})
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool(self, tool):
+        """Test unknown tools are rejected."""
+        with pytest.raises(ValidationError):
+            await tool.execute({"tool": "get_models"})
+
+    @pytest.mark.asyncio
+    async def test_max_items_and_stop_when(self, tool, mock_client):
+        """Test max_items truncates and stop_when ends early."""
+        mock_client.get.side_effect = pages_of({
+            1: [{"id": "a", "updated_at": 30}, {"id": "b", "updated_at": 20}],
+            2: [{"id": "c", "updated_at": 10}],
+        })
+
+        truncated = await tool.execute({"tool": "get_session_user_chat_list_chats_list", "max_items": 1})
+        stopped = await tool.execute({
+            "tool": "get_session_user_chat_list_chats_list",
+            "stop_when": {"field": "updated_at", "op": "lt", "value": 15},
+        })
+
+        assert truncated["count"] == 1 and truncated["truncated"] is True
+        assert [item["id"] for item in stopped["items"]] == ["a", "b"]
+        assert stopped["stopped_early"] is True
+
+    @pytest.mark.asyncio
+    async def test_invalid_stop_when(self, tool):
+        """Test malformed stop conditions are rejected."""
+        with pytest.raises(ValidationError):
+            await tool.execute({
+                "tool": "get_session_user_chat_list_chats_list",
+                "stop_when": {"field": "x", "op": "like"},
+            })
+
+    @pytest.mark.asyncio
+    async def test_spool_to_jsonl(self, tool, mock_client, tmp_path, monkeypatch):
+        """Test items are written to the spool file instead of returned."""
+        monkeypatch.setattr(fetch_all_pages_tool, "SPOOL_DIR", str(tmp_path))
+        mock_client.get.side_effect = pages_of({1: [{"id": "a"}], 2: [{"id": "b"}]})
+        spool = tmp_path / "out" / "chats.jsonl"
+
+        result = await tool.execute({
+            "tool": "get_session_user_chat_list_chats_list",
+            "spool_path": str(spool),
+        })
+
+        assert "items" not in result
+        assert result["spool_path"] == str(spool)
+        lines = spool.read_text().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_spool_outside_cache_dir(self, tool, mock_client, tmp_path, monkeypatch):
+        """Test spool_path cannot point outside the cache directory."""
+        monkeypatch.setattr(fetch_all_pages_tool, "SPOOL_DIR", str(tmp_path / "cache"))
+        for path in ["../out.jsonl", str(tmp_path / "out.jsonl"), ".", 5]:
+            with pytest.raises(ValidationError, match="spool_path"):
+                await tool.execute({"tool": "get_session_user_chat_list_chats_list", "spool_path": path})
+
+        mock_client.get.assert_not_called()
+        assert not (tmp_path / "out.jsonl").exists()
@@ -0,0 +1,42 @@
+"""Tests for the chat import ledger."""
+
+import pytest
+from src.utils.chat_import_ledger import ChatImportLedger
+
+
+class TestChatImportLedger:
+    """Tests for ChatImportLedger."""
+
+    def test_append_and_reload(self, tmp_path):
+        """Test entries survive a reload and the last entry wins."""
+        path = tmp_path / "ledger.jsonl"
+        ledger = ChatImportLedger(path)
+        ledger.append([{"source_id": "a", "chat_id": "x", "organized": False}])
+        ledger.append([{"source_id": "a", "chat_id": "x", "organized": True}])
+
+        reloaded = ChatImportLedger(path)
+        reloaded.load()
+
+        assert reloaded.get("a") == {"source_id": "a", "chat_id": "x", "organized": True}
+        assert reloaded.get("b") is None
+
+    def test_partial_last_line_is_cut(self, tmp_path):
+        """Test an interrupted append does not corrupt later appends."""
+        path = tmp_path / "ledger.jsonl"
+        path.write_text('{"source_id": "a", "chat_id": "x", "organized": true}\n{"source_id": "b", "ch')
+
+        ledger = ChatImportLedger(path)
+        ledger.load()
+        ledger.append([{"source_id": "c", "chat_id": "z", "organized": True}])
+
+        reloaded = ChatImportLedger(path)
+        reloaded.load()
+        assert sorted(reloaded.entries) == ["a", "c"]
+
+    def test_corrupt_ledger(self, tmp_path):
+        """Test corrupt lines before the end are reported."""
+        path = tmp_path / "ledger.jsonl"
+        path.write_text('not json\n{"source_id": "a", "chat_id": "x"}\n')
+
+        with pytest.raises(ValueError, match="invalid ledger entry"):
+            ChatImportLedger(path).load()
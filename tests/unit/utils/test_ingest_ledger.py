@@ -0,0 +1,38 @@
+"""Tests for the ingest ledger."""
+
+import pytest
+from src.utils.ingest_ledger import IngestLedger, content_hash
+
+
+class TestIngestLedger:
+    """Tests for IngestLedger."""
+
+    def test_record_save_and_load(self, tmp_path):
+        """Test recorded sources survive a round trip."""
+        path = tmp_path / "ledger.json"
+        ledger = IngestLedger(path)
+        ledger.record("docs", "https://a.example/", "abc")
+        ledger.save()
+
+        loaded = IngestLedger(path)
+        loaded.load()
+
+        assert loaded.contains("docs", "https://a.example/")
+        assert not loaded.contains("other", "https://a.example/")
+        assert loaded.collections["docs"]["https://a.example/"]["sha256"] == "abc"
+
+    def test_load_rejects_unknown_version(self, tmp_path):
+        """Test unknown ledger versions are rejected."""
+        path = tmp_path / "ledger.json"
+        path.write_text('{"version": 99}')
+
+        with pytest.raises(ValueError, match="version"):
+            IngestLedger(path).load()
+
+    def test_content_hash_prefers_document_text(self):
+        """Test the hash follows extracted content, not response metadata."""
+        first = {"file": {"data": {"content": "page"}, "meta": {"at": 1}}}
+        second = {"file": {"data": {"content": "page"}, "meta": {"at": 2}}}
+
+        assert content_hash(first) == content_hash(second)
+        assert content_hash({"status": True}) != content_hash({"status": False})
@@ -0,0 +1,110 @@
+"""Tests for block-compressed JSONL archives."""
+
+import pytest
+from src.utils.jsonl_archive import (
+    ArchiveWriter,
+    aiter_jsonl,
+    compression_for_path,
+    encode_block,
+    iter_jsonl,
+)
+
+
+class TestCompressionForPath:
+    """Tests for compression_for_path."""
+
+    @pytest.mark.parametrize("name,expected", [
+        ("chats.jsonl", "none"),
+        ("chats.jsonl.gz", "gzip"),
+        ("chats.jsonl.zst", "zstd"),
+    ])
+    def test_suffixes(self, tmp_path, name, expected):
+        """Test compression is inferred from the suffix."""
+        assert compression_for_path(tmp_path / name) == expected
+
+
+class TestArchiveWriter:
+    """Tests for ArchiveWriter."""
+
+    @pytest.mark.parametrize("name", ["out.jsonl", "out.jsonl.gz"])
+    def test_blocks_read_back_as_one_stream(self, tmp_path, name):
+        """Test multiple blocks read back in order."""
+        path = tmp_path / name
+        writer = ArchiveWriter(path, compression_for_path(path))
+        writer.open(resume=False)
+        writer.write_block([{"id": "a"}, {"id": "b"}])
+        writer.write_block([{"id": "c", "title": "ü"}])
+        writer.close(complete=True)
+
+        assert [r["id"] for r in iter_jsonl(path)] == ["a", "b", "c"]
+        assert not writer.checkpoint_path.exists()
+
+    def test_resume_truncates_partial_block(self, tmp_path):
+        """Test resuming drops bytes written after the checkpoint."""
+        path = tmp_path / "out.jsonl.gz"
+        writer = ArchiveWriter(path, "gzip")
+        writer.open(resume=False)
+        writer.write_block([{"id": "a"}])
+        writer.close(complete=False)
+        with open(path, "ab") as f:
+            f.write(b"\x1f\x8b partial block")
+
+        resumed = ArchiveWriter(path, "gzip")
+        assert resumed.open(resume=True) is True
+        assert resumed.records == 1
+        resumed.write_block([{"id": "b"}])
+        resumed.close(complete=True)
+
+        assert [r["id"] for r in iter_jsonl(path)] == ["a", "b"]
+
+    def test_resume_without_checkpoint_starts_over(self, tmp_path):
+        """Test resume starts a fresh archive when no checkpoint exists."""
+        path = tmp_path / "out.jsonl"
+        path.write_text('{"id": "stale"}\n')
+
+        writer = ArchiveWriter(path, "none")
+
+        assert writer.open(resume=True) is False
+        writer.close(complete=True)
+        assert path.read_bytes() == b""
+
+    def test_resume_compression_mismatch(self, tmp_path):
+        """Test a checkpoint with different compression is rejected."""
+        path = tmp_path / "out.jsonl"
+        writer = ArchiveWriter(path, "none")
+        writer.open(resume=False)
+        writer.close(complete=False)
+
+        with pytest.raises(ValueError, match="compression"):
+            ArchiveWriter(path, "gzip").open(resume=True)
+
+    def test_zstd_round_trip(self, tmp_path):
+        """Test zstd blocks read back across frames."""
+        pytest.importorskip("zstandard")
+        path = tmp_path / "out.jsonl.zst"
+        writer = ArchiveWriter(path, "zstd")
+        writer.open(resume=False)
+        writer.write_block([{"id": "a"}])
+        writer.write_block([{"id": "b"}])
+        writer.close(complete=True)
+
+        assert [r["id"] for r in iter_jsonl(path)] == ["a", "b"]
+
+    def test_unknown_compression(self):
+        """Test unknown compression names are rejected."""
+        with pytest.raises(ValueError):
+            encode_block([{}], "lz4")
+
+
+class TestAiterJsonl:
+    """Tests for aiter_jsonl."""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_chunks(self, tmp_path):
+        """Test records stream in order across chunk boundaries."""
+        path = tmp_path / "out.jsonl"
+        path.write_text("".join(f'{{"id": {i}}}\n' for i in range(7)))
+
+        records = [r async for r in aiter_jsonl(path, chunk_size=3)]
+
+        assert [r["id"] for r in records] == list(range(7))
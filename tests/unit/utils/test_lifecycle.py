@@ -0,0 +1,66 @@
+"""Tests for server readiness and draining."""
+
+import asyncio
+import pytest
+from src.utils.lifecycle import Lifecycle
+
+
+async def call(lifecycle: Lifecycle, seconds: float) -> str:
+    """Run a tool call that takes a while."""
+    with lifecycle.call():
+        await asyncio.sleep(seconds)
+    return "done"
+
+
+async def session(lifecycle: Lifecycle) -> str:
+    """Run an SSE session that only ends when cancelled."""
+    with lifecycle.session():
+        await asyncio.sleep(60)
+    return "closed"
+
+
+class TestLifecycle:
+    """Test readiness states and draining."""
+
+    def test_ready_after_start(self):
+        """Test the server reports ready only once marked, and never after draining starts."""
+        lifecycle = Lifecycle()
+        assert lifecycle.state == "starting"
+
+        lifecycle.mark_ready()
+        assert lifecycle.state == "ready"
+        assert lifecycle.accepting
+
+        lifecycle.state = "draining"
+        lifecycle.mark_ready()
+        assert lifecycle.state == "draining"
+        assert not lifecycle.accepting
+
+    async def test_drain_waits_for_calls_then_closes_sessions(self):
+        """Test draining lets in-flight calls finish before cancelling sessions."""
+        lifecycle = Lifecycle()
+        running = asyncio.create_task(call(lifecycle, 0.1))
+        open_session = asyncio.create_task(session(lifecycle))
+        await asyncio.sleep(0)
+
+        remaining = await lifecycle.drain(5)
+
+        assert remaining == 0
+        assert running.done() and running.result() == "done"
+        assert await asyncio.wait_for(open_session, 1) == "closed"
+        assert lifecycle.in_flight == 0 and lifecycle.sessions == 0
+
+    async def test_drain_deadline(self):
+        """Test draining gives up on calls still running at the deadline."""
+        lifecycle = Lifecycle()
+        running = asyncio.create_task(call(lifecycle, 10))
+        await asyncio.sleep(0)
+
+        remaining = await asyncio.wait_for(lifecycle.drain(0.1), 2)
+
+        assert remaining == 1
+        assert not running.done()
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        assert lifecycle.in_flight == 0
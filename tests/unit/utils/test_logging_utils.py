@@ -0,0 +1,154 @@
+"""Tests for logging configuration.
+
+Tests JSON formatting, sampling, argument sanitizing and queued output.
+"""
+
+import json
+import logging
+import threading
+import pytest
+from src.utils import logging_utils
+from src.utils.logging_utils import (
+    DroppingQueueHandler,
+    JSONFormatter,
+    SamplingFilter,
+    sanitize_for_logging,
+    setup_logging,
+    shutdown_logging,
+)
+from src.utils.deferred_write import defer_write
+from src.utils.tracing import start_trace
+
+
+def make_record(name="test", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    """Build a log record with extra fields."""
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestJSONFormatter:
+    """Test JSON formatter."""
+
+    def test_emits_extra_fields(self):
+        """Test extra fields are emitted alongside the standard ones."""
+        record = make_record(tool_name="ChatListTool", duration_ms=12.5, status_code=200)
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["message"] == "hello world"
+        assert data["tool_name"] == "ChatListTool"
+        assert data["duration_ms"] == 12.5
+        assert data["status_code"] == 200
+        assert "args" not in data and "msg" not in data
+
+    def test_timestamp_and_unserializable_values(self):
+        """Test timestamps are ISO 8601 UTC and odd values are stringified."""
+        record = make_record(payload=object())
+        record.created = 0.25
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["timestamp"] == "1970-01-01T00:00:00.250000Z"
+        assert data["payload"].startswith("<object")
+
+
+class TestSamplingFilter:
+    """Test per-logger sampling."""
+
+    def test_keeps_fraction_of_info_records(self):
+        """Test rates apply to child loggers and spare warnings."""
+        sampler = SamplingFilter({"src.services": 0.25, "*": 1.0})
+
+        kept = sum(sampler.filter(make_record(name="src.services.client")) for _ in range(100))
+        warnings = sum(
+            sampler.filter(make_record(name="src.services.client", level=logging.WARNING)) for _ in range(10)
+        )
+        others = sum(sampler.filter(make_record(name="src.server")) for _ in range(10))
+
+        assert kept == 25
+        assert warnings == 10
+        assert others == 10
+        assert sampler.dropped == 75
+
+    def test_zero_rate_drops_all(self):
+        """Test a zero rate drops every record below WARNING."""
+        sampler = SamplingFilter({"*": 0})
+
+        assert not any(sampler.filter(make_record()) for _ in range(5))
+
+
+class TestSanitize:
+    """Test argument sanitizing."""
+
+    def test_redacts_and_truncates(self):
+        """Test secrets are redacted, nested dicts sanitized and long strings cut."""
+        sanitized = sanitize_for_logging({
+            "api_key": "sk-1",
+            "config": {"auth_token": "t", "name": "x"},
+            "content": "a" * 300,
+        })
+
+        assert sanitized["api_key"] == "***REDACTED***"
+        assert sanitized["config"] == {"auth_token": "***REDACTED***", "name": "x"}
+        assert sanitized["content"].endswith("... (truncated)")
+
+
+class TestQueuedLogging:
+    """Test the queue-based pipeline."""
+
+    @pytest.fixture(autouse=True)
+    def restore_logging(self):
+        """Restore root logger handlers after each test."""
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        yield
+        shutdown_logging()
+        root.handlers, root.level = handlers, level
+
+    def test_queued_records_keep_context(self, capsys):
+        """Test queued records carry the request id and exception text."""
+        setup_logging("INFO", "json", queue_size=100)
+
+        with start_trace("tools/call demo") as trace:
+            try:
+                raise ValueError("bad")
+            except ValueError:
+                logging.getLogger("test").exception("failed %d", 1, extra={"tool_name": "demo"})
+        shutdown_logging()
+
+        data = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+        assert data["message"] == "failed 1"
+        assert data["request_id"] == trace.request_id
+        assert data["tool_name"] == "demo"
+        assert "ValueError: bad" in data["exception"]
+
+    def test_full_queue_drops_records(self):
+        """Test records are dropped instead of blocking when the queue is full."""
+        handler = DroppingQueueHandler(logging_utils.queue.Queue(maxsize=1))
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert handler.dropped == 1
+
+    def test_deferred_writes_run_on_listener_thread(self):
+        """Test deferred writes share the log writer thread and are flushed on shutdown."""
+        setup_logging("INFO", "json", queue_size=100)
+        threads = []
+
+        defer_write(lambda name: threads.append((name, threading.current_thread())), "w")
+        shutdown_logging()
+
+        assert threads[0][0] == "w"
+        assert threads[0][1] is not threading.current_thread()
+
+    def test_deferred_writes_run_inline_without_listener(self):
+        """Test writes run immediately when no background writer is configured."""
+        shutdown_logging()
+        written = []
+
+        defer_write(written.append, "line")
+
+        assert written == ["line"]
@@ -0,0 +1,132 @@
+"""Tests for in-process metrics primitives.
+
+Tests histogram bucketing, quantile estimates and export, and Prometheus
+text rendering of labelled metrics.
+"""
+
+from src.utils.metrics import MAX_SERIES, Histogram, MetricsRegistry, route_template
+
+
+class TestHistogram:
+    """Test fixed-bucket histogram."""
+
+    def test_empty_histogram(self):
+        """Test empty histogram exports no quantiles."""
+        histogram = Histogram((1, 10))
+
+        data = histogram.to_dict()
+
+        assert data["count"] == 0
+        assert data["p50"] is None
+        assert data["mean"] is None
+
+    def test_observe_buckets_cumulative(self):
+        """Test exported buckets are cumulative."""
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 5, 50, 500):
+            histogram.observe(value)
+
+        buckets = histogram.to_dict()["buckets"]
+
+        assert buckets == {"1": 1, "10": 2, "100": 3, "+Inf": 4}
+
+    def test_quantiles(self):
+        """Test quantile estimate returns bucket upper bound."""
+        histogram = Histogram((1, 10, 100))
+        for _ in range(90):
+            histogram.observe(5)
+        for _ in range(10):
+            histogram.observe(50)
+
+        assert histogram.quantile(0.5) == 10
+        assert histogram.quantile(0.99) == 100
+
+    def test_sum_and_mean(self):
+        """Test sum and mean."""
+        histogram = Histogram((1, 10))
+        histogram.observe(2)
+        histogram.observe(4)
+
+        data = histogram.to_dict()
+
+        assert data["sum"] == 6
+        assert data["mean"] == 3
+
+
+class TestMetricsRegistry:
+    """Test labelled metrics and Prometheus rendering."""
+
+    def test_render_counter_and_gauge(self):
+        """Test counters and gauges render with escaped labels."""
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ("tool", "outcome"))
+        sessions = registry.gauge("sessions", "Sessions")
+        calls.inc(tool='say "hi"', outcome="success")
+        calls.inc(2, tool='say "hi"', outcome="success")
+        sessions.inc()
+        sessions.dec()
+
+        text = registry.render()
+
+        assert "# TYPE calls_total counter" in text
+        assert 'calls_total{tool="say \\"hi\\"",outcome="success"} 3' in text
+        assert "sessions 0" in text.splitlines()
+
+    def test_render_histogram(self):
+        """Test histograms render cumulative buckets, sum and count."""
+        registry = MetricsRegistry()
+        duration = registry.histogram("duration_seconds", "Latency", ("route",), buckets=(0.1, 1))
+        duration.observe(0.05, route="/a")
+        duration.observe(0.5, route="/a")
+        duration.observe(5, route="/a")
+
+        lines = registry.render().splitlines()
+
+        assert 'duration_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'duration_seconds_bucket{route="/a",le="1"} 2' in lines
+        assert 'duration_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'duration_seconds_sum{route="/a"} 5.55' in lines
+        assert 'duration_seconds_count{route="/a"} 3' in lines
+
+    def test_callback_metrics(self):
+        """Test callback metrics are read at render time and failures skipped."""
+        registry = MetricsRegistry()
+        registry.callback("ratio", "Hit ratio", "gauge", lambda: {"query": 0.25}, ("cache",))
+        registry.callback("broken", "Broken", "gauge", lambda: 1 / 0)
+        registry.callback("absent", "Absent", "gauge", lambda: None)
+
+        text = registry.render()
+
+        assert 'ratio{cache="query"} 0.25' in text
+        assert "broken" not in text
+        assert "# TYPE absent gauge" in text
+
+    def test_series_cap(self):
+        """Test label combinations beyond the cap fold into "other"."""
+        registry = MetricsRegistry()
+        calls = registry.counter("calls_total", "Calls", ("tool",))
+        for i in range(MAX_SERIES + 5):
+            calls.inc(tool=f"t{i}")
+
+        series = calls.collect()
+
+        assert len(series) == MAX_SERIES + 1
+        assert series[("other",)] == 5
+
+
+class TestRouteTemplate:
+    """Test route templating."""
+
+    def test_ids_replaced(self):
+        """Test identifiers are replaced and static segments kept."""
+        assert route_template("/api/v1/chats/3f2a9c1e-5b7d-4e8f-9a0b-1c2d3e4f5a6b/tags") == (
+            "/api/v1/chats/{id}/tags"
+        )
+        assert route_template("/api/v1/knowledge/kb123/file/add") == "/api/v1/knowledge/{id}/file/add"
+        assert route_template("/api/v1/models/model") == "/api/v1/models/model"
+
+    def test_prompt_command(self):
+        """Test prompt commands are templated."""
+        assert route_template("/api/v1/prompts/command/summarize/update") == (
+            "/api/v1/prompts/command/{id}/update"
+        )
@@ -0,0 +1,106 @@
+"""Tests for pagination specs and the look-ahead page iterator."""
+
+import asyncio
+import pytest
+from src.utils.pagination import (
+    STYLE_PAGE,
+    STYLE_SKIP_LIMIT,
+    PagingSpec,
+    iterate_pages,
+)
+
+
+class TestPagingSpec:
+    """Tests for PagingSpec."""
+
+    def test_page_style_args(self):
+        """Test page style uses 1-based page numbers."""
+        spec = PagingSpec("/api/v1/chats/list", STYLE_PAGE)
+
+        assert spec.page_args(0) == {"page": 1}
+        assert spec.page_args(2) == {"page": 3}
+
+    def test_skip_limit_args(self):
+        """Test skip/limit style uses the page size."""
+        spec = PagingSpec("/api/v1/channels/{id}/messages", STYLE_SKIP_LIMIT, page_size=20)
+
+        assert spec.page_args(3) == {"skip": 60, "limit": 20}
+
+    def test_extract_items(self):
+        """Test items come from lists or the items key."""
+        assert PagingSpec("/x", STYLE_PAGE).extract_items([1, 2]) == [1, 2]
+        assert PagingSpec("/x", STYLE_PAGE, items_key="users").extract_items({"users": [1]}) == [1]
+        assert PagingSpec("/x", STYLE_PAGE).extract_items({"detail": "x"}) == []
+
+
+class TestIteratePages:
+    """Tests for iterate_pages."""
+
+    @pytest.mark.asyncio
+    async def test_yields_pages_in_order_until_empty(self):
+        """Test pages arrive in order even when fetched out of order."""
+        data = {0: [1, 2], 1: [3, 4], 2: [5]}
+
+        async def fetch(index):
+            await asyncio.sleep(0.01 * (3 - index) if index < 3 else 0)
+            return data.get(index, [])
+
+        pages = [page async for page in iterate_pages(fetch, lookahead=3)]
+
+        assert pages == [[1, 2], [3, 4], [5]]
+
+    @pytest.mark.asyncio
+    async def test_short_page_ends_skip_limit(self):
+        """Test a short page ends iteration when the page size is known."""
+        requested = []
+
+        async def fetch(index):
+            requested.append(index)
+            return [index] * (2 if index == 0 else 1)
+
+        pages = [page async for page in iterate_pages(fetch, lookahead=1, page_size=2)]
+
+        assert pages == [[0, 0], [1]]
+        assert requested == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_lookahead_bounds_in_flight(self):
+        """Test no more than lookahead fetches run at once."""
+        running = 0
+        peak = 0
+
+        async def fetch(index):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+            return [index] if index < 10 else []
+
+        pages = [page async for page in iterate_pages(fetch, lookahead=3)]
+
+        assert len(pages) == 10
+        assert peak <= 3
+
+    @pytest.mark.asyncio
+    async def test_early_stop_cancels_in_flight(self):
+        """Test closing the iterator cancels outstanding fetches."""
+        cancelled = []
+
+        async def fetch(index):
+            if index == 0:
+                return [0]
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return [index]
+
+        pages = iterate_pages(fetch, lookahead=3)
+        first = await pages.__anext__()
+        await asyncio.sleep(0)
+        await pages.aclose()
+
+        assert first == [0]
+        assert sorted(cancelled) == [1, 2]
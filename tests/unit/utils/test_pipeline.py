@@ -0,0 +1,174 @@
+"""Tests for the staged async pipeline.
+
+Tests stage chaining, batching, retry of failed items and stats.
+"""
+
+import pytest
+import asyncio
+from src.utils.pipeline import Pipeline, PipelineStage
+from src.utils.tracing import start_trace
+
+
+class TestPipeline:
+    """Test staged pipeline execution."""
+
+    @pytest.mark.asyncio
+    async def test_items_flow_through_all_stages(self):
+        """Test items pass through every stage in order."""
+        async def double(batch):
+            return [item * 2 for item in batch], []
+
+        async def increment(batch):
+            return [item + 1 for item in batch], []
+
+        pipeline = Pipeline([PipelineStage("double", double), PipelineStage("inc", increment)])
+        result = await pipeline.run(range(5))
+
+        assert sorted(result.outputs) == [1, 3, 5, 7, 9]
+        assert result.failures == []
+        assert [s.processed for s in result.stats] == [5, 5]
+
+    @pytest.mark.asyncio
+    async def test_batches_respect_batch_size(self):
+        """Test batch handler never receives more than batch_size items."""
+        sizes = []
+
+        async def record(batch):
+            sizes.append(len(batch))
+            return batch, []
+
+        pipeline = Pipeline([PipelineStage("record", record, batch_size=3)])
+        result = await pipeline.run(range(10))
+
+        assert sorted(result.outputs) == list(range(10))
+        assert max(sizes) <= 3
+
+    @pytest.mark.asyncio
+    async def test_async_iterable_input(self):
+        """Test async iterables feed the first stage lazily."""
+        async def source():
+            for item in range(4):
+                yield item
+
+        async def identity(batch):
+            return batch, []
+
+        result = await Pipeline([PipelineStage("identity", identity)]).run(source())
+
+        assert sorted(result.outputs) == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_retries_only_failed_items(self):
+        """Test retry attempts only include previously failed items."""
+        calls = []
+
+        async def flaky(batch):
+            calls.append(list(batch))
+            if len(calls) == 1:
+                return [i for i in batch if i != 2], [(2, "boom")]
+            return batch, []
+
+        stage = PipelineStage("flaky", flaky, batch_size=5, max_retries=1, retry_delay=0)
+        with start_trace("tools/call demo") as trace:
+            result = await Pipeline([stage]).run([1, 2, 3])
+
+        assert calls[1] == [2]
+        assert sorted(result.outputs) == [1, 2, 3]
+        assert result.stats[0].retried == 1
+        assert trace.stats.retries == 1
+        assert result.failures == []
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_recorded_as_failures(self):
+        """Test exceptions fail the batch and are reported after retries."""
+        async def broken(batch):
+            raise RuntimeError("upstream down")
+
+        stage = PipelineStage("broken", broken, max_retries=2, retry_delay=0)
+        result = await Pipeline([stage]).run(["a"])
+
+        assert result.outputs == []
+        assert result.failures == [{"stage": "broken", "item": "a", "error": "upstream down"}]
+        assert result.stats[0].failed == 1
+        assert result.stats[0].batches == 3
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap(self):
+        """Test downstream stage starts before upstream finishes."""
+        events = []
+
+        async def slow_first(batch):
+            await asyncio.sleep(0.01)
+            events.append(("first", batch[0]))
+            return batch, []
+
+        async def second(batch):
+            events.append(("second", batch[0]))
+            return batch, []
+
+        pipeline = Pipeline(
+            [PipelineStage("first", slow_first), PipelineStage("second", second)],
+            queue_size=1
+        )
+        await pipeline.run(range(4))
+
+        first_second = events.index(("second", 0))
+        last_first = events.index(("first", 3))
+        assert first_second < last_first
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers(self):
+        """Test stage concurrency runs handlers in parallel."""
+        active = 0
+        peak = 0
+
+        async def track(batch):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return batch, []
+
+        result = await Pipeline([PipelineStage("track", track, concurrency=4)]).run(range(8))
+
+        assert len(result.outputs) == 8
+        assert peak > 1
+
+    @pytest.mark.asyncio
+    async def test_stats_export(self):
+        """Test stage stats export includes throughput."""
+        async def noop(batch):
+            return batch, []
+
+        result = await Pipeline([PipelineStage("noop", noop)]).run(range(3))
+        stats = result.stats[0].to_dict()
+
+        assert stats["stage"] == "noop"
+        assert stats["processed"] == 3
+        assert "items_per_second" in stats
+
+    @pytest.mark.asyncio
+    async def test_progress_reports_completed_and_failed(self):
+        """Test progress callback sees every item leave the pipeline."""
+        seen = []
+
+        async def odd_fails(batch):
+            return [i for i in batch if i % 2 == 0], [(i, "odd") for i in batch if i % 2]
+
+        async def passthrough(batch):
+            return batch, []
+
+        async def on_progress(completed, failed):
+            seen.append((completed, failed))
+
+        pipeline = Pipeline([PipelineStage("filter", odd_fails), PipelineStage("pass", passthrough)])
+        await pipeline.run(range(4), on_progress=on_progress)
+
+        assert seen[-1] == (2, 2)
+        assert len(seen) == 4
+
+    def test_requires_stages(self):
+        """Test pipeline rejects empty stage list."""
+        with pytest.raises(ValueError):
+            Pipeline([])
@@ -184,3 +184,14 @@ class TestRateLimiter:
 
         result = await limiter.try_acquire()
         assert result is True
+
+    @pytest.mark.asyncio
+    async def test_wait_metrics(self):
+        """Test acquire records wait time and clears the queue depth."""
+        limiter = RateLimiter(rate=100.0, burst=1)
+
+        await asyncio.gather(limiter.acquire(), limiter.acquire())
+
+        assert limiter.waiting == 0
+        assert limiter.wait_seconds.count == 2
+        assert limiter.wait_seconds.sum > 0
@@ -0,0 +1,62 @@
+"""Tests for retrieval result merging."""
+
+from src.utils.retrieval_merge import flatten_query_result, merge_query_results
+
+
+def _result(ids, documents, distances):
+    return {
+        "ids": [ids],
+        "documents": [documents],
+        "metadatas": [[{"source": i} for i in ids]],
+        "distances": [distances],
+    }
+
+
+class TestFlattenQueryResult:
+    """Tests for flatten_query_result."""
+
+    def test_flattens_columns(self):
+        """Test column lists become one dict per chunk."""
+        chunks = flatten_query_result(_result(["1"], ["doc"], [0.5]), "c")
+
+        assert chunks == [{
+            "id": "1", "document": "doc", "metadata": {"source": "1"},
+            "distance": 0.5, "collection_name": "c"
+        }]
+
+    def test_empty_result(self):
+        """Test empty or missing columns yield no chunks."""
+        assert flatten_query_result({}, "c") == []
+
+
+class TestMergeQueryResults:
+    """Tests for merge_query_results."""
+
+    def test_top_k_by_score(self):
+        """Test highest scores across collections win."""
+        merged, duplicates = merge_query_results({
+            "a": _result(["a1", "a2"], ["p", "q"], [0.2, 0.9]),
+            "b": _result(["b1"], ["r"], [0.5]),
+        }, k=2)
+
+        assert merged["ids"] == [["a2", "b1"]]
+        assert merged["collection_names"] == [["a", "b"]]
+        assert duplicates == 0
+
+    def test_duplicates_keep_best(self):
+        """Test identical chunks collapse to the best-scoring copy."""
+        merged, duplicates = merge_query_results({
+            "a": _result(["a1"], ["same"], [0.3]),
+            "b": _result(["b1"], ["same"], [0.6]),
+        })
+
+        assert merged["ids"] == [["b1"]]
+        assert duplicates == 1
+
+    def test_lower_is_better(self):
+        """Test raw distances rank smallest first."""
+        merged, _ = merge_query_results({
+            "a": _result(["a1", "a2"], ["p", "q"], [0.2, 0.9]),
+        }, higher_is_better=False)
+
+        assert merged["ids"] == [["a1", "a2"]]
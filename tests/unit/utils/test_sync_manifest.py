@@ -0,0 +1,106 @@
+"""Tests for the local sync manifest.
+
+Tests directory diffing, hash short-circuiting and atomic persistence.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+from src.utils.sync_manifest import SyncManifest, file_sha256
+
+
+class TestSyncManifest:
+    """Test manifest load/save and directory diff."""
+
+    @pytest.fixture
+    def root(self, tmp_path):
+        """Create a small directory tree."""
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "a.md").write_text("alpha")
+        (tmp_path / "b.txt").write_text("beta")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "config").write_text("hidden")
+        return tmp_path
+
+    def _synced(self, manifest, root):
+        """Mark every file in root as synced."""
+        diff = manifest.diff(root)
+        for key in diff.added:
+            manifest.files[key] = {**diff.stats[key], "file_id": f"id-{key}", "attached": True}
+
+    def test_new_files_are_added(self, root):
+        """Test unknown files appear as added; hidden paths are skipped."""
+        manifest = SyncManifest(root / ".openwebui-sync.json")
+
+        diff = manifest.diff(root)
+
+        assert diff.added == ["b.txt", "docs/a.md"]
+        assert diff.deleted == []
+
+    def test_unchanged_files_are_not_hashed(self, root):
+        """Test files with same size and mtime skip hashing."""
+        manifest = SyncManifest(root / ".openwebui-sync.json")
+        self._synced(manifest, root)
+
+        with patch("src.utils.sync_manifest.file_sha256") as mock_hash:
+            diff = manifest.diff(root)
+
+        mock_hash.assert_not_called()
+        assert diff.unchanged == 2
+        assert diff.added == diff.modified == diff.deleted == []
+
+    def test_modified_touched_and_deleted(self, root):
+        """Test content change, mtime-only change and deletion."""
+        manifest = SyncManifest(root / ".openwebui-sync.json")
+        self._synced(manifest, root)
+
+        (root / "docs" / "a.md").write_text("alpha v2")
+        stat = (root / "b.txt").stat()
+        os.utime(root / "b.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        manifest.files["gone.md"] = {"size": 1, "mtime": 1, "sha256": "x", "file_id": "id-gone"}
+
+        diff = manifest.diff(root)
+
+        assert diff.modified == ["docs/a.md"]
+        assert diff.touched == ["b.txt"]
+        assert diff.deleted == ["gone.md"]
+
+    def test_unattached_entry_is_added_again(self, root):
+        """Test an upload whose attach failed is retried as added."""
+        manifest = SyncManifest(root / ".openwebui-sync.json")
+        self._synced(manifest, root)
+        manifest.files["b.txt"]["attached"] = False
+
+        diff = manifest.diff(root)
+
+        assert diff.added == ["b.txt"]
+
+    def test_save_and_load_roundtrip(self, root):
+        """Test manifest persists atomically and reloads."""
+        manifest = SyncManifest(root / ".openwebui-sync.json")
+        manifest.knowledge_id = "kb-1"
+        self._synced(manifest, root)
+        manifest.save()
+
+        loaded = SyncManifest(root / ".openwebui-sync.json")
+        loaded.load()
+
+        assert loaded.knowledge_id == "kb-1"
+        assert loaded.files == manifest.files
+        assert not (root / ".openwebui-sync.json.tmp").exists()
+
+    def test_load_rejects_corrupt_manifest(self, tmp_path):
+        """Test corrupt manifest raises ValueError."""
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json")
+
+        with pytest.raises(ValueError):
+            SyncManifest(path).load()
+
+    def test_file_sha256(self, tmp_path):
+        """Test hashing matches hashlib."""
+        import hashlib
+        path = tmp_path / "f"
+        path.write_bytes(b"data" * 1000)
+
+        assert file_sha256(path, chunk_size=7) == hashlib.sha256(b"data" * 1000).hexdigest()
@@ -0,0 +1,52 @@
+"""Tests for boundary-aware text splitting."""
+
+import pytest
+from src.utils.text_splitter import split_text
+
+
+class TestSplitText:
+    """Tests for split_text."""
+
+    def test_small_text_single_segment(self):
+        """Test text under the limit is one segment."""
+        segments = split_text("short text", 100)
+
+        assert [(s.index, s.offset, s.text) for s in segments] == [(0, 0, "short text")]
+
+    def test_prefers_paragraph_boundaries(self):
+        """Test paragraphs are packed up to the limit."""
+        text = "one one.\n\ntwo two.\n\nthree three."
+
+        segments = split_text(text, 20)
+
+        assert [s.text for s in segments] == ["one one.\n\ntwo two.\n\n", "three three."]
+
+    def test_falls_back_to_sentences(self):
+        """Test long paragraphs split on sentence ends."""
+        text = "First sentence. Second sentence! Third one?"
+
+        segments = split_text(text, 20)
+
+        assert [s.text for s in segments] == ["First sentence. ", "Second sentence! ", "Third one?"]
+
+    def test_hard_split_without_boundaries(self):
+        """Test text without boundaries is cut at the limit."""
+        segments = split_text("x" * 25, 10)
+
+        assert [len(s.text) for s in segments] == [10, 10, 5]
+
+    @pytest.mark.parametrize("limit", [5, 12, 40])
+    def test_segments_cover_text(self, limit):
+        """Test segments are contiguous, bounded and offsets are exact."""
+        text = "Alpha beta. Gamma delta!\n\nEpsilon zeta.\n\n" + "y" * 30
+
+        segments = split_text(text, limit)
+
+        assert "".join(s.text for s in segments) == text
+        assert all(len(s.text) <= limit for s in segments)
+        assert all(text[s.offset:s.offset + len(s.text)] == s.text for s in segments)
+
+    def test_invalid_limit(self):
+        """Test a non-positive limit is rejected."""
+        with pytest.raises(ValueError):
+            split_text("text", 0)
@@ -0,0 +1,141 @@
+"""Tests for request tracing.
+
+Tests span nesting, stage totals, httpx stage events and OTLP export.
+"""
+
+import json
+import pytest
+import httpx
+from src.utils import tracing
+from src.utils.tracing import (
+    OTLPFileExporter,
+    OTLPHTTPExporter,
+    current_trace,
+    http_stage_recorder,
+    span,
+    start_trace,
+)
+
+
+class RecordingExporter:
+    """Exporter keeping finished traces in memory."""
+
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def exporter():
+    """Enable tracing with an in-memory exporter."""
+    exporter = RecordingExporter()
+    tracing.configure([exporter])
+    yield exporter
+    tracing.configure([])
+
+
+class TestTracing:
+    """Test trace and span recording."""
+
+    def test_spans_nest_and_export(self, exporter):
+        """Test spans record their parent and the trace is exported on exit."""
+        with start_trace("tools/call demo", session_id="s1", **{"mcp.tool.name": "demo"}) as trace:
+            with span("execute") as execute:
+                with span("rate_limit") as rate_limit:
+                    pass
+
+        assert exporter.traces == [trace]
+        assert rate_limit.parent_id == execute.span_id
+        assert execute.parent_id == trace.root.span_id
+        assert set(trace.stage_totals()) == {"execute", "rate_limit"}
+        assert current_trace() is None
+
+    def test_errors_mark_spans(self, exporter):
+        """Test exceptions mark the span and root as failed."""
+        with pytest.raises(RuntimeError):
+            with start_trace("tools/call demo") as trace:
+                with span("execute") as execute:
+                    raise RuntimeError("boom")
+
+        assert execute.error == "RuntimeError"
+        assert trace.root.error == "RuntimeError"
+
+    def test_not_recording_without_exporters(self):
+        """Test only the request id is kept when no exporter is configured."""
+        with start_trace("tools/call demo") as trace:
+            with span("execute") as execute:
+                assert current_trace().request_id == trace.request_id
+
+        assert execute is None
+        assert trace.record is False
+        assert len(trace.spans) == 1
+
+    @pytest.mark.asyncio
+    async def test_http_stage_recorder(self, exporter):
+        """Test httpcore trace events become pool_wait and stage spans."""
+        with start_trace("tools/call demo") as trace:
+            with span("http") as http:
+                on_event = http_stage_recorder(trace, http.start_ns)
+                for event in (
+                    "connection.connect_tcp.started", "connection.connect_tcp.complete",
+                    "http11.send_request_headers.started", "http11.send_request_headers.complete",
+                    "http11.receive_response_headers.started", "http11.receive_response_headers.complete",
+                    "http11.receive_response_body.started", "http11.receive_response_body.complete",
+                    "connection.close.started",
+                ):
+                    await on_event(event, {})
+
+        names = [s.name for s in trace.spans if s.parent_id == http.span_id]
+        assert names == ["pool_wait", "connect", "send", "server", "download"]
+
+
+class TestExporters:
+    """Test OTLP exporters."""
+
+    def test_file_exporter_writes_otlp_lines(self, tmp_path):
+        """Test traces are appended as OTLP/JSON lines."""
+        path = tmp_path / "traces" / "out.jsonl"
+        file_exporter = OTLPFileExporter(path)
+        tracing.configure([file_exporter])
+        try:
+            with start_trace("tools/call demo", **{"mcp.tool.name": "demo", "retries": 2}) as trace:
+                with span("execute"):
+                    pass
+        finally:
+            tracing.configure([])
+
+        request = json.loads(path.read_text().splitlines()[0])
+        spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in spans] == ["tools/call demo", "execute"]
+        assert spans[0]["traceId"] == trace.request_id
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert {"key": "retries", "value": {"intValue": "2"}} in spans[0]["attributes"]
+
+    @pytest.mark.asyncio
+    async def test_http_exporter_batches(self):
+        """Test queued traces are posted to the collector in one request."""
+        bodies = []
+
+        def handler(request):
+            bodies.append(json.loads(request.content))
+            return httpx.Response(200, json={})
+
+        http_exporter = OTLPHTTPExporter("http://collector:4318/", interval=60)
+        http_exporter._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        tracing.configure([http_exporter])
+        try:
+            for _ in range(3):
+                with start_trace("tools/call demo"):
+                    pass
+        finally:
+            tracing.configure([])
+        await http_exporter.close()
+
+        assert http_exporter.url == "http://collector:4318/v1/traces"
+        assert http_exporter.exported == 3
+        assert sum(len(body["resourceSpans"]) for body in bodies) == 3
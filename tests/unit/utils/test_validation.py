@@ -92,6 +92,25 @@ class TestToolInputValidator:
         assert limit == 1000
         assert offset == 999999
 
+    # Integer Range Validation Tests
+    def test_validate_int_range_valid(self):
+        """Test integers inside the inclusive range."""
+        assert ToolInputValidator.validate_int_range(1, "size", 1, 10) == 1
+        assert ToolInputValidator.validate_int_range(10, "size", 1, 10) == 10
+
+    def test_validate_int_range_out_of_range(self):
+        """Test integers outside the range."""
+        with pytest.raises(ValidationError, match="size must be between 1 and 10"):
+            ToolInputValidator.validate_int_range(11, "size", 1, 10)
+
+    def test_validate_int_range_not_integer(self):
+        """Test non-integer and boolean values."""
+        with pytest.raises(ValidationError, match="must be an integer"):
+            ToolInputValidator.validate_int_range("5", "size", 1, 10)
+
+        with pytest.raises(ValidationError, match="must be an integer"):
+            ToolInputValidator.validate_int_range(True, "size", 1, 10)
+
     # String Length Validation Tests
     def test_validate_string_length_valid(self):
         """Test valid string lengths."""